@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Admission Control Benchmark
+===========================
+
+Lonjakan tanya_pdp (open loop, --rate request/detik) lewat session MCP
+in-memory terhadap LLM fake dengan kuota seperti Gemini (--llm-quota call
+per detik; di atasnya gagal 429). Dibandingkan:
+
+1. tanpa admission : semua tool call langsung ke LLM, kuota habis, retry
+   ikut terkena 429, dan circuit breaker terbuka
+2. admission       : ADMISSION_MAX_CONCURRENT slot, antrean prioritas, dan
+   token bucket GEMINI_GENERATE_QPS di bawah kuota; kelebihan beban
+   ditolak cepat dengan OverloadedError
+
+Selama lonjakan, tool murah (info_uu_pdp, cari_pasal dari structure index)
+dipanggil terus untuk memastikan tool tersebut tidak ikut antre.
+
+Usage:
+    python benchmarks/bench_admission.py --requests 200 --rate 40 --llm-quota 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ["ANSWER_CACHE_ENABLED"] = "false"
+os.environ["RETRIEVAL_MODE"] = "vector"
+
+from benchmarks.fakes import FakeEmbeddingService, FakeStreamingLLM, FakeVectorIndex
+from benchmarks.loadgen import percentile, run_load
+from src.rag.admission import AdmissionController, BackendRateLimiter
+from src.rag.clients import get_client_registry
+from src.rag.resilience import BackendGuard, ResiliencePolicy
+from src.rag.retriever import RAGRetriever
+
+CHEAP_TOOLS = [("info_uu_pdp", {}), ("cari_pasal", {"nomor_pasal": 5})]
+
+
+class ToolCallError(RuntimeError):
+    """Tool MCP mengembalikan isError (pesan error tool sebagai teks)."""
+
+
+def install(args: argparse.Namespace, admission: bool) -> FakeStreamingLLM:
+    """Pasang retriever fake, guard LLM baru, dan admission/rate limit untuk satu mode."""
+    registry = get_client_registry()
+    llm = FakeStreamingLLM(
+        first_token_latency=args.llm_latency, token_latency=0.005, tokens=args.tokens
+    )
+    llm.quota_qps = args.llm_quota
+    registry.register(retriever=RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=0.02),
+        pinecone_client=FakeVectorIndex(latency=0.02),
+        llm=llm,
+    ))
+    registry.guards["gemini_generate"] = BackendGuard(
+        ResiliencePolicy.from_env("gemini_generate", registry.configs["gemini_generate"].timeout)
+    )
+    if admission:
+        registry.admission = AdmissionController(
+            max_concurrent=args.max_concurrent,
+            queue_size=args.queue_size,
+            queue_timeout=args.queue_timeout,
+        )
+        qps = args.llm_quota * 0.9
+    else:
+        registry.admission = AdmissionController(max_concurrent=0)
+        qps = 0.0
+    registry.rate_limiters["gemini_generate"] = BackendRateLimiter(
+        "gemini_generate", qps=qps, max_wait=args.max_wait
+    )
+    return llm
+
+
+async def call(session, tool: str, arguments: dict) -> str:
+    result = await session.call_tool(tool, arguments)
+    text = "".join(getattr(block, "text", "") for block in result.content)
+    if result.isError:
+        raise ToolCallError(text)
+    return text
+
+
+def error_kind(message: str) -> str:
+    """Jenis error dari teks error tool (nama exception tidak ikut dikirim MCP)."""
+    if "Server sedang sibuk" in message or "sedang habis" in message:
+        return "overloaded"
+    if "circuit open" in message:
+        return "circuit_open"
+    if "429" in message:
+        return "rate_limited_429"
+    return "other"
+
+
+async def run_mode(name: str, args: argparse.Namespace, session) -> None:
+    llm = install(args, admission=name == "admission")
+    errors: dict[str, int] = {}
+    first_error_ms: list[float] = []
+    cheap_ms: list[float] = []
+    done = asyncio.Event()
+
+    async def ask(i: int) -> None:
+        start = time.perf_counter()
+        try:
+            await call(session, "tanya_pdp", {"pertanyaan": f"Kewajiban pengendali nomor {i}?"})
+        except ToolCallError as e:
+            kind = error_kind(str(e))
+            errors[kind] = errors.get(kind, 0) + 1
+            first_error_ms.append((time.perf_counter() - start) * 1000)
+            raise
+
+    async def probe() -> None:
+        i = 0
+        while not done.is_set():
+            tool, arguments = CHEAP_TOOLS[i % len(CHEAP_TOOLS)]
+            start = time.perf_counter()
+            await call(session, tool, arguments)
+            cheap_ms.append((time.perf_counter() - start) * 1000)
+            i += 1
+            await asyncio.sleep(0.02)
+
+    prober = asyncio.create_task(probe())
+    result = await run_load(
+        name, ask, requests=args.requests, concurrency=args.requests, rate=args.rate
+    )
+    done.set()
+    await prober
+
+    summary = result.to_dict()
+    print(f"   {name:<18}{len(result.latencies_ms):>6}{summary['errors']:>8}"
+          f"{summary['p50_ms']:>9.0f}{summary['p99_ms']:>9.0f}"
+          f"{percentile(first_error_ms, 50):>11.0f}{llm.calls:>8}{llm.throttled:>7}"
+          f"{percentile(cheap_ms, 99):>11.1f}")
+    for kind, count in sorted(errors.items()):
+        print(f"      {kind:<18}: {count}")
+    stats = get_client_registry().admission.stats()
+    if stats["max_concurrent"] > 0:
+        print(f"      admitted {stats['admitted']['interactive']}, queued {stats['queued']}, "
+              f"peak queue {stats['peak_queue']}, mean wait {stats['mean_wait_ms']:.0f} ms, "
+              f"rejected {stats['rejected']}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from src import server
+
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    print("=" * 72)
+    print("🚥 Admission Control Benchmark (tanya_pdp lewat session MCP)")
+    print("=" * 72)
+    print(f"   Lonjakan : {args.requests} request pada {args.rate:g}/detik, "
+          f"kuota LLM {args.llm_quota:g} call/detik, LLM {args.llm_latency * 1000:.0f} ms")
+    print(f"   Admission: {args.max_concurrent} slot, antrean {args.queue_size} "
+          f"(timeout {args.queue_timeout:g} s), rate limit {args.llm_quota * 0.9:g} QPS\n")
+    print(f"   {'mode':<18}{'ok':>6}{'errors':>8}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'error ms':>11}{'LLM':>8}{'429':>7}{'cheap p99':>11}")
+
+    async with create_connected_server_and_client_session(server.mcp._mcp_server) as session:
+        for tool, arguments in CHEAP_TOOLS:
+            await call(session, tool, arguments)
+        for name in ("tanpa admission", "admission"):
+            await run_mode(name, args, session)
+
+    print("\n   ok/p50/p99: tanya_pdp yang berhasil; error ms: median waktu sampai error "
+          "diterima client;\n   cheap p99: info_uu_pdp/cari_pasal selama lonjakan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark admission control dan rate limit LLM")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=40.0, help="Lonjakan tanya_pdp per detik")
+    parser.add_argument("--llm-quota", type=float, default=10.0, help="Kuota LLM fake per detik")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=32)
+    parser.add_argument("--queue-timeout", type=float, default=5.0)
+    parser.add_argument("--max-wait", type=float, default=5.0, help="RATE_LIMIT_MAX_WAIT")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Async Concurrency Benchmark
+===========================
+
+Membandingkan N request konkuren lewat RAGRetriever.answer (blocking,
+dipanggil dari coroutine seperti tool MCP lama) dengan RAGRetriever.aanswer
+(non-blocking). Semua backend adalah fake lokal dengan latency buatan.
+
+Usage:
+    python benchmarks/bench_async_concurrency.py --requests 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Ukur pipeline penuh, tanpa semantic answer cache dan tanpa batas admission
+os.environ.setdefault("ANSWER_CACHE_ENABLED", "false")
+os.environ.setdefault("ADMISSION_MAX_CONCURRENT", "0")
+
+from benchmarks.fakes import FakeEmbeddingService, FakeLLM, FakeVectorIndex
+from src.rag.retriever import RAGRetriever
+
+
+def build_retriever(args: argparse.Namespace) -> RAGRetriever:
+    """Buat RAGRetriever dengan fake backends."""
+    return RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=args.embed_latency),
+        pinecone_client=FakeVectorIndex(latency=args.vector_latency),
+        llm=FakeLLM(latency=args.llm_latency),
+        top_k=5,
+    )
+
+
+async def run_blocking_mode(retriever: RAGRetriever, n: int) -> float:
+    """N request konkuren yang memanggil answer() sync di dalam coroutine."""
+
+    async def tool_call(i: int) -> dict:
+        return retriever.answer(f"Pertanyaan benchmark {i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(tool_call(i) for i in range(n)))
+    return time.perf_counter() - start
+
+
+async def run_async_mode(retriever: RAGRetriever, n: int) -> float:
+    """N request konkuren yang memanggil aanswer()."""
+    start = time.perf_counter()
+    await asyncio.gather(*(retriever.aanswer(f"Pertanyaan benchmark {i}") for i in range(n)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark answer() vs aanswer()")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--vector-latency", type=float, default=0.03)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    per_request = args.embed_latency + args.vector_latency + args.llm_latency
+
+    print("=" * 60)
+    print("⏱️  Async Concurrency Benchmark (fake backends)")
+    print("=" * 60)
+    print(f"   Requests konkuren : {args.requests}")
+    print(f"   Latency/request   : {per_request * 1000:.0f} ms")
+
+    blocking = asyncio.run(run_blocking_mode(build_retriever(args), args.requests))
+    non_blocking = asyncio.run(run_async_mode(build_retriever(args), args.requests))
+
+    print(f"\n   answer()  (blocking)    : {blocking:.2f} s "
+          f"({args.requests / blocking:.1f} req/s)")
+    print(f"   aanswer() (non-blocking): {non_blocking:.2f} s "
+          f"({args.requests / non_blocking:.1f} req/s)")
+    print(f"   Speedup                 : {blocking / non_blocking:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Batch Question Benchmark
+========================
+
+Membandingkan checklist N pertanyaan yang dijawab satu per satu
+(seperti N panggilan tanya_pdp berurutan) dengan RAGRetriever.answer_many:
+
+- embedding : N request vs satu request batch
+- vector    : N query berurutan vs query konkuren (fake Pinecone) atau satu
+              perkalian matrix (LocalVectorIndex)
+- LLM       : berurutan vs paralel dengan batas concurrency
+
+Semua backend adalah fake lokal dengan latency buatan; index lokal diisi
+vector acak di folder sementara.
+
+Usage:
+    python benchmarks/bench_batch.py --questions 100 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Ukur pipeline penuh, tanpa semantic answer cache
+os.environ["ANSWER_CACHE_ENABLED"] = "false"
+os.environ["RETRIEVAL_MODE"] = "vector"
+
+from benchmarks.fakes import FakeEmbeddingService, FakeLLM, FakeVectorIndex, fake_vector
+from src.rag.local_index import LocalVectorIndex
+from src.rag.retriever import RAGRetriever
+
+TOPICS = [
+    "Apakah organisasi sudah menunjuk pejabat pelindungan data pribadi",
+    "Apakah ada dasar pemrosesan yang sah untuk",
+    "Bagaimana kewajiban pemberitahuan kegagalan pelindungan data untuk",
+    "Apakah persetujuan subjek data dicatat untuk",
+    "Bagaimana retensi dan pemusnahan data diatur untuk",
+]
+
+AREAS = ["data karyawan", "data pelanggan", "data vendor", "rekaman CCTV", "data kesehatan",
+         "data anak", "data lokasi", "data biometrik", "data keuangan", "log aplikasi"]
+
+
+def checklist(n: int, duplicates: float) -> list[str]:
+    """Checklist n pertanyaan; kira-kira porsi `duplicates` mengulang pertanyaan sebelumnya."""
+    step = round(1 / duplicates) if duplicates > 0 else 0
+    questions = []
+    for i in range(n):
+        if step and i and i % step == 0:
+            questions.append(questions[i // 2])
+        else:
+            area = AREAS[(i // len(TOPICS)) % len(AREAS)]
+            questions.append(f"{TOPICS[i % len(TOPICS)]} {area} (butir {i + 1})?")
+    return questions
+
+
+def build_local_index(directory: Path, chunks: int) -> LocalVectorIndex:
+    """LocalVectorIndex berisi `chunks` vector fake."""
+    index = LocalVectorIndex(index_dir=directory)
+    index.create_index_if_not_exists()
+    index.upsert_vectors([
+        {
+            "id": f"chunk-{i}",
+            "values": fake_vector(f"chunk {i}"),
+            "metadata": {"text": f"Teks chunk {i} untuk benchmark.", "pasal": str(i % 76 + 1)},
+        }
+        for i in range(chunks)
+    ])
+    index.flush()
+    return index
+
+
+def build_retriever(args: argparse.Namespace, vector_store) -> RAGRetriever:
+    return RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=args.embed_latency),
+        pinecone_client=vector_store,
+        llm=FakeLLM(latency=args.llm_latency),
+    )
+
+
+async def run_sequential(retriever: RAGRetriever, questions: list[str]) -> dict:
+    start = time.perf_counter()
+    first = None
+    for question in questions:
+        await retriever.aanswer(question)
+        first = first or time.perf_counter() - start
+    return {"wall": time.perf_counter() - start, "first": first}
+
+
+async def run_batch(retriever: RAGRetriever, questions: list[str], concurrency: int) -> dict:
+    start = time.perf_counter()
+    first = None
+    stats = {}
+    async for _ in retriever.answer_many(questions, concurrency=concurrency, stats=stats):
+        first = first or time.perf_counter() - start
+    return {"wall": time.perf_counter() - start, "first": first, **stats}
+
+
+def report(name: str, retriever: RAGRetriever, result: dict) -> None:
+    vector_calls = getattr(retriever.pinecone_client, "calls", None)
+    print(f"   {name:<24}{result['wall'] * 1000:>9.0f}{result['first'] * 1000:>10.0f}"
+          f"{retriever.embedding_service.calls:>8}{vector_calls if vector_calls is not None else '-':>8}"
+          f"{retriever.llm.calls:>6}")
+    if "unique_chunks" in result:
+        print(f"   {'':<24}↳ {result['unique_questions']}/{result['questions']} pertanyaan unik, "
+              f"{result['unique_chunks']}/{result['retrieved_chunks']} chunk unik")
+
+
+async def run(args: argparse.Namespace) -> None:
+    questions = checklist(args.questions, args.duplicates)
+
+    print("=" * 60)
+    print("📋 Batch Question Benchmark")
+    print("=" * 60)
+    print(f"   Pertanyaan : {len(questions)} ({len(set(questions))} unik)")
+    print(f"   Latency    : embed {args.embed_latency * 1000:.0f} ms, vector "
+          f"{args.vector_latency * 1000:.0f} ms, LLM {args.llm_latency * 1000:.0f} ms, "
+          f"concurrency {args.concurrency}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        local = build_local_index(Path(tmp), args.chunks)
+        print()
+        print(f"   {'mode':<24}{'wall ms':>9}{'first ms':>10}{'embed':>8}{'vector':>8}{'llm':>6}")
+        backends = [
+            ("fake", lambda: FakeVectorIndex(latency=args.vector_latency)),
+            ("local", lambda: local),
+        ]
+        for backend, factory in backends:
+            if not args.skip_sequential:
+                retriever = build_retriever(args, factory())
+                report(f"{backend} sequential", retriever, await run_sequential(retriever, questions))
+            retriever = build_retriever(args, factory())
+            report(f"{backend} answer_many", retriever,
+                   await run_batch(retriever, questions, args.concurrency))
+
+        # query_many (satu perkalian matrix) harus sama dengan query per vector
+        vectors = [fake_vector(q) for q in questions[:20]]
+        batch = local.query_many(vectors, top_k=5)
+        single = [local.query(v, top_k=5) for v in vectors]
+        same = all([m["id"] for m in a] == [m["id"] for m in b] for a, b in zip(batch, single))
+        print(f"\n   {'✅' if same else '❌'} LocalVectorIndex.query_many == query per vector")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark answer_many vs pertanyaan berurutan")
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Porsi pertanyaan yang berulang")
+    parser.add_argument("--concurrency", type=int, default=8, help="Generation paralel untuk answer_many")
+    parser.add_argument("--chunks", type=int, default=2000, help="Jumlah chunk di index lokal")
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--vector-latency", type=float, default=0.03)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--skip-sequential", action="store_true", help="Lewati baseline berurutan")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Chunking Benchmark
+==================
+
+Membandingkan RecursiveCharacterTextSplitter (mode "recursive") dengan
+StructuralChunker (mode "structural"): jumlah chunk, total karakter yang
+di-embed, waktu chunking, dan hit rate retrieval pada eval set berlabel.
+
+Retrieval memakai proxy TF-IDF lokal secara default; gunakan --gemini untuk
+memakai embedding text-embedding-004 asli (butuh GOOGLE_API_KEY).
+
+Usage:
+    python benchmarks/bench_chunking.py --top-k 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.evaluation import TfidfRetriever, load_eval_set, pasal_hit
+from src.document.pdf_loader import PDFLoader, get_uu_pdp_path
+from src.document.structural_chunker import CHUNK_MODES, chunk_document
+
+
+def gemini_search(chunks: list[dict], queries: list[str], top_k: int) -> list[list[int]]:
+    """Retrieval dengan embedding Gemini asli (exact cosine)."""
+    from src.rag.embeddings import get_embedding_service
+
+    service = get_embedding_service()
+    matrix = np.asarray(service.embed_batch([c["text"] for c in chunks]), dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    results = []
+    for query in queries:
+        vector = np.asarray(service.embed_query(query), dtype=np.float32)
+        scores = matrix @ (vector / np.linalg.norm(vector))
+        results.append([int(i) for i in np.argsort(-scores)[:top_k]])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recursive vs structural chunking")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--gemini", action="store_true", help="Pakai embedding Gemini asli")
+    args = parser.parse_args()
+
+    pages = [page["text"] for page in PDFLoader(get_uu_pdp_path()).load_pages()]
+    eval_set = load_eval_set()
+    queries = [item["query"] for item in eval_set]
+
+    print("=" * 60)
+    print("⏱️  Chunking Benchmark")
+    print("=" * 60)
+    print(f"   Eval set  : {len(eval_set)} pertanyaan, top_k={args.top_k}")
+    print(f"   Retriever : {'Gemini text-embedding-004' if args.gemini else 'TF-IDF proxy'}")
+    print()
+    print(f"   {'mode':<11} {'chunks':>7} {'chars':>8} {'avg':>6} {'ms':>7} {'hit@k':>7}")
+
+    for mode in CHUNK_MODES:
+        start = time.perf_counter()
+        chunks = chunk_document(pages, mode=mode)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if args.gemini:
+            rankings = gemini_search(chunks, queries, args.top_k)
+        else:
+            retriever = TfidfRetriever([c["text"] for c in chunks])
+            rankings = [retriever.search(q, args.top_k) for q in queries]
+
+        hits = sum(
+            pasal_hit([chunks[i]["metadata"] for i in ranking], item["pasal"])
+            for ranking, item in zip(rankings, eval_set)
+        )
+        total_chars = sum(len(c["text"]) for c in chunks)
+
+        print(f"   {mode:<11} {len(chunks):>7} {total_chars:>8,} "
+              f"{total_chars // len(chunks):>6} {elapsed:>7.1f} {hits / len(eval_set):>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Request Coalescing Benchmark
+============================
+
+Mensimulasikan lonjakan pertanyaan identik (misalnya webinar di mana
+ratusan peserta bertanya "apa sanksi pidana UU PDP" bersamaan) dan
+membandingkan RAGRetriever tanpa dan dengan single-flight coalescing:
+jumlah panggilan embedding/LLM, wall time, dan latency per request.
+
+Variasi huruf besar/kecil, spasi, dan tanda tanya tetap dianggap identik
+(normalize_query). Semua backend adalah fake lokal dengan latency buatan.
+
+Usage:
+    python benchmarks/bench_coalescing.py --requests 200 --distinct 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Ukur pipeline penuh, tanpa semantic answer cache dan tanpa batas admission
+os.environ["ANSWER_CACHE_ENABLED"] = "false"
+os.environ["RETRIEVAL_MODE"] = "vector"
+os.environ["ADMISSION_MAX_CONCURRENT"] = "0"
+
+from benchmarks.fakes import FakeEmbeddingService, FakeStreamingLLM, FakeVectorIndex
+from src.rag.retriever import RAGRetriever
+
+QUESTIONS = [
+    "apa sanksi pidana UU PDP",
+    "Apa hak subjek data pribadi?",
+    "Kapan pengendali wajib memberitahu kegagalan pelindungan data?",
+    "Bagaimana transfer data pribadi ke luar negeri?",
+    "Siapa yang mengawasi pelaksanaan UU PDP?",
+]
+
+# Variasi penulisan yang tetap identik setelah normalize_query
+VARIANTS = [
+    lambda q: q,
+    lambda q: q.rstrip("?") + "?",
+    lambda q: f"  {q}  ",
+    str.upper,
+    lambda q: q.lower().rstrip("?") + " ?",
+]
+
+
+def build_retriever(args: argparse.Namespace, coalesce: bool) -> RAGRetriever:
+    """Buat RAGRetriever dengan fake backends."""
+    os.environ["COALESCE_ENABLED"] = "true" if coalesce else "false"
+    return RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=args.embed_latency),
+        pinecone_client=FakeVectorIndex(latency=args.vector_latency),
+        llm=FakeStreamingLLM(first_token_latency=args.first_token, token_latency=args.token),
+    )
+
+
+def spike_queries(args: argparse.Namespace) -> list[str]:
+    """N pertanyaan dari `distinct` topik, dengan variasi penulisan."""
+    queries = []
+    for i in range(args.requests):
+        question = QUESTIONS[i % args.distinct]
+        variant = VARIANTS[(i // args.distinct) % len(VARIANTS)]
+        queries.append(variant(question))
+    return queries
+
+
+async def timed_answer(retriever: RAGRetriever, query: str) -> float:
+    start = time.perf_counter()
+    await retriever.aanswer(query)
+    return time.perf_counter() - start
+
+
+async def timed_stream(retriever: RAGRetriever, query: str) -> float:
+    start = time.perf_counter()
+    async for _ in retriever.astream_answer(query):
+        pass
+    return time.perf_counter() - start
+
+
+async def run_scenario(args: argparse.Namespace, coalesce: bool, stream: bool) -> None:
+    retriever = build_retriever(args, coalesce)
+    measure = timed_stream if stream else timed_answer
+    queries = spike_queries(args)
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(measure(retriever, q) for q in queries))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(t * 1000 for t in latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    name = f"{'astream' if stream else 'aanswer'} {'coalesce' if coalesce else 'baseline'}"
+    print(f"   {name:<20}{retriever.embedding_service.calls:>8}{retriever.llm.calls:>8}"
+          f"{wall * 1000:>10.0f}{statistics.median(latencies):>10.0f}{p95:>10.0f}")
+    if coalesce:
+        stats = retriever.singleflight.stats()
+        print(f"   {'':<20}↳ executions {stats['executions']}, coalesced {stats['coalesced']} "
+              f"({stats['coalesced_rate']:.0%}), max shared {stats['max_shared']}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    print("=" * 60)
+    print("🧲 Request Coalescing Benchmark")
+    print("=" * 60)
+    print(f"   Requests : {args.requests} konkuren, {args.distinct} pertanyaan berbeda")
+    print(f"   Latency  : embed {args.embed_latency * 1000:.0f} ms, vector "
+          f"{args.vector_latency * 1000:.0f} ms, LLM first token {args.first_token * 1000:.0f} ms")
+    print()
+    print(f"   {'scenario':<20}{'embed':>8}{'llm':>8}{'wall ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for stream in (False, True):
+        for coalesce in (False, True):
+            await run_scenario(args, coalesce, stream)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-flight request coalescing")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=5, choices=range(1, len(QUESTIONS) + 1))
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--vector-latency", type=float, default=0.03)
+    parser.add_argument("--first-token", type=float, default=0.4)
+    parser.add_argument("--token", type=float, default=0.02)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
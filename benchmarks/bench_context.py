@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Context Budget Benchmark
+========================
+
+Membandingkan context lama (concatenation teks penuh setiap chunk) dengan
+ContextAssembler (merge chunk berurutan, dedupe span, budget token) pada
+eval set berlabel:
+
+- token context rata-rata dan token yang dihemat per request
+- waktu assemble per request
+- recall pasal berlabel yang masih ada di context (tidak boleh turun
+  tanpa budget; dengan budget sebanding dengan yang dipotong)
+
+Retrieval memakai proxy TF-IDF lokal atas chunk UU PDP. Gunakan
+--count-tokens untuk membandingkan estimator lokal dengan countTokens
+Gemini (butuh GOOGLE_API_KEY).
+
+Usage:
+    python benchmarks/bench_context.py --top-k 8 --budget 1500
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.evaluation import TfidfRetriever, load_eval_set, pasal_recall
+from src.document.pdf_loader import PDFLoader, get_uu_pdp_path
+from src.document.structural_chunker import CHUNK_MODES, chunk_document
+from src.rag.context_budget import ContextAssembler, estimate_tokens, legacy_context
+
+
+def retrieved_documents(chunks: list[dict], ranking: list[int]) -> list[dict]:
+    """Bentuk hasil retrieval seperti vector store (id, score, metadata + text)."""
+    return [
+        {
+            "id": f"uu-pdp-{i}",
+            "score": 1.0 / (rank + 1),
+            "metadata": {
+                "text": chunks[i]["text"],
+                "document_id": "uu-pdp",
+                **chunks[i]["metadata"],
+            },
+        }
+        for rank, i in enumerate(ranking)
+    ]
+
+
+def count_gemini_tokens(texts: list[str]) -> list[int]:
+    """Jumlah token asli dari endpoint countTokens Gemini."""
+    from src.rag.clients import get_client_registry
+
+    registry = get_client_registry()
+    registry.configure_genai()
+    model = registry.generative_model("gemini-2.0-flash")
+    return [model.count_tokens(text).total_tokens for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark context assembler vs concatenation")
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--budget", type=int, default=1500,
+                        help="Budget token untuk baris 'budget'")
+    parser.add_argument("--count-tokens", action="store_true",
+                        help="Bandingkan estimator lokal dengan countTokens Gemini")
+    args = parser.parse_args()
+
+    pages = [page["text"] for page in PDFLoader(get_uu_pdp_path()).load_pages()]
+    eval_set = load_eval_set()
+
+    print("=" * 60)
+    print("🧮 Context Budget Benchmark")
+    print("=" * 60)
+    print(f"   Eval set: {len(eval_set)} pertanyaan, top_k={args.top_k}, budget={args.budget}")
+    print()
+    print(f"   {'mode':<11}{'context':<10}{'tokens':>8}{'saved':>8}{'ms':>8}{'recall':>8}")
+
+    samples = []
+    for mode in CHUNK_MODES:
+        chunks = chunk_document(pages, mode=mode)
+        retriever = TfidfRetriever([c["text"] for c in chunks])
+        requests = [
+            (
+                retrieved_documents(chunks, retriever.search(item["query"], args.top_k)),
+                item["pasal"],
+            )
+            for item in eval_set
+        ]
+
+        variants = [
+            ("legacy", None),
+            ("merged", ContextAssembler(budget_tokens=0)),
+            ("budget", ContextAssembler(budget_tokens=args.budget)),
+        ]
+        for name, assembler in variants:
+            tokens, saved, elapsed, recall = [], [], [], []
+            for documents, expected in requests:
+                start = time.perf_counter()
+                if assembler is None:
+                    text, used = legacy_context(documents), documents
+                    tokens.append(estimate_tokens(text))
+                    saved.append(0)
+                else:
+                    assembled = assembler.assemble(documents)
+                    text, used = assembled.text, assembled.documents
+                    tokens.append(assembled.tokens)
+                    saved.append(assembled.saved_tokens)
+                elapsed.append((time.perf_counter() - start) * 1000)
+                recall.append(pasal_recall([d["metadata"] for d in used], expected))
+                if name == "legacy" and len(samples) < 10:
+                    samples.append(text)
+
+            print(f"   {mode:<11}{name:<10}{statistics.mean(tokens):>8.0f}"
+                  f"{statistics.mean(saved):>8.0f}{statistics.mean(elapsed):>8.2f}"
+                  f"{statistics.mean(recall):>8.1%}")
+
+    if args.count_tokens:
+        print("\n🔹 Estimator lokal vs countTokens Gemini")
+        actual = count_gemini_tokens(samples)
+        for text, real in zip(samples, actual):
+            estimate = estimate_tokens(text)
+            print(f"   {len(text):>6} chars: estimate {estimate:>5}, gemini {real:>5} "
+                  f"({(estimate - real) / real:+.0%}), chars/4 {len(text) // 4:>5}")
+
+
+if __name__ == "__main__":
+    main()
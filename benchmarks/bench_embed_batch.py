@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Embedding Batch Benchmark
+=========================
+
+Membandingkan embed_text per chunk (cara ingest lama) dengan embed_batch
+(request multi-content, paralel) terhadap fake endpoint Gemini lokal.
+Hasil dilaporkan dalam chunks per detik.
+
+Usage:
+    python benchmarks/bench_embed_batch.py --latency 0.05 --error-rate 0.05
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_servers import FakeGeminiServer
+from src.rag.embeddings import EmbeddingService
+
+
+def load_texts(n: int) -> list[str]:
+    """Ambil chunk UU PDP asli jika ada, kalau tidak pakai teks sintetis."""
+    try:
+        from src.document.chunker import chunk_uu_pdp
+        from src.document.pdf_loader import load_uu_pdp
+
+        chunks = [c["text"] for c in chunk_uu_pdp(load_uu_pdp())]
+    except FileNotFoundError:
+        chunks = []
+
+    if n:
+        chunks = (chunks or ["Pasal contoh teks sintetis."]) * (n // max(len(chunks), 1) + 1)
+        chunks = [f"{text} #{i}" for i, text in enumerate(chunks[:n])]
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embed_text loop vs embed_batch")
+    parser.add_argument("--chunks", type=int, default=0, help="Jumlah chunk (0 = chunk PDF asli)")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--per-item-latency", type=float, default=0.001)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    texts = load_texts(args.chunks)
+
+    print("=" * 60)
+    print("⏱️  Embedding Batch Benchmark (fake Gemini endpoint)")
+    print("=" * 60)
+    print(f"   Chunks     : {len(texts)}")
+    print(f"   Latency    : {args.latency * 1000:.0f} ms/request")
+    print(f"   Error rate : {args.error_rate:.0%}")
+
+    with FakeGeminiServer(
+        latency=args.latency,
+        per_item_latency=args.per_item_latency,
+        error_rate=args.error_rate,
+    ) as server:
+        service = EmbeddingService(api_key="fake-key", retry_base_delay=0.05)
+        server.configure_genai()
+
+        # Cara lama: satu request per chunk (tanpa error injection)
+        error_rate, server.error_rate = server.error_rate, 0.0
+        start = time.perf_counter()
+        sequential = [service.embed_text(text) for text in texts]
+        sequential_time = time.perf_counter() - start
+        server.error_rate = error_rate
+
+        requests_before = server.request_count
+        start = time.perf_counter()
+        batched = service.embed_batch(
+            texts,
+            batch_size=args.batch_size,
+            max_concurrency=args.concurrency,
+        )
+        batched_time = time.perf_counter() - start
+        batch_requests = server.request_count - requests_before
+
+    assert batched == sequential, "embed_batch harus mengembalikan urutan yang sama"
+
+    print(f"\n   embed_text loop : {sequential_time:.2f} s "
+          f"({len(texts) / sequential_time:.1f} chunks/s, {len(texts)} requests)")
+    print(f"   embed_batch     : {batched_time:.2f} s "
+          f"({len(texts) / batched_time:.1f} chunks/s, {batch_requests} requests, "
+          f"{server.error_count} rate-limited)")
+    print(f"   Speedup         : {sequential_time / batched_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Hybrid Retrieval Benchmark
+==========================
+
+Membandingkan retrieval vector-only, BM25-only, dan hybrid (RRF) pada eval
+set berlabel: recall@k per mode, lalu latency RAGRetriever.retrieve() per
+mode dengan backend fake (embedding dan vector index berlatency buatan)
+beserta jumlah panggilan embedding yang dihemat shortcut lexical.
+
+Ranking "vector" memakai proxy TF-IDF lokal secara default; gunakan --gemini
+untuk embedding text-embedding-004 asli (butuh GOOGLE_API_KEY).
+
+Usage:
+    python benchmarks/bench_hybrid.py --mode structural
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.evaluation import TfidfRetriever, load_eval_set, pasal_recall
+from benchmarks.fakes import FakeEmbeddingService, FakeLLM, FakeVectorIndex
+from src.document.corpus import chunk_corpus_document, get_document
+from src.rag.lexical_index import BM25Index, LexicalSegment, reciprocal_rank_fusion
+from src.rag.retriever import RAGRetriever
+
+K_VALUES = (1, 3, 5, 10)
+
+
+def dense_rankings(chunks: list[dict], queries: list[str], depth: int, gemini: bool) -> list[list[int]]:
+    """Ranking indeks chunk per query dari retriever dense (atau proxy TF-IDF)."""
+    if not gemini:
+        retriever = TfidfRetriever([c["text"] for c in chunks])
+        return [retriever.search(q, depth) for q in queries]
+
+    from src.rag.embeddings import get_embedding_service
+
+    service = get_embedding_service()
+    matrix = np.asarray(service.embed_batch([c["text"] for c in chunks]), dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    rankings = []
+    for query in queries:
+        vector = np.asarray(service.embed_query(query), dtype=np.float32)
+        scores = matrix @ (vector / np.linalg.norm(vector))
+        rankings.append([int(i) for i in np.argsort(-scores)[:depth]])
+    return rankings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector vs BM25 vs hybrid retrieval")
+    parser.add_argument("--mode", default="structural", help="Mode chunking (recursive/structural)")
+    parser.add_argument("--candidates", type=int, default=20, help="Kandidat per retriever untuk RRF")
+    parser.add_argument("--embed-latency", type=float, default=0.08)
+    parser.add_argument("--vector-latency", type=float, default=0.04)
+    parser.add_argument("--gemini", action="store_true", help="Pakai embedding Gemini asli")
+    args = parser.parse_args()
+
+    document = get_document("uu-pdp")
+    _, chunks, _ = chunk_corpus_document(document, mode=args.mode)
+    ids = [f"{document.id_prefix}-{i}" for i in range(len(chunks))]
+    metadata = [{"text": c["text"], **c["metadata"]} for c in chunks]
+    position = {vid: i for i, vid in enumerate(ids)}
+
+    bm25 = BM25Index({document.id: LexicalSegment.build(ids, [c["text"] for c in chunks], metadata)})
+    eval_set = load_eval_set()
+    queries = [item["query"] for item in eval_set]
+
+    print("=" * 64)
+    print("⏱️  Hybrid Retrieval Benchmark")
+    print("=" * 64)
+    print(f"   Chunks    : {len(chunks)} (mode: {args.mode})")
+    print(f"   Eval set  : {len(eval_set)} pertanyaan")
+    print(f"   Vector    : {'Gemini text-embedding-004' if args.gemini else 'TF-IDF proxy'}")
+    print()
+
+    # Recall@k per mode
+    dense = dense_rankings(chunks, queries, args.candidates, args.gemini)
+    rankings = {"vector": [], "bm25": [], "hybrid": []}
+    for query, dense_ranking in zip(queries, dense):
+        vector_results = [{"id": ids[i], "metadata": metadata[i]} for i in dense_ranking]
+        lexical_results = bm25.search(query, top_k=args.candidates)
+        fused = reciprocal_rank_fusion([vector_results, lexical_results], top_k=args.candidates)
+        rankings["vector"].append(dense_ranking)
+        rankings["bm25"].append([position[m["id"]] for m in lexical_results])
+        rankings["hybrid"].append([position[m["id"]] for m in fused])
+
+    header = "".join(f"{f'recall@{k}':>11}" for k in K_VALUES)
+    print(f"   {'retriever':<10}{header}")
+    for name, per_query in rankings.items():
+        row = ""
+        for k in K_VALUES:
+            recall = statistics.mean(
+                pasal_recall([metadata[i] for i in ranking[:k]], item["pasal"])
+                for ranking, item in zip(per_query, eval_set)
+            )
+            row += f"{recall:>11.1%}"
+        print(f"   {name:<10}{row}")
+
+    # Latency RAGRetriever.retrieve() per RETRIEVAL_MODE dengan backend fake
+    print()
+    print(f"   Latency retrieve() (embed {args.embed_latency * 1000:.0f} ms, "
+          f"vector {args.vector_latency * 1000:.0f} ms):")
+    print(f"   {'mode':<10}{'mean ms':>10}{'p95 ms':>10}{'embed calls':>13}")
+    for mode in ("vector", "hybrid", "lexical"):
+        os.environ["RETRIEVAL_MODE"] = mode
+        embedder = FakeEmbeddingService(latency=args.embed_latency)
+        retriever = RAGRetriever(
+            embedding_service=embedder,
+            pinecone_client=FakeVectorIndex(latency=args.vector_latency),
+            llm=FakeLLM(latency=0),
+            answer_cache=None,
+            lexical_index=bm25,
+        )
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            retriever.retrieve(query, top_k=5)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        p95 = sorted(timings)[int(0.95 * (len(timings) - 1))]
+        print(f"   {mode:<10}{statistics.mean(timings):>10.1f}{p95:>10.1f}"
+              f"{embedder.calls:>8}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Load Test Benchmark
+===================
+
+Load test offline untuk RAGRetriever dan tools FastMCP asli. Semua backend
+adalah fake lokal dengan latency dan error rate yang bisa diatur, lalu
+setiap skenario dijalankan oleh load generator konkuren:
+
+- single     : tanya_pdp, setiap request pertanyaan baru (tanpa answer cache)
+- batch      : tanya_pdp_batch dengan --batch-size pertanyaan per request
+- cache-hot  : tanya_pdp dengan answer cache, pertanyaan berulang dari hot set
+- cache-cold : tanya_pdp dengan answer cache, setiap pertanyaan unik (selalu miss)
+- ingest     : IngestionPipeline (embed -> upsert) atas --ingest-chunks chunk
+
+Tools dipanggil lewat session MCP in-memory (sama seperti client sungguhan),
+atau langsung ke QueryRouter dengan --direct. Dengan --backend http, vector
+search memakai PineconeClient asli terhadap FakePineconeServer dan ingest
+memakai EmbeddingService asli terhadap FakeGeminiServer; embedding query
+dan LLM tetap fake in-process karena SDK google.generativeai tidak
+mendukung call async lewat REST.
+
+Hasil per skenario: p50/p95/p99 latency, RPS, error rate, RSS, dan breakdown
+latency per tahap (StageMetrics). Simpan dengan --output lalu bandingkan
+commit lain dengan --compare (exit code 1 jika ada regresi).
+
+Usage:
+    python benchmarks/bench_load.py --requests 200 --concurrency 16 --output load.json
+    python benchmarks/bench_load.py --compare load.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Answer cache hanya dipasang eksplisit oleh skenario cache-*
+os.environ["ANSWER_CACHE_ENABLED"] = "false"
+os.environ["RETRIEVAL_MODE"] = "vector"
+
+from benchmarks.fake_servers import FakeGeminiServer, FakePineconeServer
+from benchmarks.fakes import FakeEmbeddingService, FakeStreamingLLM, FakeVectorIndex
+from benchmarks.loadgen import compare_results, run_load, run_metadata, save_results
+from src.rag.answer_cache import SemanticAnswerCache
+from src.rag.clients import get_client_registry
+from src.rag.ingestion import IngestionPipeline
+from src.rag.local_index import LocalVectorIndex
+from src.rag.metrics import get_metrics
+from src.rag.retriever import RAGRetriever
+
+SCENARIOS = ("single", "batch", "cache-hot", "cache-cold", "ingest")
+
+TOPICS = [
+    "Apa kewajiban pengendali data pribadi terkait",
+    "Bagaimana dasar pemrosesan yang sah untuk",
+    "Apa hak subjek data pribadi atas",
+    "Bagaimana kewajiban pemberitahuan kegagalan pelindungan data untuk",
+    "Berapa lama retensi yang diperbolehkan untuk",
+]
+
+AREAS = ["data karyawan", "data pelanggan", "data vendor", "rekaman CCTV", "data kesehatan",
+         "data anak", "data lokasi", "data biometrik", "data keuangan", "log aplikasi"]
+
+
+class ToolCallError(RuntimeError):
+    """Tool MCP mengembalikan isError."""
+
+
+def question(i: int, salt: str) -> str:
+    """Pertanyaan RAG ke-i; salt berbeda menghasilkan embedding berbeda."""
+    area = AREAS[(i // len(TOPICS)) % len(AREAS)]
+    return f"{TOPICS[i % len(TOPICS)]} {area}? ({salt} {i})"
+
+
+def synthetic_chunks(n: int, salt: str) -> list[dict]:
+    """Chunk sintetis seukuran chunk UU PDP (~800 karakter)."""
+    body = "Pengendali data pribadi wajib melindungi dan memastikan keamanan data pribadi. " * 10
+    return [
+        {
+            "text": f"Pasal {i % 76 + 1} ({salt}) {body}",
+            "metadata": {"pasal": str(i % 76 + 1), "chunk_index": i},
+        }
+        for i in range(n)
+    ]
+
+
+class Backends:
+    """Fake backend sesuai --backend, dengan server HTTP yang hidup selama benchmark."""
+
+    def __init__(self, args: argparse.Namespace, stack: contextlib.ExitStack, tmp: Path):
+        self.args = args
+        self.tmp = tmp
+        self.pinecone_server = None
+        self.gemini_server = None
+        if args.backend == "http":
+            self.pinecone_server = stack.enter_context(FakePineconeServer(
+                latency=args.vector_latency, error_rate=args.vector_error_rate,
+            ))
+            self.gemini_server = stack.enter_context(FakeGeminiServer(
+                latency=args.embed_latency, error_rate=args.embed_error_rate,
+            ))
+
+    def retriever(self, answer_cache=None) -> RAGRetriever:
+        args = self.args
+        if self.pinecone_server:
+            vector_store = self.pinecone_server.client()
+        else:
+            vector_store = FakeVectorIndex(
+                latency=args.vector_latency, error_rate=args.vector_error_rate, seed=args.seed,
+            )
+        return RAGRetriever(
+            embedding_service=FakeEmbeddingService(
+                latency=args.embed_latency, error_rate=args.embed_error_rate, seed=args.seed,
+            ),
+            pinecone_client=vector_store,
+            llm=FakeStreamingLLM(
+                first_token_latency=args.llm_latency,
+                token_latency=args.token_latency,
+                tokens=args.tokens,
+                error_rate=args.llm_error_rate,
+                seed=args.seed,
+            ),
+            answer_cache=answer_cache,
+        )
+
+    def answer_cache(self) -> SemanticAnswerCache:
+        return SemanticAnswerCache(version_path=self.tmp / "VERSION")
+
+    def ingestion(self, run: int) -> IngestionPipeline:
+        args = self.args
+        if self.gemini_server:
+            from src.rag.embeddings import EmbeddingService
+
+            embedding_service = EmbeddingService(api_key="fake-key", retry_base_delay=0.05)
+            self.gemini_server.configure_genai()
+            vector_store = self.pinecone_server.client()
+        else:
+            embedding_service = FakeEmbeddingService(
+                latency=args.embed_latency, error_rate=args.embed_error_rate, seed=args.seed,
+            )
+            vector_store = LocalVectorIndex(index_dir=self.tmp / f"ingest-{run}")
+            vector_store.create_index_if_not_exists()
+        return IngestionPipeline(
+            embedding_service,
+            vector_store,
+            batch_size=args.ingest_batch_size,
+            id_prefix=f"load-{run}",
+        )
+
+
+class Client:
+    """Pemanggil tanya_pdp / tanya_pdp_batch: lewat session MCP atau langsung ke router."""
+
+    def __init__(self, session=None):
+        self.session = session
+
+    async def ask(self, pertanyaan: str) -> None:
+        if self.session is None:
+            await get_client_registry().router().aanswer(pertanyaan)
+            return
+        await self._call("tanya_pdp", {"pertanyaan": pertanyaan})
+
+    async def ask_many(self, pertanyaan: list[str]) -> int:
+        """Return jumlah pertanyaan yang gagal di dalam batch."""
+        if self.session is None:
+            results = [r async for r in get_client_registry().router().answer_many(pertanyaan)]
+            return sum(1 for r in results if r.get("error"))
+        text = await self._call("tanya_pdp_batch", {"pertanyaan": pertanyaan})
+        return text.count("❌ Error:")
+
+    async def _call(self, tool: str, arguments: dict) -> str:
+        result = await self.session.call_tool(tool, arguments)
+        text = "".join(getattr(block, "text", "") for block in result.content)
+        if result.isError:
+            raise ToolCallError(text)
+        return text
+
+
+async def run_scenario(name: str, args, backends: Backends, client: Client) -> dict:
+    """Siapkan retriever untuk skenario, warm-up, lalu jalankan load test."""
+    registry = get_client_registry()
+    requests, concurrency = args.requests, args.concurrency
+    extra = {}
+
+    if name == "single":
+        registry.register(retriever=backends.retriever())
+
+        async def operation(i: int) -> None:
+            await client.ask(question(i, "single"))
+
+        async def warm_up(i: int) -> None:
+            await client.ask(question(i, "warm"))
+
+    elif name == "batch":
+        registry.register(retriever=backends.retriever())
+        requests = max(1, args.requests // args.batch_size)
+        concurrency = max(1, min(args.concurrency, requests))
+        failed = []
+
+        async def operation(i: int) -> None:
+            batch = [question(i * args.batch_size + j, "batch") for j in range(args.batch_size)]
+            failed.append(await client.ask_many(batch))
+
+        async def warm_up(i: int) -> None:
+            await client.ask_many([question(i, "warm")])
+
+    elif name in ("cache-hot", "cache-cold"):
+        registry.register(retriever=backends.retriever(answer_cache=backends.answer_cache()))
+        hot = name == "cache-hot"
+
+        async def operation(i: int) -> None:
+            await client.ask(question(i % args.hot_set, "hot") if hot else question(i, "cold"))
+
+        async def warm_up(i: int) -> None:
+            # cache-hot: isi cache dengan seluruh hot set
+            for j in range(i, args.hot_set, max(args.warmup, 1)) if hot else [i]:
+                await client.ask(question(j, "hot") if hot else question(j, "warm"))
+
+    elif name == "ingest":
+        requests, concurrency = args.ingest_runs, 1
+        chunks = []
+
+        async def operation(i: int) -> None:
+            # Progress per batch dari pipeline/SDK tidak ikut dicetak
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                pipeline = backends.ingestion(i)
+                stats = await asyncio.to_thread(
+                    pipeline.run, synthetic_chunks(args.ingest_chunks, f"run {i}"),
+                )
+            chunks.append(stats["upserted"])
+
+        async def warm_up(i: int) -> None:
+            pass
+
+    else:
+        raise ValueError(f"Skenario tidak dikenal: {name}. Pilihan: {', '.join(SCENARIOS)}")
+
+    await asyncio.gather(*(warm_up(i) for i in range(args.warmup)), return_exceptions=True)
+    get_metrics().reset()
+
+    result = await run_load(
+        name,
+        operation,
+        requests=requests,
+        concurrency=concurrency,
+        rate=args.rate if name != "ingest" else None,
+        trace_memory=args.trace_memory,
+    )
+    summary = result.to_dict()
+
+    if name == "batch":
+        questions = args.batch_size * len(result.latencies_ms)
+        extra = {
+            "batch_size": args.batch_size,
+            "questions_per_second": round(questions / result.seconds, 2),
+            "failed_questions": sum(failed),
+        }
+    elif name == "ingest":
+        extra = {
+            "chunks_per_run": args.ingest_chunks,
+            "chunks_per_second": round(sum(chunks) / result.seconds, 1),
+        }
+    elif name.startswith("cache"):
+        cache = (await registry.aretriever()).answer_cache
+        extra = {"cache_hit_rate": round(cache.hits / max(cache.hits + cache.misses, 1), 3)}
+
+    summary.update(extra)
+    summary["stages"] = {
+        stage: {key: entry[key] for key in ("count", "errors", "p50_ms", "p95_ms")}
+        for stage, entry in get_metrics().stats().items()
+    }
+    return summary
+
+
+def print_summary(name: str, summary: dict) -> None:
+    print(f"   {name:<12}{summary['requests']:>6}{summary['error_rate']:>8.1%}"
+          f"{summary['rps']:>9.1f}{summary['p50_ms']:>9.1f}{summary['p95_ms']:>9.1f}"
+          f"{summary['p99_ms']:>9.1f}{summary['rss_peak_mb']:>9.1f}")
+
+
+def print_comparison(rows: list[dict], baseline_meta: dict) -> None:
+    print(f"\n🔹 Dibandingkan dengan {baseline_meta.get('commit') or 'baseline'} "
+          f"({baseline_meta.get('timestamp', '?')})")
+    for row in rows:
+        mark = "❌" if row["regression"] else "  "
+        unit = "" if row["metric"] == "error_rate" else "%"
+        change = row["change"] * (1 if row["metric"] == "error_rate" else 100)
+        print(f"   {mark} {row['scenario']:<12}{row['metric']:<13}{row['baseline']:>10}"
+              f" → {row['current']:<10}({change:+.1f}{unit})")
+
+
+async def run(args: argparse.Namespace) -> int:
+    import logging
+
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from src import server
+
+    for logger in ("mcp", "httpx", "pinecone"):
+        logging.getLogger(logger).setLevel(logging.WARNING)
+    scenarios = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+
+    print("=" * 72)
+    print("🚦 Load Test Benchmark")
+    print("=" * 72)
+    print(f"   Backend    : {args.backend}, via {'QueryRouter' if args.direct else 'session MCP'}")
+    print(f"   Latency    : embed {args.embed_latency * 1000:.0f} ms, vector "
+          f"{args.vector_latency * 1000:.0f} ms, LLM {args.llm_latency * 1000:.0f} ms "
+          f"+ {args.tokens} token")
+    print(f"   Error rate : embed {args.embed_error_rate:.0%}, vector "
+          f"{args.vector_error_rate:.0%}, LLM {args.llm_error_rate:.0%}")
+    print(f"   Load       : {args.requests} request, concurrency {args.concurrency}"
+          f"{f', rate {args.rate:g}/s' if args.rate else ''}")
+    print()
+    print(f"   {'scenario':<12}{'req':>6}{'errors':>8}{'rps':>9}{'p50 ms':>9}"
+          f"{'p95 ms':>9}{'p99 ms':>9}{'rss MB':>9}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, contextlib.ExitStack() as stack:
+        backends = Backends(args, stack, Path(tmp))
+        async with contextlib.AsyncExitStack() as session_stack:
+            client = Client()
+            if not args.direct:
+                client.session = await session_stack.enter_async_context(
+                    create_connected_server_and_client_session(server.mcp._mcp_server)
+                )
+            for name in scenarios:
+                results[name] = await run_scenario(name, args, backends, client)
+                print_summary(name, results[name])
+
+    if args.output:
+        save_results(args.output, run_metadata(vars(args)), results)
+        print(f"\n💾 Hasil disimpan ke {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        rows = compare_results(baseline, results, threshold=args.threshold)
+        print_comparison(rows, baseline.get("meta", {}))
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresi di atas threshold {args.threshold:.0%}")
+            return 1
+        print(f"\n✅ Tidak ada regresi di atas threshold {args.threshold:.0%}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test RAGRetriever dan tools MCP dengan backend fake"
+    )
+    parser.add_argument("--scenarios", default="",
+                        help=f"Daftar skenario dipisah koma (default: {','.join(SCENARIOS)})")
+    parser.add_argument("--requests", type=int, default=200, help="Request per skenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Open loop: target request per detik (default: closed loop)")
+    parser.add_argument("--warmup", type=int, default=5, help="Request warm-up (tidak diukur)")
+    parser.add_argument("--backend", choices=("inproc", "http"), default="inproc",
+                        help="Fake in-process atau server HTTP lokal (Pinecone/Gemini)")
+    parser.add_argument("--direct", action="store_true",
+                        help="Panggil QueryRouter langsung, tanpa session MCP")
+    parser.add_argument("--batch-size", type=int, default=20, help="Pertanyaan per tanya_pdp_batch")
+    parser.add_argument("--hot-set", type=int, default=10, help="Jumlah pertanyaan unik cache-hot")
+    parser.add_argument("--ingest-runs", type=int, default=3)
+    parser.add_argument("--ingest-chunks", type=int, default=500)
+    parser.add_argument("--ingest-batch-size", type=int, default=50)
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--vector-latency", type=float, default=0.03)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Latency token pertama LLM")
+    parser.add_argument("--token-latency", type=float, default=0.005)
+    parser.add_argument("--tokens", type=int, default=20, help="Token per jawaban LLM")
+    parser.add_argument("--embed-error-rate", type=float, default=0.0)
+    parser.add_argument("--vector-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0, help="Seed RNG error injection")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Ukur peak heap Python dengan tracemalloc (lebih lambat)")
+    parser.add_argument("--output", help="Simpan hasil JSON ke file ini")
+    parser.add_argument("--compare", help="File JSON baseline untuk deteksi regresi")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Perubahan relatif yang dianggap regresi (default 0.1 = 10%%)")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Re-ranking Benchmark
+====================
+
+Trade-off recall vs latency tahap re-ranking pada eval set berlabel:
+kandidat diambil dari retriever vector (proxy TF-IDF, atau Gemini dengan
+--gemini) dan hybrid (RRF dengan BM25) sebanyak --candidates, lalu
+dibandingkan:
+
+- recall@k tanpa rerank (top_k langsung dari retriever)
+- recall@k setelah LexicalReranker (dan CrossEncoderReranker dengan
+  --cross-encoder, butuh sentence-transformers)
+- latency rerank per query: cold (semua cache kosong) dan warm (skor dari cache)
+- token context top_k vs semua kandidat
+
+Usage:
+    python benchmarks/bench_rerank.py --mode structural --candidates 20
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.bench_hybrid import dense_rankings
+from benchmarks.evaluation import load_eval_set, pasal_recall
+from src.document.corpus import chunk_corpus_document, get_document
+from src.rag.context_budget import estimate_tokens
+from src.rag.lexical_index import BM25Index, LexicalSegment, reciprocal_rank_fusion
+from src.rag.reranker import CrossEncoderReranker, LexicalReranker, _chunk_terms
+
+K_VALUES = (1, 3, 5)
+
+
+def recall_at(results: list[list[dict]], eval_set: list[dict], k: int) -> float:
+    return statistics.mean(
+        pasal_recall([m["metadata"] for m in ranked[:k]], item["pasal"])
+        for ranked, item in zip(results, eval_set)
+    )
+
+
+def timed_rerank(reranker, queries: list[str], candidates: list[list[dict]], k: int):
+    """Rerank semua query; return (hasil, latency ms per query)."""
+    results, timings = [], []
+    for query, docs in zip(queries, candidates):
+        start = time.perf_counter()
+        results.append(reranker.rerank(query, docs, k))
+        timings.append((time.perf_counter() - start) * 1000)
+    return results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark re-ranking: recall@k vs latency")
+    parser.add_argument("--mode", default="structural", help="Mode chunking (recursive/structural)")
+    parser.add_argument("--candidates", type=int, default=20, help="Kandidat sebelum rerank")
+    parser.add_argument("--gemini", action="store_true", help="Pakai embedding Gemini asli")
+    parser.add_argument("--cross-encoder", action="store_true",
+                        help="Ikut ukur CrossEncoderReranker (sentence-transformers)")
+    args = parser.parse_args()
+
+    document = get_document("uu-pdp")
+    _, chunks, _ = chunk_corpus_document(document, mode=args.mode)
+    ids = [f"{document.id_prefix}-{i}" for i in range(len(chunks))]
+    metadata = [{"text": c["text"], **c["metadata"]} for c in chunks]
+
+    segment = LexicalSegment.build(ids, [c["text"] for c in chunks], metadata)
+    bm25 = BM25Index({document.id: segment})
+    eval_set = load_eval_set()
+    queries = [item["query"] for item in eval_set]
+
+    print("=" * 64)
+    print("🎯 Re-ranking Benchmark")
+    print("=" * 64)
+    print(f"   Chunks     : {len(chunks)} (mode: {args.mode})")
+    print(f"   Eval set   : {len(eval_set)} pertanyaan, {args.candidates} kandidat per query")
+    print(f"   Vector     : {'Gemini text-embedding-004' if args.gemini else 'TF-IDF proxy'}")
+
+    dense = dense_rankings(chunks, queries, args.candidates, args.gemini)
+    first_stage = {"vector": [], "hybrid": []}
+    for query, ranking in zip(queries, dense):
+        vector_results = [
+            {"id": ids[i], "score": 1.0 / (rank + 1), "metadata": metadata[i]}
+            for rank, i in enumerate(ranking)
+        ]
+        lexical_results = bm25.search(query, top_k=args.candidates)
+        first_stage["vector"].append(vector_results)
+        first_stage["hybrid"].append(
+            reciprocal_rank_fusion([vector_results, lexical_results], top_k=args.candidates)
+        )
+
+    rerankers = [("lexical", lambda: LexicalReranker(idf=bm25.idf, cache_size=100000))]
+    if args.cross_encoder:
+        rerankers.append(("cross-encoder", lambda: CrossEncoderReranker(cache_size=100000)))
+
+    print()
+    header = "".join(f"{f'recall@{k}':>11}" for k in K_VALUES)
+    print(f"   {'pipeline':<24}{header}{'cold ms':>9}{'warm ms':>9}")
+    for stage, candidates in first_stage.items():
+        row = "".join(f"{recall_at(candidates, eval_set, k):>11.1%}" for k in K_VALUES)
+        print(f"   {stage:<24}{row}{'-':>9}{'-':>9}")
+
+        for name, factory in rerankers:
+            reranker = factory()
+            _chunk_terms.cache_clear()
+            k = max(K_VALUES)
+            reranked, cold = timed_rerank(reranker, queries, candidates, k)
+            _, warm = timed_rerank(reranker, queries, candidates, k)
+            row = "".join(f"{recall_at(reranked, eval_set, k):>11.1%}" for k in K_VALUES)
+            print(f"   {f'{stage} + {name}':<24}{row}"
+                  f"{statistics.mean(cold):>9.2f}{statistics.mean(warm):>9.2f}")
+
+    # Ukuran prompt: top_k hasil rerank vs semua kandidat
+    print()
+    for k in (*K_VALUES, args.candidates):
+        tokens = statistics.mean(
+            sum(estimate_tokens(m["metadata"]["text"]) for m in docs[:k])
+            for docs in first_stage["hybrid"]
+        )
+        print(f"   Context top_k={k:<3} ≈ {tokens:>6.0f} token")
+
+
+if __name__ == "__main__":
+    main()
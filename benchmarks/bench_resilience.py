@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Resilience Benchmark
+====================
+
+PineconeClient asli terhadap FakePineconeServer yang menyuntikkan fault:
+
+1. Stall/tail: sebagian request menggantung --stall-seconds. Dibandingkan
+   tanpa guard (timeout SDK panjang, tanpa retry), deadline + retry, dan
+   deadline + retry + hedging pada p95. Dilaporkan p50/p95/p99, error,
+   retry, timeout, dan hedge (beserta berapa yang menang).
+2. Backend down: semua request dijawab 429. Circuit breaker terbuka
+   setelah CIRCUIT_FAILURE_THRESHOLD kegagalan dan call berikutnya gagal
+   cepat; setelah backend pulih dan reset timeout lewat, satu call
+   percobaan menutup circuit lagi.
+
+Usage:
+    python benchmarks/bench_resilience.py --requests 300 --stall-rate 0.03 --stall-seconds 2
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_servers import FakePineconeServer
+from benchmarks.fakes import fake_vector
+from benchmarks.loadgen import run_load
+from src.rag.clients import get_client_registry
+from src.rag.resilience import BackendGuard, CircuitOpenError, ResiliencePolicy
+
+
+def install_guard(**overrides) -> BackendGuard:
+    """Pasang BackendGuard baru untuk pinecone di registry (dipakai PineconeClient baru)."""
+    registry = get_client_registry()
+    policy = ResiliencePolicy.from_env("pinecone", registry.configs["pinecone"].timeout)
+    guard = BackendGuard(dataclasses.replace(policy, **overrides))
+    registry.guards["pinecone"] = guard
+    return guard
+
+
+async def stall_scenarios(args: argparse.Namespace) -> None:
+    print(f"\n🔹 Stall {args.stall_rate:.0%} request selama {args.stall_seconds:g} s "
+          f"(latency normal {args.latency * 1000:.0f} ms)")
+    print(f"   {'mode':<24}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+          f"{'retries':>9}{'timeouts':>10}{'hedges':>8}{'won':>6}")
+
+    modes = [
+        ("tanpa guard", {"timeout": 60.0, "deadline": 60.0, "max_retries": 0, "hedge": False}),
+        ("deadline + retry", {"timeout": args.timeout, "hedge": False}),
+        ("deadline + retry + hedge", {"timeout": args.timeout, "hedge": True}),
+    ]
+    vector = fake_vector("kewajiban pengendali data pribadi")
+    for name, overrides in modes:
+        with FakePineconeServer(latency=args.latency) as server:
+            guard = install_guard(retry_base_delay=0.05, **overrides)
+            client = server.client()
+
+            # Warm-up tanpa fault: isi window latency untuk delay hedging
+            for _ in range(30):
+                await client.aquery(vector, top_k=5)
+            server.stall_rate, server.stall_seconds = args.stall_rate, args.stall_seconds
+            guard.retries = guard.timeouts = guard.hedges = guard.hedge_wins = 0
+
+            result = await run_load(
+                name,
+                lambda i: client.aquery(vector, top_k=5),
+                requests=args.requests,
+                concurrency=args.concurrency,
+            )
+            summary = result.to_dict()
+            print(f"   {name:<24}{summary['p50_ms']:>9.1f}{summary['p95_ms']:>9.1f}"
+                  f"{summary['p99_ms']:>9.1f}{summary['errors']:>8}{guard.retries:>9}"
+                  f"{guard.timeouts:>10}{guard.hedges:>8}{guard.hedge_wins:>6}")
+            await get_client_registry().aclose()
+
+
+async def outage_scenario(args: argparse.Namespace) -> None:
+    print(f"\n🔹 Backend down (semua request 429), lalu pulih setelah {args.outage_calls} call")
+    vector = fake_vector("sanksi administratif")
+    with FakePineconeServer(latency=args.latency, error_rate=1.0) as server:
+        guard = install_guard(retry_base_delay=0.05, reset_timeout=args.reset_timeout)
+        client = server.client()
+
+        timings = {"error": [], "CircuitOpenError": []}
+        for _ in range(args.outage_calls):
+            start = time.perf_counter()
+            try:
+                await client.aquery(vector, top_k=5)
+            except CircuitOpenError:
+                timings["CircuitOpenError"].append(time.perf_counter() - start)
+            except Exception:
+                timings["error"].append(time.perf_counter() - start)
+
+        for kind, values in timings.items():
+            if values:
+                print(f"   {kind:<18}: {len(values):>4} call, rata-rata "
+                      f"{sum(values) / len(values) * 1000:>8.2f} ms")
+        print(f"   Request ke server : {server.request_count} "
+              f"(tanpa circuit breaker: {args.outage_calls * (guard.policy.max_retries + 1)})")
+        print(f"   Circuit           : {guard.breaker.state}")
+
+        server.error_rate = 0.0
+        await asyncio.sleep(args.reset_timeout)
+        print(f"   Setelah {args.reset_timeout:g} s : {guard.breaker.state}", end="")
+        await client.aquery(vector, top_k=5)
+        print(f" → call percobaan berhasil → {guard.breaker.state}")
+        await get_client_registry().aclose()
+
+
+async def run(args: argparse.Namespace) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    print("=" * 72)
+    print("🛡️  Resilience Benchmark (PineconeClient vs FakePineconeServer)")
+    print("=" * 72)
+    print(f"   Requests: {args.requests}, concurrency {args.concurrency}, "
+          f"timeout attempt {args.timeout * 1000:.0f} ms")
+    await stall_scenarios(args)
+    await outage_scenario(args)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark deadline, retry, hedging, dan circuit breaker"
+    )
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--stall-rate", type=float, default=0.03)
+    parser.add_argument("--stall-seconds", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=0.5, help="Timeout per attempt (detik)")
+    parser.add_argument("--outage-calls", type=int, default=50)
+    parser.add_argument("--reset-timeout", type=float, default=1.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+=================
+
+Mengukur cold start MCP server, setiap skenario di proses Python baru:
+
+- import src.server          : waktu import dan SDK berat yang ikut ter-load
+- import SDK                 : biaya import masing-masing SDK (genai, pinecone,
+                               fitz, langchain text splitter)
+- info_uu_pdp                : request pertama tool statis lewat session MCP
+                               in-memory (tidak boleh butuh SDK)
+- cold vs warm               : latency request pertama cari_pasal/tanya_pdp
+                               tanpa warm-up dibanding setelah registry.warm_up()
+
+Backend RAG memakai fake (benchmarks/fakes.py) sehingga tidak butuh API key;
+yang diukur adalah biaya import, load index, dan inisialisasi di jalur request.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = {
+    "genai": "google.generativeai",
+    "pinecone": "pinecone",
+    "fitz": "fitz",
+    "langchain": "langchain_text_splitters",
+    "numpy": "numpy",
+}
+
+
+def loaded_heavy_modules() -> list[str]:
+    """Nama SDK berat yang sudah ada di sys.modules."""
+    return [name for name, module in HEAVY_MODULES.items() if module in sys.modules]
+
+
+def child_import() -> dict:
+    start = time.perf_counter()
+    import src.server  # noqa: F401
+
+    return {"ms": (time.perf_counter() - start) * 1000, "heavy": loaded_heavy_modules()}
+
+
+def child_sdk(module: str) -> dict:
+    import importlib
+
+    start = time.perf_counter()
+    importlib.import_module(module)
+    return {"ms": (time.perf_counter() - start) * 1000}
+
+
+def register_fake_retriever() -> None:
+    """Daftarkan RAGRetriever dengan backend fake ke client registry."""
+    from benchmarks.fakes import FakeEmbeddingService, FakeStreamingLLM, FakeVectorIndex
+    from src.rag.clients import get_client_registry
+    from src.rag.retriever import RAGRetriever
+
+    get_client_registry().register(retriever=RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=0.05),
+        pinecone_client=FakeVectorIndex(latency=0.03),
+        llm=FakeStreamingLLM(first_token_latency=0.1, token_latency=0.0, tokens=20),
+        answer_cache=None,
+    ))
+
+
+async def call_tools(calls: list[tuple[str, dict]], warm_up: bool = False) -> dict:
+    """Import server, (opsional) warm-up, lalu ukur setiap tool call lewat session in-memory."""
+    import logging
+
+    start = time.perf_counter()
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from src import server
+    from src.rag.clients import get_client_registry
+
+    result = {"import_ms": (time.perf_counter() - start) * 1000, "calls": {}}
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+
+    registry = get_client_registry()
+    if warm_up:
+        start = time.perf_counter()
+        result["warm_up"] = await registry.warm_up()
+        result["warm_up_ms"] = (time.perf_counter() - start) * 1000
+
+    async with create_connected_server_and_client_session(server.mcp) as session:
+        for name, arguments in calls:
+            start = time.perf_counter()
+            await session.call_tool(name, arguments)
+            result["calls"][name] = (time.perf_counter() - start) * 1000
+    result["heavy"] = loaded_heavy_modules()
+    return result
+
+
+def child(scenario: str, arg: str | None) -> dict:
+    os.environ["CLIENT_WARMUP"] = "false"
+    os.environ["RETRIEVAL_MODE"] = "vector"
+    os.environ["ANSWER_CACHE_ENABLED"] = "false"
+    sys.path.insert(0, str(ROOT))
+
+    if scenario == "import":
+        return child_import()
+    if scenario == "sdk":
+        return child_sdk(arg)
+    if scenario == "info":
+        return asyncio.run(call_tools([("info_uu_pdp", {})]))
+
+    register_fake_retriever()
+
+    calls = [
+        ("cari_pasal", {"nomor_pasal": 5}),
+        ("tanya_pdp", {"pertanyaan": "Apa saja hak subjek data pribadi?"}),
+    ]
+    return asyncio.run(call_tools(calls, warm_up=scenario == "warm"))
+
+
+def run_child(scenario: str, arg: str | None = None) -> dict:
+    """Jalankan satu skenario di proses baru dan parse hasil JSON-nya."""
+    command = [sys.executable, __file__, "--child", scenario]
+    if arg:
+        command += ["--arg", arg]
+    env = dict(os.environ, READY_FILE=str(Path(tempfile.gettempdir()) / "bench-startup.ready"))
+    output = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def median(results: list[dict], key) -> float:
+    return statistics.median(key(r) for r in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start dan warm-up MCP server")
+    parser.add_argument("--runs", type=int, default=5, help="Jumlah proses per skenario (median)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--arg", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.arg)))
+        return
+
+    print("=" * 60)
+    print("🚀 Startup Benchmark (median dari proses baru)")
+    print("=" * 60)
+    print(f"   Runs: {args.runs}")
+
+    print("\n🔹 import src.server")
+    results = [run_child("import") for _ in range(args.runs)]
+    print(f"   ⏱️ {median(results, lambda r: r['ms']):.0f} ms, "
+          f"SDK ter-load: {', '.join(results[0]['heavy']) or '-'}")
+
+    print("\n🔹 Import SDK (dipindah ke warm-up)")
+    for name, module in HEAVY_MODULES.items():
+        results = [run_child("sdk", module) for _ in range(args.runs)]
+        print(f"   {name:<12}{median(results, lambda r: r['ms']):>8.0f} ms")
+
+    print("\n🔹 Request pertama info_uu_pdp (tanpa warm-up)")
+    results = [run_child("info") for _ in range(args.runs)]
+    print(f"   ⏱️ {median(results, lambda r: r['calls']['info_uu_pdp']):.0f} ms, "
+          f"SDK ter-load: {', '.join(results[0]['heavy']) or '-'}")
+
+    print("\n🔹 Request pertama cold vs setelah warm-up")
+    cold = [run_child("cold") for _ in range(args.runs)]
+    warm = [run_child("warm") for _ in range(args.runs)]
+    print(f"   {'tool':<14}{'cold ms':>10}{'warm ms':>10}")
+    for name in cold[0]["calls"]:
+        print(f"   {name:<14}{median(cold, lambda r: r['calls'][name]):>10.0f}"
+              f"{median(warm, lambda r: r['calls'][name]):>10.0f}")
+    print(f"   warm-up total: {median(warm, lambda r: r['warm_up_ms']):.0f} ms "
+          f"(di background, server sudah menerima koneksi)")
+    for step, value in warm[0]["warm_up"].items():
+        if isinstance(value, str):
+            print(f"      {step:<12}⚠️ {value}")
+        else:
+            print(f"      {step:<12}{median(warm, lambda r: r['warm_up'][step]):>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Streaming Answer Benchmark
+==========================
+
+Mengukur time-to-first-token (TTFT) dibanding total latency untuk jawaban
+RAG dengan backend fake (embedding, vector index, dan LLM streaming
+berlatency buatan):
+
+- aanswer()        : jawaban baru terlihat setelah LLM selesai (TTFT = total)
+- astream_answer() : token pertama terlihat setelah prefill LLM
+- tool tanya_pdp   : TTFT seperti dirasakan client MCP, yaitu saat progress
+                     notification pertama diterima lewat session in-memory
+
+Usage:
+    python benchmarks/bench_streaming.py --requests 10 --first-token 0.4 --token 0.02
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fakes import FakeEmbeddingService, FakeStreamingLLM, FakeVectorIndex
+from src.rag.retriever import RAGRetriever
+
+QUERIES = [
+    "Apa saja hak subjek data pribadi?",
+    "Bagaimana kewajiban pengendali data pribadi saat terjadi kebocoran?",
+    "Kapan data pribadi boleh ditransfer ke luar negeri?",
+    "Apa sanksi administratif bagi pengendali yang melanggar?",
+    "Bagaimana peran lembaga penyelenggara pelindungan data pribadi?",
+]
+
+
+def make_retriever(args) -> RAGRetriever:
+    """RAGRetriever dengan backend fake (tanpa cache dan tanpa BM25)."""
+    os.environ["RETRIEVAL_MODE"] = "vector"
+    os.environ["ANSWER_CACHE_ENABLED"] = "false"
+    return RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=args.embed_latency),
+        pinecone_client=FakeVectorIndex(latency=args.vector_latency),
+        llm=FakeStreamingLLM(
+            first_token_latency=args.first_token,
+            token_latency=args.token,
+            tokens=args.tokens,
+        ),
+        answer_cache=None,
+    )
+
+
+async def measure_aanswer(retriever: RAGRetriever, query: str) -> tuple[float, float]:
+    start = time.perf_counter()
+    await retriever.aanswer(query)
+    total = time.perf_counter() - start
+    return total, total
+
+
+async def measure_stream(retriever: RAGRetriever, query: str) -> tuple[float, float]:
+    start = time.perf_counter()
+    ttft = None
+    async for event in retriever.astream_answer(query):
+        if ttft is None and event["type"] == "token":
+            ttft = time.perf_counter() - start
+    return ttft, time.perf_counter() - start
+
+
+async def measure_tool(retriever: RAGRetriever, queries: list[str]) -> list[tuple[float, float]]:
+    """TTFT/total tool tanya_pdp dari sisi client MCP (progress notification)."""
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from src import server
+    from src.rag.clients import get_client_registry
+
+    os.environ["CLIENT_WARMUP"] = "false"
+    get_client_registry().register(retriever=retriever)
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+
+    results = []
+    async with create_connected_server_and_client_session(server.mcp) as session:
+        for query in queries:
+            start = time.perf_counter()
+            first = []
+
+            async def on_progress(progress, total, message):
+                if not first:
+                    first.append(time.perf_counter() - start)
+
+            await session.call_tool("tanya_pdp", {"pertanyaan": query}, progress_callback=on_progress)
+            total = time.perf_counter() - start
+            results.append((first[0] if first else total, total))
+    return results
+
+
+def report(name: str, timings: list[tuple[float, float]]) -> None:
+    ttft = [t * 1000 for t, _ in timings]
+    total = [t * 1000 for _, t in timings]
+    print(f"   {name:<16}{statistics.mean(ttft):>10.0f}{max(ttft):>10.0f}"
+          f"{statistics.mean(total):>12.0f}{max(total):>10.0f}")
+
+
+async def run(args) -> None:
+    retriever = make_retriever(args)
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.requests)]
+
+    print("=" * 60)
+    print("⏱️  Streaming Answer Benchmark (TTFT vs total)")
+    print("=" * 60)
+    print(f"   Requests    : {args.requests}")
+    print(f"   Embed/vector: {args.embed_latency * 1000:.0f} ms / {args.vector_latency * 1000:.0f} ms")
+    print(f"   LLM         : first token {args.first_token * 1000:.0f} ms, "
+          f"{args.token * 1000:.0f} ms/token x {args.tokens} token")
+    print()
+    print(f"   {'path':<16}{'TTFT ms':>10}{'max':>10}{'total ms':>12}{'max':>10}")
+
+    report("aanswer", [await measure_aanswer(retriever, q) for q in queries])
+    report("astream_answer", [await measure_stream(retriever, q) for q in queries])
+    if not args.skip_tool:
+        report("tool tanya_pdp", await measure_tool(retriever, queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTFT streaming vs non-streaming")
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--vector-latency", type=float, default=0.03)
+    parser.add_argument("--first-token", type=float, default=0.4, help="Latency sampai token pertama (detik)")
+    parser.add_argument("--token", type=float, default=0.02, help="Latency per token berikutnya (detik)")
+    parser.add_argument("--tokens", type=int, default=60, help="Jumlah token per jawaban")
+    parser.add_argument("--skip-tool", action="store_true", help="Lewati pengukuran lewat session MCP")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tracing Overhead Benchmark
+==========================
+
+Mengukur biaya instrumentasi span() per tahap (harus jauh di bawah latency
+tahap yang diukur), lalu menjalankan N aanswer() dengan backend fake dan
+menampilkan breakdown latency per tahap dari StageMetrics, sama seperti
+yang terbaca di pdp://stats/stages.
+
+Usage:
+    python benchmarks/bench_tracing.py --requests 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Ukur pipeline penuh, tanpa semantic answer cache dan coalescing
+os.environ["ANSWER_CACHE_ENABLED"] = "false"
+os.environ["COALESCE_ENABLED"] = "false"
+os.environ["RETRIEVAL_MODE"] = "vector"
+
+from benchmarks.fakes import FakeEmbeddingService, FakeLLM, FakeVectorIndex
+from src.rag.metrics import StageMetrics, get_metrics
+from src.rag.retriever import RAGRetriever
+
+
+def span_overhead(iterations: int) -> float:
+    """Biaya satu span() kosong dengan dua counter, dalam mikrodetik."""
+    metrics = StageMetrics()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with metrics.span("bench") as s:
+            s.add("input_chars", 10)
+            s.add("items", 1)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def run(args: argparse.Namespace) -> None:
+    print("=" * 60)
+    print("🔭 Tracing Overhead Benchmark")
+    print("=" * 60)
+    print(f"   span() overhead: {span_overhead(args.iterations):.2f} µs per tahap")
+
+    retriever = RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=args.embed_latency),
+        pinecone_client=FakeVectorIndex(latency=args.vector_latency),
+        llm=FakeLLM(latency=args.llm_latency),
+    )
+    get_metrics().reset()
+    for i in range(args.requests):
+        await retriever.aanswer(f"Apa kewajiban pengendali data pribadi? ({i})")
+
+    print(f"\n   Breakdown {args.requests} aanswer() (backend fake):")
+    print(f"   {'stage':<22}{'count':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for stage, entry in get_metrics().stats().items():
+        print(f"   {stage:<22}{entry['count']:>7}{entry['mean_ms']:>10.2f}"
+              f"{entry['p50_ms']:>10.2f}{entry['p95_ms']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark overhead span() dan breakdown per tahap")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=100000, help="Iterasi ukur overhead span")
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--vector-latency", type=float, default=0.03)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
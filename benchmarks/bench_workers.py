@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+HTTP Workers Benchmark
+======================
+
+Throughput server HTTP (streamable HTTP, src/http_server.py) untuk
+beberapa jumlah worker. Setiap skenario menjalankan server di proses baru
+dengan backend fake (benchmarks/fakes.py) yang dipasang di proses master
+sebelum fork, lalu --clients proses load generator mengirim tool call
+tanya_pdp (JSON-RPC mentah lewat httpx, dengan progressToken sehingga
+jawaban di-stream sebagai progress notification) ke port yang sama.
+
+Selain latency jaringan LLM fake, setiap jawaban memakan --cpu-ms waktu
+CPU di event loop (mewakili rerank, penyusunan context, parsing), sehingga
+satu worker jenuh di CPU dan throughput naik dengan jumlah worker sampai
+jumlah core habis.
+
+Dilaporkan RPS, p50/p99, dan memory worker: RSS vs PSS (RSS dengan halaman
+bersama dibagi rata). Selisihnya adalah memory hasil preload di master
+(SDK, structure index, index) yang dibagi copy-on-write.
+
+Usage:
+    python benchmarks/bench_workers.py --workers 1 2 4 --requests 400 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(args: argparse.Namespace) -> None:
+    """Proses server: pasang retriever fake di master lalu jalankan serve()."""
+    os.environ.update({
+        "ANSWER_CACHE_ENABLED": "false",
+        "RETRIEVAL_MODE": "vector",
+        "CLIENT_WARMUP": "false",
+        "ADMISSION_MAX_CONCURRENT": "0",
+        "MCP_LOG_LEVEL": "warning",
+    })
+    sys.path.insert(0, str(ROOT))
+
+    from benchmarks.fakes import FakeEmbeddingService, FakeStreamingLLM, FakeVectorIndex
+    from src import server
+    from src.http_server import serve as serve_http
+    from src.rag.clients import get_client_registry
+    from src.rag.retriever import RAGRetriever
+
+    class CpuBoundLLM(FakeStreamingLLM):
+        """LLM fake yang juga memakai --cpu-ms CPU per call (menahan GIL)."""
+
+        async def generate_content_async(self, prompt: str, stream: bool = False):
+            deadline = time.process_time() + args.cpu_ms / 1000
+            while time.process_time() < deadline:
+                pass
+            return await super().generate_content_async(prompt, stream=stream)
+
+    get_client_registry().register(retriever=RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=0.01),
+        pinecone_client=FakeVectorIndex(latency=0.01),
+        llm=CpuBoundLLM(first_token_latency=args.llm_latency, token_latency=0.0,
+                        tokens=args.tokens),
+    ))
+    serve_http(server.mcp, "streamable-http", "127.0.0.1", args.port, args.serve)
+
+
+async def load(args: argparse.Namespace) -> dict:
+    """Proses load generator: --requests tool call dengan --concurrency worker."""
+    import httpx
+
+    sys.path.insert(0, str(ROOT))
+    from benchmarks.loadgen import run_load
+
+    url = f"http://127.0.0.1:{args.port}/mcp"
+    offset = args.client * args.requests
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        async def ask(i: int) -> None:
+            payload = {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "tools/call",
+                "params": {
+                    "name": "tanya_pdp",
+                    "arguments": {"pertanyaan": f"Kewajiban pengendali nomor {offset + i}?"},
+                    "_meta": {"progressToken": i},
+                },
+            }
+            response = await client.post(url, json=payload, headers=HEADERS)
+            response.raise_for_status()
+            if '"isError":true' in response.text or '"result"' not in response.text:
+                raise RuntimeError(response.text[:200])
+
+        # Jam dinding: dibandingkan antar proses client
+        start = time.time()
+        result = await run_load(
+            "workers", ask, requests=args.requests, concurrency=args.concurrency
+        )
+        return {
+            "latencies_ms": result.latencies_ms,
+            "errors": result.to_dict()["errors"],
+            "start": start,
+            "seconds": time.time() - start,
+        }
+
+
+def memory(pid: int) -> dict:
+    """RSS dan PSS (MB) satu proses dari /proc/<pid>/smaps_rollup."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0][:-1].lower()] = int(parts[1]) / 1024
+    return values
+
+
+def worker_pids(pid: int) -> list[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_ready(port: int, timeout: float = 60.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Server di port {port} tidak siap dalam {timeout:g} s")
+
+
+def run_scenario(args: argparse.Namespace, workers: int) -> dict:
+    """Jalankan server dengan `workers` worker dan --clients load generator."""
+    port = free_port()
+    env = dict(os.environ, READY_FILE=str(Path(tempfile.gettempdir()) / "bench-workers.ready"))
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", str(workers), "--port", str(port),
+         "--cpu-ms", str(args.cpu_ms), "--llm-latency", str(args.llm_latency),
+         "--tokens", str(args.tokens)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port)
+        pids = worker_pids(server.pid) if workers > 1 else [server.pid]
+
+        # Warm-up: setiap worker menerima beberapa request sebelum diukur
+        warm_up = [sys.executable, __file__, "--load", "--port", str(port),
+                   "--requests", str(workers * 10), "--concurrency", str(workers * 2)]
+        subprocess.run(warm_up, cwd=ROOT, capture_output=True, check=True)
+
+        per_client = args.requests // args.clients
+        clients = [
+            subprocess.Popen(
+                [sys.executable, __file__, "--load", "--client", str(n), "--port", str(port),
+                 "--requests", str(per_client),
+                 "--concurrency", str(max(1, args.concurrency // args.clients))],
+                cwd=ROOT, stdout=subprocess.PIPE, text=True,
+            )
+            for n in range(args.clients)
+        ]
+        results = [json.loads(c.communicate()[0].strip().splitlines()[-1]) for c in clients]
+        mem = [memory(pid) for pid in pids]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    from benchmarks.loadgen import percentile
+
+    latencies = [ms for r in results for ms in r["latencies_ms"]]
+    wall = (max(r["start"] + r["seconds"] for r in results)
+            - min(r["start"] for r in results))
+    return {
+        "ok": len(latencies),
+        "errors": sum(r["errors"] for r in results),
+        "rps": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "rss_mb": sum(m["rss"] for m in mem) / len(mem),
+        "pss_mb": sum(m["pss"] for m in mem) / len(mem),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark throughput server HTTP per jumlah worker"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--clients", type=int, default=2, help="Proses load generator")
+    parser.add_argument("--cpu-ms", type=float, default=5.0, help="Waktu CPU per jawaban")
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--load", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--client", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+    if args.load:
+        print(json.dumps(asyncio.run(load(args))))
+        return
+
+    sys.path.insert(0, str(ROOT))
+    print("=" * 72)
+    print("👷 HTTP Workers Benchmark (tanya_pdp lewat streamable HTTP)")
+    print("=" * 72)
+    print(f"   {args.requests} request, concurrency {args.concurrency} dari {args.clients} "
+          f"proses client; LLM fake {args.llm_latency * 1000:.0f} ms + {args.cpu_ms:g} ms CPU, "
+          f"{args.tokens} token")
+    print(f"   CPU tersedia: {len(os.sched_getaffinity(0))} core "
+          f"(throughput berhenti naik saat worker + client melebihi core)\n")
+    print(f"   {'workers':<10}{'ok':>6}{'errors':>8}{'RPS':>9}{'speedup':>9}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'RSS MB':>9}{'PSS MB':>9}")
+
+    baseline = None
+    for workers in args.workers:
+        r = run_scenario(args, workers)
+        baseline = baseline or r["rps"]
+        print(f"   {workers:<10}{r['ok']:>6}{r['errors']:>8}{r['rps']:>9.1f}"
+              f"{r['rps'] / baseline:>8.2f}x{r['p50_ms']:>9.0f}{r['p99_ms']:>9.0f}"
+              f"{r['rss_mb']:>9.0f}{r['pss_mb']:>9.0f}")
+
+    print("\n   RSS/PSS: rata-rata per worker; PSS membagi halaman copy-on-write "
+          "(hasil preload master)\n   rata ke semua proses yang memakainya")
+
+
+if __name__ == "__main__":
+    main()
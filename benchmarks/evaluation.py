@@ -0,0 +1,76 @@
+"""
+Evaluation Helpers
+==================
+
+Utilitas evaluasi retrieval offline: eval set berlabel (pertanyaan -> pasal
+yang relevan), retriever proxy TF-IDF lokal, dan metrik hit@k / recall@k.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+EVAL_SET_PATH = Path(__file__).parent / "data" / "eval_queries.json"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def load_eval_set(path: Path = EVAL_SET_PATH) -> list[dict]:
+    """
+    Load eval set berlabel.
+
+    Returns:
+        List of dict dengan keys: query, pasal (list nomor pasal relevan)
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def tokenize(text: str) -> list[str]:
+    """Tokenisasi sederhana (lowercase, kata alfanumerik)."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TfidfRetriever:
+    """Retriever proxy TF-IDF (cosine) untuk membandingkan strategi chunking."""
+
+    def __init__(self, texts: list[str]):
+        docs = [Counter(tokenize(t)) for t in texts]
+        self.vocab = {term: i for i, term in enumerate(sorted({t for d in docs for t in d}))}
+        df = np.zeros(len(self.vocab), dtype=np.float32)
+        for doc in docs:
+            for term in doc:
+                df[self.vocab[term]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+        self.matrix = np.stack([self._vectorize(d) for d in docs])
+
+    def _vectorize(self, counts: Counter) -> np.ndarray:
+        vector = np.zeros(len(self.vocab), dtype=np.float32)
+        for term, count in counts.items():
+            idx = self.vocab.get(term)
+            if idx is not None:
+                vector[idx] = (1 + math.log(count)) * self.idf[idx]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, query: str, top_k: int = 5) -> list[int]:
+        """Indeks dokumen top-k untuk query."""
+        scores = self.matrix @ self._vectorize(Counter(tokenize(query)))
+        return [int(i) for i in np.argsort(-scores)[:top_k]]
+
+
+def pasal_hit(retrieved_metadata: list[dict], expected: list[int]) -> bool:
+    """True jika salah satu chunk yang di-retrieve bermetadata pasal yang diharapkan."""
+    wanted = {str(p) for p in expected}
+    return any(str(m.get("pasal", "")) in wanted for m in retrieved_metadata)
+
+
+def pasal_recall(retrieved_metadata: list[dict], expected: list[int]) -> float:
+    """Proporsi pasal relevan yang muncul di metadata chunk yang di-retrieve."""
+    wanted = {str(p) for p in expected}
+    found = {str(m.get("pasal", "")) for m in retrieved_metadata} & wanted
+    return len(found) / len(wanted) if wanted else 0.0
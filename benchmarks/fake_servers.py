@@ -0,0 +1,231 @@
+"""
+Fake Servers
+============
+
+HTTP server lokal yang meniru endpoint REST Google Generative Language API
+dan data plane Pinecone, sehingga EmbeddingService dan PineconeClient asli
+bisa di-benchmark tanpa jaringan. Latency, error rate (HTTP 429), dan
+stall (request menggantung selama stall_seconds) bisa diatur.
+
+Usage:
+    with FakeGeminiServer(latency=0.05) as server:
+        server.configure_genai()
+        ...
+
+    with FakePineconeServer(latency=0.03) as server:
+        client = server.client()
+        ...
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fakes import FakeVectorIndex, fake_vector
+
+
+class _FakeHTTPServer:
+    """Dasar fake server: ThreadingHTTPServer di port acak, error rate, counter."""
+
+    def __init__(self, latency: float = 0.05, error_rate: float = 0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stall_rate = 0.0
+        self.stall_seconds = 30.0
+        self.request_count = 0
+        self.error_count = 0
+        self.stall_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _count_request(self) -> bool:
+        """
+        Catat satu request; return True jika request ini harus gagal (429).
+        Request yang terkena stall_rate ditahan stall_seconds lebih dulu.
+        """
+        with self._lock:
+            self.request_count += 1
+            fail = random.random() < self.error_rate
+            stall = not fail and random.random() < self.stall_rate
+            if fail:
+                self.error_count += 1
+            if stall:
+                self.stall_count += 1
+        if stall:
+            time.sleep(self.stall_seconds)
+        return fail
+
+    def _handle(self, path: str, body: dict) -> tuple[int, dict]:
+        raise NotImplementedError
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive seperti API asli; tanpa Nagle agar tidak kena delayed ACK
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                status, payload = server._handle(self.path, body)
+                data = json.dumps(payload).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client sudah membatalkan request (timeout/hedge)
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class FakeGeminiServer(_FakeHTTPServer):
+    """Fake endpoint embedContent / batchEmbedContents."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        per_item_latency: float = 0.0,
+        error_rate: float = 0.0,
+        dimension: int = 768,
+    ):
+        """
+        Initialize Fake Gemini Server.
+
+        Args:
+            latency: Latency tetap per request (detik)
+            per_item_latency: Latency tambahan per konten dalam batch (detik)
+            error_rate: Probabilitas request dijawab HTTP 429
+            dimension: Dimensi embedding
+        """
+        super().__init__(latency=latency, error_rate=error_rate)
+        self.per_item_latency = per_item_latency
+        self.dimension = dimension
+
+    def configure_genai(self, api_key: str = "fake-key") -> None:
+        """Arahkan google.generativeai ke server ini (REST transport)."""
+        import google.generativeai as genai
+
+        genai.configure(
+            api_key=api_key,
+            transport="rest",
+            client_options={"api_endpoint": self.url},
+        )
+
+    def _handle(self, path: str, body: dict) -> tuple[int, dict]:
+        """Proses satu request dan kembalikan (status, payload)."""
+        if self._count_request():
+            return 429, {"error": {"code": 429, "message": "Resource exhausted (fake)",
+                                   "status": "RESOURCE_EXHAUSTED"}}
+
+        if ":batchEmbedContents" in path:
+            requests = body.get("requests", [])
+            time.sleep(self.latency + self.per_item_latency * len(requests))
+            return 200, {
+                "embeddings": [
+                    {"values": fake_vector(_content_text(r.get("content", {})), self.dimension)}
+                    for r in requests
+                ]
+            }
+
+        if ":embedContent" in path:
+            time.sleep(self.latency + self.per_item_latency)
+            return 200, {
+                "embedding": {
+                    "values": fake_vector(_content_text(body.get("content", {})), self.dimension)
+                }
+            }
+
+        return 404, {"error": {"code": 404, "message": f"Unknown path {path}"}}
+
+
+class FakePineconeServer(_FakeHTTPServer):
+    """Fake data plane Pinecone (/query, /vectors/upsert, /describe_index_stats)."""
+
+    def __init__(
+        self,
+        latency: float = 0.03,
+        error_rate: float = 0.0,
+        documents: list[dict] | None = None,
+    ):
+        """
+        Initialize Fake Pinecone Server.
+
+        Args:
+            latency: Latency per request (detik)
+            error_rate: Probabilitas request dijawab HTTP 429
+            documents: Match yang dikembalikan (default: 10 chunk contoh)
+        """
+        super().__init__(latency=latency, error_rate=error_rate)
+        self.documents = documents or FakeVectorIndex().documents
+
+    def client(self, api_key: str = "fake-key"):
+        """PineconeClient asli dengan host data plane diarahkan ke server ini."""
+        from src.rag.pinecone_client import PineconeClient
+
+        client = PineconeClient(api_key=api_key, index_name="fake-index")
+        client._host = self.url
+        return client
+
+    def _handle(self, path: str, body: dict) -> tuple[int, dict]:
+        """Proses satu request dan kembalikan (status, payload)."""
+        if self._count_request():
+            return 429, {"code": 8, "message": "Too many requests (fake)"}
+
+        time.sleep(self.latency)
+        if path == "/query":
+            include_metadata = body.get("includeMetadata", False)
+            return 200, {
+                "matches": [
+                    {
+                        "id": doc["id"],
+                        "score": doc["score"],
+                        **({"metadata": doc["metadata"]} if include_metadata else {}),
+                    }
+                    for doc in self.documents[: body.get("topK", 10)]
+                ],
+                "namespace": body.get("namespace", ""),
+            }
+        if path == "/vectors/upsert":
+            return 200, {"upsertedCount": len(body.get("vectors", []))}
+        if path == "/describe_index_stats":
+            return 200, {"dimension": 768, "totalVectorCount": len(self.documents)}
+
+        return 404, {"code": 5, "message": f"Unknown path {path}"}
+
+
+def _content_text(content: dict) -> str:
+    """Ambil teks dari payload Content REST."""
+    return "".join(part.get("text", "") for part in content.get("parts", []))
@@ -0,0 +1,272 @@
+"""
+Fake Backends
+=============
+
+Backend lokal (embedding, vector index, LLM) untuk benchmark tanpa
+memanggil Google AI atau Pinecone. Setiap fake punya latency buatan
+yang bisa diatur, dengan versi sync (time.sleep) dan async (asyncio.sleep)
+supaya perilaku blocking vs non-blocking bisa dibandingkan. Error rate
+opsional membuat sebagian call gagal dengan FakeBackendError (seperti
+429/503 dari API asli) untuk load test.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+def fake_vector(text: str, dimension: int = 768) -> list[float]:
+    """
+    Buat vector deterministik (unit length) dari teks.
+
+    Args:
+        text: Teks sumber
+        dimension: Dimensi vector
+
+    Returns:
+        List of floats
+    """
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    values = [((seed[i % len(seed)] + i * 31) % 255) / 255.0 - 0.5 for i in range(dimension)]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+
+class FakeBackendError(RuntimeError):
+    """Error buatan dari fake backend (error rate), diperlakukan seperti HTTP 503."""
+
+    code = 503
+
+
+class FakeRateLimitError(FakeBackendError):
+    """Kuota fake backend terlampaui, diperlakukan seperti HTTP 429."""
+
+    code = 429
+
+
+class _FaultInjector:
+    """
+    Fault injection dengan RNG sendiri (seed opsional agar bisa diulang).
+
+    - error_rate: probabilitas call gagal dengan FakeBackendError
+    - stall_rate: probabilitas call macet selama stall_seconds (meniru
+      koneksi yang menggantung); bisa diatur sebagai atribut setelah dibuat
+    - quota_qps: batas call per detik (sliding window 1 detik) seperti kuota
+      API; call di atasnya gagal dengan FakeRateLimitError
+    """
+
+    def __init__(self, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.error_rate = error_rate
+        self.stall_rate = 0.0
+        self.stall_seconds = 30.0
+        self.quota_qps = 0.0
+        self.errors = 0
+        self.stalls = 0
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._window: deque[float] = deque()
+
+    def _fault(self, backend: str) -> float:
+        """
+        Raise FakeRateLimitError (quota_qps) atau FakeBackendError (error_rate),
+        atau return latency tambahan (stall_rate).
+        """
+        if self.quota_qps:
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            if len(self._window) >= self.quota_qps:
+                self.throttled += 1
+                raise FakeRateLimitError(f"{backend}: quota exceeded (fake 429)")
+            self._window.append(now)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            raise FakeBackendError(f"{backend}: injected error (fake)")
+        if self.stall_rate and self._random.random() < self.stall_rate:
+            self.stalls += 1
+            return self.stall_seconds
+        return 0.0
+
+
+class FakeEmbeddingService(_FaultInjector):
+    """Pengganti EmbeddingService dengan latency buatan."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        dimension: int = 768,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(error_rate, seed)
+        self.latency = latency
+        self.model = "fake-embedding"
+        self._dimension = dimension
+        self.calls = 0
+
+    def embed_text(self, text: str) -> list[float]:
+        self.calls += 1
+        time.sleep(self.latency + self._fault("embed"))
+        return fake_vector(text, self._dimension)
+
+    def embed_query(self, query: str) -> list[float]:
+        self.calls += 1
+        time.sleep(self.latency + self._fault("embed"))
+        return fake_vector(query, self._dimension)
+
+    async def aembed_query(self, query: str) -> list[float]:
+        self.calls += 1
+        await asyncio.sleep(self.latency + self._fault("embed"))
+        return fake_vector(query, self._dimension)
+
+    async def aembed_queries(self, queries: list[str]) -> list[list[float]]:
+        # Satu request batch (maks 100 query) seperti batchEmbedContents
+        self.calls += 1
+        await asyncio.sleep(self.latency * math.ceil(len(queries) / 100) + self._fault("embed"))
+        return [fake_vector(query, self._dimension) for query in queries]
+
+    def embed_batch(self, texts: list[str], batch_size: int = 100, **kwargs) -> list[list[float]]:
+        # Satu request per batch, berurutan (seperti embed_batch dengan concurrency 1)
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            self.calls += 1
+            time.sleep(self.latency + self._fault("embed"))
+            vectors.extend(fake_vector(text, self._dimension) for text in texts[i : i + batch_size])
+        return vectors
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+
+class FakeVectorIndex(_FaultInjector):
+    """Pengganti PineconeClient yang mengembalikan dokumen statis."""
+
+    def __init__(
+        self,
+        latency: float = 0.03,
+        documents: list[dict] | None = None,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(error_rate, seed)
+        self.latency = latency
+        self.calls = 0
+        self.documents = documents or [
+            {
+                "id": f"fake-chunk-{i}",
+                "score": 0.9 - i * 0.05,
+                "metadata": {
+                    "text": f"Pasal {i + 1} teks contoh untuk benchmark.",
+                    "pasal": str(i + 1),
+                    "bab": "I",
+                    "chunk_index": i,
+                },
+            }
+            for i in range(10)
+        ]
+
+    def query(
+        self,
+        vector: list[float],
+        top_k: int = 5,
+        namespace: str = "",
+        include_metadata: bool = True,
+        filter: Optional[dict] = None,
+    ) -> list[dict]:
+        self.calls += 1
+        time.sleep(self.latency + self._fault("vector"))
+        return self.documents[:top_k]
+
+    async def aquery(
+        self,
+        vector: list[float],
+        top_k: int = 5,
+        namespace: str = "",
+        include_metadata: bool = True,
+        filter: Optional[dict] = None,
+    ) -> list[dict]:
+        self.calls += 1
+        await asyncio.sleep(self.latency + self._fault("vector"))
+        return self.documents[:top_k]
+
+
+@dataclass
+class FakeResponse:
+    """Meniru response generate_content (hanya atribut text)."""
+
+    text: str
+
+
+class FakeLLM(_FaultInjector):
+    """Pengganti genai.GenerativeModel dengan latency buatan."""
+
+    def __init__(self, latency: float = 0.5, error_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__(error_rate, seed)
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        self.calls += 1
+        time.sleep(self.latency + self._fault("llm"))
+        return FakeResponse(text=f"Jawaban palsu ({len(prompt)} karakter prompt).")
+
+    async def generate_content_async(self, prompt: str) -> FakeResponse:
+        self.calls += 1
+        await asyncio.sleep(self.latency + self._fault("llm"))
+        return FakeResponse(text=f"Jawaban palsu ({len(prompt)} karakter prompt).")
+
+
+class FakeStreamingLLM(_FaultInjector):
+    """
+    Pengganti genai.GenerativeModel yang mendukung stream=True.
+
+    Latency dimodelkan seperti LLM sungguhan: first_token_latency sebelum
+    token pertama (prefill), lalu token_latency per token berikutnya.
+    Tanpa stream, response baru dikembalikan setelah semua token selesai.
+    """
+
+    def __init__(
+        self,
+        first_token_latency: float = 0.4,
+        token_latency: float = 0.02,
+        tokens: int = 60,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(error_rate, seed)
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.tokens = tokens
+        self.calls = 0
+
+    def _tokens(self, prompt: str) -> list[str]:
+        return [f"token{i} " for i in range(self.tokens - 1)] + [f"({len(prompt)} karakter prompt)."]
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        self.calls += 1
+        stall = self._fault("llm")
+        time.sleep(self.first_token_latency + self.token_latency * (self.tokens - 1) + stall)
+        return FakeResponse(text="".join(self._tokens(prompt)))
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        self.calls += 1
+        stall = self._fault("llm")
+        if stream:
+            return self._stream(self._tokens(prompt), stall)
+        await asyncio.sleep(
+            self.first_token_latency + self.token_latency * (self.tokens - 1) + stall
+        )
+        return FakeResponse(text="".join(self._tokens(prompt)))
+
+    async def _stream(self, tokens: list[str], stall: float = 0.0):
+        await asyncio.sleep(self.first_token_latency + stall)
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self.token_latency)
+            yield FakeResponse(text=token)
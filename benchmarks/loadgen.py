@@ -0,0 +1,278 @@
+"""
+Load Generator
+==============
+
+Load generator async untuk benchmark: menjalankan satu operasi berulang
+kali dengan N worker konkuren (closed loop) atau dengan laju tetap
+(open loop, --rate), lalu merangkum latency p50/p95/p99, RPS, error dan
+memory per skenario. Hasil bisa disimpan sebagai JSON dan dibandingkan
+dengan hasil commit lain.
+
+Usage:
+    result = await run_load("single", operation, requests=200, concurrency=16)
+    print(result.to_dict())
+"""
+
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+# Metric yang dibandingkan: nama -> arah yang lebih baik
+COMPARED_METRICS = {
+    "p50_ms": "lower",
+    "p95_ms": "lower",
+    "p99_ms": "lower",
+    "rps": "higher",
+    "error_rate": "lower",
+    "rss_peak_mb": "lower",
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Percentile dengan interpolasi linear (seperti numpy.percentile).
+
+    Args:
+        values: Data (tidak perlu terurut)
+        q: Percentile 0-100
+
+    Returns:
+        Nilai percentile (0.0 jika data kosong)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def rss_mb() -> float:
+    """Resident set size proses saat ini dalam MB (fallback: peak RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1e6
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss dalam KB di Linux, byte di macOS
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+@dataclass
+class LoadResult:
+    """Hasil satu skenario load test."""
+
+    scenario: str
+    concurrency: int
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    error_types: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+    rss_start_mb: float = 0.0
+    rss_peak_mb: float = 0.0
+    heap_peak_mb: Optional[float] = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms) + self.errors
+
+    def to_dict(self) -> dict:
+        """Ringkasan JSON-serializable (tanpa daftar latency mentah)."""
+        latencies = self.latencies_ms
+        result = {
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "error_types": self.error_types,
+            "seconds": round(self.seconds, 3),
+            "rps": round(self.requests / self.seconds, 2) if self.seconds else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(max(latencies, default=0.0), 2),
+            "rss_start_mb": round(self.rss_start_mb, 1),
+            "rss_peak_mb": round(self.rss_peak_mb, 1),
+            "rss_delta_mb": round(self.rss_peak_mb - self.rss_start_mb, 1),
+        }
+        if self.heap_peak_mb is not None:
+            result["heap_peak_mb"] = round(self.heap_peak_mb, 2)
+        result.update(self.extra)
+        return result
+
+
+async def run_load(
+    scenario: str,
+    operation: Callable[[int], Awaitable[Any]],
+    requests: int,
+    concurrency: int,
+    rate: Optional[float] = None,
+    trace_memory: bool = False,
+    sample_interval: float = 0.02,
+) -> LoadResult:
+    """
+    Jalankan operation(i) untuk i = 0..requests-1 dan ukur setiap call.
+
+    Closed loop (rate=None): `concurrency` worker masing-masing langsung
+    mengambil request berikutnya setelah selesai. Open loop: request ke-i
+    dijadwalkan pada start + i / rate dan latency dihitung dari jadwal
+    tersebut (termasuk antre menunggu worker), sehingga antrean yang
+    menumpuk saat overload ikut terlihat di p99.
+
+    Args:
+        scenario: Nama skenario
+        operation: Coroutine function yang menerima nomor request; exception = error
+        requests: Jumlah request
+        concurrency: Jumlah request paralel maksimum
+        rate: Target request per detik (None = closed loop)
+        trace_memory: Ukur peak heap Python dengan tracemalloc (menambah overhead)
+        sample_interval: Interval sampling RSS (detik)
+
+    Returns:
+        LoadResult
+    """
+    result = LoadResult(scenario=scenario, concurrency=concurrency)
+    result.rss_start_mb = result.rss_peak_mb = rss_mb()
+    done = asyncio.Event()
+
+    async def sample_memory() -> None:
+        while not done.is_set():
+            result.rss_peak_mb = max(result.rss_peak_mb, rss_mb())
+            try:
+                await asyncio.wait_for(done.wait(), sample_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def call(i: int, scheduled: float) -> None:
+        try:
+            await operation(i)
+        except Exception as e:
+            result.errors += 1
+            name = type(e).__name__
+            result.error_types[name] = result.error_types.get(name, 0) + 1
+        else:
+            result.latencies_ms.append((time.perf_counter() - scheduled) * 1000)
+
+    if trace_memory:
+        tracemalloc.start()
+    sampler = asyncio.create_task(sample_memory())
+    start = time.perf_counter()
+
+    if rate is None:
+        counter = iter(range(requests))
+
+        async def worker() -> None:
+            for i in counter:
+                await call(i, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scheduled_call(i: int) -> None:
+            scheduled = start + i / rate
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            async with semaphore:
+                await call(i, scheduled)
+
+        await asyncio.gather(*(scheduled_call(i) for i in range(requests)))
+
+    result.seconds = time.perf_counter() - start
+    done.set()
+    await sampler
+    result.rss_peak_mb = max(result.rss_peak_mb, rss_mb())
+    if trace_memory:
+        result.heap_peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return result
+
+
+def run_metadata(args: Optional[dict] = None) -> dict:
+    """Metadata run (commit git, waktu, Python, platform) untuk file JSON."""
+
+    def git(*command: str) -> str:
+        try:
+            return subprocess.run(
+                ["git", *command],
+                capture_output=True,
+                text=True,
+                cwd=Path(__file__).parent,
+                timeout=10,
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "args": args or {},
+    }
+
+
+def save_results(path: str | Path, metadata: dict, scenarios: dict[str, dict]) -> None:
+    """Simpan hasil sebagai JSON {"meta": ..., "scenarios": {nama: ringkasan}}."""
+    Path(path).write_text(
+        json.dumps({"meta": metadata, "scenarios": scenarios}, indent=2, ensure_ascii=False),
+        encoding="utf-8",
+    )
+
+
+def compare_results(
+    baseline: dict,
+    current: dict[str, dict],
+    threshold: float = 0.1,
+) -> list[dict]:
+    """
+    Bandingkan ringkasan skenario dengan baseline (hasil JSON commit lain).
+
+    Args:
+        baseline: Isi file JSON baseline (dengan key "scenarios")
+        current: Ringkasan skenario run saat ini
+        threshold: Perubahan relatif yang dianggap regresi (0.1 = 10%)
+
+    Returns:
+        List perbandingan: scenario, metric, baseline, current, change, regression
+    """
+    rows = []
+    for scenario, summary in current.items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if not before:
+            continue
+        for metric, better in COMPARED_METRICS.items():
+            if metric not in summary or metric not in before:
+                continue
+            old, new = before[metric], summary[metric]
+            if metric == "error_rate":
+                # Error rate dibandingkan selisih absolut (baseline sering 0)
+                change = new - old
+            else:
+                change = (new - old) / old if old else 0.0
+            worse = change > threshold if better == "lower" else change < -threshold
+            rows.append({
+                "scenario": scenario,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": round(change, 4),
+                "regression": worse,
+            })
+    return rows
+
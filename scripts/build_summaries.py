@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Build BAB Summaries Script
+==========================
+
+Script untuk membuat ringkasan per BAB dari structure index (dijalankan
+otomatis oleh scripts/ingest_documents.py). Hanya BAB yang belum punya
+ringkasan atau teks pasalnya berubah yang dikirim ke LLM.
+
+Usage:
+    python scripts/build_summaries.py                    # UU PDP
+    python scripts/build_summaries.py --document pp-71
+    python scripts/build_summaries.py --force --concurrency 8 --rpm 60
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.rag.bab_summaries import build_bab_summaries, get_summary_path
+
+
+def main():
+    """Main function untuk build ringkasan BAB."""
+    parser = argparse.ArgumentParser(description="Build ringkasan BAB dari structure index")
+    parser.add_argument("--document", default="uu-pdp",
+                        help="ID dokumen korpus (default: uu-pdp)")
+    parser.add_argument("--force", action="store_true",
+                        help="Buat ulang semua BAB walaupun sumbernya tidak berubah")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Request LLM paralel (default: SUMMARY_CONCURRENCY atau 4)")
+    parser.add_argument("--rpm", type=float, default=None,
+                        help="Maksimum request LLM per menit (default: SUMMARY_RPM atau 30)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📝 BAB Summaries Build")
+    print("=" * 60)
+
+    try:
+        stats = build_bab_summaries(
+            args.document,
+            force=args.force,
+            concurrency=args.concurrency,
+            rate=args.rpm,
+        )
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return
+
+    print(f"   ✅ {stats['generated']} generated, {stats['unchanged']} unchanged "
+          f"({stats['seconds']:.1f}s) -> {get_summary_path(args.document)}")
+    if stats["failed"]:
+        print(f"   ⚠️ Gagal: BAB {', '.join(stats['failed'])} (jalankan ulang untuk mencoba lagi)")
+
+
+if __name__ == "__main__":
+    main()
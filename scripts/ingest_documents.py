@@ -3,104 +3,254 @@
 Ingest Documents Script
 =======================
 
-Script untuk indexing dokumen PDF ke Pinecone vector database.
-Jalankan script ini sekali untuk meng-upload dokumen ke Pinecone.
+Script untuk indexing dokumen PDF ke vector database (Pinecone atau
+index lokal, sesuai VECTOR_BACKEND). Jalankan script ini sekali untuk
+meng-upload dokumen.
 
 Usage:
-    python scripts/ingest_documents.py
+    python scripts/ingest_documents.py                     # UU PDP saja
+    python scripts/ingest_documents.py --document pp-71    # satu dokumen korpus
+    python scripts/ingest_documents.py --all --processes 4 # semua PDF di data/
+    python scripts/ingest_documents.py --no-resume --batch-size 100
+    python scripts/ingest_documents.py --full              # abaikan diff, upsert semua chunk
+    python scripts/ingest_documents.py --skip-summaries    # tanpa ringkasan BAB
+
+Ingest satu dokumen berjalan streaming (halaman -> chunk -> embedding ->
+upsert) dengan checkpoint per batch; jika gagal di tengah jalan, jalankan
+ulang script untuk melanjutkan dari batch terakhir yang sudah di-upsert.
+Mode --all mengekstrak dan men-chunk setiap PDF di process pool (CPU-bound),
+lalu meng-embed dan meng-upsert dokumen yang sudah selesai di-chunk.
+
+Ingest bersifat incremental: hash setiap chunk dibandingkan dengan manifest
+ingest sebelumnya (INDEX_DIR/manifests), hanya chunk baru/berubah yang
+di-embed dan di-upsert, dan vector yang sudah tidak ada dihapus. Setelah itu
+ringkasan per BAB dibuat ulang hanya untuk BAB yang teksnya berubah
+(lihat scripts/build_summaries.py).
 """
 
+import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Iterable
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.document.pdf_loader import load_uu_pdp
-from src.document.chunker import chunk_uu_pdp
-from src.rag.embeddings import EmbeddingService
-from src.rag.pinecone_client import PineconeClient
+from src.document.corpus import (
+    CorpusDocument,
+    chunk_corpus_document,
+    get_document,
+    iter_corpus_chunks,
+    load_corpus,
+)
+from src.document.pdf_loader import PDFLoader
+from src.document.structure import StructureIndex, build_structure_index, get_structure_path
+from src.rag.bab_summaries import build_bab_summaries
+from src.rag.embeddings import get_embedding_service
+from src.rag.index_version import bump_index_version
+from src.rag.ingestion import (
+    ChunkManifest,
+    IngestCheckpoint,
+    IngestionPipeline,
+    get_checkpoint_path,
+    get_manifest_path,
+    make_fingerprint,
+)
+from src.rag.lexical_index import LexicalSegmentBuilder, get_lexical_index_dir
+from src.rag.vector_store import get_vector_store
+
+
+def save_structure(document: CorpusDocument, structure: StructureIndex) -> None:
+    """Simpan structure index dokumen (jika dokumen punya pasal)."""
+    if not structure.pasal:
+        print(f"   ℹ️ [{document.id}] Tidak ada struktur pasal, structure index dilewati")
+        return
+    path = get_structure_path(document.id)
+    structure.save(path)
+    print(f"   🧭 [{document.id}] Indexed {len(structure.pasal)} pasal in "
+          f"{len(structure.bab)} BAB -> {path}")
+
+
+def ingest_chunks(
+    document: CorpusDocument,
+    chunks: Iterable[dict],
+    embedding_service,
+    vector_store,
+    args: argparse.Namespace,
+) -> dict:
+    """Jalankan pipeline embed -> upsert dan bangun index BM25 untuk chunk satu dokumen."""
+    stat = document.path.stat()
+    fingerprint = make_fingerprint(
+        document.id, document.path.name, stat.st_size, stat.st_mtime,
+        os.getenv("CHUNK_MODE", "recursive"),
+        os.getenv("CHUNK_MAX_CHARS", 1500),
+        os.getenv("CHUNK_SIZE", 1000), os.getenv("CHUNK_OVERLAP", 200),
+        args.batch_size or os.getenv("INGEST_BATCH_SIZE", 50),
+        embedding_service.model, vector_store.index_name,
+    )
+    pipeline = IngestionPipeline(
+        embedding_service,
+        vector_store,
+        batch_size=args.batch_size,
+        id_prefix=document.id_prefix,
+        checkpoint=IngestCheckpoint(get_checkpoint_path(document.id), fingerprint),
+        manifest=ChunkManifest(get_manifest_path(document.id)),
+        lexical=LexicalSegmentBuilder(get_lexical_index_dir(), document.id),
+    )
+    stats = pipeline.run(chunks, resume=not args.no_resume, incremental=not args.full)
+
+    lexical = stats["lexical"]
+    print(f"   🔤 [{document.id}] BM25 index: {lexical['terms']:,} terms, "
+          f"{lexical['postings']:,} postings -> {get_lexical_index_dir()}")
+
+    diff = stats["diff"]
+    print(f"   🔍 [{document.id}] Diff: +{diff['added']} added, ~{diff['changed']} changed, "
+          f"-{diff['removed']} removed, ={diff['unchanged']} unchanged")
+    print(f"   ✅ [{document.id}] Upserted {stats['upserted']} vectors in "
+          f"{stats['batches']} batches ({stats['seconds']:.1f}s)")
+    if stats["skipped_batches"]:
+        print(f"   ⏩ [{document.id}] Skipped {stats['skipped_batches']} batches (already committed)")
+    return stats
+
+
+def ingest_streaming(document: CorpusDocument, embedding_service, vector_store, args) -> dict:
+    """Ingest satu dokumen secara streaming langsung dari halaman PDF."""
+    loader = PDFLoader(document.path)
+
+    def iter_page_texts():
+        return (page["text"] for page in loader.iter_pages())
+
+    save_structure(document, build_structure_index(iter_page_texts(), source=document.title))
+    return ingest_chunks(
+        document, iter_corpus_chunks(document, iter_page_texts()), embedding_service, vector_store, args
+    )
+
+
+def ingest_parallel(documents: list[CorpusDocument], embedding_service, vector_store, args) -> list[dict]:
+    """Chunk semua dokumen di process pool, lalu embed/upsert begitu satu dokumen siap."""
+    workers = args.processes or int(os.getenv("INGEST_PROCESSES", os.cpu_count() or 1))
+    workers = max(1, min(workers, len(documents)))
+    print(f"   ⚙️ Chunking {len(documents)} dokumen dengan {workers} proses")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(chunk_corpus_document, document, os.getenv("CHUNK_MODE"))
+            for document in documents
+        ]
+        for future in as_completed(futures):
+            document, chunks, structure = future.result()
+            print(f"   ✂️ [{document.id}] {len(chunks)} chunks")
+            save_structure(document, structure)
+            results.append(ingest_chunks(document, chunks, embedding_service, vector_store, args))
+    return results
 
 
 def main():
     """Main function untuk ingesting documents."""
+    parser = argparse.ArgumentParser(description="Ingest dokumen korpus ke vector index")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--all", action="store_true",
+                        help="Ingest semua dokumen di korpus (data/*.pdf)")
+    target.add_argument("--document", default="uu-pdp",
+                        help="ID dokumen korpus yang di-ingest (default: uu-pdp)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Jumlah proses chunking untuk --all (default: INGEST_PROCESSES atau jumlah CPU)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Abaikan checkpoint dan ingest ulang dari awal")
+    parser.add_argument("--full", action="store_true",
+                        help="Upsert semua chunk walaupun hash-nya tidak berubah")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Jumlah chunk per batch (default: INGEST_BATCH_SIZE atau 50)")
+    parser.add_argument("--skip-summaries", action="store_true",
+                        help="Jangan build/refresh ringkasan BAB")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("📄 UU PDP Document Ingestion")
     print("=" * 60)
 
-    # Step 1: Load PDF
-    print("\n🔹 Step 1: Loading PDF...")
-    try:
-        text = load_uu_pdp()
-        print(f"   ✅ Loaded PDF: {len(text):,} characters")
-    except Exception as e:
-        print(f"   ❌ Error loading PDF: {e}")
-        return
-
-    # Step 2: Chunk text
-    print("\n🔹 Step 2: Chunking text...")
+    # Step 1: Resolve corpus documents
+    print("\n🔹 Step 1: Loading corpus manifest...")
     try:
-        chunks = chunk_uu_pdp(text, chunk_size=1000, chunk_overlap=200)
-        print(f"   ✅ Created {len(chunks)} chunks")
+        documents = load_corpus() if args.all else [get_document(args.document)]
+        if not documents:
+            raise FileNotFoundError("Tidak ada PDF di folder data/")
+        for document in documents:
+            if not document.path.exists():
+                raise FileNotFoundError(f"File tidak ditemukan: {document.path}")
+            print(f"   📄 {document.id}: {document.path.name} "
+                  f"({document.path.stat().st_size:,} bytes)")
     except Exception as e:
-        print(f"   ❌ Error chunking: {e}")
+        print(f"   ❌ Error loading corpus: {e}")
         return
 
-    # Step 3: Initialize services
-    print("\n🔹 Step 3: Initializing services...")
+    # Step 2: Initialize services
+    print("\n🔹 Step 2: Initializing services...")
     try:
-        embedding_service = EmbeddingService()
-        pinecone_client = PineconeClient()
+        embedding_service = get_embedding_service()
+        pinecone_client = get_vector_store()
         print("   ✅ Services initialized")
     except Exception as e:
         print(f"   ❌ Error initializing services: {e}")
         return
 
-    # Step 4: Create Pinecone index
-    print("\n🔹 Step 4: Creating/checking Pinecone index...")
+    # Step 3: Create vector index
+    print("\n🔹 Step 3: Creating/checking vector index...")
     try:
         pinecone_client.create_index_if_not_exists(dimension=768)
     except Exception as e:
         print(f"   ❌ Error creating index: {e}")
         return
 
-    # Step 5: Generate embeddings and upsert
-    print("\n🔹 Step 5: Generating embeddings and uploading to Pinecone...")
+    # Step 4: Chunk -> embedding -> upsert
+    mode = os.getenv("CHUNK_MODE", "recursive")
+    print(f"\n🔹 Step 4: Chunks -> embeddings -> vector index (mode: {mode})...")
     try:
-        vectors = []
-
-        for i, chunk in enumerate(chunks):
-            # Generate embedding
-            embedding = embedding_service.embed_text(chunk["text"])
-
-            # Prepare vector
-            vector = {
-                "id": f"uu-pdp-chunk-{i}",
-                "values": embedding,
-                "metadata": {
-                    "text": chunk["text"],
-                    **chunk["metadata"],
-                },
-            }
-            vectors.append(vector)
-
-            # Progress
-            if (i + 1) % 10 == 0:
-                print(f"   📊 Embedded {i + 1}/{len(chunks)} chunks...")
-
-        print(f"   ✅ Generated {len(vectors)} embeddings")
-
-        # Upsert to Pinecone
-        print("\n🔹 Step 6: Upserting vectors to Pinecone...")
-        result = pinecone_client.upsert_vectors(vectors, batch_size=50)
-        print(f"   ✅ Upserted {result['upserted_count']} vectors")
+        if len(documents) == 1:
+            results = [ingest_streaming(documents[0], embedding_service, pinecone_client, args)]
+        else:
+            results = ingest_parallel(documents, embedding_service, pinecone_client, args)
+
+        cache = getattr(embedding_service, "cache", None)
+        if cache is not None:
+            cache_stats = cache.stats()
+            print(f"   💾 Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+        # Tandai versi index baru: server memuat ulang index lokal/BM25 dan
+        # meng-invalidasi answer cache
+        if any(r["upserted"] or r["diff"]["removed"] for r in results):
+            version = bump_index_version()
+            print(f"   🏷️ Index version: {version}")
+        else:
+            print("   ✅ Index sudah up to date, tidak ada perubahan")
 
     except Exception as e:
         print(f"   ❌ Error during embedding/upsert: {e}")
+        print("   ↩️ Jalankan ulang script untuk melanjutkan dari checkpoint terakhir")
         return
 
-    # Step 7: Verify
-    print("\n🔹 Step 7: Verifying...")
+    # Step 5: Ringkasan BAB (hanya BAB yang sumbernya berubah)
+    if not args.skip_summaries:
+        print("\n🔹 Step 5: Building BAB summaries...")
+        for document in documents:
+            path = get_structure_path(document.id)
+            if not path.exists():
+                continue
+            try:
+                summary_stats = build_bab_summaries(document.id, StructureIndex.load(path))
+                print(f"   📝 [{document.id}] {summary_stats['generated']} generated, "
+                      f"{summary_stats['unchanged']} unchanged ({summary_stats['seconds']:.1f}s)")
+                if summary_stats["failed"]:
+                    print(f"   ⚠️ [{document.id}] Gagal: BAB {', '.join(summary_stats['failed'])} "
+                          f"(jalankan scripts/build_summaries.py untuk mencoba lagi)")
+            except Exception as e:
+                print(f"   ⚠️ [{document.id}] Could not build summaries: {e}")
+
+    # Step 6: Verify
+    print("\n🔹 Step 6: Verifying...")
     try:
         stats = pinecone_client.get_stats()
         print(f"   📊 Total vectors in index: {stats.get('total_vector_count', 0)}")
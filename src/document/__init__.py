@@ -3,9 +3,30 @@ Document Processing Module
 ==========================
 
 Module untuk loading dan processing dokumen PDF UU PDP.
+
+Export di bawah di-load lazy (PEP 562) supaya import
+src.document.structure tidak ikut memuat PyMuPDF dan langchain.
 """
 
-from .pdf_loader import PDFLoader
-from .chunker import TextChunker
+import importlib
+
+_EXPORTS = {
+    "PDFLoader": ".pdf_loader",
+    "CorpusDocument": ".corpus",
+    "load_corpus": ".corpus",
+    "TextChunker": ".chunker",
+    "StructuralChunker": ".structural_chunker",
+    "chunk_document": ".structural_chunker",
+    "iter_document_chunks": ".structural_chunker",
+    "StructureIndex": ".structure",
+    "build_structure_index": ".structure",
+    "get_structure_index": ".structure",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ["PDFLoader", "TextChunker"]
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -8,7 +8,12 @@ Module untuk membagi teks dokumen menjadi chunks yang sesuai untuk embedding.
 import re
 from typing import Optional
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+# Pola struktur dokumen UU (dipakai juga oleh structure.py)
+BAB_PATTERN = re.compile(r"BAB ([IVXLCDM]+)")
+PASAL_PATTERN = re.compile(r"Pasal (\d+)")
+BAGIAN_PATTERN = re.compile(r"Bagian ([A-Za-z]+)")
+AYAT_PATTERN = re.compile(r"\((\d+)\)")
+PAGE_NUMBER_PATTERN = re.compile(r"- \d+ -")
 
 
 class TextChunker:
@@ -44,6 +49,9 @@ class TextChunker:
             "",              # Karakter
         ]
 
+        # Import lazy: langchain cukup berat dan hanya dibutuhkan saat ingest
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+
         self.splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -105,13 +113,13 @@ class TextChunker:
         text = re.sub(r"\s+", " ", text)
 
         # Kembalikan newline untuk struktur dokumen
-        text = re.sub(r" (BAB [IVXLCDM]+)", r"\n\n\1", text)
-        text = re.sub(r" (Pasal \d+)", r"\n\n\1", text)
-        text = re.sub(r" (Bagian [A-Za-z]+)", r"\n\n\1", text)
-        text = re.sub(r" \((\d+)\) ", r"\n(\1) ", text)  # Ayat
+        text = re.sub(f" ({BAB_PATTERN.pattern})", r"\n\n\1", text)
+        text = re.sub(f" ({PASAL_PATTERN.pattern})", r"\n\n\1", text)
+        text = re.sub(f" ({BAGIAN_PATTERN.pattern})", r"\n\n\1", text)
+        text = re.sub(f" {AYAT_PATTERN.pattern} ", r"\n(\1) ", text)  # Ayat
 
         # Hapus header/footer yang berulang
-        text = re.sub(r"- \d+ -", "", text)  # Nomor halaman
+        text = PAGE_NUMBER_PATTERN.sub("", text)  # Nomor halaman
 
         return text.strip()
 
@@ -133,17 +141,17 @@ class TextChunker:
         }
 
         # Extract BAB
-        bab_match = re.search(r"BAB ([IVXLCDM]+)", chunk)
+        bab_match = BAB_PATTERN.search(chunk)
         if bab_match:
             metadata["bab"] = bab_match.group(1)
 
         # Extract Pasal
-        pasal_match = re.search(r"Pasal (\d+)", chunk)
+        pasal_match = PASAL_PATTERN.search(chunk)
         if pasal_match:
             metadata["pasal"] = pasal_match.group(1)
 
         # Extract Ayat
-        ayat_matches = re.findall(r"\((\d+)\)", chunk)
+        ayat_matches = AYAT_PATTERN.findall(chunk)
         if ayat_matches:
             metadata["ayat"] = ayat_matches
 
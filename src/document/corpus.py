@@ -0,0 +1,173 @@
+"""
+Corpus Module
+=============
+
+Manifest korpus dokumen (UU PDP, peraturan pelaksana, pedoman, dsb).
+
+Daftar dokumen dibaca dari data/corpus.json; PDF lain di folder data yang
+belum tercantum di manifest ikut terdaftar dengan ID hasil slug nama file.
+ID dokumen menjadi prefix vector ID ("<id>-chunk-pasal-<n>...") dan nilai metadata
+document_id, sehingga setiap dokumen bisa di-ingest dan di-query terpisah.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .pdf_loader import PDFLoader, get_data_dir
+from .structural_chunker import iter_document_chunks
+from .structure import StructureIndex, build_structure_index
+
+# Nama file manifest di folder data
+CORPUS_MANIFEST = "corpus.json"
+
+# ID dokumen yang valid: huruf kecil, angka, dan tanda hubung
+DOCUMENT_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9-]{0,62}$")
+
+
+@dataclass(frozen=True)
+class CorpusDocument:
+    """Satu dokumen dalam korpus."""
+
+    id: str
+    path: Path
+    title: str
+
+    @property
+    def id_prefix(self) -> str:
+        """Prefix vector ID untuk chunk dokumen ini."""
+        return f"{self.id}-chunk"
+
+
+def make_document_id(filename: str) -> str:
+    """
+    Buat ID dokumen stabil dari nama file.
+
+    Args:
+        filename: Nama file PDF (mis. "PP Nomor 71 Tahun 2019.pdf")
+
+    Returns:
+        Slug huruf kecil (mis. "pp-nomor-71-tahun-2019")
+    """
+    slug = re.sub(r"[^a-z0-9]+", "-", Path(filename).stem.lower()).strip("-")
+    return slug[:48] or hashlib.sha1(filename.encode("utf-8")).hexdigest()[:8]
+
+
+def load_corpus(data_dir: Optional[str | Path] = None) -> list[CorpusDocument]:
+    """
+    Load daftar dokumen korpus dari manifest dan folder data.
+
+    Args:
+        data_dir: Path ke folder data (optional)
+
+    Returns:
+        List CorpusDocument (urutan manifest, lalu PDF lain urut nama file)
+
+    Raises:
+        ValueError: Jika ID di manifest tidak valid atau duplikat
+    """
+    data_dir = get_data_dir(data_dir)
+    documents: list[CorpusDocument] = []
+    seen_ids: set[str] = set()
+    seen_files: set[str] = set()
+
+    manifest_path = data_dir / CORPUS_MANIFEST
+    if manifest_path.exists():
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        for entry in manifest.get("documents", []):
+            doc_id = entry["id"]
+            if not DOCUMENT_ID_PATTERN.match(doc_id):
+                raise ValueError(f"ID dokumen tidak valid di {CORPUS_MANIFEST}: {doc_id}")
+            if doc_id in seen_ids:
+                raise ValueError(f"ID dokumen duplikat di {CORPUS_MANIFEST}: {doc_id}")
+
+            seen_ids.add(doc_id)
+            seen_files.add(entry["file"])
+            documents.append(CorpusDocument(
+                id=doc_id,
+                path=data_dir / entry["file"],
+                title=entry.get("title", Path(entry["file"]).stem),
+            ))
+
+    # PDF yang belum terdaftar: ID dari slug nama file, diberi suffix hash
+    # nama file jika slug-nya bentrok dengan dokumen lain
+    for path in sorted(data_dir.glob("*.pdf")):
+        if path.name in seen_files:
+            continue
+        doc_id = make_document_id(path.name)
+        if doc_id in seen_ids:
+            doc_id = f"{doc_id}-{hashlib.sha1(path.name.encode('utf-8')).hexdigest()[:6]}"
+        seen_ids.add(doc_id)
+        documents.append(CorpusDocument(id=doc_id, path=path, title=path.stem))
+
+    return documents
+
+
+def get_document(doc_id: str, data_dir: Optional[str | Path] = None) -> CorpusDocument:
+    """
+    Ambil satu dokumen korpus berdasarkan ID.
+
+    Args:
+        doc_id: ID dokumen
+        data_dir: Path ke folder data (optional)
+
+    Returns:
+        CorpusDocument
+
+    Raises:
+        KeyError: Jika ID tidak ada di korpus
+    """
+    for document in load_corpus(data_dir):
+        if document.id == doc_id:
+            return document
+    raise KeyError(f"Dokumen tidak ditemukan di korpus: {doc_id}")
+
+
+def chunk_corpus_document(
+    document: CorpusDocument,
+    mode: Optional[str] = None,
+) -> tuple[CorpusDocument, list[dict], StructureIndex]:
+    """
+    Ekstrak, chunk, dan bangun structure index untuk satu dokumen.
+
+    Pekerjaan ini CPU-bound (PyMuPDF + parsing), jadi didesain untuk
+    dijalankan di worker ProcessPoolExecutor; semua argumen dan hasilnya
+    bisa di-pickle.
+
+    Args:
+        document: Dokumen korpus
+        mode: Mode chunking (default: env CHUNK_MODE)
+
+    Returns:
+        Tuple (document, chunks, structure index)
+    """
+    pages = [page["text"] for page in PDFLoader(document.path).iter_pages()]
+    chunks = list(iter_corpus_chunks(document, pages, mode=mode))
+    return document, chunks, build_structure_index(pages, source=document.title)
+
+
+def iter_corpus_chunks(
+    document: CorpusDocument,
+    pages: Iterable[str],
+    mode: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Stream chunk satu dokumen dengan metadata source dan document_id.
+
+    Args:
+        document: Dokumen korpus
+        pages: Iterable teks per halaman
+        mode: Mode chunking (default: env CHUNK_MODE)
+
+    Yields:
+        Dict dengan keys: text, metadata
+    """
+    for chunk in iter_document_chunks(pages, mode=mode):
+        chunk["metadata"]["source"] = document.title
+        chunk["metadata"]["document_id"] = document.id
+        yield chunk
@@ -7,7 +7,7 @@ Module untuk extract teks dari dokumen PDF UU PDP.
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import fitz  # PyMuPDF
 
@@ -52,18 +52,23 @@ class PDFLoader:
         Returns:
             List of dict dengan keys: page_number, text
         """
-        pages = []
+        return list(self.iter_pages())
 
+    def iter_pages(self) -> Iterator[dict]:
+        """
+        Stream teks per halaman tanpa memuat seluruh dokumen ke memory.
+
+        Yields:
+            Dict dengan keys: page_number, text
+        """
         with fitz.open(self.file_path) as doc:
             for page_num, page in enumerate(doc, start=1):
                 page_text = page.get_text("text")
                 if page_text.strip():
-                    pages.append({
+                    yield {
                         "page_number": page_num,
                         "text": page_text.strip(),
-                    })
-
-        return pages
+                    }
 
     def get_metadata(self) -> dict:
         """
@@ -78,22 +83,32 @@ class PDFLoader:
             return metadata
 
 
-def load_uu_pdp(data_dir: Optional[str] = None) -> str:
+def get_data_dir(data_dir: Optional[str | Path] = None) -> Path:
     """
-    Helper function untuk load UU PDP dari folder data.
+    Helper function untuk mendapatkan folder data (PDF dan manifest korpus).
 
     Args:
         data_dir: Path ke folder data (optional)
 
     Returns:
-        Teks lengkap UU PDP
+        Path folder data (default: folder data di root project)
     """
     if data_dir is None:
-        # Default: folder data di root project
-        current_dir = Path(__file__).parent.parent.parent
-        data_dir = current_dir / "data"
+        return Path(__file__).parent.parent.parent / "data"
+    return Path(data_dir)
 
-    pdf_path = Path(data_dir) / "UU Nomor 27 Tahun 2022.pdf"
+
+def get_uu_pdp_path(data_dir: Optional[str] = None) -> Path:
+    """
+    Helper function untuk mendapatkan path PDF UU PDP di folder data.
+
+    Args:
+        data_dir: Path ke folder data (optional)
+
+    Returns:
+        Path ke file PDF UU PDP
+    """
+    pdf_path = get_data_dir(data_dir) / "UU Nomor 27 Tahun 2022.pdf"
 
     if not pdf_path.exists():
         raise FileNotFoundError(
@@ -101,7 +116,20 @@ def load_uu_pdp(data_dir: Optional[str] = None) -> str:
             "Pastikan file 'UU Nomor 27 Tahun 2022.pdf' ada di folder 'data/'"
         )
 
-    loader = PDFLoader(pdf_path)
+    return pdf_path
+
+
+def load_uu_pdp(data_dir: Optional[str] = None) -> str:
+    """
+    Helper function untuk load UU PDP dari folder data.
+
+    Args:
+        data_dir: Path ke folder data (optional)
+
+    Returns:
+        Teks lengkap UU PDP
+    """
+    loader = PDFLoader(get_uu_pdp_path(data_dir))
     return loader.load()
 
 
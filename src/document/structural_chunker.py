@@ -0,0 +1,196 @@
+"""
+Structural Chunker Module
+=========================
+
+Chunker yang mengikuti struktur UU (BAB -> Bagian -> Pasal -> ayat) alih-alih
+jumlah karakter. Setiap pasal menjadi satu chunk; pasal yang terlalu panjang
+dipecah per kelompok ayat. Metadata (bab, pasal, ayat, parent) diambil dari
+state parser, bukan dari regex yang dijalankan ulang pada teks chunk.
+"""
+
+import os
+import re
+from typing import Iterable, Iterator, Optional
+
+from .chunker import chunk_uu_pdp
+from .structure import iter_pasal
+
+# Titik potong untuk pasal panjang tanpa ayat (mis. daftar definisi Pasal 1)
+ITEM_BOUNDARY = re.compile(r"(?<=[.;:])\s+(?=(?:\d{1,2}|[a-z])\.\s)")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.;:])\s+")
+
+CHUNK_MODES = ("recursive", "structural")
+
+
+class StructuralChunker:
+    """Membagi dokumen UU menjadi chunk per pasal / kelompok ayat."""
+
+    def __init__(
+        self,
+        max_chars: int = 1500,
+        source: str = "UU No 27 Tahun 2022",
+    ):
+        """
+        Initialize Structural Chunker.
+
+        Args:
+            max_chars: Panjang maksimum satu chunk sebelum pasal dipecah per ayat
+            source: Nama dokumen sumber (disimpan di metadata)
+        """
+        self.max_chars = max_chars
+        self.source = source
+
+    def iter_chunks(self, pages: Iterable[str]) -> Iterator[dict]:
+        """
+        Stream chunk dari halaman-halaman dokumen.
+
+        Args:
+            pages: Iterable teks per halaman (urut)
+
+        Yields:
+            Dict dengan keys: text, metadata
+        """
+        chunk_index = 0
+        for pasal in iter_pasal(pages):
+            for text, extra in self._split_pasal(pasal):
+                metadata = {
+                    "chunk_index": chunk_index,
+                    "source": self.source,
+                    "char_count": len(text),
+                    "bab": pasal["bab"],
+                    "pasal": str(pasal["nomor"]),
+                    **extra,
+                }
+                if pasal["bab_judul"]:
+                    metadata["bab_judul"] = pasal["bab_judul"]
+                if pasal["bagian"]:
+                    metadata["bagian"] = pasal["bagian"]
+
+                yield {"text": text, "metadata": metadata}
+                chunk_index += 1
+
+    def chunk_pages(self, pages: Iterable[str]) -> list[dict]:
+        """
+        Membagi dokumen menjadi chunks dengan metadata.
+
+        Args:
+            pages: Iterable teks per halaman (urut)
+
+        Returns:
+            List of dict dengan keys: text, metadata
+        """
+        return list(self.iter_chunks(pages))
+
+    def _split_pasal(self, pasal: dict) -> Iterator[tuple[str, dict]]:
+        """Yield (teks chunk, metadata tambahan) untuk satu pasal."""
+        header = f"Pasal {pasal['nomor']}"
+        ayat = pasal["ayat"]
+
+        full_text = f"{header}\n{_format_body(pasal)}"
+        if len(full_text) <= self.max_chars:
+            extra = {"chunk_type": "pasal", "parent": f"bab-{pasal['bab']}"}
+            if ayat:
+                extra["ayat"] = [a["nomor"] for a in ayat]
+            yield full_text, extra
+            return
+
+        parent = f"pasal-{pasal['nomor']}"
+        budget = self.max_chars - len(header) - 1
+
+        if ayat:
+            # Kelompokkan ayat berurutan sampai batas karakter
+            for group in _pack([f"({a['nomor']}) {a['text']}" for a in ayat], budget, "\n"):
+                numbers = [a["nomor"] for a in ayat[group.start : group.stop]]
+                body = "\n".join(f"({a['nomor']}) {a['text']}" for a in ayat[group.start : group.stop])
+                yield f"{header}\n{body}", {
+                    "chunk_type": "ayat",
+                    "parent": parent,
+                    "ayat": numbers,
+                }
+            return
+
+        # Pasal tanpa ayat: potong di batas butir/kalimat
+        pieces = ITEM_BOUNDARY.split(pasal["text"])
+        if len(pieces) == 1:
+            pieces = SENTENCE_BOUNDARY.split(pasal["text"])
+        for part, group in enumerate(_pack(pieces, budget, " "), start=1):
+            body = " ".join(pieces[group.start : group.stop])
+            yield f"{header}\n{body}", {
+                "chunk_type": "pasal-bagian",
+                "parent": parent,
+                "part": part,
+            }
+
+
+def chunk_document(pages: list[str], mode: Optional[str] = None) -> list[dict]:
+    """
+    Helper function untuk chunk dokumen sesuai mode.
+
+    Args:
+        pages: Teks per halaman PDF
+        mode: "recursive" (default, env CHUNK_MODE) atau "structural"
+
+    Returns:
+        List of chunks dengan metadata
+    """
+    mode = (mode or os.getenv("CHUNK_MODE", "recursive")).lower()
+
+    if mode == "structural":
+        max_chars = int(os.getenv("CHUNK_MAX_CHARS", 1500))
+        return StructuralChunker(max_chars=max_chars).chunk_pages(pages)
+
+    if mode == "recursive":
+        return chunk_uu_pdp(
+            "\n\n".join(pages),
+            chunk_size=int(os.getenv("CHUNK_SIZE", 1000)),
+            chunk_overlap=int(os.getenv("CHUNK_OVERLAP", 200)),
+        )
+
+    raise ValueError(f"CHUNK_MODE tidak valid: {mode}. Pilihan: {', '.join(CHUNK_MODES)}")
+
+
+def iter_document_chunks(pages: Iterable[str], mode: Optional[str] = None) -> Iterator[dict]:
+    """
+    Stream chunks dokumen sesuai mode.
+
+    Mode structural benar-benar streaming (halaman diproses satu per satu).
+    Mode recursive butuh seluruh teks untuk splitter, jadi halaman dikumpulkan
+    dulu sebelum chunk pertama di-yield.
+
+    Args:
+        pages: Iterable teks per halaman
+        mode: "recursive" (default, env CHUNK_MODE) atau "structural"
+
+    Yields:
+        Dict dengan keys: text, metadata
+    """
+    mode = (mode or os.getenv("CHUNK_MODE", "recursive")).lower()
+
+    if mode == "structural":
+        max_chars = int(os.getenv("CHUNK_MAX_CHARS", 1500))
+        yield from StructuralChunker(max_chars=max_chars).iter_chunks(pages)
+    else:
+        yield from chunk_document(list(pages), mode=mode)
+
+
+def _format_body(pasal: dict) -> str:
+    """Isi pasal dengan setiap ayat di baris sendiri."""
+    if pasal["ayat"]:
+        return "\n".join(f"({a['nomor']}) {a['text']}" for a in pasal["ayat"])
+    return pasal["text"]
+
+
+def _pack(pieces: list[str], budget: int, separator: str) -> Iterator[range]:
+    """Kelompokkan potongan berurutan (greedy) agar setiap grup <= budget karakter."""
+    start = 0
+    size = 0
+    for i, piece in enumerate(pieces):
+        added = len(piece) + (len(separator) if i > start else 0)
+        if i > start and size + added > budget:
+            yield range(start, i)
+            start = i
+            size = len(piece)
+        else:
+            size += added
+    if start < len(pieces):
+        yield range(start, len(pieces))
@@ -0,0 +1,488 @@
+"""
+Structure Index Module
+======================
+
+Index struktural UU PDP: nomor Pasal -> teks lengkap, daftar ayat, dan BAB
+yang melingkupinya. Dibangun sekali saat ingest dari teks per halaman PDF
+lalu disimpan sebagai JSON, sehingga lookup pasal cukup berupa dict lookup
+tanpa vector search maupun LLM.
+
+Teks PDF hasil scan mengandung salah baca OCR (misalnya "Pasal I", "Pasal 7O",
+"BAB xI"). Nomor pasal dibaca dari heading (dengan koreksi karakter OCR)
+lalu diperiksa terhadap urutan: heading yang hilang tidak menggeser nomor
+pasal berikutnya, heading ganda tidak membuat pasal baru, dan nomor yang
+tidak masuk akal diganti nomor urut berikutnya.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .chunker import BAGIAN_PATTERN, PASAL_PATTERN
+
+# Versi format file structure.json
+STRUCTURE_FORMAT_VERSION = 2
+
+# Heading satu baris penuh, toleran terhadap salah baca OCR
+PASAL_HEADING = re.compile(r"^Pasa[l1I7]?\s*([0-9IlOoTt]{1,3})$")
+BAB_HEADING = re.compile(r"^BAB\s+([IVXLCDMivxlcdm]+)$")
+BAGIAN_HEADING = re.compile(rf"^{BAGIAN_PATTERN.pattern}$")
+AYAT_START = re.compile(r"^\(([0-9lI]{1,2})[\)1]?\.?\s")
+
+# Penanda akhir batang tubuh (kalimat penutup atau awal bagian Penjelasan)
+BODY_END = re.compile(r"^(Agar setiap orang mengetahuinya|PENJE\S*ASAN$)")
+
+# Header/footer halaman
+PAGE_NUMBER_LINE = re.compile(r"^-\s*\S{1,3}\s*-$")
+FOOTER_LINE = re.compile(r"^SK No\b")
+CONTINUATION_LINE = re.compile(r"(\.\s?\.\s?\.|…)$")
+
+# Butir definisi Pasal 1 ("1. Data Pribadi adalah ..."), toleran OCR ("S.", "1O.", "1 1.")
+DEFINITION_ITEM = re.compile(r"(?:^|\s)(?:[0-9SOlI]{1,2}|1\s[0-9])\.\s+(?=[A-Z])")
+DEFINITION_ALIAS = re.compile(r"\s+yang selanjutnya disebut\s+(.+)$")
+
+# Koreksi karakter OCR yang sering tertukar dengan angka
+OCR_DIGITS = str.maketrans({"I": "1", "l": "1", "O": "0", "o": "0", "T": "7", "t": "7"})
+
+# Lompatan nomor maksimum yang dipercaya dari heading (heading pasal
+# sebelumnya tidak terbaca); lompatan lebih jauh dianggap salah baca OCR
+MAX_PASAL_SKIP = 2
+
+# Kalimat penutup baku pasal terakhir UU. Baris terakhirnya ("diundangkan.")
+# tidak ada di text layer PDF UU PDP (hanya di gambar scan halaman 33).
+CLOSING_FORMULA = re.compile(r"mulai berlaku pada tanggal$")
+
+
+class StructureIndex:
+    """Index Pasal dan BAB hasil parsing dokumen UU."""
+
+    def __init__(
+        self,
+        pasal: dict[int, dict],
+        bab: dict[str, dict],
+        source: str = "",
+        definitions: Optional[list[dict]] = None,
+    ):
+        """
+        Initialize Structure Index.
+
+        Args:
+            pasal: Mapping nomor pasal -> dict (nomor, bab, bab_judul, bagian, text, ayat)
+            bab: Mapping nomor BAB romawi -> dict (romawi, judul, pasal)
+            source: Nama dokumen sumber
+            definitions: Daftar definisi Pasal 1 (default: di-parse dari Pasal 1)
+        """
+        self.pasal = pasal
+        self.bab = bab
+        self.source = source
+        if definitions is None:
+            definitions = parse_definitions(pasal[1]["text"]) if 1 in pasal else []
+        self.definitions = definitions
+        self._terms = {}
+        for entry in definitions:
+            for term in [entry["istilah"], *entry.get("alias", [])]:
+                self._terms[_normalize_term(term)] = entry
+
+    def get_pasal(self, nomor: int) -> Optional[dict]:
+        """
+        Ambil satu pasal.
+
+        Args:
+            nomor: Nomor pasal
+
+        Returns:
+            Dict pasal atau None jika tidak ada
+        """
+        return self.pasal.get(int(nomor))
+
+    def get_bab(self, romawi: str) -> Optional[dict]:
+        """
+        Ambil satu BAB.
+
+        Args:
+            romawi: Nomor BAB dalam angka romawi (I-XVI)
+
+        Returns:
+            Dict BAB atau None jika tidak ada
+        """
+        return self.bab.get(romawi.upper())
+
+    def get_definition(self, term: str) -> Optional[dict]:
+        """
+        Cari definisi istilah di Pasal 1.
+
+        Cocok jika istilah sama persis (tanpa membedakan huruf besar/kecil),
+        atau jika hanya ada satu istilah yang diawali kata-kata query
+        (mis. "pengendali" -> "Pengendali Data Pribadi").
+
+        Args:
+            term: Istilah yang dicari
+
+        Returns:
+            Dict definisi (nomor, istilah, alias, definisi) atau None
+        """
+        key = _normalize_term(term)
+        if not key:
+            return None
+        if key in self._terms:
+            return self._terms[key]
+
+        candidates = {
+            id(entry): entry
+            for name, entry in self._terms.items()
+            if name.startswith(key + " ")
+        }
+        if len(candidates) == 1:
+            return next(iter(candidates.values()))
+        return None
+
+    def to_dict(self) -> dict:
+        """Serialisasi ke dict JSON-friendly."""
+        return {
+            "version": STRUCTURE_FORMAT_VERSION,
+            "source": self.source,
+            "pasal": {str(k): v for k, v in self.pasal.items()},
+            "bab": self.bab,
+            "definitions": self.definitions,
+        }
+
+    def save(self, path: str | Path) -> None:
+        """
+        Simpan index ke file JSON (atomic).
+
+        Args:
+            path: Path file tujuan
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "StructureIndex":
+        """
+        Load index dari file JSON.
+
+        Args:
+            path: Path file structure.json
+
+        Returns:
+            StructureIndex instance
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            pasal={int(k): v for k, v in data["pasal"].items()},
+            bab=data["bab"],
+            source=data.get("source", ""),
+            definitions=data.get("definitions"),
+        )
+
+
+def iter_pasal(pages: Iterable[str]) -> Iterator[dict]:
+    """
+    Parse dokumen UU dalam satu pass dan yield setiap pasal begitu selesai.
+
+    Pasal baru di-yield ketika heading pasal berikutnya muncul, karena teks
+    hasil ekstraksi kadang meletakkan sisa isi pasal setelah heading BAB
+    berikutnya (misalnya Pasal 64 yang terpotong oleh heading BAB XIII).
+
+    Args:
+        pages: Iterable teks per halaman (urut)
+
+    Yields:
+        Dict pasal: nomor, bab, bab_judul, bagian, text, ayat, referensi_pasal
+    """
+    bab = ""
+    bab_judul = ""
+    bagian = ""
+    expect_title: Optional[str] = None
+    current: Optional[dict] = None
+    last_nomor = 0
+
+    for line in _iter_body_lines(pages):
+        # Judul BAB/Bagian ada di baris setelah heading
+        if expect_title == "bab":
+            bab_judul = line
+            expect_title = None
+            continue
+        if expect_title == "bagian":
+            bagian = f"{bagian} - {line}"
+            expect_title = None
+            continue
+
+        bab_match = BAB_HEADING.match(line)
+        if bab_match:
+            bab = bab_match.group(1).upper()
+            bagian = ""
+            expect_title = "bab"
+            continue
+
+        bagian_match = BAGIAN_HEADING.match(line)
+        if bagian_match and bab:
+            bagian = f"Bagian {bagian_match.group(1)}"
+            expect_title = "bagian"
+            continue
+
+        pasal_match = PASAL_HEADING.match(line)
+        if pasal_match and bab:
+            nomor = _pasal_number(pasal_match.group(1), last_nomor)
+            if nomor is None:
+                # Heading ganda dari pasal yang sedang dibaca
+                continue
+            if current is not None:
+                yield _make_pasal(**current)
+            last_nomor = nomor
+            current = {
+                "nomor": nomor,
+                "bab": bab,
+                "bab_judul": bab_judul,
+                "bagian": bagian,
+                "lines": [],
+            }
+            continue
+
+        if current is not None:
+            current["lines"].append(line)
+
+    if current is not None:
+        yield _make_pasal(**current)
+
+
+def _pasal_number(heading: str, last_nomor: int) -> Optional[int]:
+    """
+    Nomor pasal dari heading, diperiksa terhadap urutan pasal.
+
+    Args:
+        heading: Nomor di heading hasil OCR (mis. "22", "2T", "I")
+        last_nomor: Nomor pasal sebelumnya (0 sebelum pasal pertama)
+
+    Returns:
+        Nomor dari heading jika sesuai urutan (termasuk lompatan sampai
+        MAX_PASAL_SKIP karena heading sebelumnya tidak terbaca), None jika
+        heading mengulang pasal sebelumnya, selain itu nomor urut berikutnya
+    """
+    digits = heading.translate(OCR_DIGITS)
+    if not digits.isdigit():
+        return last_nomor + 1
+    nomor = int(digits)
+    if nomor == last_nomor:
+        return None
+    if last_nomor < nomor <= last_nomor + 1 + MAX_PASAL_SKIP:
+        return nomor
+    return last_nomor + 1
+
+
+def build_structure_index(pages: Iterable[str], source: str = "UU No 27 Tahun 2022") -> StructureIndex:
+    """
+    Bangun StructureIndex dari teks per halaman PDF.
+
+    Args:
+        pages: Iterable teks per halaman (urut)
+        source: Nama dokumen sumber
+
+    Returns:
+        StructureIndex instance
+    """
+    pasal: dict[int, dict] = {}
+    bab: dict[str, dict] = {}
+
+    for entry in iter_pasal(pages):
+        pasal[entry["nomor"]] = entry
+        bab_entry = bab.setdefault(
+            entry["bab"],
+            {"romawi": entry["bab"], "judul": entry["bab_judul"], "pasal": []},
+        )
+        bab_entry["pasal"].append(entry["nomor"])
+
+    return StructureIndex(pasal=pasal, bab=bab, source=source)
+
+
+def parse_definitions(text: str) -> list[dict]:
+    """
+    Parse daftar definisi dari teks Pasal 1 ("Dalam Undang-Undang ini yang
+    dimaksud dengan: 1. X adalah ...").
+
+    Butir dinomori urut (nomor hasil OCR tidak dipakai), seperti pasal.
+
+    Args:
+        text: Teks Pasal 1
+
+    Returns:
+        List dict: nomor, istilah, alias, definisi
+    """
+    definitions = []
+    for item in DEFINITION_ITEM.split(text)[1:]:
+        if " adalah " not in item:
+            continue
+        term, definition = item.split(" adalah ", 1)
+        aliases = []
+        alias_match = DEFINITION_ALIAS.search(term)
+        if alias_match:
+            aliases.append(alias_match.group(1).strip())
+            term = term[: alias_match.start()]
+        definitions.append({
+            "nomor": len(definitions) + 1,
+            "istilah": term.strip(),
+            "alias": aliases,
+            "definisi": definition.strip(),
+        })
+    return definitions
+
+
+def format_pasal(entry: dict) -> str:
+    """
+    Format pasal menjadi teks yang siap ditampilkan.
+
+    Args:
+        entry: Dict pasal dari StructureIndex
+
+    Returns:
+        Teks pasal dengan ayat di baris terpisah
+    """
+    if entry.get("ayat"):
+        return "\n".join(f"({a['nomor']}) {a['text']}" for a in entry["ayat"])
+    return entry["text"]
+
+
+def get_structure_path(document_id: str = "uu-pdp") -> Path:
+    """
+    Get path file structure index (di INDEX_DIR).
+
+    Args:
+        document_id: ID dokumen korpus (default: UU PDP)
+
+    Returns:
+        Path INDEX_DIR/structure.json untuk UU PDP, atau
+        INDEX_DIR/structure/<document_id>.json untuk dokumen lain
+    """
+    from ..rag.index_version import get_index_dir
+
+    if document_id == "uu-pdp":
+        return get_index_dir() / "structure.json"
+    return get_index_dir() / "structure" / f"{document_id}.json"
+
+
+# Global structure index (lazy loaded, dipakai bersama oleh semua tools,
+# dimuat ulang saat ingest menulis versi index baru). Hasil None (file
+# index maupun PDF tidak ada) juga di-cache sampai versi berikutnya.
+_structure_index: Optional[StructureIndex] = None
+_structure_watcher = None
+
+
+def get_structure_index() -> Optional[StructureIndex]:
+    """
+    Get or load StructureIndex dari INDEX_DIR/structure.json.
+
+    Jika file belum dibuat oleh ingest, index dibangun di memory dari PDF
+    di folder data (tanpa menulis ke disk). Index dimuat ulang jika
+    INDEX_DIR/VERSION berubah sejak terakhir dimuat.
+
+    Returns:
+        StructureIndex, atau None jika file index maupun PDF tidak ada
+    """
+    global _structure_index, _structure_watcher
+    from ..rag.index_version import IndexVersionWatcher
+
+    if _structure_watcher is None or _structure_watcher.changed():
+        _structure_watcher = _structure_watcher or IndexVersionWatcher()
+        _structure_index = _load_structure_index()
+    return _structure_index
+
+
+def _load_structure_index() -> Optional[StructureIndex]:
+    """Load structure.json, atau bangun dari PDF jika belum di-ingest."""
+    path = get_structure_path()
+    if path.exists():
+        return StructureIndex.load(path)
+
+    from .pdf_loader import PDFLoader, get_uu_pdp_path
+
+    try:
+        pages = PDFLoader(get_uu_pdp_path()).load_pages()
+    except FileNotFoundError:
+        return None
+    return build_structure_index([page["text"] for page in pages])
+
+
+def _iter_body_lines(pages: Iterable[str]) -> Iterator[str]:
+    """
+    Yield baris isi batang tubuh UU: tanpa header/footer halaman dan
+    berhenti di kalimat penutup (sebelum tanda tangan dan Penjelasan).
+    """
+    for page in pages:
+        lines = [line.strip() for line in page.splitlines()]
+        lines = [line for line in lines if line]
+
+        # Header: semua baris sampai nomor halaman (mis. "-12-")
+        for i, line in enumerate(lines[:5]):
+            if PAGE_NUMBER_LINE.match(line):
+                lines = lines[i + 1 :]
+                break
+
+        # Footer: nomor SK dan penanda lanjutan (mis. "Pasal 40...")
+        for i in range(max(len(lines) - 3, 0), len(lines)):
+            if FOOTER_LINE.match(lines[i]) or CONTINUATION_LINE.search(lines[i]):
+                lines = lines[:i]
+                break
+
+        for line in lines:
+            if BODY_END.match(line):
+                return
+            yield line
+
+
+def _make_pasal(nomor: int, bab: str, bab_judul: str, bagian: str, lines: list[str]) -> dict:
+    """Susun dict pasal (teks lengkap dan daftar ayat) dari baris-baris isinya."""
+    if lines and CLOSING_FORMULA.search(lines[-1]):
+        lines = [*lines, "diundangkan."]
+    ayat: list[dict] = []
+    current: list[str] = []
+    previous = ""
+
+    for line in lines:
+        match = AYAT_START.match(line)
+        expected = str(len(ayat) + 1)
+        is_new_ayat = (
+            match is not None
+            and match.group(1).translate(OCR_DIGITS) == expected
+            and not previous.endswith("ayat")
+        )
+        if is_new_ayat:
+            if ayat:
+                ayat[-1]["text"] = _join(current)
+            ayat.append({"nomor": expected, "text": ""})
+            current = [line[match.end():]]
+        else:
+            current.append(line)
+        previous = line
+
+    if ayat:
+        ayat[-1]["text"] = _join(current)
+
+    text = _join(lines)
+    references = sorted({int(n) for n in PASAL_PATTERN.findall(text)} - {nomor})
+
+    return {
+        "nomor": nomor,
+        "bab": bab,
+        "bab_judul": bab_judul,
+        "bagian": bagian,
+        "text": text,
+        "ayat": ayat,
+        "referensi_pasal": references,
+    }
+
+
+def _normalize_term(term: str) -> str:
+    """Normalisasi istilah untuk lookup definisi."""
+    return " ".join(re.findall(r"\w+", term.lower()))
+
+
+def _join(lines: list[str]) -> str:
+    """Gabungkan baris menjadi satu paragraf dengan whitespace rapi."""
+    return re.sub(r"\s+", " ", " ".join(lines)).strip()
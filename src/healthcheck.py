@@ -0,0 +1,167 @@
+"""
+Healthcheck Module
+==================
+
+Readiness server MCP lewat file status (env READY_FILE). Server menulis
+file ini setelah warm-up selesai; Docker HEALTHCHECK menjalankan
+
+    python -m src.healthcheck
+
+yang hanya membaca file tersebut (tanpa import SDK), dan keluar dengan
+kode 0 jika server yang menulisnya masih hidup dan sudah ready.
+
+Dengan beberapa worker HTTP, setiap worker menulis file sendiri
+(READY_FILE.<pid>, lihat worker_ready_file) dan master menulis daftar
+worker ke READY_FILE (write_workers). Server baru ready jika master hidup
+dan semua worker di daftar itu hidup dan ready.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Default lokasi file readiness
+DEFAULT_READY_FILE = "/tmp/mcp-pdp-server.ready"
+
+
+def get_ready_file() -> Path:
+    """
+    Get path file readiness (env READY_FILE).
+
+    Returns:
+        Path file readiness
+    """
+    return Path(os.getenv("READY_FILE", DEFAULT_READY_FILE))
+
+
+def worker_ready_file(pid: int, path: Optional[Path] = None) -> Path:
+    """
+    Get path file readiness satu worker HTTP.
+
+    Args:
+        pid: PID worker
+        path: File readiness master (default: get_ready_file())
+
+    Returns:
+        Path READY_FILE.<pid>
+    """
+    path = path or get_ready_file()
+    return path.with_name(f"{path.name}.{pid}")
+
+
+def _write_status(status: dict, path: Path) -> None:
+    """Tulis file status JSON secara atomic."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), **status, "updated_at": time.time()}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def write_readiness(ready: bool, steps: dict, path: Optional[Path] = None) -> None:
+    """
+    Tulis status readiness (atomic).
+
+    Args:
+        ready: True jika semua langkah warm-up berhasil
+        steps: Hasil per langkah warm-up (ms atau pesan error)
+        path: Path file (default: get_ready_file())
+    """
+    _write_status({"ready": ready, "steps": steps}, path or get_ready_file())
+
+
+def write_workers(pids: list[int], path: Optional[Path] = None) -> None:
+    """
+    Tulis daftar worker HTTP (dipanggil master setiap kali worker di-fork).
+
+    Args:
+        pids: PID semua worker yang sedang berjalan
+        path: Path file (default: get_ready_file())
+    """
+    _write_status({"workers": sorted(pids)}, path or get_ready_file())
+
+
+def clear_readiness(path: Optional[Path] = None) -> None:
+    """
+    Hapus file readiness (saat server start/stop).
+
+    Args:
+        path: Path file (default: get_ready_file())
+    """
+    (path or get_ready_file()).unlink(missing_ok=True)
+
+
+def _read_status(path: Path) -> tuple[Optional[dict], str]:
+    """
+    Baca file status dan pastikan proses penulisnya masih hidup.
+
+    Returns:
+        Tuple (status, keterangan); status None jika tidak valid
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            status = json.load(f)
+    except FileNotFoundError:
+        return None, "warm-up belum selesai"
+    except ValueError:
+        return None, f"file status tidak valid: {path}"
+
+    try:
+        os.kill(status["pid"], 0)
+    except ProcessLookupError:
+        return None, f"proses server {status['pid']} tidak berjalan"
+    except PermissionError:
+        pass
+    return status, ""
+
+
+def _check_status(status: dict) -> tuple[bool, str]:
+    """Cek status readiness satu proses server."""
+    if not status.get("ready"):
+        errors = {k: v for k, v in status.get("steps", {}).items() if isinstance(v, str)}
+        return False, f"warm-up gagal: {errors}"
+    return True, "ready"
+
+
+def check_readiness(path: Optional[Path] = None) -> tuple[bool, str]:
+    """
+    Cek readiness server dari file status.
+
+    Untuk server multi-worker, file master berisi daftar worker dan setiap
+    worker harus ready (file READY_FILE.<pid> masing-masing).
+
+    Args:
+        path: Path file (default: get_ready_file())
+
+    Returns:
+        Tuple (ready, keterangan)
+    """
+    path = path or get_ready_file()
+    status, message = _read_status(path)
+    if status is None:
+        return False, message
+    if "workers" not in status:
+        return _check_status(status)
+
+    for pid in status["workers"]:
+        worker, message = _read_status(worker_ready_file(pid, path))
+        if worker is not None:
+            ready, message = _check_status(worker)
+            if ready:
+                continue
+        return False, f"worker {pid}: {message}"
+    return True, f"ready ({len(status['workers'])} worker)"
+
+
+def main() -> int:
+    """Entry point Docker HEALTHCHECK."""
+    ready, message = check_readiness()
+    print(message)
+    return 0 if ready else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
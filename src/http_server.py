@@ -0,0 +1,233 @@
+"""
+HTTP Server Module
+==================
+
+Mode produksi MCP PDP Server lewat HTTP (streamable HTTP atau SSE),
+dilayani uvicorn dengan beberapa worker (pre-fork).
+
+- Proses master memuat state berat sekali (registry.preload(): SDK,
+  structure index, ringkasan BAB, index lokal mmap, index BM25),
+  membekukan heap (gc.freeze) lalu fork MCP_WORKERS worker. Memory itu
+  dibagi copy-on-write; uvicorn --workers memakai spawn sehingga setiap
+  worker memuat ulang semuanya.
+- Socket di-bind sekali oleh master dan di-accept bersama oleh semua
+  worker (kernel membagi koneksi baru antar worker).
+- Worker stateless (MCP_STATELESS_HTTP=true, default): setiap request
+  streamable HTTP berdiri sendiri tanpa session di memory worker, jadi
+  server bisa di-scale out di belakang load balancer tanpa sticky session.
+  Session SSE disimpan di memory worker, sehingga transport sse hanya
+  bisa satu worker.
+- Setiap worker membuka koneksi Gemini/Pinecone sendiri (warm-up di
+  lifespan), mendapat bagian rata dari kuota rate limit, dan punya cache
+  jawaban, admission, serta metrics sendiri.
+- Master meneruskan SIGTERM/SIGINT ke worker dan menjalankan ulang worker
+  yang mati.
+- Readiness per worker: setiap worker menulis READY_FILE.<pid>, master
+  menulis daftar worker ke READY_FILE (lihat src/healthcheck.py).
+- Pesan operasional master (preload, worker, restart) lewat logging ke
+  stderr, bukan stdout.
+
+Usage:
+    MCP_TRANSPORT=streamable-http MCP_WORKERS=4 python -m src.server
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator
+
+from src.healthcheck import clear_readiness, get_ready_file, worker_ready_file, write_workers
+from src.rag.clients import get_client_registry
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+    from starlette.applications import Starlette
+
+TRANSPORTS = ("streamable-http", "sse")
+
+# Jeda sebelum worker yang mati dijalankan ulang (mencegah crash loop)
+RESTART_DELAY = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def create_app(server: "FastMCP", transport: str = "streamable-http") -> "Starlette":
+    """
+    Buat aplikasi ASGI untuk satu transport MCP.
+
+    Lifespan FastMCP server (warm-up, readiness, penutupan client) dijalankan
+    sekali di lifespan app bersama session manager MCP; lifespan yang sama
+    per session/request menjadi no-op (lihat server_lifespan di server.py).
+
+    Args:
+        server: FastMCP server (dengan lifespan)
+        transport: streamable-http atau sse
+
+    Returns:
+        Starlette app
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Transport harus salah satu dari {TRANSPORTS}: {transport}")
+    app = server.streamable_http_app() if transport == "streamable-http" else server.sse_app()
+    mcp_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: "Starlette") -> AsyncIterator[None]:
+        async with server.settings.lifespan(server), mcp_lifespan(app):
+            yield
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """
+    Bind socket listen di proses master (diwariskan ke semua worker).
+
+    Args:
+        host: Host/IP
+        port: Port
+
+    Returns:
+        Socket yang sudah listen
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(int(os.getenv("MCP_BACKLOG", 2048)))
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app: "Starlette", sock: socket.socket, workers: int) -> None:
+    """
+    Jalankan satu worker uvicorn pada socket bersama.
+
+    Args:
+        app: Aplikasi ASGI dari create_app()
+        sock: Socket dari bind_socket()
+        workers: Jumlah worker (untuk membagi kuota rate limit)
+    """
+    import uvicorn
+
+    get_client_registry().prepare_worker(workers)
+    config = uvicorn.Config(
+        app,
+        log_level=os.getenv("MCP_LOG_LEVEL", "info").lower(),
+        access_log=os.getenv("MCP_ACCESS_LOG", "false").lower() == "true",
+        timeout_graceful_shutdown=float(os.getenv("MCP_GRACEFUL_TIMEOUT", 30)),
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(
+    server: "FastMCP",
+    transport: str = "streamable-http",
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 1,
+) -> None:
+    """
+    Jalankan server HTTP dengan `workers` proses worker.
+
+    Args:
+        server: FastMCP server
+        transport: streamable-http atau sse
+        host: Host/IP listen
+        port: Port listen
+        workers: Jumlah worker (1 = tanpa fork)
+
+    Raises:
+        ValueError: Jika transport tidak dikenal, atau sse dengan lebih dari satu worker
+    """
+    if transport == "sse" and workers > 1:
+        raise ValueError("Transport sse menyimpan session per worker; pakai MCP_WORKERS=1")
+    logging.basicConfig(
+        level=os.getenv("MCP_LOG_LEVEL", "info").upper(),
+        format="%(asctime)s %(levelname)s [%(process)d] %(message)s",
+        stream=sys.stderr,
+    )
+    if workers > 1 and not server.settings.stateless_http:
+        logger.warning("MCP_STATELESS_HTTP=false dengan beberapa worker: "
+                       "session harus sticky di load balancer")
+
+    app = create_app(server, transport)
+    start = time.perf_counter()
+    results = get_client_registry().preload()
+    logger.info("Preload %.0f ms: %s", (time.perf_counter() - start) * 1000, results)
+    sock = bind_socket(host, port)
+
+    if workers <= 1:
+        run_worker(app, sock, 1)
+        return
+
+    # Objek hasil preload tidak disentuh GC worker (halaman memory tetap dibagi)
+    gc.collect()
+    gc.freeze()
+
+    ready_file = get_ready_file()
+    clear_readiness(ready_file)
+    children: dict[int, int] = {}
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            # Readiness worker ini di READY_FILE.<pid> (diagregasi healthcheck)
+            os.environ["READY_FILE"] = str(worker_ready_file(os.getpid(), ready_file))
+            code = 0
+            try:
+                run_worker(app, sock, workers)
+            except BaseException:
+                logger.exception("Worker %d gagal", os.getpid())
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        children[pid] = slot
+        write_workers(list(children), ready_file)
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for slot in range(workers):
+        spawn(slot)
+    logger.info("%d worker: %s", workers, ", ".join(str(pid) for pid in children))
+
+    try:
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            slot = children.pop(pid, None)
+            clear_readiness(worker_ready_file(pid, ready_file))
+            if slot is None or stopping:
+                continue
+            # Daftar worker tetap memuat pid lama (tidak ready) sampai penggantinya di-fork
+            logger.warning("Worker %d berhenti (exit %d), dijalankan ulang",
+                           pid, os.waitstatus_to_exitcode(status))
+            time.sleep(RESTART_DELAY)
+            if not stopping:
+                spawn(slot)
+    finally:
+        clear_readiness(ready_file)
+        sock.close()
@@ -4,10 +4,44 @@ RAG (Retrieval-Augmented Generation) Module
 
 Module untuk handling embeddings, vector database (Pinecone), 
 dan retrieval logic.
+
+Export di bawah di-load lazy (PEP 562): SDK Gemini dan Pinecone baru
+di-import saat class yang membutuhkannya dipakai.
 """
 
-from .embeddings import EmbeddingService
-from .pinecone_client import PineconeClient
-from .retriever import RAGRetriever
+import importlib
+
+_EXPORTS = {
+    "EmbeddingService": ".embeddings",
+    "EmbeddingCache": ".embedding_cache",
+    "CachedEmbeddingService": ".embedding_cache",
+    "PineconeClient": ".pinecone_client",
+    "LocalVectorIndex": ".local_index",
+    "RAGRetriever": ".retriever",
+    "QueryRouter": ".router",
+    "IngestionPipeline": ".ingestion",
+    "ChunkManifest": ".ingestion",
+    "SemanticAnswerCache": ".answer_cache",
+    "SingleFlight": ".singleflight",
+    "ContextAssembler": ".context_budget",
+    "LexicalReranker": ".reranker",
+    "CrossEncoderReranker": ".reranker",
+    "StageMetrics": ".metrics",
+    "get_metrics": ".metrics",
+    "BackendGuard": ".resilience",
+    "CircuitOpenError": ".resilience",
+    "DeadlineExceededError": ".resilience",
+    "AdmissionController": ".admission",
+    "BackendRateLimiter": ".admission",
+    "OverloadedError": ".admission",
+    "ClientRegistry": ".clients",
+    "get_client_registry": ".clients",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ["EmbeddingService", "PineconeClient", "RAGRetriever"]
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
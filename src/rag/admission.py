@@ -0,0 +1,488 @@
+"""
+Admission Control Module
+========================
+
+Pengatur beban di depan pipeline RAG. Tanpa ini, lonjakan tool call
+langsung diteruskan semua ke Gemini, semuanya terkena rate limit pada saat
+yang sama, lalu semuanya gagal.
+
+- AdmissionController: maksimal ADMISSION_MAX_CONCURRENT pipeline RAG
+  berjalan bersamaan. Request berikutnya menunggu di antrean prioritas
+  (interactive sebelum batch sebelum background) sebesar
+  ADMISSION_QUEUE_SIZE dengan batas waktu ADMISSION_QUEUE_TIMEOUT. Saat
+  antrean penuh, request prioritas rendah yang sedang antre digeser oleh
+  request prioritas lebih tinggi; jika tidak ada yang bisa digeser, request
+  baru langsung ditolak dengan OverloadedError.
+- BackendRateLimiter: token bucket per backend (<NAME>_QPS dan, untuk LLM,
+  <NAME>_TPM). Jika waktu tunggu kuota melebihi RATE_LIMIT_MAX_WAIT, call
+  ditolak seketika alih-alih menunggu lalu timeout.
+
+Tool murah (info_uu_pdp, lookup pasal/BAB/definisi dari structure index,
+ringkasan BAB precomputed) tidak melewati admission sama sekali, jadi
+tidak pernah antre di belakang call LLM.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+# Kelas prioritas, dari yang paling didahulukan
+PRIORITIES = ("interactive", "batch", "background")
+
+# Alasan penolakan (label metric pdp_admission_rejected_total)
+REJECT_REASONS = ("queue_full", "queue_timeout", "shed")
+
+
+class OverloadedError(RuntimeError):
+    """Request ditolak karena server atau kuota backend sedang penuh (load shedding)."""
+
+    def __init__(self, reason: str, message: str, retry_after: float):
+        super().__init__(f"{message} (coba lagi dalam {retry_after:.1f} detik)")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: terisi `rate` token per detik sampai `capacity`.
+
+    reserve() langsung mengurangi token (boleh minus) dan mengembalikan
+    berapa lama caller harus menunggu, sehingga caller berikutnya antre di
+    belakangnya secara adil tanpa lock yang ditahan selama menunggu.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock=time.monotonic,
+    ):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Token per detik (<= 0 berarti tanpa batas)
+            capacity: Token maksimum / burst (default: max(1, rate))
+            clock: Sumber waktu (untuk test/benchmark)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def reserve(self, amount: float = 1.0, max_wait: float = math.inf) -> Optional[float]:
+        """
+        Pesan `amount` token.
+
+        Args:
+            amount: Jumlah token (dibatasi capacity agar request besar tetap bisa lewat)
+            max_wait: Waktu tunggu maksimum yang masih diterima
+
+        Returns:
+            Detik yang harus ditunggu sebelum call, atau None jika melebihi
+            max_wait (token tidak dikurangi)
+        """
+        if not self.enabled:
+            return 0.0
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (amount - self.tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self.tokens -= amount
+            return wait
+
+    def refund(self, amount: float = 1.0) -> None:
+        """Kembalikan token dari reserve() yang dibatalkan."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Perkiraan detik sampai `amount` token tersedia (tanpa memesan)."""
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            elapsed = self._clock() - self._updated
+            tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            return max(0.0, (min(amount, self.capacity) - tokens) / self.rate)
+
+
+class BackendRateLimiter:
+    """Kuota request (QPS) dan token (TPM) satu backend."""
+
+    def __init__(self, name: str, qps: float = 0.0, tpm: float = 0.0, max_wait: float = 10.0):
+        """
+        Initialize rate limiter.
+
+        Args:
+            name: Nama backend
+            qps: Request per detik (0 = tanpa batas)
+            tpm: Token per menit (0 = tanpa batas), burst sampai satu menit kuota
+            max_wait: Waktu tunggu kuota maksimum sebelum call ditolak
+        """
+        self.name = name
+        self.qps = qps
+        self.tpm = tpm
+        self.max_wait = max_wait
+        # Request berjarak rata (tanpa burst) agar tidak melewati kuota per window
+        self.requests = TokenBucket(qps, capacity=1)
+        self.tokens = TokenBucket(tpm / 60, capacity=tpm)
+
+        self._lock = threading.Lock()
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, name: str) -> "BackendRateLimiter":
+        """
+        Load limit dari env <NAME>_QPS dan <NAME>_TPM (mis. GEMINI_GENERATE_TPM),
+        serta RATE_LIMIT_MAX_WAIT.
+
+        Args:
+            name: Nama backend (salah satu dari BACKENDS)
+
+        Returns:
+            BackendRateLimiter
+        """
+        prefix = name.upper()
+        return cls(
+            name=name,
+            qps=float(os.getenv(f"{prefix}_QPS", 0)),
+            tpm=float(os.getenv(f"{prefix}_TPM", 0)),
+            max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", 10)),
+        )
+
+    def share(self, parts: int) -> None:
+        """
+        Bagi kuota rata ke `parts` proses (mis. worker HTTP) yang memakai
+        API key yang sama, agar total semua proses tetap di bawah kuota.
+
+        Args:
+            parts: Jumlah proses yang berbagi kuota
+        """
+        if parts <= 1:
+            return
+        self.qps /= parts
+        self.tpm /= parts
+        self.requests = TokenBucket(self.qps, capacity=1)
+        self.tokens = TokenBucket(self.tpm / 60, capacity=self.tpm)
+
+    def reserve(self, tokens: int = 0, max_wait: Optional[float] = None) -> float:
+        """
+        Pesan satu request (dan `tokens` token) dari kuota.
+
+        Args:
+            tokens: Perkiraan token request (untuk limit TPM)
+            max_wait: Override RATE_LIMIT_MAX_WAIT (math.inf = selalu tunggu)
+
+        Returns:
+            Detik yang harus ditunggu sebelum call
+
+        Raises:
+            OverloadedError: Jika kuota baru tersedia setelah max_wait
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        request_wait = self.requests.reserve(1, max_wait)
+        token_wait = self.tokens.reserve(tokens, max_wait) if request_wait is not None else None
+        if request_wait is None or token_wait is None:
+            if request_wait is not None:
+                self.requests.refund(1)
+            with self._lock:
+                self.rejected += 1
+            retry_after = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            raise OverloadedError(
+                "rate_limit", f"Kuota {self.name} sedang habis", retry_after
+            )
+
+        wait = max(request_wait, token_wait)
+        if wait:
+            with self._lock:
+                self.waited += 1
+                self.wait_seconds += wait
+        return wait
+
+    async def acquire(self, tokens: int = 0, max_wait: Optional[float] = None) -> None:
+        """Tunggu kuota (async); lihat reserve()."""
+        wait = self.reserve(tokens, max_wait)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: int = 0, max_wait: Optional[float] = None) -> None:
+        """Tunggu kuota (blocking); lihat reserve()."""
+        wait = self.reserve(tokens, max_wait)
+        if wait:
+            time.sleep(wait)
+
+    def stats(self) -> dict:
+        """Limit dan counter: call yang menunggu kuota, total waktu tunggu, ditolak."""
+        with self._lock:
+            return {
+                "qps": self.qps,
+                "tpm": self.tpm,
+                "waited": self.waited,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "rejected": self.rejected,
+            }
+
+
+class _Waiter:
+    """Satu request di antrean admission (async atau sync)."""
+
+    def __init__(self, priority: str, seq: int, loop: Optional[asyncio.AbstractEventLoop]):
+        self.priority = priority
+        self.rank = PRIORITIES.index(priority)
+        self.seq = seq
+        self.enqueued = time.perf_counter()
+        self.granted = False
+        self.error: Optional[OverloadedError] = None
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+    def wake(self) -> None:
+        """Bangunkan request (dipanggil di luar lock, bisa dari thread lain)."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.event.set)
+        else:
+            self.event.set()
+
+
+class AdmissionController:
+    """Batas concurrency pipeline RAG dengan antrean prioritas terbatas."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        queue_size: int = 64,
+        queue_timeout: float = 10.0,
+    ):
+        """
+        Initialize admission controller.
+
+        Args:
+            max_concurrent: Pipeline RAG paralel maksimum (<= 0 = tanpa batas)
+            queue_size: Request menunggu maksimum (0 = langsung tolak jika penuh)
+            queue_timeout: Waktu antre maksimum (detik) sebelum request ditolak
+        """
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        self.active = 0
+        self.peak_active = 0
+        self.peak_queue = 0
+        self.admitted = {priority: 0 for priority in PRIORITIES}
+        self.queued = 0
+        self.rejected = {reason: 0 for reason in REJECT_REASONS}
+        self.wait_seconds = 0.0
+        self.completed = 0
+        self.hold_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """
+        Load dari env ADMISSION_MAX_CONCURRENT, ADMISSION_QUEUE_SIZE, dan
+        ADMISSION_QUEUE_TIMEOUT.
+
+        Returns:
+            AdmissionController
+        """
+        return cls(
+            max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", 8)),
+            queue_size=int(os.getenv("ADMISSION_QUEUE_SIZE", 64)),
+            queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 10)),
+        )
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        priority: str = "interactive",
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Jalankan blok setelah mendapat slot (menunggu di antrean jika penuh).
+
+        Args:
+            priority: Salah satu dari PRIORITIES
+            timeout: Override ADMISSION_QUEUE_TIMEOUT
+
+        Raises:
+            OverloadedError: Antrean penuh, waktu antre habis, atau digeser
+                request prioritas lebih tinggi
+        """
+        waiter = self._enter(priority, asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(waiter.event.wait(), self._timeout(timeout))
+            except asyncio.TimeoutError:
+                pass
+            except BaseException:
+                # Dibatalkan saat antre (mis. client disconnect)
+                self._abandon(waiter)
+                raise
+            self._settle(waiter)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - start)
+
+    @contextmanager
+    def admit_sync(
+        self,
+        priority: str = "interactive",
+        timeout: Optional[float] = None,
+    ) -> Iterator[None]:
+        """Versi blocking dari admit() untuk caller di thread."""
+        waiter = self._enter(priority)
+        if waiter is not None:
+            waiter.event.wait(self._timeout(timeout))
+            self._settle(waiter)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        """
+        Get statistik admission.
+
+        Returns:
+            Dict dengan limit, active, queue_length, peak, admitted per
+            prioritas, queued, rejected per alasan, dan rata-rata waktu antre
+        """
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "queue_size": self.queue_size,
+                "queue_timeout": self.queue_timeout,
+                "active": self.active,
+                "peak_active": self.peak_active,
+                "queue_length": len(self._queue),
+                "peak_queue": self.peak_queue,
+                "admitted": dict(self.admitted),
+                "queued": self.queued,
+                "rejected": dict(self.rejected),
+                "mean_wait_ms": self.wait_seconds / self.queued * 1000 if self.queued else 0.0,
+            }
+
+    def _timeout(self, timeout: Optional[float]) -> float:
+        return self.queue_timeout if timeout is None else timeout
+
+    def _enter(
+        self,
+        priority: str,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> Optional[_Waiter]:
+        """Ambil slot langsung (return None) atau masuk antrean (return waiter)."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Prioritas tidak valid: {priority}. Pilihan: {', '.join(PRIORITIES)}")
+
+        evicted = None
+        with self._lock:
+            if self.max_concurrent <= 0 or (
+                self.active < self.max_concurrent and not self._queue
+            ):
+                self.active += 1
+                self.peak_active = max(self.peak_active, self.active)
+                self.admitted[priority] += 1
+                return None
+
+            waiter = _Waiter(priority, next(self._seq), loop)
+            if len(self._queue) >= self.queue_size:
+                # Antrean penuh: geser request antre dengan prioritas paling rendah
+                worst = max(self._queue, default=None, key=lambda w: (w.rank, w.seq))
+                if worst is None or worst.rank <= waiter.rank:
+                    self.rejected["queue_full"] += 1
+                    raise OverloadedError(
+                        "queue_full", "Server sedang sibuk: antrean penuh", self._retry_after()
+                    )
+                self._queue.remove(worst)
+                heapq.heapify(self._queue)
+                self.rejected["shed"] += 1
+                worst.error = OverloadedError(
+                    "shed",
+                    "Server sedang sibuk: request digeser oleh request prioritas lebih tinggi",
+                    self._retry_after(),
+                )
+                evicted = worst
+
+            heapq.heappush(self._queue, waiter)
+            self.queued += 1
+            self.peak_queue = max(self.peak_queue, len(self._queue))
+
+        if evicted is not None:
+            evicted.wake()
+        return waiter
+
+    def _settle(self, waiter: _Waiter) -> None:
+        """Setelah menunggu: pakai slot yang sudah diberikan atau keluar dari antrean."""
+        with self._lock:
+            if waiter.granted:
+                return
+            if waiter.error is None:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                self.rejected["queue_timeout"] += 1
+                waiter.error = OverloadedError(
+                    "queue_timeout",
+                    f"Server sedang sibuk: antre lebih dari {self.queue_timeout:g} detik",
+                    self._retry_after(),
+                )
+        raise waiter.error
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Request batal saat antre: lepas slot jika sudah diberikan, atau keluar antrean."""
+        with self._lock:
+            granted = waiter.granted
+            if not granted and waiter in self._queue:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+        if granted:
+            self._release(0.0)
+
+    def _release(self, seconds: float) -> None:
+        """Selesai: serahkan slot ke request antre berikutnya (prioritas tertinggi)."""
+        with self._lock:
+            self.completed += 1
+            self.hold_seconds += seconds
+            waiter = heapq.heappop(self._queue) if self._queue else None
+            if waiter is None:
+                self.active -= 1
+                return
+            waiter.granted = True
+            self.admitted[waiter.priority] += 1
+            self.wait_seconds += time.perf_counter() - waiter.enqueued
+        waiter.wake()
+
+    def _retry_after(self) -> float:
+        """Perkiraan detik sampai antrean longgar (dipanggil dengan lock)."""
+        mean_hold = self.hold_seconds / self.completed if self.completed else 1.0
+        slots = max(self.max_concurrent, 1)
+        return max(1.0, mean_hold * (len(self._queue) + 1) / slots)
@@ -0,0 +1,282 @@
+"""
+Answer Cache Module
+===================
+
+Semantic cache untuk jawaban RAG. Pertanyaan baru yang embedding-nya cukup
+mirip (cosine similarity >= threshold) dengan pertanyaan yang sudah pernah
+dijawab langsung mendapat jawaban dari cache tanpa memanggil Pinecone
+maupun LLM.
+
+Embedding hampir tidak membedakan "Pasal 5" dari "Pasal 6", sehingga nomor
+Pasal/ayat/BAB yang disebut di pertanyaan menjadi bagian dari key: cache
+hit hanya jika referensinya persis sama.
+"""
+
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .index_version import get_version_path, read_index_version
+
+# Referensi struktural di pertanyaan: "Pasal 5", "ayat (2)", "BAB IV"
+STRUCTURAL_REFERENCE = re.compile(
+    r"\b(pasal|ayat)\s*\(?(\d{1,3})\)?|\b(bab)\s+([ivxl]+|\d{1,2})\b", re.IGNORECASE
+)
+ROMAN_NUMERALS = {"i": 1, "v": 5, "x": 10, "l": 50}
+
+
+@dataclass
+class CachedAnswer:
+    """Satu entry di answer cache."""
+
+    query: str
+    top_k: int
+    references: tuple
+    result: dict
+    created_at: float
+    latency: float
+
+
+class SemanticAnswerCache:
+    """Answer cache berbasis kemiripan embedding dengan TTL dan LRU eviction."""
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        version_path: Optional[Path] = None,
+    ):
+        """
+        Initialize Semantic Answer Cache.
+
+        Args:
+            threshold: Minimum cosine similarity untuk cache hit (default: env ANSWER_CACHE_THRESHOLD atau 0.95)
+            ttl: Umur maksimum entry dalam detik (default: env ANSWER_CACHE_TTL atau 86400)
+            max_entries: Jumlah maksimum entry (default: env ANSWER_CACHE_MAX_ENTRIES atau 1000)
+            version_path: File versi index untuk invalidasi (default: INDEX_DIR/VERSION)
+        """
+        if threshold is None:
+            threshold = float(os.getenv("ANSWER_CACHE_THRESHOLD", 0.95))
+        if ttl is None:
+            ttl = float(os.getenv("ANSWER_CACHE_TTL", 86400))
+        if max_entries is None:
+            max_entries = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", 1000))
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version_path = version_path or get_version_path()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.latency_saved = 0.0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, CachedAnswer] = OrderedDict()
+        self._vectors: dict[int, np.ndarray] = {}
+        self._next_id = 0
+
+        # Matrix embedding (dibangun ulang hanya setelah ada perubahan)
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_ids: list[int] = []
+
+        self._version_mtime = self._stat_version()
+        self._version = read_index_version(self.version_path)
+
+    def lookup(self, query: str, embedding: list[float], top_k: int) -> Optional[dict]:
+        """
+        Cari jawaban untuk query yang mirip.
+
+        Args:
+            query: Pertanyaan (referensi Pasal/ayat/BAB harus sama dengan entry)
+            embedding: Query embedding
+            top_k: top_k yang dipakai request (harus sama dengan entry)
+
+        Returns:
+            Salinan hasil answer() dengan key "cached": True, atau None jika miss
+        """
+        self._check_version()
+        references = extract_references(query)
+        vector = _normalize(embedding)
+
+        with self._lock:
+            self._expire()
+            if self._matrix is None:
+                self._rebuild_matrix()
+
+            best_id = None
+            if self._matrix_ids:
+                scores = self._matrix @ vector
+                for idx in np.argsort(-scores):
+                    if scores[idx] < self.threshold:
+                        break
+                    entry_id = self._matrix_ids[idx]
+                    entry = self._entries[entry_id]
+                    if entry.top_k == top_k and entry.references == references:
+                        best_id = entry_id
+                        similarity = float(scores[idx])
+                        break
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            entry = self._entries[best_id]
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            self.latency_saved += entry.latency
+
+        result = copy.deepcopy(entry.result)
+        result["cached"] = True
+        result["cache_similarity"] = similarity
+        return result
+
+    def put(
+        self,
+        query: str,
+        embedding: list[float],
+        top_k: int,
+        result: dict,
+        latency: float = 0.0,
+    ) -> None:
+        """
+        Simpan jawaban ke cache.
+
+        Args:
+            query: Pertanyaan asli
+            embedding: Query embedding
+            top_k: top_k yang dipakai
+            result: Hasil answer()
+            latency: Waktu pipeline penuh (untuk metrik latency saved)
+        """
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = CachedAnswer(
+                query=query,
+                top_k=top_k,
+                references=extract_references(query),
+                result=copy.deepcopy(result),
+                created_at=time.time(),
+                latency=latency,
+            )
+            self._vectors[entry_id] = _normalize(embedding)
+
+            while len(self._entries) > self.max_entries:
+                old_id, _ = self._entries.popitem(last=False)
+                del self._vectors[old_id]
+                self.evictions += 1
+
+            self._matrix = None
+
+    def invalidate(self) -> None:
+        """Hapus semua entry (misalnya setelah index di-ingest ulang)."""
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+            self._matrix = None
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """
+        Get statistik cache.
+
+        Returns:
+            Dict berisi entries, hits, misses, hit_rate, latency_saved, dll
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "latency_saved_seconds": round(self.latency_saved, 3),
+        }
+
+    def _expire(self) -> None:
+        """Hapus entry yang melewati TTL (dipanggil dengan lock)."""
+        cutoff = time.time() - self.ttl
+        expired = [i for i, e in self._entries.items() if e.created_at < cutoff]
+        for entry_id in expired:
+            del self._entries[entry_id]
+            del self._vectors[entry_id]
+        if expired:
+            self.evictions += len(expired)
+            self._matrix = None
+
+    def _rebuild_matrix(self) -> None:
+        """Susun ulang matrix embedding (dipanggil dengan lock)."""
+        self._matrix_ids = list(self._entries)
+        if self._matrix_ids:
+            self._matrix = np.stack([self._vectors[i] for i in self._matrix_ids])
+        else:
+            self._matrix = np.empty((0, 0), dtype=np.float32)
+
+    def _stat_version(self) -> Optional[int]:
+        """mtime file versi index (None jika belum ada)."""
+        try:
+            return self.version_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _check_version(self) -> None:
+        """Invalidasi cache jika versi index berubah sejak terakhir dicek."""
+        mtime = self._stat_version()
+        if mtime == self._version_mtime:
+            return
+
+        self._version_mtime = mtime
+        version = read_index_version(self.version_path)
+        if version != self._version:
+            self._version = version
+            self.invalidate()
+
+
+def extract_references(query: str) -> tuple:
+    """
+    Ambil referensi Pasal/ayat/BAB dari pertanyaan sebagai bagian key cache.
+
+    Args:
+        query: Pertanyaan user
+
+    Returns:
+        Tuple terurut (jenis, nomor), misalnya (("ayat", 2), ("pasal", 5));
+        BAB romawi diubah ke angka
+    """
+    references = set()
+    for match in STRUCTURAL_REFERENCE.finditer(query):
+        if match.group(1):
+            references.add((match.group(1).lower(), int(match.group(2))))
+        else:
+            references.add(("bab", _bab_number(match.group(4))))
+    return tuple(sorted(references))
+
+
+def _bab_number(value: str) -> int:
+    """Nomor BAB dari angka arab atau romawi."""
+    if value.isdigit():
+        return int(value)
+    total = 0
+    digits = [ROMAN_NUMERALS[c] for c in value.lower()]
+    for i, digit in enumerate(digits):
+        total += -digit if i + 1 < len(digits) and digits[i + 1] > digit else digit
+    return total
+
+
+def _normalize(embedding: list[float]) -> np.ndarray:
+    """Ubah embedding menjadi vector float32 ber-norm 1."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
@@ -0,0 +1,412 @@
+"""
+BAB Summaries Module
+====================
+
+Ringkasan per BAB yang dibuat offline (sekali per ingest) dari teks lengkap
+semua pasal di BAB tersebut, lalu disimpan di INDEX_DIR/summaries. Tool
+ringkasan_bab cukup membaca store ini tanpa vector search maupun LLM.
+
+Setiap ringkasan menyimpan hash sumbernya (teks pasal + model + versi
+prompt), sehingga build ulang hanya memanggil LLM untuk BAB yang teksnya
+berubah. Generation berjalan konkuren dengan batas concurrency dan rate
+limiter request per menit.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+
+from ..document.structure import (
+    StructureIndex,
+    format_pasal,
+    get_structure_index,
+    get_structure_path,
+)
+from .clients import get_client_registry
+from .index_version import get_index_dir
+
+# Load environment variables
+load_dotenv()
+
+# Versi format file summaries
+SUMMARY_FORMAT_VERSION = 1
+
+# Naikkan jika prompt ringkasan berubah agar semua BAB dibuat ulang
+SUMMARY_PROMPT_VERSION = 1
+
+
+def get_summary_path(document_id: str = "uu-pdp") -> Path:
+    """
+    Get path file ringkasan BAB satu dokumen.
+
+    Args:
+        document_id: ID dokumen korpus (default: UU PDP)
+
+    Returns:
+        Path INDEX_DIR/summaries/<document_id>.json
+    """
+    return get_index_dir() / "summaries" / f"{document_id}.json"
+
+
+def bab_source(structure: StructureIndex, romawi: str) -> str:
+    """
+    Teks lengkap semua pasal dalam satu BAB.
+
+    Args:
+        structure: Structure index dokumen
+        romawi: Nomor BAB romawi
+
+    Returns:
+        Teks "[Pasal N]\\n<isi>" untuk setiap pasal, dipisah baris kosong
+    """
+    bab = structure.get_bab(romawi)
+    return "\n\n".join(
+        f"[Pasal {nomor}]\n{format_pasal(structure.get_pasal(nomor))}"
+        for nomor in bab["pasal"]
+    )
+
+
+def bab_source_hash(structure: StructureIndex, romawi: str, model: str) -> str:
+    """
+    Hash sumber ringkasan satu BAB.
+
+    Args:
+        structure: Structure index dokumen
+        romawi: Nomor BAB romawi
+        model: Model LLM yang membuat ringkasan
+
+    Returns:
+        Hex SHA-256 dari versi prompt, model, judul BAB, dan teks pasal
+    """
+    bab = structure.get_bab(romawi)
+    digest = hashlib.sha256()
+    for part in (str(SUMMARY_PROMPT_VERSION), model, romawi, bab["judul"], bab_source(structure, romawi)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class AsyncRateLimiter:
+    """Rate limiter sederhana: maksimal `rate` acquire per menit, berjarak rata."""
+
+    def __init__(self, rate: float):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Jumlah request per menit (<= 0 berarti tanpa batas)
+        """
+        self.interval = 60.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Tunggu sampai slot request berikutnya tersedia."""
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class BabSummaryStore:
+    """Penyimpanan ringkasan BAB (JSON per dokumen)."""
+
+    def __init__(self, path: Optional[str | Path] = None):
+        """
+        Initialize store.
+
+        Args:
+            path: Path file summaries (default: get_summary_path())
+        """
+        self.path = Path(path) if path else get_summary_path()
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._signature: Optional[tuple[int, int, int]] = None
+        self.load()
+
+    def load(self) -> None:
+        """Load entries dari file (kosong jika belum ada atau format lama)."""
+        self._signature = self._stat()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+            return
+        if data.get("version") == SUMMARY_FORMAT_VERSION:
+            self.entries = data.get("bab", {})
+        else:
+            self.entries = {}
+
+    def refresh(self) -> bool:
+        """
+        Load ulang jika file berubah sejak terakhir dimuat (mis. setelah
+        ingest membuat ringkasan baru). Hanya stat() jika tidak berubah.
+
+        Returns:
+            True jika entries dimuat ulang
+        """
+        if self._stat() == self._signature:
+            return False
+        self.load()
+        return True
+
+    def _stat(self) -> Optional[tuple[int, int, int]]:
+        """
+        (inode, mtime, ukuran) file summaries, None jika belum ada. save()
+        memakai os.replace, jadi setiap penulisan mengganti inode walaupun
+        mtime-nya sama.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def get(self, romawi: str, structure: Optional[StructureIndex] = None) -> Optional[dict]:
+        """
+        Ambil ringkasan satu BAB.
+
+        Args:
+            romawi: Nomor BAB romawi
+            structure: Jika diberikan, ringkasan hanya dikembalikan jika hash
+                sumbernya masih cocok dengan teks BAB di structure index
+
+        Returns:
+            Dict entry (bab, judul, pasal, model, source_hash, summary,
+            generated_at) atau None
+        """
+        entry = self.entries.get(romawi.upper())
+        if entry is None or structure is None:
+            return entry
+        if structure.get_bab(romawi) is None:
+            return None
+        if entry["source_hash"] != bab_source_hash(structure, romawi.upper(), entry["model"]):
+            return None
+        return entry
+
+    def put(self, entry: dict) -> None:
+        """
+        Simpan/replace ringkasan satu BAB (di memory, panggil save() untuk menulis).
+
+        Args:
+            entry: Dict entry dengan key bab
+        """
+        with self._lock:
+            self.entries[entry["bab"]] = entry
+
+    def save(self) -> None:
+        """Tulis semua entry ke file JSON (atomic)."""
+        with self._lock:
+            data = {"version": SUMMARY_FORMAT_VERSION, "bab": dict(self.entries)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+
+class BabSummarizer:
+    """Generator ringkasan BAB (offline, dipanggil dari script ingest/build)."""
+
+    def __init__(
+        self,
+        structure: StructureIndex,
+        store: BabSummaryStore,
+        llm: Optional[Any] = None,
+        model: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+    ):
+        """
+        Initialize BAB Summarizer.
+
+        Args:
+            structure: Structure index dokumen
+            store: Store tujuan
+            llm: Model generatif (optional, default: genai.GenerativeModel dari client registry)
+            model: Model Gemini (default: env SUMMARY_MODEL atau GEMINI_MODEL)
+            concurrency: Maksimum request LLM paralel (default: env SUMMARY_CONCURRENCY atau 4)
+            rate: Maksimum request LLM per menit (default: env SUMMARY_RPM atau 30)
+        """
+        self.structure = structure
+        self.store = store
+        self.model = model or os.getenv("SUMMARY_MODEL", os.getenv("GEMINI_MODEL", "gemini-2.0-flash"))
+        self.concurrency = concurrency or int(os.getenv("SUMMARY_CONCURRENCY", 4))
+        self.rate = rate if rate is not None else float(os.getenv("SUMMARY_RPM", 30))
+
+        self.generate_options = {}
+        if llm is None:
+            registry = get_client_registry()
+            llm = registry.generative_model(self.model)
+            self.generate_options = {
+                "request_options": registry.configs["gemini_generate"].request_options
+            }
+        self.llm = llm
+
+    async def abuild(self, force: bool = False) -> dict:
+        """
+        Buat ringkasan untuk setiap BAB yang belum ada atau sumbernya berubah.
+
+        Args:
+            force: Buat ulang semua BAB walaupun hash sumbernya sama
+
+        Returns:
+            Dict statistik: generated, unchanged, failed (list BAB), seconds
+        """
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = AsyncRateLimiter(self.rate)
+
+        pending = []
+        unchanged = 0
+        for romawi in self.structure.bab:
+            source_hash = bab_source_hash(self.structure, romawi, self.model)
+            entry = self.store.get(romawi)
+            if not force and entry is not None and entry["source_hash"] == source_hash:
+                unchanged += 1
+            else:
+                pending.append((romawi, source_hash))
+
+        async def run(romawi: str, source_hash: str) -> Optional[str]:
+            async with semaphore:
+                await limiter.acquire()
+                try:
+                    await self._summarize(romawi, source_hash)
+                except Exception as e:
+                    print(f"   ⚠️ Ringkasan BAB {romawi} gagal: {e}")
+                    return romawi
+            return None
+
+        results = await asyncio.gather(*(run(romawi, h) for romawi, h in pending))
+        failed = [romawi for romawi in results if romawi is not None]
+        if len(failed) < len(pending):
+            self.store.save()
+
+        return {
+            "generated": len(pending) - len(failed),
+            "unchanged": unchanged,
+            "failed": failed,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def build(self, force: bool = False) -> dict:
+        """
+        Versi sync dari abuild().
+
+        Args:
+            force: Buat ulang semua BAB walaupun hash sumbernya sama
+
+        Returns:
+            Dict statistik: generated, unchanged, failed (list BAB), seconds
+        """
+        return asyncio.run(self.abuild(force=force))
+
+    async def _summarize(self, romawi: str, source_hash: str) -> None:
+        """Generate dan simpan ringkasan satu BAB."""
+        bab = self.structure.get_bab(romawi)
+        prompt = self._create_prompt(romawi, bab["judul"], bab_source(self.structure, romawi))
+        response = await get_client_registry().guard("gemini_generate").call(
+            lambda: self.llm.generate_content_async(prompt, **self.generate_options)
+        )
+
+        self.store.put({
+            "bab": romawi,
+            "judul": bab["judul"],
+            "pasal": bab["pasal"],
+            "model": self.model,
+            "source_hash": source_hash,
+            "summary": response.text.strip(),
+            "generated_at": int(time.time()),
+        })
+
+    def _create_prompt(self, romawi: str, judul: str, source: str) -> str:
+        """
+        Create prompt ringkasan BAB.
+
+        Args:
+            romawi: Nomor BAB romawi
+            judul: Judul BAB
+            source: Teks lengkap semua pasal di BAB
+
+        Returns:
+            Formatted prompt
+        """
+        return f"""Anda adalah asisten ahli hukum yang merangkum UU Perlindungan Data Pribadi (UU No. 27 Tahun 2022).
+
+Berikut teks lengkap BAB {romawi} - {judul}:
+
+{source}
+
+INSTRUKSI:
+1. Buat ringkasan BAB {romawi} dalam bahasa Indonesia yang jelas dan mudah dipahami
+2. Cakup SEMUA pasal di atas, kelompokkan pasal yang membahas topik yang sama
+3. Sebutkan nomor pasal untuk setiap poin
+4. Gunakan HANYA informasi dari teks di atas
+
+RINGKASAN:"""
+
+
+# Global summary store (lazy loaded)
+_summary_store: Optional[BabSummaryStore] = None
+
+
+def get_summary_store() -> BabSummaryStore:
+    """
+    Get or load BabSummaryStore UU PDP dari INDEX_DIR/summaries.
+
+    Store dimuat ulang jika file ringkasan berubah sejak terakhir dimuat.
+
+    Returns:
+        BabSummaryStore (kosong jika ringkasan belum dibuat)
+    """
+    global _summary_store
+    if _summary_store is None:
+        _summary_store = BabSummaryStore()
+    else:
+        _summary_store.refresh()
+    return _summary_store
+
+
+def build_bab_summaries(
+    document_id: str = "uu-pdp",
+    structure: Optional[StructureIndex] = None,
+    force: bool = False,
+    **kwargs,
+) -> dict:
+    """
+    Build/refresh ringkasan BAB satu dokumen.
+
+    Args:
+        document_id: ID dokumen korpus
+        structure: Structure index dokumen (default: dari INDEX_DIR)
+        force: Buat ulang semua BAB
+        **kwargs: Diteruskan ke BabSummarizer (llm, model, concurrency, rate)
+
+    Returns:
+        Dict statistik dari BabSummarizer.abuild()
+
+    Raises:
+        FileNotFoundError: Jika structure index dokumen belum dibuat
+    """
+    if structure is None:
+        path = get_structure_path(document_id)
+        if path.exists():
+            structure = StructureIndex.load(path)
+        elif document_id == "uu-pdp":
+            structure = get_structure_index()
+        if structure is None:
+            raise FileNotFoundError(f"Structure index tidak ditemukan: {path}")
+    store = BabSummaryStore(get_summary_path(document_id))
+    return BabSummarizer(structure, store, **kwargs).build(force=force)
@@ -0,0 +1,666 @@
+"""
+Client Registry Module
+======================
+
+Satu registry per proses untuk semua client backend (Gemini, Pinecone) dan
+instance RAGRetriever/QueryRouter yang dipakai bersama oleh server.py dan
+tools/pdp_tools.py.
+
+- Gemini: genai.configure dipanggil sekali. SDK memakai gRPC (HTTP/2,
+  satu channel multiplexed), jadi yang diatur di sini adalah timeout per
+  jenis request (embedding vs generation) lewat request_options.
+- Pinecone: SDK client dibuat sekali dengan timeout dan ukuran pool yang
+  bisa diatur; query async memakai httpx.AsyncClient HTTP/2 dengan pool
+  keep-alive sendiri (tanpa thread executor).
+- warm_up() meng-import SDK dan membuka koneksi di awal (TLS handshake,
+  gRPC channel) supaya request pertama setelah start tidak menanggung
+  biaya cold start; run_warm_up() menjalankannya di background dan
+  menulis status readiness untuk Docker HEALTHCHECK.
+- preload() memuat index dan retriever secara sync di proses master HTTP
+  sebelum fork worker (dibagi copy-on-write); prepare_worker() membagi
+  kuota rate limit per worker (lihat src/http_server.py).
+- guard() memberi BackendGuard per backend (deadline, retry dengan backoff
+  dan jitter, hedging, circuit breaker; lihat resilience.py).
+- admission membatasi pipeline RAG yang berjalan bersamaan dan
+  rate_limiter() memberi kuota QPS/TPM per backend (lihat admission.py).
+- stats() berisi jumlah request, in-flight, dan utilisasi pool per backend;
+  counter yang sama ikut di-render di metrics Prometheus (metric_samples).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
+
+from dotenv import load_dotenv
+
+from .admission import AdmissionController, BackendRateLimiter
+from .metrics import Sample, get_metrics
+from .resilience import CIRCUIT_STATES, BackendGuard, ResiliencePolicy
+
+if TYPE_CHECKING:
+    import httpx
+
+# Load environment variables
+load_dotenv()
+
+BACKENDS = ("gemini_embed", "gemini_generate", "pinecone")
+
+# Default timeout (detik) dan limit pool per backend
+DEFAULT_TIMEOUTS = {"gemini_embed": 10.0, "gemini_generate": 60.0, "pinecone": 10.0}
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 120.0
+
+
+@dataclass
+class BackendConfig:
+    """Timeout dan limit koneksi satu backend."""
+
+    name: str
+    timeout: float
+    max_connections: int
+    keepalive_expiry: float
+
+    @classmethod
+    def from_env(cls, name: str) -> "BackendConfig":
+        """
+        Load config backend dari env <NAME>_TIMEOUT, <NAME>_MAX_CONNECTIONS,
+        dan <NAME>_KEEPALIVE_EXPIRY (mis. PINECONE_TIMEOUT).
+
+        Args:
+            name: Nama backend (salah satu dari BACKENDS)
+
+        Returns:
+            BackendConfig
+        """
+        prefix = name.upper()
+        return cls(
+            name=name,
+            timeout=float(os.getenv(f"{prefix}_TIMEOUT", DEFAULT_TIMEOUTS[name])),
+            max_connections=int(os.getenv(f"{prefix}_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            keepalive_expiry=float(os.getenv(f"{prefix}_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)),
+        )
+
+    @property
+    def request_options(self) -> dict:
+        """request_options untuk call google.generativeai."""
+        return {"timeout": self.timeout}
+
+
+class BackendStats:
+    """Counter request per backend (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_seconds = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, seconds: float, error: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.total_seconds += seconds
+            if error:
+                self.errors += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "mean_ms": self.total_seconds / self.requests * 1000 if self.requests else 0.0,
+            }
+
+
+class ClientRegistry:
+    """Registry client backend dan komponen RAG yang dipakai bersama."""
+
+    def __init__(self):
+        """Initialize registry (semua client dibuat lazy)."""
+        self.configs = {name: BackendConfig.from_env(name) for name in BACKENDS}
+        self.backend_stats = {name: BackendStats() for name in BACKENDS}
+        self.guards = {
+            name: BackendGuard(ResiliencePolicy.from_env(name, self.configs[name].timeout))
+            for name in BACKENDS
+        }
+        self.rate_limiters = {name: BackendRateLimiter.from_env(name) for name in BACKENDS}
+        self.admission = AdmissionController.from_env()
+
+        self._lock = threading.RLock()
+        self._genai_api_key: Optional[str] = None
+        self._pinecone = None
+        # backend -> (event loop, client, task penutup client saat loop shutdown)
+        self._http_clients: dict[
+            str, tuple[asyncio.AbstractEventLoop, "httpx.AsyncClient", asyncio.Task]
+        ] = {}
+        self._models: dict[str, Any] = {}
+        self._retriever = None
+        self._router = None
+        self.ready = False
+        self.warm_up_results: dict = {}
+        self.warmed_up_at: Optional[float] = None
+
+        # Counter backend ikut di-render di pdp://metrics dan /metrics
+        get_metrics().add_collector(self.metric_samples)
+
+    def configure_genai(self, api_key: Optional[str] = None) -> None:
+        """
+        Configure google.generativeai sekali per proses (ulang hanya jika
+        API key berbeda).
+
+        Transport dan endpoint bisa diatur lewat env GEMINI_TRANSPORT
+        (grpc/grpc_asyncio/rest) dan GEMINI_API_ENDPOINT.
+
+        Args:
+            api_key: Google API key (default: env GOOGLE_API_KEY)
+        """
+        api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        with self._lock:
+            if self._genai_api_key == api_key:
+                return
+            import google.generativeai as genai
+
+            options = {}
+            if os.getenv("GEMINI_API_ENDPOINT"):
+                options["client_options"] = {"api_endpoint": os.getenv("GEMINI_API_ENDPOINT")}
+            genai.configure(
+                api_key=api_key,
+                transport=os.getenv("GEMINI_TRANSPORT") or None,
+                **options,
+            )
+            self._genai_api_key = api_key
+
+    def generative_model(self, model: str) -> Any:
+        """
+        Get shared genai.GenerativeModel untuk satu nama model.
+
+        Args:
+            model: Nama model Gemini
+
+        Returns:
+            genai.GenerativeModel instance
+        """
+        with self._lock:
+            if model not in self._models:
+                import google.generativeai as genai
+
+                self.configure_genai()
+                self._models[model] = genai.GenerativeModel(model)
+            return self._models[model]
+
+    def pinecone(self, api_key: Optional[str] = None) -> Any:
+        """
+        Get shared Pinecone SDK client (timeout dan ukuran pool dari config pinecone).
+
+        Args:
+            api_key: Pinecone API key (default: env PINECONE_API_KEY)
+
+        Returns:
+            pinecone.Pinecone instance
+        """
+        with self._lock:
+            if self._pinecone is None:
+                from pinecone import Pinecone
+
+                config = self.configs["pinecone"]
+                self._pinecone = Pinecone(
+                    api_key=api_key or os.getenv("PINECONE_API_KEY"),
+                    timeout=config.timeout,
+                    connection_pool_maxsize=config.max_connections,
+                )
+            return self._pinecone
+
+    def http_client(self, backend: str) -> "httpx.AsyncClient":
+        """
+        Get shared httpx.AsyncClient (HTTP/2, keep-alive) untuk satu backend.
+
+        Client terikat ke event loop yang sedang berjalan; loop baru
+        mendapat client baru dan client loop lama ditutup. Client juga
+        ditutup di loop-nya sendiri saat loop itu shutdown (asyncio.run
+        membatalkan semua task sebelum menutup loop), sehingga koneksi
+        HTTP/2 tidak bocor ke loop yang sudah mati.
+
+        Args:
+            backend: Nama backend (salah satu dari BACKENDS)
+
+        Returns:
+            httpx.AsyncClient
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._http_clients.get(backend)
+            if entry is None or entry[0] is not loop:
+                import httpx
+
+                if entry is not None:
+                    _retire_http_client(entry)
+                config = self.configs[backend]
+                limits = httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_connections,
+                    keepalive_expiry=config.keepalive_expiry,
+                )
+                client = httpx.AsyncClient(
+                    http2=True,
+                    limits=limits,
+                    timeout=httpx.Timeout(config.timeout, connect=min(config.timeout, 5.0)),
+                )
+                entry = (loop, client, loop.create_task(_close_on_cancel(client)))
+                self._http_clients[backend] = entry
+            return entry[1]
+
+    def guard(self, backend: str) -> BackendGuard:
+        """
+        Get BackendGuard (deadline, retry, hedging, circuit breaker) satu backend.
+
+        Args:
+            backend: Nama backend (salah satu dari BACKENDS)
+
+        Returns:
+            BackendGuard
+        """
+        return self.guards[backend]
+
+    def rate_limiter(self, backend: str) -> BackendRateLimiter:
+        """
+        Get BackendRateLimiter (kuota QPS/TPM) satu backend.
+
+        Args:
+            backend: Nama backend (salah satu dari BACKENDS)
+
+        Returns:
+            BackendRateLimiter
+        """
+        return self.rate_limiters[backend]
+
+    @asynccontextmanager
+    async def track(self, backend: str) -> AsyncIterator[None]:
+        """
+        Catat satu request ke backend (in-flight, latency, error).
+
+        Args:
+            backend: Nama backend
+        """
+        stats = self.backend_stats[backend]
+        stats.start()
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            stats.finish(time.perf_counter() - start, error)
+
+    def retriever(self) -> Any:
+        """
+        Get shared RAGRetriever (satu instance untuk server dan tools).
+
+        Returns:
+            RAGRetriever instance
+        """
+        with self._lock:
+            if self._retriever is None:
+                from .retriever import RAGRetriever
+
+                self._retriever = RAGRetriever()
+            return self._retriever
+
+    def router(self) -> Any:
+        """
+        Get shared QueryRouter (structural lookup di depan RAG).
+
+        Returns:
+            QueryRouter instance
+        """
+        with self._lock:
+            if self._router is None:
+                from .router import QueryRouter
+
+                self._router = QueryRouter(
+                    retriever_factory=self.retriever,
+                    aretriever_factory=self.aretriever,
+                )
+            return self._router
+
+    def register(self, retriever: Any = None, router: Any = None) -> None:
+        """
+        Pasang retriever/router yang sudah dibuat (mis. dengan backend fake
+        untuk benchmark). Router di-reset agar memakai retriever baru.
+
+        Args:
+            retriever: RAGRetriever instance (optional)
+            router: QueryRouter instance (optional)
+        """
+        with self._lock:
+            if retriever is not None:
+                self._retriever = retriever
+                self._router = None
+            if router is not None:
+                self._router = router
+
+    async def aretriever(self) -> Any:
+        """
+        Versi async dari retriever(): jika retriever belum ada (mis. warm-up
+        masih berjalan), pembuatannya ditunggu di thread executor sehingga
+        event loop tetap melayani request lain.
+
+        Returns:
+            RAGRetriever instance
+        """
+        if self._retriever is not None:
+            return self._retriever
+        from .executor import run_blocking
+
+        return await run_blocking(self.retriever)
+
+    async def warm_up(self) -> dict:
+        """
+        Siapkan semua komponen sebelum request pertama.
+
+        Import SDK berat, load structure index dan ringkasan BAB, membuat
+        retriever (load index lokal), membuka gRPC channel Gemini dengan
+        satu embedding kecil, membuka koneksi HTTP/2 ke host index
+        Pinecone, dan load model reranker (jika cross-encoder). Kegagalan
+        satu langkah tidak menghentikan yang lain.
+
+        Returns:
+            Dict per langkah: waktu (ms) atau pesan error
+        """
+        results = {}
+
+        async def step(name: str, coro) -> None:
+            start = time.perf_counter()
+            try:
+                await coro
+                results[name] = round((time.perf_counter() - start) * 1000, 1)
+            except Exception as e:
+                results[name] = f"error: {e}"
+
+        from .executor import run_blocking
+
+        await step("imports", run_blocking(_import_sdks))
+        await step("structure", run_blocking(_load_structure))
+        await step("retriever", self.aretriever())
+        retriever = self._retriever
+        if retriever is not None:
+            embedding_service = getattr(retriever.embedding_service, "service", retriever.embedding_service)
+            if hasattr(embedding_service, "warm_up"):
+                await step("gemini", embedding_service.warm_up())
+            if hasattr(retriever.pinecone_client, "warm_up"):
+                await step("pinecone", retriever.pinecone_client.warm_up())
+            if hasattr(getattr(retriever, "reranker", None), "warm_up"):
+                await step("reranker", retriever.reranker.warm_up())
+
+        self.warm_up_results = results
+        self.ready = not any(isinstance(v, str) for v in results.values())
+        self.warmed_up_at = time.time()
+        return results
+
+    async def run_warm_up(self, retry_interval: Optional[float] = None) -> dict:
+        """
+        Jalankan warm-up di background dan tulis status readiness.
+
+        Langkah yang gagal (mis. Pinecone belum bisa dihubungi) dicoba lagi
+        setiap retry_interval detik sampai semua berhasil.
+
+        Args:
+            retry_interval: Jeda retry (default: env WARMUP_RETRY_INTERVAL atau 30, 0 = tanpa retry)
+
+        Returns:
+            Hasil warm-up terakhir
+        """
+        from ..healthcheck import write_readiness
+
+        if retry_interval is None:
+            retry_interval = float(os.getenv("WARMUP_RETRY_INTERVAL", 30))
+
+        while True:
+            results = await self.warm_up()
+            write_readiness(self.ready, results)
+            if self.ready or retry_interval <= 0:
+                return results
+            await asyncio.sleep(retry_interval)
+
+    def preload(self) -> dict:
+        """
+        Load komponen berat secara sync, tanpa event loop, thread, atau
+        koneksi jaringan.
+
+        Dipakai proses master HTTP sebelum fork worker: SDK, structure index,
+        ringkasan BAB, dan retriever (index lokal mmap, index BM25) dimuat
+        sekali lalu dibagi copy-on-write ke semua worker. Koneksi Gemini dan
+        Pinecone tetap dibuka per worker oleh warm_up().
+
+        Returns:
+            Dict per langkah: waktu (ms) atau pesan error
+        """
+        results = {}
+        for name, load in (
+            ("imports", _import_sdks),
+            ("structure", _load_structure),
+            ("retriever", self.retriever),
+        ):
+            start = time.perf_counter()
+            try:
+                load()
+                results[name] = round((time.perf_counter() - start) * 1000, 1)
+            except Exception as e:
+                results[name] = f"error: {e}"
+        return results
+
+    def prepare_worker(self, workers: int) -> None:
+        """
+        Siapkan registry di worker yang baru di-fork dari proses master.
+
+        Kuota rate limit dibagi rata ke semua worker (API key sama) dan RNG
+        jitter retry di-seed ulang agar worker tidak retry serentak.
+
+        Args:
+            workers: Jumlah worker yang berbagi kuota backend
+        """
+        for limiter in self.rate_limiters.values():
+            limiter.share(workers)
+        for guard in self.guards.values():
+            guard.reseed()
+
+    def stats(self) -> dict:
+        """
+        Get statistik request dan utilisasi pool per backend.
+
+        Returns:
+            Dict per backend: config (timeout, max_connections), counter
+            request, resilience (retry, timeout, hedge, status circuit
+            breaker), rate_limit (kuota dan waktu tunggu), dan untuk pool
+            httpx: connections, active, idle, http2,
+            utilization (active / max_connections); serta admission
+            (slot aktif, antrean, request ditolak), coalescing
+            (request identik yang berbagi satu eksekusi RAG), context
+            (token context dan token yang dihemat ContextAssembler), dan
+            rerank (latency dan cache hit reranker)
+        """
+        result = {}
+        for name in BACKENDS:
+            config = self.configs[name]
+            entry = {
+                "timeout": config.timeout,
+                "max_connections": config.max_connections,
+                **self.backend_stats[name].to_dict(),
+                "resilience": self.guards[name].stats(),
+                "rate_limit": self.rate_limiters[name].stats(),
+            }
+            client = self._http_clients.get(name)
+            if client is not None:
+                entry["pool"] = _pool_stats(client[1], config.max_connections)
+            result[name] = entry
+        result["admission"] = self.admission.stats()
+        if self._retriever is not None and hasattr(self._retriever, "singleflight"):
+            result["coalescing"] = self._retriever.singleflight.stats()
+        if getattr(self._retriever, "context_assembler", None) is not None:
+            result["context"] = self._retriever.context_assembler.stats()
+        if getattr(self._retriever, "reranker", None) is not None:
+            result["rerank"] = self._retriever.reranker.stats()
+        result["ready"] = self.ready
+        result["warm_up"] = self.warm_up_results
+        result["warmed_up_at"] = self.warmed_up_at
+        return result
+
+    def metric_samples(self) -> list[Sample]:
+        """
+        Metrics backend untuk StageMetrics.render().
+
+        Returns:
+            List Sample: request, error, in-flight, retry, timeout, hedge,
+            status circuit breaker, dan rate limit per backend, admission
+            (aktif, antrean, ditolak), serta readiness
+        """
+        samples: list[Sample] = []
+        for name in BACKENDS:
+            stats = self.backend_stats[name].to_dict()
+            guard = self.guards[name].stats()
+            limit = self.rate_limiters[name].stats()
+            labels = {"backend": name}
+            samples += [
+                ("pdp_backend_requests_total", "counter", "Request ke backend", labels,
+                 stats["requests"]),
+                ("pdp_backend_errors_total", "counter", "Request backend yang gagal", labels,
+                 stats["errors"]),
+                ("pdp_backend_in_flight", "gauge", "Request backend yang sedang berjalan", labels,
+                 stats["in_flight"]),
+                ("pdp_backend_retries_total", "counter", "Retry call backend", labels,
+                 guard["retries"]),
+                ("pdp_backend_timeouts_total", "counter", "Attempt backend yang timeout", labels,
+                 guard["timeouts"]),
+                ("pdp_backend_hedges_total", "counter", "Request duplikat (hedging)", labels,
+                 guard["hedges"]),
+                ("pdp_backend_rejected_total", "counter", "Call ditolak circuit breaker", labels,
+                 guard["circuit"]["rejected"]),
+                ("pdp_circuit_state", "gauge", "0 closed, 1 half-open, 2 open", labels,
+                 CIRCUIT_STATES[guard["circuit"]["state"]]),
+                ("pdp_rate_limit_wait_seconds_total", "counter", "Waktu tunggu kuota backend",
+                 labels, limit["wait_seconds"]),
+                ("pdp_rate_limit_rejected_total", "counter", "Call ditolak karena kuota habis",
+                 labels, limit["rejected"]),
+            ]
+        admission = self.admission.stats()
+        samples += [
+            ("pdp_admission_active", "gauge", "Pipeline RAG yang sedang berjalan", {},
+             admission["active"]),
+            ("pdp_admission_queue_length", "gauge", "Request yang menunggu di antrean", {},
+             admission["queue_length"]),
+        ]
+        samples += [
+            ("pdp_admission_admitted_total", "counter", "Request yang mendapat slot",
+             {"priority": priority}, count)
+            for priority, count in admission["admitted"].items()
+        ]
+        samples += [
+            ("pdp_admission_rejected_total", "counter", "Request yang ditolak (load shedding)",
+             {"reason": reason}, count)
+            for reason, count in admission["rejected"].items()
+        ]
+        samples.append(("pdp_ready", "gauge", "1 jika warm-up selesai", {}, int(self.ready)))
+        return samples
+
+    async def aclose(self) -> None:
+        """Tutup semua httpx client (client loop lain ditutup di loop-nya)."""
+        with self._lock:
+            entries = list(self._http_clients.values())
+            self._http_clients.clear()
+        loop = asyncio.get_running_loop()
+        for entry in entries:
+            client_loop, _, closer = entry
+            if client_loop is loop:
+                closer.cancel()
+                await asyncio.gather(closer, return_exceptions=True)
+                # Task yang di-cancel sebelum sempat berjalan tidak menutup client
+                await entry[1].aclose()
+            else:
+                _retire_http_client(entry)
+
+
+async def _close_on_cancel(client: "httpx.AsyncClient") -> None:
+    """Tunggu sampai task di-cancel, lalu tutup client di event loop-nya sendiri."""
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await client.aclose()
+
+
+def _retire_http_client(
+    entry: tuple[asyncio.AbstractEventLoop, "httpx.AsyncClient", asyncio.Task]
+) -> None:
+    """
+    Tutup client yang diganti: cancel task penutupnya di loop pemilik client.
+
+    Loop yang sudah ditutup lewat asyncio.run sudah menjalankan task itu
+    saat shutdown; loop yang masih hidup menjalankannya begitu berjalan.
+    """
+    loop, _, closer = entry
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(closer.cancel)
+
+
+def _import_sdks() -> None:
+    """Import SDK berat (Gemini, Pinecone, PyMuPDF) di luar jalur request."""
+    import fitz  # noqa: F401
+    import google.generativeai  # noqa: F401
+    import pinecone  # noqa: F401
+
+
+def _load_structure() -> None:
+    """Load structure index dan ringkasan BAB ke memory."""
+    from ..document.structure import get_structure_index
+    from .bab_summaries import get_summary_store
+
+    get_structure_index()
+    get_summary_store()
+
+
+def _pool_stats(client: "httpx.AsyncClient", max_connections: int) -> dict:
+    """Utilisasi connection pool httpx (dari httpcore pool transport)."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for c in connections if c.is_idle())
+    active = len(connections) - idle
+    return {
+        "connections": len(connections),
+        "active": active,
+        "idle": idle,
+        "http2": sum(1 for c in connections if "HTTP/2" in c.info()),
+        "utilization": active / max_connections if max_connections else 0.0,
+    }
+
+
+# Global registry (satu per proses)
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> ClientRegistry:
+    """
+    Get or create ClientRegistry global.
+
+    Returns:
+        ClientRegistry instance
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ClientRegistry()
+    return _registry
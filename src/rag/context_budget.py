@@ -0,0 +1,365 @@
+"""
+Context Budget Module
+=====================
+
+Penyusun context untuk prompt LLM. Chunk hasil retrieval dengan overlap
+(default 200 karakter) mengulang teks chunk tetangganya, sehingga context
+hasil concatenation biasa membayar token input Gemini untuk teks yang sama
+dua kali.
+
+ContextAssembler:
+1. menggabungkan chunk yang berurutan (chunk_index berdampingan dalam
+   dokumen yang sama) dan membuang teks overlap di sambungannya
+2. membuang baris yang sudah muncul di segmen lain (span duplikat)
+3. mengisi context dengan segmen paling relevan sampai batas token
+   (CONTEXT_BUDGET_TOKENS), memotong segmen terakhir di batas kalimat
+
+Jumlah token dihitung dengan estimator lokal (tanpa request ke API), dan
+token yang dihemat dicatat per request.
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# Pecahan teks untuk estimasi token: kata atau satu tanda baca
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Rata-rata karakter per token untuk kata panjang (SentencePiece Gemini)
+CHARS_PER_TOKEN = 4
+
+# Baris lebih pendek dari ini (mis. "(1)" atau judul) tidak dianggap duplikat
+MIN_DUPLICATE_LINE = 40
+
+# Overlap sambungan terpendek yang dianggap teks berulang
+MIN_OVERLAP = 20
+
+# Pemisah antar segmen context
+SEPARATOR = "\n\n---\n\n"
+
+# Batas kalimat untuk memotong segmen yang tidak muat
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.;:])\s+|\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimasi jumlah token teks secara lokal.
+
+    Setiap tanda baca dihitung satu token, dan setiap kata satu token per
+    CHARS_PER_TOKEN karakter (dibulatkan ke atas).
+
+    Args:
+        text: Teks
+
+    Returns:
+        Perkiraan jumlah token
+    """
+    return sum(
+        (len(piece) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+        for piece in _TOKEN_PATTERN.findall(text)
+    )
+
+
+@dataclass
+class _Segment:
+    """Potongan context: satu chunk atau beberapa chunk berurutan yang digabung."""
+
+    documents: list[dict]
+    text: str
+    score: float
+    rank: int
+
+    def header_parts(self) -> tuple[list[str], list[str]]:
+        """BAB dan pasal unik dari semua chunk di segmen (urut kemunculan)."""
+        babs, pasal = [], []
+        for doc in self.documents:
+            metadata = doc.get("metadata", {})
+            if metadata.get("bab") and metadata["bab"] not in babs:
+                babs.append(metadata["bab"])
+            if metadata.get("pasal") and metadata["pasal"] not in pasal:
+                pasal.append(metadata["pasal"])
+        return babs, pasal
+
+
+@dataclass
+class AssembledContext:
+    """Hasil ContextAssembler.assemble()."""
+
+    text: str
+    documents: list[dict] = field(default_factory=list)
+    tokens: int = 0
+    raw_tokens: int = 0
+    merged_chunks: int = 0
+    duplicate_lines: int = 0
+    truncated: bool = False
+
+    @property
+    def saved_tokens(self) -> int:
+        """Token yang dihemat dibanding concatenation semua chunk."""
+        return max(0, self.raw_tokens - self.tokens)
+
+    def to_dict(self) -> dict:
+        """
+        Statistik context untuk hasil answer.
+
+        Returns:
+            Dict dengan tokens, raw_tokens, saved_tokens, merged_chunks,
+            duplicate_lines, truncated
+        """
+        return {
+            "tokens": self.tokens,
+            "raw_tokens": self.raw_tokens,
+            "saved_tokens": self.saved_tokens,
+            "merged_chunks": self.merged_chunks,
+            "duplicate_lines": self.duplicate_lines,
+            "truncated": self.truncated,
+        }
+
+
+class ContextAssembler:
+    """Gabung, dedupe, dan pack chunk retrieval di bawah budget token."""
+
+    def __init__(
+        self,
+        budget_tokens: Optional[int] = None,
+        estimator: Callable[[str], int] = estimate_tokens,
+    ):
+        """
+        Initialize Context Assembler.
+
+        Args:
+            budget_tokens: Maksimum token context (default: env
+                CONTEXT_BUDGET_TOKENS atau 2000, 0 = tanpa batas)
+            estimator: Fungsi estimasi token (default: estimate_tokens)
+        """
+        self.budget_tokens = (
+            budget_tokens if budget_tokens is not None
+            else int(os.getenv("CONTEXT_BUDGET_TOKENS", 2000))
+        )
+        self.estimator = estimator
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.tokens = 0
+        self.saved_tokens = 0
+        self.truncated = 0
+
+    def assemble(self, documents: list[dict]) -> AssembledContext:
+        """
+        Susun context dari retrieved documents.
+
+        Args:
+            documents: Retrieved documents (urut relevansi, dengan metadata
+                text, chunk_index, document_id, bab, pasal)
+
+        Returns:
+            AssembledContext dengan teks context, dokumen yang dipakai, dan
+            statistik token
+        """
+        raw_tokens = self.estimator(legacy_context(documents))
+        segments = self._merge(documents)
+        merged = len(documents) - len(segments)
+
+        # Segmen paling relevan lebih dulu, lalu buang baris yang sudah muncul
+        segments.sort(key=lambda s: (-s.score, s.rank))
+        seen: set[str] = set()
+        duplicates = 0
+        for segment in segments:
+            segment.text, removed = _dedupe_lines(segment.text, seen)
+            duplicates += removed
+
+        parts, used, truncated = self._pack([s for s in segments if s.text])
+        text = SEPARATOR.join(parts)
+
+        result = AssembledContext(
+            text=text,
+            documents=[doc for segment in used for doc in segment.documents],
+            tokens=self.estimator(text),
+            raw_tokens=raw_tokens,
+            merged_chunks=merged,
+            duplicate_lines=duplicates,
+            truncated=truncated,
+        )
+        with self._lock:
+            self.requests += 1
+            self.tokens += result.tokens
+            self.saved_tokens += result.saved_tokens
+            self.truncated += int(truncated)
+        return result
+
+    def stats(self) -> dict:
+        """
+        Get statistik kumulatif.
+
+        Returns:
+            Dict dengan requests, budget_tokens, mean_tokens, saved_tokens,
+            mean_saved_tokens, truncated
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "budget_tokens": self.budget_tokens,
+                "mean_tokens": self.tokens / self.requests if self.requests else 0.0,
+                "saved_tokens": self.saved_tokens,
+                "mean_saved_tokens": self.saved_tokens / self.requests if self.requests else 0.0,
+                "truncated": self.truncated,
+            }
+
+    def _merge(self, documents: list[dict]) -> list[_Segment]:
+        """Gabungkan chunk dengan chunk_index berdampingan di dokumen yang sama."""
+        by_position: dict[tuple, _Segment] = {}
+        segments: list[_Segment] = []
+        seen_ids = set()
+
+        ordered = sorted(
+            enumerate(documents),
+            key=lambda item: (
+                _position(item[1]) is None,
+                _position(item[1]) or (),
+                item[0],
+            ),
+        )
+        for rank, doc in ordered:
+            if doc.get("id") is not None:
+                if doc["id"] in seen_ids:
+                    continue
+                seen_ids.add(doc["id"])
+
+            text = doc.get("metadata", {}).get("text", "")
+            position = _position(doc)
+            previous = None
+            if position is not None:
+                previous = by_position.get((position[0], position[1] - 1))
+
+            if previous is not None:
+                previous.text = _join_overlapping(previous.text, text)
+                previous.documents.append(doc)
+                previous.score = max(previous.score, doc.get("score", 0.0))
+                previous.rank = min(previous.rank, rank)
+                segment = previous
+            else:
+                segment = _Segment([doc], text, doc.get("score", 0.0), rank)
+                segments.append(segment)
+            if position is not None:
+                by_position[position] = segment
+        return segments
+
+    def _pack(self, segments: list[_Segment]) -> tuple[list[str], list[_Segment], bool]:
+        """Isi context dengan segmen berurutan sampai budget token habis (termasuk pemisah)."""
+        parts, used = [], []
+        remaining = self.budget_tokens or None
+        truncated = False
+        separator = self.estimator(SEPARATOR)
+
+        for segment in segments:
+            header = _header(len(parts) + 1, segment)
+            part = f"{header}\n{segment.text}"
+            cost = self.estimator(part) + (separator if parts else 0)
+            if remaining is None or cost <= remaining:
+                parts.append(part)
+                used.append(segment)
+                if remaining is not None:
+                    remaining -= cost
+                continue
+
+            # Tidak muat: ambil kalimat awal segmen yang masih muat
+            truncated = True
+            overhead = self.estimator(header) + (separator if parts else 0)
+            body = _truncate(segment.text, remaining - overhead, self.estimator)
+            if body:
+                parts.append(f"{header}\n{body}")
+                used.append(segment)
+            break
+        return parts, used, truncated
+
+
+def legacy_context(documents: list[dict]) -> str:
+    """
+    Context lama: concatenation teks penuh setiap chunk (tanpa merge/dedupe).
+
+    Args:
+        documents: Retrieved documents
+
+    Returns:
+        Context string "[Dokumen i] BAB x Pasal y\\n<teks>" dipisah "---"
+    """
+    context_parts = []
+
+    for i, doc in enumerate(documents, 1):
+        metadata = doc.get("metadata", {})
+        text = metadata.get("text", "")
+
+        # Format dengan metadata
+        pasal = metadata.get("pasal", "")
+        bab = metadata.get("bab", "")
+
+        header = f"[Dokumen {i}]"
+        if bab:
+            header += f" BAB {bab}"
+        if pasal:
+            header += f" Pasal {pasal}"
+
+        context_parts.append(f"{header}\n{text}")
+
+    return SEPARATOR.join(context_parts)
+
+
+def _position(doc: dict) -> Optional[tuple[str, int]]:
+    """(document_id, chunk_index) chunk, atau None jika tidak ada chunk_index."""
+    metadata = doc.get("metadata", {})
+    index = metadata.get("chunk_index")
+    if index is None:
+        return None
+    return str(metadata.get("document_id", "")), int(index)
+
+
+def _header(number: int, segment: _Segment) -> str:
+    """Header segmen: [Dokumen i] BAB x Pasal y, z."""
+    babs, pasal = segment.header_parts()
+    header = f"[Dokumen {number}]"
+    if babs:
+        header += f" BAB {', '.join(babs)}"
+    if pasal:
+        header += f" Pasal {', '.join(pasal)}"
+    return header
+
+
+def _join_overlapping(left: str, right: str) -> str:
+    """Sambung dua chunk berurutan tanpa mengulang teks overlap di sambungannya."""
+    probe = right[:MIN_OVERLAP]
+    if len(probe) == MIN_OVERLAP:
+        # Posisi paling awal di left yang suffix-nya adalah prefix right = overlap terpanjang
+        i = left.find(probe)
+        while i != -1:
+            if right.startswith(left[i:]):
+                return left + right[len(left) - i :]
+            i = left.find(probe, i + 1)
+    return f"{left}\n{right}"
+
+
+def _dedupe_lines(text: str, seen: set[str]) -> tuple[str, int]:
+    """Buang baris panjang yang sudah muncul (whitespace dinormalisasi)."""
+    kept, removed = [], 0
+    for line in text.split("\n"):
+        key = " ".join(line.split())
+        if len(key) >= MIN_DUPLICATE_LINE:
+            if key in seen:
+                removed += 1
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept).strip(), removed
+
+
+def _truncate(text: str, budget: int, estimator: Callable[[str], int]) -> str:
+    """Ambil kalimat awal teks sampai budget token."""
+    kept, used = [], 0
+    for piece in _SENTENCE_BOUNDARY.split(text):
+        cost = estimator(piece)
+        if used + cost > budget:
+            break
+        kept.append(piece)
+        used += cost
+    return " ".join(kept)
@@ -0,0 +1,406 @@
+"""
+Embedding Cache Module
+======================
+
+Cache embedding persisten (SQLite) dengan key (model, task_type, hash teks).
+Vector disimpan sebagai BLOB float32 dan dievict secara LRU ketika jumlah
+entry melebihi batas. Waktu akses (untuk LRU) dikumpulkan di memory dan
+ditulis sekaligus paling sering setiap EMBEDDING_CACHE_TOUCH_INTERVAL detik
+atau sebelum eviction, sehingga cache hit tidak memicu write + commit.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from .embeddings import EmbeddingService
+from .executor import run_blocking
+
+# Default lokasi cache: folder .cache di root project
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / ".cache" / "embeddings.sqlite3"
+
+
+class EmbeddingCache:
+    """Cache embedding berbasis SQLite dengan LRU eviction."""
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        max_entries: Optional[int] = None,
+        touch_interval: Optional[float] = None,
+    ):
+        """
+        Initialize Embedding Cache.
+
+        Args:
+            path: Path file SQLite (default: env EMBEDDING_CACHE_PATH atau .cache/embeddings.sqlite3)
+            max_entries: Jumlah maksimum entry sebelum eviction (default: env EMBEDDING_CACHE_MAX_ENTRIES)
+            touch_interval: Jeda minimum (detik) antar penulisan last_access
+                (default: env EMBEDDING_CACHE_TOUCH_INTERVAL atau 60)
+        """
+        self.path = Path(path or os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.max_entries = max_entries or int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 50000))
+        if touch_interval is None:
+            touch_interval = float(os.getenv("EMBEDDING_CACHE_TOUCH_INTERVAL", 60))
+        self.touch_interval = touch_interval
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # last_access yang belum ditulis: key -> waktu akses terakhir
+        self._touched: dict[str, float] = {}
+        self._last_touch_flush = time.monotonic()
+        self._forked_connections: list[sqlite3.Connection] = []
+        self._connect()
+
+    def _connect(self) -> None:
+        """Buka koneksi SQLite untuk proses ini dan pastikan tabel ada."""
+        self._pid = os.getpid()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                task_type TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)"
+        )
+        self._connection.commit()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Koneksi SQLite milik proses ini.
+
+        Koneksi SQLite tidak boleh dipakai lintas fork: worker HTTP yang
+        di-fork dari proses master membuka koneksi sendiri. Koneksi warisan
+        tidak ditutup (close di child bisa merusak lock milik master), cukup
+        tetap direferensikan agar tidak di-finalize.
+        """
+        if self._pid != os.getpid():
+            self._forked_connections.append(self._connection)
+            self._connect()
+        return self._connection
+
+    @staticmethod
+    def make_key(model: str, task_type: str, text: str) -> str:
+        """
+        Buat cache key dari (model, task_type, hash teks).
+
+        Args:
+            model: Nama model embedding
+            task_type: Task type embedding
+            text: Teks sumber
+
+        Returns:
+            Cache key
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{task_type}:{digest}"
+
+    def get_many(self, model: str, task_type: str, texts: list[str]) -> list[Optional[list[float]]]:
+        """
+        Ambil embedding dari cache.
+
+        Args:
+            model: Nama model embedding
+            task_type: Task type embedding
+            texts: List of texts
+
+        Returns:
+            List vector (None untuk yang tidak ada di cache), urutan sama dengan texts
+        """
+        keys = [self.make_key(model, task_type, text) for text in texts]
+        found: dict[str, list[float]] = {}
+
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+            if found:
+                now = time.time()
+                self._touched.update((key, now) for key in found)
+                if time.monotonic() - self._last_touch_flush >= self.touch_interval:
+                    self._flush_touches()
+                    self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for r in results if r is not None)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        return results
+
+    def get(self, model: str, task_type: str, text: str) -> Optional[list[float]]:
+        """
+        Ambil satu embedding dari cache.
+
+        Args:
+            model: Nama model embedding
+            task_type: Task type embedding
+            text: Teks sumber
+
+        Returns:
+            Vector atau None jika tidak ada
+        """
+        return self.get_many(model, task_type, [text])[0]
+
+    def put_many(
+        self,
+        model: str,
+        task_type: str,
+        texts: list[str],
+        vectors: list[list[float]],
+    ) -> None:
+        """
+        Simpan embedding ke cache lalu evict entry lama jika perlu.
+
+        Args:
+            model: Nama model embedding
+            task_type: Task type embedding
+            texts: List of texts
+            vectors: List of vectors (urutan sama dengan texts)
+        """
+        now = time.time()
+        rows = [
+            (self.make_key(model, task_type, text), model, task_type,
+             array("f", vector).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, task_type, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._flush_touches()
+            self._evict()
+            self._conn.commit()
+
+    def put(self, model: str, task_type: str, text: str, vector: list[float]) -> None:
+        """
+        Simpan satu embedding ke cache.
+
+        Args:
+            model: Nama model embedding
+            task_type: Task type embedding
+            text: Teks sumber
+            vector: Embedding vector
+        """
+        self.put_many(model, task_type, [text], [vector])
+
+    def _flush_touches(self) -> None:
+        """Tulis last_access yang tertunda (dipanggil dengan lock, commit oleh pemanggil)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                [(at, key) for key, at in self._touched.items()],
+            )
+            self._touched.clear()
+        self._last_touch_flush = time.monotonic()
+
+    def _evict(self) -> None:
+        """Hapus entry yang paling lama tidak diakses (dipanggil dengan lock)."""
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def clear(self) -> None:
+        """Hapus semua entry di cache."""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Get statistik cache.
+
+        Returns:
+            Dict berisi entries, hits, misses, hit_rate, evictions
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """Tulis last_access yang tertunda lalu tutup koneksi SQLite."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
+
+
+class CachedEmbeddingService:
+    """
+    Wrapper EmbeddingService yang membaca/menulis EmbeddingCache.
+
+    Interface sama dengan EmbeddingService, jadi bisa dipakai langsung oleh
+    RAGRetriever maupun script ingest.
+    """
+
+    def __init__(
+        self,
+        service: Optional[EmbeddingService] = None,
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        """
+        Initialize Cached Embedding Service.
+
+        Args:
+            service: EmbeddingService yang dibungkus
+            cache: EmbeddingCache yang dipakai
+        """
+        self.service = service or EmbeddingService()
+        self.cache = cache or EmbeddingCache()
+
+    @property
+    def model(self) -> str:
+        """Nama model embedding."""
+        return self.service.model
+
+    @property
+    def dimension(self) -> int:
+        """Dimensi embedding."""
+        return self.service.dimension
+
+    def embed_text(self, text: str) -> list[float]:
+        """
+        Generate embedding dokumen (cache-first).
+
+        Args:
+            text: Teks yang akan di-embed
+
+        Returns:
+            List of floats (embedding vector)
+        """
+        cached = self.cache.get(self.model, "retrieval_document", text)
+        if cached is not None:
+            return cached
+
+        embedding = self.service.embed_text(text)
+        self.cache.put(self.model, "retrieval_document", text, embedding)
+        return embedding
+
+    def embed_query(self, query: str) -> list[float]:
+        """
+        Generate embedding query (cache-first).
+
+        Args:
+            query: Query text
+
+        Returns:
+            List of floats (embedding vector)
+        """
+        cached = self.cache.get(self.model, "retrieval_query", query)
+        if cached is not None:
+            return cached
+
+        embedding = self.service.embed_query(query)
+        self.cache.put(self.model, "retrieval_query", query, embedding)
+        return embedding
+
+    async def aembed_query(self, query: str) -> list[float]:
+        """
+        Generate embedding query secara async (cache-first).
+
+        Baca/tulis SQLite dijalankan di bounded executor, bukan di event loop.
+
+        Args:
+            query: Query text
+
+        Returns:
+            List of floats (embedding vector)
+        """
+        cached = await run_blocking(self.cache.get, self.model, "retrieval_query", query)
+        if cached is not None:
+            return cached
+
+        embedding = await self.service.aembed_query(query)
+        await run_blocking(self.cache.put, self.model, "retrieval_query", query, embedding)
+        return embedding
+
+    async def aembed_queries(self, queries: list[str]) -> list[list[float]]:
+        """
+        Generate embedding banyak query secara async; hanya query yang belum
+        ada di cache yang dikirim ke API (dalam satu request batch). Baca/tulis
+        SQLite dijalankan di bounded executor.
+
+        Args:
+            queries: List query text
+
+        Returns:
+            List of embedding vectors (urutan sama dengan queries)
+        """
+        results = await run_blocking(self.cache.get_many, self.model, "retrieval_query", queries)
+
+        missing = list(dict.fromkeys(q for q, r in zip(queries, results) if r is None))
+        if missing:
+            embeddings = await self.service.aembed_queries(missing)
+            await run_blocking(
+                self.cache.put_many, self.model, "retrieval_query", missing, embeddings
+            )
+            computed = dict(zip(missing, embeddings))
+            results = [r if r is not None else computed[q] for q, r in zip(queries, results)]
+
+        return results
+
+    def embed_batch(self, texts: list[str], **kwargs) -> list[list[float]]:
+        """
+        Generate embeddings untuk batch; hanya teks yang belum ada di cache
+        yang dikirim ke API.
+
+        Args:
+            texts: List of texts
+            **kwargs: Diteruskan ke EmbeddingService.embed_batch
+
+        Returns:
+            List of embedding vectors (urutan sama dengan texts)
+        """
+        results = self.cache.get_many(self.model, "retrieval_document", texts)
+
+        # Teks unik yang belum ada di cache
+        missing = list(dict.fromkeys(t for t, r in zip(texts, results) if r is None))
+        if missing:
+            embeddings = self.service.embed_batch(missing, **kwargs)
+            self.cache.put_many(self.model, "retrieval_document", missing, embeddings)
+            computed = dict(zip(missing, embeddings))
+            results = [r if r is not None else computed[t] for t, r in zip(texts, results)]
+
+        return results
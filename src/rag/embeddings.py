@@ -5,15 +5,33 @@ Embeddings Module
 Module untuk generate embeddings menggunakan Google Generative AI.
 """
 
+import math
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
 import google.generativeai as genai
 from dotenv import load_dotenv
+from google.api_core import exceptions as google_exceptions
+
+from .clients import get_client_registry
+from .metrics import span
 
 # Load environment variables
 load_dotenv()
 
+# Batas jumlah konten per request batchEmbedContents
+MAX_BATCH_SIZE = 100
+
+# Error yang layak di-retry (rate limit / server sibuk)
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+)
+
 
 class EmbeddingService:
     """Service untuk generate embeddings menggunakan Google Gemini."""
@@ -22,6 +40,8 @@ class EmbeddingService:
         self,
         api_key: Optional[str] = None,
         model: str = "text-embedding-004",
+        max_retries: int = 5,
+        retry_base_delay: float = 1.0,
     ):
         """
         Initialize Embedding Service.
@@ -29,6 +49,8 @@ class EmbeddingService:
         Args:
             api_key: Google API key (optional, akan ambil dari env jika tidak ada)
             model: Model embedding yang digunakan
+            max_retries: Jumlah retry saat terkena rate limit
+            retry_base_delay: Delay awal (detik) untuk exponential backoff
         """
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
@@ -38,9 +60,16 @@ class EmbeddingService:
             )
 
         self.model = model
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
 
-        # Configure Google AI
-        genai.configure(api_key=self.api_key)
+        # Configure Google AI (sekali per proses, lewat client registry)
+        self.registry = get_client_registry()
+        self.registry.configure_genai(self.api_key)
+        self.request_options = self.registry.configs["gemini_embed"].request_options
+        # Deadline, retry, hedging, dan circuit breaker untuk call Gemini
+        self.guard = self.registry.guard("gemini_embed")
+        self.rate_limiter = self.registry.rate_limiter("gemini_embed")
 
     def embed_text(self, text: str) -> list[float]:
         """
@@ -52,11 +81,15 @@ class EmbeddingService:
         Returns:
             List of floats (embedding vector)
         """
-        result = genai.embed_content(
-            model=f"models/{self.model}",
-            content=text,
-            task_type="retrieval_document",
-        )
+        self.rate_limiter.acquire_sync()
+        with span("embed_text") as s:
+            s.add("input_chars", len(text))
+            result = self.guard.call_sync(lambda: genai.embed_content(
+                model=f"models/{self.model}",
+                content=text,
+                task_type="retrieval_document",
+                request_options=self.request_options,
+            ))
         return result["embedding"]
 
     def embed_query(self, query: str) -> list[float]:
@@ -69,37 +102,152 @@ class EmbeddingService:
         Returns:
             List of floats (embedding vector)
         """
-        result = genai.embed_content(
-            model=f"models/{self.model}",
-            content=query,
-            task_type="retrieval_query",
-        )
+        self.rate_limiter.acquire_sync()
+        with span("embed_query") as s:
+            s.add("input_chars", len(query))
+            result = self.guard.call_sync(lambda: genai.embed_content(
+                model=f"models/{self.model}",
+                content=query,
+                task_type="retrieval_query",
+                request_options=self.request_options,
+            ))
         return result["embedding"]
 
-    def embed_batch(self, texts: list[str], batch_size: int = 100) -> list[list[float]]:
+    async def aembed_query(self, query: str) -> list[float]:
         """
-        Generate embeddings untuk batch of texts.
+        Generate embedding untuk query secara async (tidak memblokir event loop).
+
+        Request menunggu kuota GEMINI_EMBED_QPS, dibatasi deadline, di-retry
+        saat error sementara, dan di-hedge jika lebih lambat dari p95 (lihat
+        BackendGuard).
 
         Args:
-            texts: List of texts
-            batch_size: Ukuran batch per request
+            query: Query text
 
         Returns:
-            List of embedding vectors
+            List of floats (embedding vector)
+        """
+        await self.rate_limiter.acquire()
+        with span("embed_query") as s:
+            s.add("input_chars", len(query))
+            result = await self.guard.call(lambda: self._aembed(query))
+        return result["embedding"]
+
+    async def aembed_queries(self, queries: list[str]) -> list[list[float]]:
         """
-        embeddings = []
+        Generate embedding banyak query sekaligus secara async.
+
+        Semua query dikirim sebagai request batchEmbedContents (SDK memecah
+        per 100 query), bukan satu request per query.
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
+        Args:
+            queries: List query text
 
-            # Process batch
-            for text in batch:
-                embedding = self.embed_text(text)
-                embeddings.append(embedding)
+        Returns:
+            List of embedding vectors (urutan sama dengan queries)
+        """
+        if not queries:
+            return []
+        await self.rate_limiter.acquire()
+        with span("embed_queries") as s:
+            s.add("items", len(queries))
+            s.add("input_chars", sum(len(q) for q in queries))
+            result = await self.guard.call(lambda: self._aembed(queries))
+        return result["embedding"]
 
-            print(f"  Processed {min(i + batch_size, len(texts))}/{len(texts)} texts")
+    async def _aembed(self, content: str | list[str]) -> dict:
+        """Satu request embedding query async (satu attempt BackendGuard)."""
+        async with self.registry.track("gemini_embed"):
+            return await genai.embed_content_async(
+                model=f"models/{self.model}",
+                content=content,
+                task_type="retrieval_query",
+                request_options=self.request_options,
+            )
 
-        return embeddings
+    async def warm_up(self) -> None:
+        """Buka koneksi ke Gemini dengan satu embedding query kecil."""
+        await self.aembed_query("data pribadi")
+
+    def embed_batch(
+        self,
+        texts: list[str],
+        batch_size: int = 100,
+        max_concurrency: Optional[int] = None,
+    ) -> list[list[float]]:
+        """
+        Generate embeddings untuk batch of texts.
+
+        Setiap batch dikirim sebagai satu request multi-content
+        (batchEmbedContents). Beberapa batch dijalankan paralel sampai
+        max_concurrency, dan hasilnya dikembalikan sesuai urutan input.
+
+        Args:
+            texts: List of texts
+            batch_size: Ukuran batch per request (maksimum 100 dari API)
+            max_concurrency: Jumlah request paralel (default: env EMBED_MAX_CONCURRENCY atau 4)
+
+        Returns:
+            List of embedding vectors (urutan sama dengan texts)
+        """
+        if not texts:
+            return []
+
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        max_concurrency = max_concurrency or int(os.getenv("EMBED_MAX_CONCURRENCY", 4))
+
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        results: list[Optional[list[list[float]]]] = [None] * len(batches)
+        processed = 0
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as pool:
+            futures = {
+                pool.submit(self._embed_batch_request, batch): idx
+                for idx, batch in enumerate(batches)
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+                processed += len(batches[idx])
+                print(f"  Processed {processed}/{len(texts)} texts")
+
+        return [embedding for batch in results for embedding in batch]
+
+    def _embed_batch_request(
+        self,
+        batch: list[str],
+        task_type: str = "retrieval_document",
+    ) -> list[list[float]]:
+        """
+        Kirim satu request batchEmbedContents dengan retry saat rate limit.
+
+        Args:
+            batch: Texts dalam satu batch
+            task_type: Task type embedding
+
+        Returns:
+            List of embedding vectors untuk batch ini
+        """
+        for attempt in range(self.max_retries + 1):
+            # Ingest berjalan di background: tunggu kuota selama apa pun
+            self.rate_limiter.acquire_sync(max_wait=math.inf)
+            try:
+                with span("embed_batch") as s:
+                    s.add("items", len(batch))
+                    s.add("input_chars", sum(len(text) for text in batch))
+                    result = genai.embed_content(
+                        model=f"models/{self.model}",
+                        content=batch,
+                        task_type=task_type,
+                        request_options=self.request_options,
+                    )
+                return result["embedding"]
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                # Exponential backoff dengan jitter
+                delay = self.retry_base_delay * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay))
 
     @property
     def dimension(self) -> int:
@@ -113,14 +261,24 @@ class EmbeddingService:
         return 768
 
 
-def get_embedding_service() -> EmbeddingService:
+def get_embedding_service():
     """
     Factory function untuk mendapatkan EmbeddingService instance.
 
+    Jika EMBEDDING_CACHE_ENABLED (default: true), service dibungkus
+    CachedEmbeddingService agar embedding yang sama tidak dihitung ulang.
+
     Returns:
-        EmbeddingService instance
+        EmbeddingService atau CachedEmbeddingService instance
     """
-    return EmbeddingService()
+    service = EmbeddingService()
+
+    if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true":
+        from .embedding_cache import CachedEmbeddingService
+
+        return CachedEmbeddingService(service)
+
+    return service
 
 
 if __name__ == "__main__":
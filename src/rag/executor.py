@@ -0,0 +1,67 @@
+"""
+Executor Module
+===============
+
+Bounded thread pool untuk menjalankan SDK call yang tidak punya versi async
+(misalnya Pinecone query) tanpa memblokir event loop MCP server.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Global executor (lazy initialized)
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get or create bounded ThreadPoolExecutor.
+
+    Jumlah worker diatur lewat env RAG_EXECUTOR_WORKERS (default: 16).
+
+    Returns:
+        ThreadPoolExecutor instance
+    """
+    global _executor
+    if _executor is None:
+        max_workers = int(os.getenv("RAG_EXECUTOR_WORKERS", 16))
+        _executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="rag-blocking",
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Jalankan fungsi blocking di bounded executor.
+
+    Args:
+        func: Fungsi sync yang akan dijalankan
+        *args: Positional arguments untuk func
+        **kwargs: Keyword arguments untuk func
+
+    Returns:
+        Return value dari func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(),
+        functools.partial(func, *args, **kwargs),
+    )
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """
+    Shutdown executor global (dipakai saat server berhenti).
+
+    Args:
+        wait: Tunggu sampai semua task selesai
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
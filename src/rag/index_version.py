@@ -0,0 +1,114 @@
+"""
+Index Version Module
+====================
+
+Penanda versi index. Script ingest menulis versi baru setiap kali index
+di-update, dan komponen serving (answer cache, index BM25) membaca versi
+ini untuk mendeteksi bahwa data yang di-cache atau dimuat sudah basi.
+"""
+
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+# Default folder artefak index: data/index di root project
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent.parent / "data" / "index"
+
+
+def get_index_dir() -> Path:
+    """
+    Get folder artefak index (env INDEX_DIR, default: data/index).
+
+    Returns:
+        Path folder index
+    """
+    return Path(os.getenv("INDEX_DIR", DEFAULT_INDEX_DIR))
+
+
+def get_version_path() -> Path:
+    """
+    Get path file penanda versi index.
+
+    Returns:
+        Path file VERSION
+    """
+    return get_index_dir() / "VERSION"
+
+
+def read_index_version(path: Optional[Path] = None) -> str:
+    """
+    Baca versi index saat ini.
+
+    Args:
+        path: Path file versi (default: INDEX_DIR/VERSION)
+
+    Returns:
+        String versi, atau string kosong jika belum pernah di-ingest
+    """
+    path = path or get_version_path()
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return ""
+
+
+def bump_index_version(path: Optional[Path] = None) -> str:
+    """
+    Tulis versi index baru (dipanggil setelah ingest selesai).
+
+    Args:
+        path: Path file versi (default: INDEX_DIR/VERSION)
+
+    Returns:
+        String versi baru
+    """
+    path = path or get_version_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    version = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    path.write_text(version + "\n", encoding="utf-8")
+    return version
+
+
+class IndexVersionWatcher:
+    """Deteksi versi index baru untuk komponen serving yang memuat index ke memory."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize Index Version Watcher.
+
+        Args:
+            path: Path file versi (default: INDEX_DIR/VERSION)
+        """
+        self.path = path or get_version_path()
+        self._mtime = self._stat()
+        self.version = read_index_version(self.path)
+
+    def changed(self) -> bool:
+        """
+        Apakah versi index berubah sejak pemanggilan sebelumnya.
+
+        Hanya stat() selama mtime file versi tidak berubah, jadi murah
+        dipanggil per request.
+
+        Returns:
+            True jika ada versi baru (sekali per versi)
+        """
+        mtime = self._stat()
+        if mtime == self._mtime:
+            return False
+
+        self._mtime = mtime
+        version = read_index_version(self.path)
+        if version == self.version:
+            return False
+        self.version = version
+        return True
+
+    def _stat(self) -> Optional[int]:
+        """mtime file versi (None jika belum ada)."""
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
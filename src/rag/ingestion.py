@@ -0,0 +1,597 @@
+"""
+Ingestion Pipeline Module
+=========================
+
+Pipeline ingest streaming: halaman PDF -> chunker -> embedding (batch) ->
+upsert (batch). Setiap tahap berjalan di thread sendiri dan dihubungkan
+oleh queue berukuran terbatas, sehingga:
+
+- tahap saling overlap (chunking batch berikutnya selagi batch sebelumnya
+  di-embed dan di-upsert),
+- back-pressure alami: producer berhenti ketika queue penuh, jadi memory
+  hanya menampung beberapa batch berapapun ukuran dokumennya,
+- setiap batch yang sudah di-upsert dicatat di file checkpoint, sehingga
+  ingest yang gagal di tengah jalan bisa dilanjutkan dari batch terakhir,
+- dengan ChunkManifest, hanya chunk baru/berubah yang di-embed dan di-upsert;
+  vector yang hilang dihapus setelah upsert selesai (index tidak pernah kosong),
+- dengan LexicalSegmentBuilder, segment BM25 dokumen dibangun dari stream
+  chunk yang sama (termasuk chunk yang tidak berubah/sudah di-commit).
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from .index_version import get_index_dir
+
+if TYPE_CHECKING:
+    from .lexical_index import LexicalSegmentBuilder
+
+# Penanda akhir stream di queue
+_DONE = object()
+
+
+def get_checkpoint_path(document_id: str = "uu-pdp") -> Path:
+    """
+    Get path file checkpoint ingest untuk satu dokumen.
+
+    Args:
+        document_id: ID dokumen
+
+    Returns:
+        Path INDEX_DIR/checkpoints/<document_id>.json
+    """
+    return get_index_dir() / "checkpoints" / f"{document_id}.json"
+
+
+def make_fingerprint(*parts) -> str:
+    """
+    Fingerprint konfigurasi ingest (file sumber, mode chunking, dsb).
+
+    Checkpoint hanya dipakai ulang jika fingerprint-nya sama, karena
+    batch yang dilewati bergantung pada urutan chunk.
+
+    Returns:
+        SHA-256 hex dari semua parts
+    """
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class IngestCheckpoint:
+    """Catatan batch yang sudah berhasil di-upsert (disimpan atomic sebagai JSON)."""
+
+    def __init__(self, path: str | Path, fingerprint: str):
+        """
+        Initialize checkpoint.
+
+        Args:
+            path: Path file checkpoint
+            fingerprint: Fingerprint konfigurasi ingest saat ini
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.committed_batches = 0
+        self.committed_chunks = 0
+
+    def load(self) -> int:
+        """
+        Load checkpoint dari disk.
+
+        Returns:
+            Jumlah batch yang sudah committed (0 jika tidak ada/tidak cocok)
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        if data.get("fingerprint") != self.fingerprint or data.get("complete"):
+            return 0
+
+        self.committed_batches = int(data.get("committed_batches", 0))
+        self.committed_chunks = int(data.get("committed_chunks", 0))
+        return self.committed_batches
+
+    def commit(self, batches: int, chunks: int, complete: bool = False) -> None:
+        """
+        Catat progress terbaru.
+
+        Args:
+            batches: Jumlah batch berurutan yang sudah di-upsert
+            chunks: Jumlah chunk dalam batch-batch tersebut
+            complete: True jika seluruh dokumen selesai
+        """
+        self.committed_batches = batches
+        self.committed_chunks = chunks
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "fingerprint": self.fingerprint,
+                    "committed_batches": batches,
+                    "committed_chunks": chunks,
+                    "complete": complete,
+                    "updated_at": time.time(),
+                },
+                f,
+            )
+        os.replace(tmp, self.path)
+
+
+def get_manifest_path(document_id: str = "uu-pdp") -> Path:
+    """
+    Get path manifest hash chunk untuk satu dokumen.
+
+    Args:
+        document_id: ID dokumen
+
+    Returns:
+        Path INDEX_DIR/manifests/<document_id>.json
+    """
+    return get_index_dir() / "manifests" / f"{document_id}.json"
+
+
+# Metadata posisi: berubah jika chunk sebelumnya memanjang/memendek, bukan isi chunk
+POSITIONAL_METADATA = ("chunk_index", "char_count", "page", "pages")
+
+
+def chunk_hash(chunk: dict) -> str:
+    """
+    Hash konten chunk (teks + metadata non-posisi).
+
+    Metadata ikut di-hash karena tersimpan di vector store; perubahan label
+    pasal/BAB juga harus di-upsert ulang. Field posisi (POSITIONAL_METADATA)
+    tidak ikut, agar mengubah satu pasal tidak menandai semua chunk
+    sesudahnya sebagai berubah.
+
+    Args:
+        chunk: Dict dengan keys text, metadata
+
+    Returns:
+        SHA-256 hex
+    """
+    payload = json.dumps(
+        {
+            "text": chunk["text"],
+            "metadata": {
+                k: v for k, v in chunk["metadata"].items() if k not in POSITIONAL_METADATA
+            },
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ChunkManifest:
+    """Hash konten per vector ID dari ingest terakhir yang berhasil."""
+
+    def __init__(self, path: str | Path):
+        """
+        Initialize manifest.
+
+        Args:
+            path: Path file manifest (JSON)
+        """
+        self.path = Path(path)
+
+    def load(self, target: str) -> dict[str, str]:
+        """
+        Load mapping vector ID -> hash.
+
+        Args:
+            target: Identitas vector store/model tujuan; manifest milik
+                target lain dianggap kosong
+
+        Returns:
+            Dict vector ID -> hash (kosong jika belum ada)
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get("target") != target:
+            return {}
+        return data.get("chunks", {})
+
+    def save(self, hashes: dict[str, str], target: str) -> None:
+        """
+        Simpan manifest (atomic).
+
+        Args:
+            hashes: Dict vector ID -> hash
+            target: Identitas vector store/model tujuan
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"target": target, "updated_at": time.time(), "chunks": hashes},
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(tmp, self.path)
+
+
+class IngestionPipeline:
+    """Pipeline chunk -> embed -> upsert dengan queue terbatas dan checkpoint."""
+
+    def __init__(
+        self,
+        embedding_service,
+        vector_store,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        embed_workers: Optional[int] = None,
+        id_prefix: str = "uu-pdp-chunk",
+        namespace: str = "",
+        checkpoint: Optional[IngestCheckpoint] = None,
+        manifest: Optional[ChunkManifest] = None,
+        checkpoint_interval: Optional[float] = None,
+        lexical: Optional["LexicalSegmentBuilder"] = None,
+    ):
+        """
+        Initialize Ingestion Pipeline.
+
+        Args:
+            embedding_service: Service dengan method embed_batch
+            vector_store: PineconeClient atau LocalVectorIndex
+            batch_size: Jumlah chunk per batch (default: env INGEST_BATCH_SIZE atau 50)
+            queue_size: Maksimum batch yang menunggu di setiap queue
+                (default: env INGEST_QUEUE_SIZE atau 4)
+            embed_workers: Jumlah thread embedding (default: env INGEST_EMBED_WORKERS atau 2)
+            id_prefix: Prefix vector ID (lihat vector_id())
+            namespace: Namespace vector store
+            checkpoint: IngestCheckpoint untuk resume (None = tanpa checkpoint)
+            manifest: ChunkManifest untuk ingest incremental (None = upsert semua chunk)
+            checkpoint_interval: Untuk vector store yang menampung upsert (punya
+                flush(), mis. LocalVectorIndex): jeda minimum antar flush + commit
+                checkpoint dalam detik (default: env INGEST_CHECKPOINT_INTERVAL atau 30)
+            lexical: LexicalSegmentBuilder yang diisi setiap chunk dan disimpan
+                setelah ingest berhasil (None = tanpa index BM25)
+        """
+        self.embedding_service = embedding_service
+        self.vector_store = vector_store
+        self.batch_size = batch_size or int(os.getenv("INGEST_BATCH_SIZE", 50))
+        self.queue_size = queue_size or int(os.getenv("INGEST_QUEUE_SIZE", 4))
+        self.embed_workers = embed_workers or int(os.getenv("INGEST_EMBED_WORKERS", 2))
+        self.id_prefix = id_prefix
+        self.namespace = namespace
+        self.checkpoint = checkpoint
+        self.manifest = manifest
+        if checkpoint_interval is None:
+            checkpoint_interval = float(os.getenv("INGEST_CHECKPOINT_INTERVAL", 30))
+        self.checkpoint_interval = checkpoint_interval
+        self.lexical = lexical
+
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def run(self, chunks: Iterable[dict], resume: bool = True, incremental: bool = True) -> dict:
+        """
+        Jalankan pipeline sampai semua chunk di-upsert.
+
+        Args:
+            chunks: Iterable chunk (dict text, metadata), boleh generator
+            resume: Lewati batch yang sudah tercatat di checkpoint
+            incremental: Dengan manifest, lewati chunk yang hash-nya tidak berubah
+
+        Returns:
+            Stats: chunks, batches, skipped_batches, upserted, seconds, peak_queue,
+            dan diff (added, changed, unchanged, removed) jika memakai manifest,
+            lexical (chunks, terms, postings) jika memakai LexicalSegmentBuilder
+
+        Raises:
+            Exception pertama yang terjadi di salah satu tahap
+        """
+        start = time.perf_counter()
+        self._stop.clear()
+        self._errors = []
+        skip = self.checkpoint.load() if (self.checkpoint and resume) else 0
+        if skip:
+            print(f"   ⏩ Resuming from checkpoint: {skip} batch sudah di-upsert")
+
+        chunks = self._assign_ids(chunks)
+        if self.lexical is not None:
+            chunks = self._feed_lexical(chunks)
+        if self.manifest is not None:
+            target = self._manifest_target()
+            previous = self.manifest.load(target)
+            current: dict[str, str] = {}
+            diff = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+            chunks = self._diff_chunks(chunks, previous, current, diff, force=not incremental)
+
+        embed_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        upsert_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stats = {
+            "chunks": 0,
+            "batches": 0,
+            "skipped_batches": skip,
+            "upserted": 0,
+            "peak_queue": 0,
+        }
+
+        embedders = [
+            threading.Thread(
+                target=self._embed_stage,
+                args=(embed_queue, upsert_queue),
+                name=f"ingest-embed-{i}",
+                daemon=True,
+            )
+            for i in range(self.embed_workers)
+        ]
+        upserter = threading.Thread(
+            target=self._upsert_stage,
+            args=(upsert_queue, stats, skip),
+            name="ingest-upsert",
+            daemon=True,
+        )
+        for thread in [*embedders, upserter]:
+            thread.start()
+
+        try:
+            for batch_no, batch in enumerate(self._iter_batches(chunks)):
+                stats["chunks"] += len(batch)
+                stats["batches"] += 1
+                if batch_no < skip:
+                    continue
+                if not self._put(embed_queue, (batch_no, batch)):
+                    break
+                stats["peak_queue"] = max(stats["peak_queue"], embed_queue.qsize())
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for _ in embedders:
+                self._put(embed_queue, _DONE, force=True)
+            for thread in embedders:
+                thread.join()
+            self._put(upsert_queue, _DONE, force=True)
+            upserter.join()
+
+        if self._errors:
+            if self.lexical is not None:
+                self.lexical.discard()
+            raise self._errors[0]
+
+        if self.manifest is not None:
+            # Hapus vector yang hilang hanya setelah semua upsert berhasil
+            removed = sorted(set(previous) - set(current))
+            if removed:
+                self.vector_store.delete_vectors(removed, namespace=self.namespace)
+            diff["removed"] = len(removed)
+
+        # Store yang menampung upsert ditulis sekali di akhir, sebelum manifest
+        flush = getattr(self.vector_store, "flush", None)
+        if flush is not None:
+            flush(self.namespace)
+
+        if self.lexical is not None:
+            stats["lexical"] = self.lexical.save()
+
+        if self.manifest is not None:
+            self.manifest.save(current, target)
+            stats["diff"] = diff
+
+        if self.checkpoint:
+            self.checkpoint.commit(stats["batches"], stats["chunks"], complete=True)
+
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    def _diff_chunks(
+        self,
+        chunks: Iterable[dict],
+        previous: dict[str, str],
+        current: dict[str, str],
+        diff: dict,
+        force: bool = False,
+    ) -> Iterator[dict]:
+        """Catat hash setiap chunk dan yield chunk baru/berubah (semua jika force)."""
+        for chunk in chunks:
+            vector_id = self.vector_id(chunk)
+            digest = chunk_hash(chunk)
+            current[vector_id] = digest
+
+            old = previous.get(vector_id)
+            if old == digest:
+                diff["unchanged"] += 1
+                if not force:
+                    continue
+            else:
+                diff["added" if old is None else "changed"] += 1
+            yield chunk
+
+    def vector_id(self, chunk: dict) -> str:
+        """
+        Vector ID stabil untuk chunk, tidak bergantung pada posisi chunk.
+
+        Chunk structural: <prefix>-pasal-<n>[-ayat-<m>][-part-<k>] (m = ayat
+        pertama dalam kelompok). Chunk lain (mode recursive): <prefix>-<hash
+        teks>. ID yang sudah diberikan oleh run() (chunk["id"]) dipakai apa adanya.
+
+        Args:
+            chunk: Dict dengan keys text, metadata
+
+        Returns:
+            Vector ID
+        """
+        if "id" in chunk:
+            return chunk["id"]
+        metadata = chunk["metadata"]
+        if metadata.get("chunk_type") and metadata.get("pasal"):
+            vector_id = f"{self.id_prefix}-pasal-{metadata['pasal']}"
+            if metadata["chunk_type"] == "ayat" and metadata.get("ayat"):
+                vector_id += f"-ayat-{metadata['ayat'][0]}"
+            if metadata.get("part"):
+                vector_id += f"-part-{metadata['part']}"
+            return vector_id
+        digest = hashlib.sha256(chunk["text"].encode("utf-8")).hexdigest()[:16]
+        return f"{self.id_prefix}-{digest}"
+
+    def _assign_ids(self, chunks: Iterable[dict]) -> Iterator[dict]:
+        """Simpan vector ID di setiap chunk; ID kembar (teks identik) diberi suffix -2, -3, ..."""
+        seen: dict[str, int] = {}
+        for chunk in chunks:
+            chunk.pop("id", None)
+            vector_id = self.vector_id(chunk)
+            seen[vector_id] = seen.get(vector_id, 0) + 1
+            if seen[vector_id] > 1:
+                vector_id = f"{vector_id}-{seen[vector_id]}"
+            chunk["id"] = vector_id
+            yield chunk
+
+    def _feed_lexical(self, chunks: Iterable[dict]) -> Iterator[dict]:
+        """Teruskan stream chunk sambil mengisi segment BM25 (sebelum diff/resume)."""
+        for chunk in chunks:
+            metadata = {"text": chunk["text"], **chunk["metadata"]}
+            self.lexical.add(chunk["id"], chunk["text"], metadata)
+            yield chunk
+
+    def _manifest_target(self) -> str:
+        """Identitas tujuan ingest (index, namespace, model embedding)."""
+        return "|".join([
+            str(getattr(self.vector_store, "index_name", "")),
+            self.namespace,
+            str(getattr(self.embedding_service, "model", "")),
+        ])
+
+    def _iter_batches(self, chunks: Iterable[dict]) -> Iterator[list[dict]]:
+        """Kelompokkan stream chunk menjadi batch berukuran batch_size."""
+        batch: list[dict] = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _embed_stage(self, inbox: queue.Queue, outbox: queue.Queue) -> None:
+        """Thread embedding: batch chunk -> batch vector siap upsert."""
+        while True:
+            item = self._get(inbox)
+            if item is _DONE:
+                return
+
+            batch_no, batch = item
+            try:
+                embeddings = self.embedding_service.embed_batch([c["text"] for c in batch])
+                vectors = [
+                    {
+                        "id": self.vector_id(chunk),
+                        "values": embedding,
+                        "metadata": {"text": chunk["text"], **chunk["metadata"]},
+                    }
+                    for chunk, embedding in zip(batch, embeddings)
+                ]
+            except BaseException as e:
+                self._fail(e)
+                continue
+            self._put(outbox, (batch_no, vectors))
+
+    def _upsert_stage(self, inbox: queue.Queue, stats: dict, skip: int) -> None:
+        """
+        Thread upsert: tulis batch ke vector store lalu update checkpoint.
+
+        Dengan beberapa embed worker, batch bisa datang tidak berurutan.
+        Checkpoint hanya maju sampai prefix batch yang sudah lengkap, jadi
+        resume tidak pernah melewati batch yang belum di-upsert. Untuk store
+        yang menampung upsert (punya flush()), checkpoint maju paling sering
+        setiap checkpoint_interval detik, tepat setelah flush().
+        """
+        flush = getattr(self.vector_store, "flush", None)
+        last_flush = time.monotonic()
+        done: set[int] = set()
+        sizes: dict[int, int] = {}
+        committed = skip
+        committed_chunks = self.checkpoint.committed_chunks if self.checkpoint else 0
+
+        while True:
+            item = self._get(inbox)
+            if item is _DONE:
+                return
+
+            batch_no, vectors = item
+            try:
+                self.vector_store.upsert_vectors(
+                    vectors, namespace=self.namespace, batch_size=len(vectors)
+                )
+            except BaseException as e:
+                self._fail(e)
+                continue
+
+            stats["upserted"] += len(vectors)
+            done.add(batch_no)
+            sizes[batch_no] = len(vectors)
+
+            advanced = False
+            while committed in done:
+                done.remove(committed)
+                committed_chunks += sizes.pop(committed)
+                committed += 1
+                advanced = True
+            if advanced and self.checkpoint:
+                if flush is None:
+                    self.checkpoint.commit(committed, committed_chunks)
+                elif time.monotonic() - last_flush >= self.checkpoint_interval:
+                    try:
+                        flush(self.namespace)
+                    except BaseException as e:
+                        self._fail(e)
+                        continue
+                    self.checkpoint.commit(committed, committed_chunks)
+                    last_flush = time.monotonic()
+
+            print(f"   📦 Batch {batch_no + 1}: {len(vectors)} vectors "
+                  f"(committed {committed} batch, {committed_chunks} chunks)")
+
+    def _put(self, q: queue.Queue, item, force: bool = False) -> bool:
+        """
+        Put dengan back-pressure yang tetap bisa dibatalkan.
+
+        Args:
+            q: Queue tujuan
+            item: Item yang dimasukkan
+            force: Tetap masukkan walaupun pipeline sudah dihentikan
+                (dipakai untuk sentinel _DONE)
+
+        Returns:
+            False jika pipeline dihentikan sebelum item masuk
+        """
+        while True:
+            if self._stop.is_set() and not force:
+                return False
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    # Pipeline gagal: buang batch yang tertunda agar sentinel masuk
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def _get(self, q: queue.Queue):
+        """Get yang mengembalikan _DONE begitu pipeline dihentikan."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, error: BaseException) -> None:
+        """Catat error dan hentikan semua tahap."""
+        self._errors.append(error)
+        self._stop.set()
@@ -0,0 +1,566 @@
+"""
+Lexical Index Module
+====================
+
+Index BM25 in-memory untuk retrieval berbasis kata kunci. Query hukum banyak
+berisi token persis ("Pasal 67", "ayat (2)", "pengendali", "sanksi
+administratif") yang kurang cocok ditangkap dense embedding, jadi hasil BM25
+digabung dengan hasil vector search lewat reciprocal-rank fusion.
+
+Index dibangun saat ingest per dokumen (satu segment per dokumen) dan
+disimpan di INDEX_DIR/lexical:
+    <document_id>.npz   - postings CSR: offsets, doc_ids (int32), tfs (uint16), lengths
+    <document_id>.json  - daftar term, vector ID, dan metadata per chunk
+Statistik korpus (df, panjang rata-rata) dihitung gabungan semua segment.
+
+Saat ingest, segment dibangun incremental oleh LexicalSegmentBuilder yang
+diisi IngestionPipeline per chunk: postings disimpan sebagai array integer
+ringkas dan teks/metadata chunk ditulis ke spill file, jadi memory ingest
+tidak bertambah dengan ukuran dokumen.
+"""
+
+import json
+import os
+import re
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .index_version import IndexVersionWatcher, get_index_dir
+from .local_index import match_filter
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+    ada adalah agar akan antara apa apabila atas atau bagaimana bagi bahwa
+    beberapa berapa dalam dan dapat dari dengan di hal harus ia ini itu jika
+    juga ke kepada maka mana masing melalui menjadi menurut mengenai nya oleh
+    pada para saat saja sama sebagai sebagaimana secara sedang sehingga sejak
+    serta siapa suatu tanpa telah tentang terhadap tersebut untuk yaitu yakni
+    yang
+""".split())
+
+PARTICLES = ("lah", "kah", "tah", "pun")
+POSSESSIVES = ("nya", "ku", "mu")
+SUFFIXES = ("kan", "an", "i")
+# Akhiran -i hanya dibuang pada kata kerja berawalan me-/di-/ter-
+# ("melindungi"); pada kata lain "i" biasanya bagian kata dasar
+# ("sanksi", "pengendali")
+I_SUFFIX_PREFIXES = ("me", "di", "ter")
+PREFIXES = (
+    ("meny", "s"), ("peny", "s"),
+    # peN- + kata dasar ber-p sebelum r: "pemrosesan" -> "proses" (sama dengan "memproses")
+    ("pemr", "pr"),
+    ("meng", ""), ("peng", ""), ("mem", ""), ("pem", ""), ("men", ""), ("pen", ""),
+    ("ber", ""), ("per", ""), ("ter", ""), ("me", ""), ("pe", ""),
+    ("di", ""), ("ke", ""), ("se", ""),
+)
+# Awalan kedua hanya per-/peN-/ber-/ter- ("memperoleh", "diperlukan");
+# "dikendalikan" tidak menjadi "ndali"
+INNER_PREFIXES = ("pe", "be", "te")
+
+# Panjang minimum kata dasar setelah stemming
+MIN_STEM = 4
+
+
+def stem(word: str) -> str:
+    """
+    Stemmer bahasa Indonesia ringan (tanpa kamus kata dasar).
+
+    Menghapus partikel, kata ganti kepemilikan, akhiran, lalu awalan
+    (maksimal dua; awalan kedua hanya INNER_PREFIXES), selama sisa kata tidak lebih pendek dari MIN_STEM.
+    Hasilnya tidak selalu kata dasar yang benar, tetapi konsisten antara
+    query dan dokumen ("pengendali" dan "mengendalikan" -> "endali",
+    "pemrosesan" dan "memproses" -> "proses").
+
+    Args:
+        word: Kata huruf kecil
+
+    Returns:
+        Kata hasil stemming
+    """
+    if word.isdigit() or len(word) <= MIN_STEM:
+        return word
+
+    for group in (PARTICLES, POSSESSIVES, SUFFIXES):
+        for suffix in group:
+            if suffix == "i" and not word.startswith(I_SUFFIX_PREFIXES):
+                continue
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+                word = word[: -len(suffix)]
+                break
+
+    for layer in range(2):
+        for prefix, replacement in PREFIXES:
+            if layer and not prefix.startswith(INNER_PREFIXES):
+                continue
+            if word.startswith(prefix) and len(word) - len(prefix) + len(replacement) >= MIN_STEM:
+                word = replacement + word[len(prefix):]
+                break
+        else:
+            break
+
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Tokenisasi + stemming untuk index dan query.
+
+    Angka dipertahankan ("Pasal 67" -> ["pasal", "67"]) karena nomor pasal
+    dan ayat adalah token paling spesifik dalam query hukum.
+
+    Args:
+        text: Teks bebas
+
+    Returns:
+        List token
+    """
+    return [
+        stem(token)
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+@dataclass
+class LexicalSegment:
+    """Postings BM25 satu dokumen dalam format CSR."""
+
+    terms: list[str]
+    offsets: np.ndarray
+    doc_ids: np.ndarray
+    tfs: np.ndarray
+    lengths: np.ndarray
+    ids: list[str]
+    metadata: list[dict]
+
+    def __post_init__(self):
+        self.vocab = {term: i for i, term in enumerate(self.terms)}
+
+    @classmethod
+    def build(cls, ids: list[str], texts: list[str], metadata: list[dict]) -> "LexicalSegment":
+        """
+        Bangun segment dari chunk dokumen.
+
+        Args:
+            ids: Vector ID per chunk
+            texts: Teks per chunk
+            metadata: Metadata per chunk (termasuk text, dipakai sebagai hasil)
+
+        Returns:
+            LexicalSegment
+        """
+        counts = [Counter(tokenize(text)) for text in texts]
+        terms = sorted({term for c in counts for term in c})
+        vocab = {term: i for i, term in enumerate(terms)}
+
+        postings: list[list[tuple[int, int]]] = [[] for _ in terms]
+        for doc, c in enumerate(counts):
+            for term, tf in c.items():
+                postings[vocab[term]].append((doc, tf))
+
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in postings])
+        flat = [pair for p in postings for pair in p]
+
+        return cls(
+            terms=terms,
+            offsets=offsets,
+            doc_ids=np.array([d for d, _ in flat], dtype=np.int32),
+            tfs=np.array([min(tf, 65535) for _, tf in flat], dtype=np.uint16),
+            lengths=np.array([sum(c.values()) for c in counts], dtype=np.int32),
+            ids=list(ids),
+            metadata=list(metadata),
+        )
+
+    def postings(self, term: str) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """(doc_ids, tfs) untuk satu term, atau None jika tidak ada."""
+        idx = self.vocab.get(term)
+        if idx is None:
+            return None
+        start, end = self.offsets[idx], self.offsets[idx + 1]
+        return self.doc_ids[start:end], self.tfs[start:end]
+
+    def save(self, directory: str | Path, name: str) -> None:
+        """
+        Simpan segment ke <name>.npz dan <name>.json (atomic).
+
+        Args:
+            directory: Folder tujuan
+            name: Nama segment (ID dokumen)
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        _save_arrays(directory, name, self.offsets, self.doc_ids, self.tfs, self.lengths)
+
+        tmp_meta = directory / f"{name}.json.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(
+                {"terms": self.terms, "ids": self.ids, "metadata": self.metadata},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_meta, directory / f"{name}.json")
+
+    @classmethod
+    def load(cls, directory: str | Path, name: str) -> "LexicalSegment":
+        """
+        Load segment dari disk.
+
+        Args:
+            directory: Folder index lexical
+            name: Nama segment (ID dokumen)
+
+        Returns:
+            LexicalSegment
+        """
+        directory = Path(directory)
+        with np.load(directory / f"{name}.npz") as arrays:
+            offsets, doc_ids = arrays["offsets"], arrays["doc_ids"]
+            tfs, lengths = arrays["tfs"], arrays["lengths"]
+        with open(directory / f"{name}.json", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        return cls(
+            terms=sidecar["terms"],
+            offsets=offsets,
+            doc_ids=doc_ids,
+            tfs=tfs,
+            lengths=lengths,
+            ids=sidecar["ids"],
+            metadata=sidecar["metadata"],
+        )
+
+
+class LexicalSegmentBuilder:
+    """
+    Bangun segment BM25 satu dokumen secara incremental dari stream chunk.
+
+    Setiap chunk langsung di-tokenize; postings (term, chunk, tf) disimpan di
+    array integer ringkas dan (vector ID, metadata) ditulis ke spill file
+    <name>.spill.jsonl di folder tujuan. save() menyusun postings CSR dan
+    menulis <name>.npz/<name>.json dengan format yang sama seperti
+    LexicalSegment.save().
+    """
+
+    def __init__(self, directory: str | Path, name: str):
+        """
+        Initialize Lexical Segment Builder.
+
+        Args:
+            directory: Folder index lexical
+            name: Nama segment (ID dokumen)
+        """
+        self.directory = Path(directory)
+        self.name = name
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vocab: dict[str, int] = {}
+        self._term_ids = array("i")
+        self._doc_ids = array("i")
+        self._tfs = array("H")
+        self._lengths = array("i")
+        self._spill_path = self.directory / f"{name}.spill.jsonl"
+        self._spill = open(self._spill_path, "w", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, vector_id: str, text: str, metadata: dict) -> None:
+        """
+        Tambah satu chunk.
+
+        Args:
+            vector_id: Vector ID chunk
+            text: Teks chunk
+            metadata: Metadata chunk (termasuk text, dipakai sebagai hasil)
+        """
+        doc = len(self._lengths)
+        counts = Counter(tokenize(text))
+        for term, tf in counts.items():
+            self._term_ids.append(self._vocab.setdefault(term, len(self._vocab)))
+            self._doc_ids.append(doc)
+            self._tfs.append(min(tf, 65535))
+        self._lengths.append(sum(counts.values()))
+        self._spill.write(json.dumps([vector_id, metadata], ensure_ascii=False) + "\n")
+
+    def save(self) -> dict:
+        """
+        Tulis segment ke <name>.npz dan <name>.json (atomic) lalu hapus spill file.
+
+        Returns:
+            Dict chunks, terms, postings
+        """
+        self._spill.close()
+        terms = sorted(self._vocab)
+        rank = np.empty(len(terms), dtype=np.int64)
+        for new, term in enumerate(terms):
+            rank[self._vocab[term]] = new
+
+        term_ids = rank[np.frombuffer(self._term_ids, dtype=np.intc)]
+        doc_ids = np.frombuffer(self._doc_ids, dtype=np.intc)
+        order = np.lexsort((doc_ids, term_ids))
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(term_ids, minlength=len(terms)))
+        _save_arrays(
+            self.directory,
+            self.name,
+            offsets,
+            doc_ids[order].astype(np.int32),
+            np.frombuffer(self._tfs, dtype=np.uint16)[order],
+            np.frombuffer(self._lengths, dtype=np.intc).astype(np.int32),
+        )
+
+        # Sidecar ditulis streaming dari spill file (dua kali baca: ids, metadata)
+        tmp_meta = self.directory / f"{self.name}.json.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            f.write('{"terms": ')
+            json.dump(terms, f, ensure_ascii=False)
+            for key, field in (("ids", 0), ("metadata", 1)):
+                f.write(f', "{key}": [')
+                for i, entry in enumerate(self._iter_spill()):
+                    f.write(", " if i else "")
+                    json.dump(entry[field], f, ensure_ascii=False)
+                f.write("]")
+            f.write("}")
+        os.replace(tmp_meta, self.directory / f"{self.name}.json")
+        self._spill_path.unlink(missing_ok=True)
+        return {"chunks": len(self), "terms": len(terms), "postings": len(doc_ids)}
+
+    def discard(self) -> None:
+        """Batalkan build (ingest gagal): tutup dan hapus spill file."""
+        self._spill.close()
+        self._spill_path.unlink(missing_ok=True)
+
+    def _iter_spill(self):
+        """Baca (vector ID, metadata) per chunk dari spill file."""
+        with open(self._spill_path, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def _save_arrays(
+    directory: Path,
+    name: str,
+    offsets: np.ndarray,
+    doc_ids: np.ndarray,
+    tfs: np.ndarray,
+    lengths: np.ndarray,
+) -> None:
+    """Simpan postings CSR segment ke <name>.npz (atomic)."""
+    tmp_arrays = directory / f"{name}.tmp.npz"
+    np.savez(tmp_arrays, offsets=offsets, doc_ids=doc_ids, tfs=tfs, lengths=lengths)
+    os.replace(tmp_arrays, directory / f"{name}.npz")
+
+
+class BM25Index:
+    """BM25 (Okapi) di atas satu atau lebih LexicalSegment."""
+
+    def __init__(
+        self,
+        segments: Optional[dict[str, LexicalSegment]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """
+        Initialize BM25 Index.
+
+        Args:
+            segments: Mapping ID dokumen -> segment
+            k1: Parameter saturasi term frequency
+            b: Parameter normalisasi panjang dokumen
+        """
+        self.segments = dict(segments or {})
+        self.k1 = k1
+        self.b = b
+        self._refresh_stats()
+
+    def add_segment(self, name: str, segment: LexicalSegment) -> None:
+        """
+        Tambah atau ganti segment satu dokumen.
+
+        Args:
+            name: ID dokumen
+            segment: LexicalSegment
+        """
+        self.segments[name] = segment
+        self._refresh_stats()
+
+    def __len__(self) -> int:
+        return self.total_docs
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Cari chunk dengan skor BM25 tertinggi.
+
+        Args:
+            query: Query teks
+            top_k: Jumlah hasil
+            filter: Metadata filter (sintaks sama dengan vector store)
+
+        Returns:
+            List of matches dengan id, score, metadata (format sama dengan vector store)
+        """
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t in self.df]
+        if not terms or not self.total_docs:
+            return []
+
+        candidates: list[tuple[float, str, int]] = []
+        for name, segment in self._segments_for(filter):
+            scores = np.zeros(len(segment.ids), dtype=np.float32)
+            norm = self.k1 * (1 - self.b + self.b * segment.lengths / self.avg_length)
+
+            for term in terms:
+                postings = segment.postings(term)
+                if postings is None:
+                    continue
+                doc_ids, tfs = postings
+                tf = tfs.astype(np.float32)
+                scores[doc_ids] += self.idf[term] * tf * (self.k1 + 1) / (tf + norm[doc_ids])
+
+            hits = np.flatnonzero(scores)
+            if filter:
+                hits = [i for i in hits if match_filter(segment.metadata[i], filter)]
+            candidates.extend((float(scores[i]), name, int(i)) for i in hits)
+
+        candidates.sort(key=lambda c: -c[0])
+        return [
+            {
+                "id": self.segments[name].ids[i],
+                "score": score,
+                "metadata": self.segments[name].metadata[i],
+            }
+            for score, name, i in candidates[:top_k]
+        ]
+
+    def _segments_for(self, filter: Optional[dict]) -> Iterable[tuple[str, LexicalSegment]]:
+        """Segment yang perlu di-scan; filter document_id melewati dokumen lain."""
+        condition = (filter or {}).get("document_id")
+        if condition is None:
+            return self.segments.items()
+        if isinstance(condition, dict):
+            wanted = condition.get("$in") or [condition.get("$eq")]
+        else:
+            wanted = [condition]
+        return [(name, self.segments[name]) for name in wanted if name in self.segments]
+
+    def _refresh_stats(self) -> None:
+        """Hitung ulang df, idf, dan panjang rata-rata gabungan semua segment."""
+        df: Counter = Counter()
+        total_length = 0
+        self.total_docs = 0
+        for segment in self.segments.values():
+            counts = np.diff(segment.offsets)
+            df.update(dict(zip(segment.terms, counts.tolist())))
+            total_length += int(segment.lengths.sum())
+            self.total_docs += len(segment.ids)
+
+        self.df = dict(df)
+        self.avg_length = total_length / self.total_docs if self.total_docs else 1.0
+        n = self.total_docs
+        self.idf = {
+            term: float(np.log(1 + (n - freq + 0.5) / (freq + 0.5)))
+            for term, freq in self.df.items()
+        }
+
+    def save(self, directory: Optional[str | Path] = None) -> None:
+        """
+        Simpan semua segment.
+
+        Args:
+            directory: Folder tujuan (default: INDEX_DIR/lexical)
+        """
+        directory = directory or get_lexical_index_dir()
+        for name, segment in self.segments.items():
+            segment.save(directory, name)
+
+    @classmethod
+    def load(cls, directory: Optional[str | Path] = None) -> "BM25Index":
+        """
+        Load semua segment di folder index lexical.
+
+        Args:
+            directory: Folder index (default: INDEX_DIR/lexical)
+
+        Returns:
+            BM25Index (kosong jika folder belum ada)
+        """
+        directory = Path(directory or get_lexical_index_dir())
+        segments = {}
+        if directory.exists():
+            for path in sorted(directory.glob("*.npz")):
+                if path.stem.endswith(".tmp"):
+                    continue
+                segments[path.stem] = LexicalSegment.load(directory, path.stem)
+        return cls(segments)
+
+
+def reciprocal_rank_fusion(
+    result_lists: list[list[dict]],
+    top_k: int = 5,
+    k: int = 60,
+) -> list[dict]:
+    """
+    Gabungkan beberapa ranking dengan reciprocal-rank fusion.
+
+    Skor RRF = sum(1 / (k + rank)) di setiap ranking tempat dokumen muncul;
+    skor asli tiap retriever tidak perlu dinormalisasi.
+
+    Args:
+        result_lists: List hasil retrieval (masing-masing sudah terurut)
+        top_k: Jumlah hasil gabungan
+        k: Konstanta RRF (default 60)
+
+    Returns:
+        List of matches dengan score RRF
+    """
+    fused: dict[str, dict] = {}
+    for results in result_lists:
+        for rank, match in enumerate(results, start=1):
+            entry = fused.setdefault(match["id"], {**match, "score": 0.0})
+            entry["score"] += 1.0 / (k + rank)
+
+    return sorted(fused.values(), key=lambda m: -m["score"])[:top_k]
+
+
+def get_lexical_index_dir() -> Path:
+    """
+    Get folder index lexical.
+
+    Returns:
+        Path INDEX_DIR/lexical
+    """
+    return get_index_dir() / "lexical"
+
+
+# Global BM25 index (lazy loaded saat startup/retrieval pertama, dimuat
+# ulang saat ingest menulis versi index baru)
+_lexical_index: Optional[BM25Index] = None
+_lexical_watcher: Optional[IndexVersionWatcher] = None
+
+
+def get_lexical_index() -> Optional[BM25Index]:
+    """
+    Get or load BM25Index dari INDEX_DIR/lexical.
+
+    Index dimuat ulang jika INDEX_DIR/VERSION berubah sejak terakhir dimuat
+    (scripts/ingest_documents.py menulis versi baru setelah segment disimpan).
+
+    Returns:
+        BM25Index, atau None jika index lexical belum dibangun oleh ingest
+    """
+    global _lexical_index, _lexical_watcher
+    if _lexical_watcher is None or _lexical_watcher.changed():
+        _lexical_watcher = _lexical_watcher or IndexVersionWatcher()
+        index = BM25Index.load()
+        _lexical_index = index if len(index) else None
+    return _lexical_index
@@ -0,0 +1,499 @@
+"""
+Local Vector Index Module
+=========================
+
+Vector index in-process sebagai alternatif PineconeClient. Korpus UU PDP
+hanya beberapa ratus chunk, jadi exact cosine top-k di atas matrix NumPy
+float32 (baris sudah dinormalisasi) cukup cepat dan tidak butuh jaringan.
+
+Data disimpan per namespace di INDEX_DIR/local:
+    <namespace>.npy   - matrix vector float32 (dibuka dengan mmap)
+    <namespace>.json  - sidecar berisi ids dan metadata
+
+upsert_vectors/delete_vectors hanya menampung perubahan di memory; matrix
+disusun ulang sekali saat dibaca atau saat flush(), dan hanya flush() yang
+menulis file. Ingest memanggil flush() sekali per namespace (dan pada
+setiap checkpoint), bukan menulis ulang seluruh index per batch.
+
+Proses serving membuang namespace yang sudah dimuat (mmap) begitu ingest
+menulis versi index baru (INDEX_DIR/VERSION, hook yang sama dengan answer
+cache dan index BM25), sehingga query berikutnya membaca file terbaru.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .executor import run_blocking
+from .index_version import IndexVersionWatcher, get_index_dir
+from .metrics import span
+
+# Nama file untuk namespace default ("")
+DEFAULT_NAMESPACE_FILE = "__default__"
+
+
+@dataclass
+class _Namespace:
+    """Data satu namespace: matrix, ids, dan metadata per baris."""
+
+    matrix: np.ndarray
+    ids: list[str] = field(default_factory=list)
+    metadata: list[dict] = field(default_factory=list)
+    slices: dict[str, tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+
+@dataclass
+class _Staged:
+    """Perubahan satu namespace yang belum digabung ke matrix."""
+
+    upserts: dict[str, tuple[np.ndarray, dict]] = field(default_factory=dict)
+    deletes: set[str] = field(default_factory=set)
+
+
+class LocalVectorIndex:
+    """Exact cosine vector index dengan interface yang sama seperti PineconeClient."""
+
+    def __init__(
+        self,
+        index_dir: Optional[str | Path] = None,
+        dimension: int = 768,
+        version_path: Optional[Path] = None,
+    ):
+        """
+        Initialize Local Vector Index.
+
+        Args:
+            index_dir: Folder penyimpanan (default: INDEX_DIR/local)
+            dimension: Dimensi embedding vector
+            version_path: File versi index untuk reload (default: INDEX_DIR/VERSION)
+        """
+        self.index_dir = Path(index_dir or get_index_dir() / "local")
+        self.index_name = str(self.index_dir)
+        self.dimension = dimension
+        self._namespaces: dict[str, _Namespace] = {}
+        self._staged: dict[str, _Staged] = {}
+        self._dirty: set[str] = set()
+        self._lock = threading.RLock()
+        self._version = IndexVersionWatcher(version_path)
+
+    def create_index_if_not_exists(self, dimension: int = 768) -> None:
+        """
+        Siapkan folder index.
+
+        Args:
+            dimension: Dimensi embedding vector
+        """
+        self.dimension = dimension
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        print(f"✅ Local index ready at '{self.index_dir}'")
+
+    def upsert_vectors(
+        self,
+        vectors: list[dict],
+        namespace: str = "",
+        batch_size: int = 100,
+    ) -> dict:
+        """
+        Upsert vectors ke index lokal (ditampung sampai flush()).
+
+        Args:
+            vectors: List of dicts dengan keys: id, values, metadata
+            namespace: Namespace untuk vectors
+            batch_size: Tidak dipakai (untuk kompatibilitas dengan PineconeClient)
+
+        Returns:
+            Upsert stats
+        """
+        if not vectors:
+            return {"upserted_count": 0}
+
+        with self._lock:
+            staged = self._staged.setdefault(namespace, _Staged())
+            for v in vectors:
+                staged.upserts[v["id"]] = (_normalize(v["values"]), v.get("metadata", {}))
+                staged.deletes.discard(v["id"])
+
+        print(f"  Upserted {len(vectors)} vectors")
+        return {"upserted_count": len(vectors)}
+
+    def flush(self, namespace: Optional[str] = None) -> None:
+        """
+        Gabungkan perubahan yang ditampung lalu simpan namespace ke disk.
+
+        Args:
+            namespace: Namespace yang disimpan (default: semua yang berubah)
+        """
+        with self._lock:
+            names = [namespace] if namespace is not None else [*self._staged, *self._dirty]
+            for name in dict.fromkeys(names):
+                self._apply(name)
+                if name in self._dirty:
+                    self._save(name)
+                    self._dirty.discard(name)
+
+    def query(
+        self,
+        vector: list[float],
+        top_k: int = 5,
+        namespace: str = "",
+        include_metadata: bool = True,
+        filter: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Exact cosine top-k query.
+
+        Args:
+            vector: Query embedding vector
+            top_k: Jumlah hasil yang dikembalikan
+            namespace: Namespace untuk query
+            include_metadata: Include metadata dalam hasil
+            filter: Metadata filter subset sintaks Pinecone ($eq, $in, atau nilai langsung)
+
+        Returns:
+            List of matches dengan score dan metadata
+        """
+        self._check_version()
+        ns = self._load(namespace)
+        if not ns.ids:
+            return []
+
+        if filter:
+            # Hanya scan baris yang lolos filter (slice di-cache per filter)
+            rows, matrix = self._slice(ns, filter)
+            if not len(rows):
+                return []
+        else:
+            rows, matrix = None, ns.matrix
+
+        with span("local_query", top_k=top_k) as s:
+            s.add("scanned_vectors", len(matrix))
+            scores = matrix @ _normalize(vector)
+            k = min(top_k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+        if rows is not None:
+            positions = rows[top]
+        else:
+            positions = top
+
+        return [
+            {
+                "id": ns.ids[row],
+                "score": float(scores[i]),
+                "metadata": ns.metadata[row] if include_metadata else {},
+            }
+            for i, row in zip(top, positions)
+        ]
+
+    async def aquery(
+        self,
+        vector: list[float],
+        top_k: int = 5,
+        namespace: str = "",
+        include_metadata: bool = True,
+        filter: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Query secara async.
+
+        Query lokal hanya butuh mikrodetik, jadi dijalankan langsung; hanya
+        load dari disk (pertama kali dan setelah versi index baru) yang
+        dipindah ke executor.
+
+        Args:
+            vector: Query embedding vector
+            top_k: Jumlah hasil yang dikembalikan
+            namespace: Namespace untuk query
+            include_metadata: Include metadata dalam hasil
+            filter: Metadata filter subset sintaks Pinecone ($eq, $in, atau nilai langsung)
+
+        Returns:
+            List of matches dengan score dan metadata
+        """
+        self._check_version()
+        if namespace not in self._namespaces:
+            await run_blocking(self._load, namespace)
+        return self.query(vector, top_k, namespace, include_metadata, filter)
+
+    def query_many(
+        self,
+        vectors: list[list[float]],
+        top_k: int = 5,
+        namespace: str = "",
+        include_metadata: bool = True,
+        filter: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Exact cosine top-k untuk banyak query dengan satu perkalian matrix.
+
+        Args:
+            vectors: List query embedding vector
+            top_k: Jumlah hasil per query
+            namespace: Namespace untuk query
+            include_metadata: Include metadata dalam hasil
+            filter: Metadata filter (sama untuk semua query)
+
+        Returns:
+            List hasil per query (urutan sama dengan vectors)
+        """
+        self._check_version()
+        ns = self._load(namespace)
+        if not ns.ids or not vectors:
+            return [[] for _ in vectors]
+
+        if filter:
+            rows, matrix = self._slice(ns, filter)
+            if not len(rows):
+                return [[] for _ in vectors]
+        else:
+            rows, matrix = None, ns.matrix
+
+        with span("local_query_many", top_k=top_k) as s:
+            s.add("items", len(vectors))
+            s.add("scanned_vectors", len(vectors) * len(matrix))
+            queries = np.stack([_normalize(vector) for vector in vectors])
+            scores = queries @ matrix.T
+            k = min(top_k, scores.shape[1])
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+
+        results = []
+        for q, columns in enumerate(top):
+            positions = rows[columns] if rows is not None else columns
+            results.append([
+                {
+                    "id": ns.ids[row],
+                    "score": float(scores[q, i]),
+                    "metadata": ns.metadata[row] if include_metadata else {},
+                }
+                for i, row in zip(columns, positions)
+            ])
+        return results
+
+    async def aquery_many(
+        self,
+        vectors: list[list[float]],
+        top_k: int = 5,
+        namespace: str = "",
+        include_metadata: bool = True,
+        filter: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Versi async dari query_many().
+
+        Args:
+            vectors: List query embedding vector
+            top_k: Jumlah hasil per query
+            namespace: Namespace untuk query
+            include_metadata: Include metadata dalam hasil
+            filter: Metadata filter (sama untuk semua query)
+
+        Returns:
+            List hasil per query (urutan sama dengan vectors)
+        """
+        self._check_version()
+        if namespace not in self._namespaces:
+            await run_blocking(self._load, namespace)
+        return self.query_many(vectors, top_k, namespace, include_metadata, filter)
+
+    def delete_vectors(
+        self,
+        ids: list[str],
+        namespace: str = "",
+        batch_size: int = 1000,
+    ) -> dict:
+        """
+        Hapus vectors berdasarkan ID (ditampung sampai flush()).
+
+        Args:
+            ids: List vector ID yang dihapus
+            namespace: Namespace vectors
+            batch_size: Tidak dipakai (untuk kompatibilitas dengan PineconeClient)
+
+        Returns:
+            Delete stats
+        """
+        if not ids:
+            return {"deleted_count": 0}
+
+        with self._lock:
+            ns = self._load(namespace)
+            staged = self._staged.setdefault(namespace, _Staged())
+            existing = set(ns.ids)
+            deleted = 0
+            for vid in dict.fromkeys(ids):
+                was_staged = staged.upserts.pop(vid, None) is not None
+                if vid in existing:
+                    staged.deletes.add(vid)
+                deleted += was_staged or vid in existing
+            if not deleted:
+                return {"deleted_count": 0}
+
+        print(f"🗑️ Deleted {deleted} vectors in namespace '{namespace}'")
+        return {"deleted_count": deleted}
+
+    def delete_all(self, namespace: str = "") -> None:
+        """
+        Hapus semua vectors dalam namespace.
+
+        Args:
+            namespace: Namespace yang akan dihapus
+        """
+        with self._lock:
+            self._namespaces.pop(namespace, None)
+            self._staged.pop(namespace, None)
+            self._dirty.discard(namespace)
+            for path in self._paths(namespace):
+                path.unlink(missing_ok=True)
+        print(f"🗑️ Deleted all vectors in namespace '{namespace}'")
+
+    def get_stats(self) -> dict:
+        """
+        Get statistics dari index.
+
+        Returns:
+            Index statistics (format mirip describe_index_stats Pinecone)
+        """
+        self._check_version()
+        names = set(self._staged)
+        if self.index_dir.exists():
+            for path in self.index_dir.glob("*.json"):
+                names.add("" if path.stem == DEFAULT_NAMESPACE_FILE else path.stem)
+        namespaces = {name: {"vector_count": len(self._load(name).ids)} for name in sorted(names)}
+
+        return {
+            "dimension": self.dimension,
+            "namespaces": namespaces,
+            "total_vector_count": sum(ns["vector_count"] for ns in namespaces.values()),
+        }
+
+    def _check_version(self) -> None:
+        """Buang namespace yang dimuat dari disk jika ingest menulis versi index baru."""
+        if not self._version.changed():
+            return
+        with self._lock:
+            for name in list(self._namespaces):
+                if name not in self._dirty and name not in self._staged:
+                    del self._namespaces[name]
+
+    def _slice(self, ns: _Namespace, filter: dict) -> tuple[np.ndarray, np.ndarray]:
+        """Indeks baris dan sub-matrix yang lolos filter (di-cache per namespace)."""
+        key = json.dumps(filter, sort_keys=True)
+        cached = ns.slices.get(key)
+        if cached is None:
+            rows = np.array(
+                [i for i, meta in enumerate(ns.metadata) if match_filter(meta, filter)],
+                dtype=np.int64,
+            )
+            cached = (rows, np.ascontiguousarray(ns.matrix[rows]))
+            ns.slices[key] = cached
+        return cached
+
+    def _paths(self, namespace: str) -> tuple[Path, Path]:
+        """Path file .npy dan .json untuk namespace."""
+        name = namespace or DEFAULT_NAMESPACE_FILE
+        return self.index_dir / f"{name}.npy", self.index_dir / f"{name}.json"
+
+    def _load(self, namespace: str) -> _Namespace:
+        """Namespace terkini: data tersimpan ditambah perubahan yang masih ditampung."""
+        if namespace in self._staged:
+            with self._lock:
+                return self._apply(namespace)
+        return self._load_stored(namespace)
+
+    def _apply(self, namespace: str) -> _Namespace:
+        """Gabungkan perubahan yang ditampung ke matrix namespace (dipanggil dengan lock)."""
+        ns = self._load_stored(namespace)
+        staged = self._staged.pop(namespace, None)
+        if staged is None:
+            return ns
+
+        keep = [i for i, vid in enumerate(ns.ids) if vid not in staged.deletes]
+        matrix = np.array(ns.matrix[keep], dtype=np.float32)
+        ids = [ns.ids[i] for i in keep]
+        metadata = [ns.metadata[i] for i in keep]
+        positions = {vid: i for i, vid in enumerate(ids)}
+
+        new_rows = []
+        for vid, (row, meta) in staged.upserts.items():
+            if vid in positions:
+                matrix[positions[vid]] = row
+                metadata[positions[vid]] = meta
+            else:
+                ids.append(vid)
+                metadata.append(meta)
+                new_rows.append(row)
+
+        if new_rows:
+            matrix = np.vstack([matrix.reshape(-1, len(new_rows[0])), np.stack(new_rows)])
+
+        ns = _Namespace(matrix=matrix, ids=ids, metadata=metadata)
+        self._namespaces[namespace] = ns
+        self._dirty.add(namespace)
+        return ns
+
+    def _load_stored(self, namespace: str) -> _Namespace:
+        """Load namespace dari disk (mmap) atau dari memory jika sudah ada."""
+        ns = self._namespaces.get(namespace)
+        if ns is not None:
+            return ns
+
+        matrix_path, meta_path = self._paths(namespace)
+        if matrix_path.exists() and meta_path.exists():
+            with open(meta_path, encoding="utf-8") as f:
+                sidecar = json.load(f)
+            ns = _Namespace(
+                matrix=np.load(matrix_path, mmap_mode="r"),
+                ids=sidecar["ids"],
+                metadata=sidecar["metadata"],
+            )
+        else:
+            ns = _Namespace(matrix=np.empty((0, self.dimension), dtype=np.float32))
+
+        self._namespaces[namespace] = ns
+        return ns
+
+    def _save(self, namespace: str) -> None:
+        """Simpan namespace ke disk secara atomic lalu buka ulang sebagai mmap."""
+        ns = self._namespaces[namespace]
+        matrix_path, meta_path = self._paths(namespace)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_matrix = matrix_path.with_suffix(".tmp.npy")
+        np.save(tmp_matrix, ns.matrix.astype(np.float32))
+        os.replace(tmp_matrix, matrix_path)
+
+        tmp_meta = meta_path.with_suffix(".tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"ids": ns.ids, "metadata": ns.metadata}, f, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+
+        ns.matrix = np.load(matrix_path, mmap_mode="r")
+
+
+def match_filter(metadata: dict, filter: dict) -> bool:
+    """Cek metadata terhadap filter: {field: nilai | {"$eq": v} | {"$in": [..]}}."""
+    for field_name, condition in filter.items():
+        value = metadata.get(field_name)
+        if isinstance(condition, dict):
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _normalize(vector: list[float]) -> np.ndarray:
+    """Ubah vector menjadi float32 ber-norm 1."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
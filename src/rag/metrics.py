@@ -0,0 +1,378 @@
+"""
+Metrics Module
+==============
+
+Tracing latency per tahap pipeline RAG (embedding, vector query, rerank,
+context, generation) dengan histogram dan counter yang bisa dibaca dalam
+format Prometheus (MCP resource pdp://metrics atau endpoint /metrics saat
+server berjalan di transport HTTP).
+
+Setiap tahap dibungkus span():
+
+    with span("embed_query") as s:
+        s.add("input_chars", len(query))
+        ...
+
+yang mencatat durasi ke histogram pdp_stage_duration_seconds{stage=...},
+exception ke pdp_stage_errors_total{stage=..., error=...}, dan nilai add()
+ke pdp_stage_<nama>_total{stage=...}. Tahap yang dibatalkan (CancelledError
+saat client disconnect/timeout, GeneratorExit saat stream ditutup) bukan
+error: dicatat di pdp_stage_cancelled_total{stage=...} dan tidak masuk
+histogram latency.
+
+Jika OTEL_ENABLED=true (butuh opentelemetry-sdk dan exporter OTLP), setiap
+span juga dikirim sebagai span OpenTelemetry ke collector lokal
+(OTEL_EXPORTER_OTLP_ENDPOINT), dengan span bersarang sesuai pemanggilan.
+"""
+
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterator, Optional
+
+# Batas bucket histogram latency (detik)
+STAGE_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5,
+    0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0,
+)
+
+# Exception yang berarti tahap dibatalkan pemanggil, bukan gagal
+CANCELLED = ("CancelledError", "GeneratorExit")
+
+# Sample collector tambahan: (nama, tipe, help, labels, value)
+Sample = tuple[str, str, str, dict, float]
+
+
+class Histogram:
+    """Histogram bucket tetap (format Prometheus)."""
+
+    def __init__(self, buckets: tuple[float, ...] = STAGE_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimasi quantile dengan interpolasi linear di dalam bucket.
+
+        Args:
+            q: Quantile (0-1)
+
+        Returns:
+            Nilai estimasi (batas bucket terakhir jika jatuh di bucket +Inf)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if cumulative + n >= rank and n:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / n
+            cumulative += n
+        return self.buckets[-1]
+
+
+class Span:
+    """Satu tahap yang sedang diukur (hasil span())."""
+
+    def __init__(self, stage: str, attributes: dict, otel_span: Any = None):
+        self.stage = stage
+        self.attributes = attributes
+        self.counts: dict[str, float] = defaultdict(float)
+        self._otel_span = otel_span
+
+    def add(self, name: str, value: float) -> None:
+        """
+        Tambah counter tahap ini (mis. input_chars, output_tokens, items).
+
+        Args:
+            name: Nama counter (menjadi pdp_stage_<name>_total)
+            value: Nilai yang ditambahkan
+        """
+        self.counts[name] += value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(f"pdp.{name}", self.counts[name])
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Set atribut span (hanya dikirim ke OpenTelemetry, bukan label metrics).
+
+        Args:
+            key: Nama atribut
+            value: Nilai atribut (str, bool, int, atau float)
+        """
+        self.attributes[key] = value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(f"pdp.{key}", value)
+
+
+class StageMetrics:
+    """Histogram latency, error counter, dan counter per tahap (thread-safe)."""
+
+    def __init__(self, buckets: tuple[float, ...] = STAGE_BUCKETS):
+        """
+        Initialize Stage Metrics.
+
+        Args:
+            buckets: Batas bucket histogram latency (detik)
+        """
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._durations: dict[str, Histogram] = {}
+        self._errors: dict[tuple[str, str], int] = defaultdict(int)
+        self._cancelled: dict[str, int] = defaultdict(int)
+        self._counts: dict[tuple[str, str], float] = defaultdict(float)
+        self._collectors: list[Callable[[], list[Sample]]] = []
+        self._tracer: Any = None
+        self._tracer_loaded = False
+
+    @contextmanager
+    def span(self, stage: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Ukur satu tahap pipeline.
+
+        Exception tetap diteruskan setelah dicatat sebagai error (atau
+        sebagai pembatalan untuk CancelledError/GeneratorExit).
+
+        Args:
+            stage: Nama tahap (mis. embed_query, pinecone_query, generate)
+            **attributes: Atribut span OpenTelemetry (mis. top_k=5)
+
+        Yields:
+            Span untuk menambah counter (add) atau atribut (set)
+        """
+        tracer = self.tracer()
+        context = nullcontext()
+        if tracer is not None:
+            context = tracer.start_as_current_span(
+                f"rag.{stage}", attributes={f"pdp.{k}": v for k, v in attributes.items()}
+            )
+        with context as otel_span:
+            current = Span(stage, attributes, otel_span)
+            start = time.perf_counter()
+            try:
+                yield current
+            except BaseException as e:
+                self.observe(stage, time.perf_counter() - start, type(e).__name__, current.counts)
+                raise
+            self.observe(stage, time.perf_counter() - start, None, current.counts)
+
+    def observe(
+        self,
+        stage: str,
+        seconds: float,
+        error: Optional[str] = None,
+        counts: Optional[dict[str, float]] = None,
+    ) -> None:
+        """
+        Catat satu eksekusi tahap (untuk kode yang tidak bisa memakai span(),
+        mis. di dalam async generator yang yield di tengah tahap).
+
+        Args:
+            stage: Nama tahap
+            seconds: Durasi
+            error: Nama class exception jika gagal (CANCELLED dicatat sebagai
+                pembatalan, tanpa durasi)
+            counts: Counter tambahan {nama: nilai}
+        """
+        with self._lock:
+            if error in CANCELLED:
+                self._cancelled[stage] += 1
+                return
+            histogram = self._durations.get(stage)
+            if histogram is None:
+                histogram = self._durations[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if error is not None:
+                self._errors[(stage, error)] += 1
+            for name, value in (counts or {}).items():
+                self._counts[(stage, name)] += value
+
+    def add_collector(self, collector: Callable[[], list[Sample]]) -> None:
+        """
+        Daftarkan sumber metrics tambahan untuk render() (mis. gauge in-flight
+        per backend dari client registry).
+
+        Args:
+            collector: Fungsi tanpa argumen yang mengembalikan list Sample
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def stats(self) -> dict:
+        """
+        Ringkasan per tahap untuk dibaca manusia.
+
+        Returns:
+            Dict per tahap: count, errors, cancelled, mean_ms, p50_ms, p95_ms,
+            p99_ms (estimasi dari histogram), dan counter tahap
+        """
+        with self._lock:
+            result = {}
+            for stage in sorted({*self._durations, *self._cancelled}):
+                histogram = self._durations.get(stage) or Histogram(self.buckets)
+                result[stage] = {
+                    "count": histogram.count,
+                    "errors": sum(n for (s, _), n in self._errors.items() if s == stage),
+                    "cancelled": self._cancelled.get(stage, 0),
+                    "mean_ms": histogram.sum / histogram.count * 1000 if histogram.count else 0.0,
+                    "p50_ms": histogram.quantile(0.50) * 1000,
+                    "p95_ms": histogram.quantile(0.95) * 1000,
+                    "p99_ms": histogram.quantile(0.99) * 1000,
+                    **{name: value for (s, name), value in self._counts.items() if s == stage},
+                }
+            return result
+
+    def render(self) -> str:
+        """
+        Render semua metrics dalam format teks Prometheus (exposition 0.0.4).
+
+        Returns:
+            Teks metrics
+        """
+        lines = [
+            "# HELP pdp_stage_duration_seconds Latency per tahap pipeline RAG",
+            "# TYPE pdp_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._durations.items()):
+                metric = "pdp_stage_duration_seconds"
+                cumulative = 0
+                for le, n in zip([*self.buckets, "+Inf"], histogram.counts):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {histogram.count}')
+
+            lines += [
+                "# HELP pdp_stage_errors_total Exception per tahap pipeline RAG",
+                "# TYPE pdp_stage_errors_total counter",
+            ]
+            for (stage, error), n in sorted(self._errors.items()):
+                lines.append(f'pdp_stage_errors_total{{stage="{stage}",error="{error}"}} {n}')
+
+            lines += [
+                "# HELP pdp_stage_cancelled_total Tahap yang dibatalkan pemanggil "
+                "(disconnect, timeout, stream ditutup)",
+                "# TYPE pdp_stage_cancelled_total counter",
+            ]
+            for stage, n in sorted(self._cancelled.items()):
+                lines.append(f'pdp_stage_cancelled_total{{stage="{stage}"}} {n}')
+
+            by_name: dict[str, list[tuple[str, float]]] = defaultdict(list)
+            for (stage, name), value in sorted(self._counts.items()):
+                by_name[name].append((stage, value))
+            for name, values in sorted(by_name.items()):
+                metric = f"pdp_stage_{name}_total"
+                lines += [f"# HELP {metric} Total {name} per tahap", f"# TYPE {metric} counter"]
+                lines += [f'{metric}{{stage="{stage}"}} {_number(v)}' for stage, v in values]
+            collectors = list(self._collectors)
+
+        # Sample satu metric harus berurutan dalam exposition format
+        families: dict[str, list[Sample]] = {}
+        for collector in collectors:
+            for sample in collector():
+                families.setdefault(sample[0], []).append(sample)
+        for name, samples in families.items():
+            _, kind, help_text, _, _ = samples[0]
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for _, _, _, labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {_number(value)}" if label_text
+                             else f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Hapus semua nilai (collector tetap terdaftar)."""
+        with self._lock:
+            self._durations.clear()
+            self._errors.clear()
+            self._cancelled.clear()
+            self._counts.clear()
+
+    def tracer(self) -> Any:
+        """Tracer OpenTelemetry jika OTEL_ENABLED=true dan SDK ter-install, selain itu None."""
+        if not self._tracer_loaded:
+            with self._lock:
+                if not self._tracer_loaded:
+                    self._tracer = _create_tracer()
+                    self._tracer_loaded = True
+        return self._tracer
+
+
+def _create_tracer() -> Any:
+    """Setup TracerProvider dengan exporter OTLP (endpoint dari env OTEL_EXPORTER_OTLP_*)."""
+    if os.getenv("OTEL_ENABLED", "false").lower() != "true":
+        return None
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        # stdout dipakai transport stdio MCP, jadi peringatan ke stderr
+        print(
+            "⚠️ OTEL_ENABLED=true tetapi opentelemetry belum ter-install "
+            "(pip install -e '.[otel]'); hanya metrics lokal yang dicatat",
+            file=sys.stderr,
+        )
+        return None
+
+    service = os.getenv("OTEL_SERVICE_NAME", "mcp-pdp-server")
+    provider = TracerProvider(resource=Resource.create({"service.name": service}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    return trace.get_tracer("src.rag")
+
+
+def _number(value: float) -> str:
+    """Format angka Prometheus (integer tanpa .0)."""
+    return str(int(value)) if float(value).is_integer() else f"{value:.6f}"
+
+
+# Global metrics (satu per proses)
+_metrics: Optional[StageMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> StageMetrics:
+    """
+    Get StageMetrics global.
+
+    Returns:
+        StageMetrics bersama untuk semua komponen di proses ini
+    """
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = StageMetrics()
+    return _metrics
+
+
+def span(stage: str, **attributes: Any):
+    """
+    Shortcut get_metrics().span(stage, **attributes).
+
+    Args:
+        stage: Nama tahap
+        **attributes: Atribut span OpenTelemetry
+
+    Returns:
+        Context manager yang menghasilkan Span
+    """
+    return get_metrics().span(stage, **attributes)
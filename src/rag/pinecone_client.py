@@ -5,15 +5,23 @@ Pinecone Client Module
 Module untuk operasi vector database menggunakan Pinecone.
 """
 
+import asyncio
 import os
 from typing import Optional
 
 from dotenv import load_dotenv
-from pinecone import Pinecone, ServerlessSpec
+from pinecone import ServerlessSpec
+
+from .clients import get_client_registry
+from .executor import run_blocking
+from .metrics import span
 
 # Load environment variables
 load_dotenv()
 
+# Versi API data plane untuk query REST lewat httpx
+PINECONE_API_VERSION = "2025-04"
+
 
 class PineconeClient:
     """Client untuk operasi Pinecone vector database."""
@@ -39,9 +47,17 @@ class PineconeClient:
 
         self.index_name = index_name or os.getenv("PINECONE_INDEX_NAME", "uu-pdp-27-2022")
 
-        # Initialize Pinecone
-        self.pc = Pinecone(api_key=self.api_key)
+        # Initialize Pinecone (client SDK bersama, timeout/pool dari registry)
+        self.registry = get_client_registry()
+        self.pc = self.registry.pinecone(self.api_key)
+        # Deadline, retry, hedging, dan circuit breaker untuk query
+        self.guard = self.registry.guard("pinecone")
+        self.rate_limiter = self.registry.rate_limiter("pinecone")
         self._index = None
+        self._host: Optional[str] = None
+
+        # Query async lewat httpx HTTP/2 (tanpa thread executor)
+        self.http2 = os.getenv("PINECONE_HTTP2", "true").lower() == "true"
 
     def create_index_if_not_exists(self, dimension: int = 768) -> None:
         """
@@ -67,11 +83,19 @@ class PineconeClient:
         else:
             print(f"✅ Index '{self.index_name}' already exists.")
 
+    @property
+    def host(self) -> str:
+        """Host data plane index (di-resolve sekali lewat describe_index)."""
+        if self._host is None:
+            host = self.pc.describe_index(self.index_name).host
+            self._host = host if host.startswith("http") else f"https://{host}"
+        return self._host
+
     @property
     def index(self):
         """Get Pinecone index instance."""
         if self._index is None:
-            self._index = self.pc.Index(self.index_name)
+            self._index = self.pc.Index(host=self.host)
         return self._index
 
     def upsert_vectors(
@@ -118,6 +142,7 @@ class PineconeClient:
         top_k: int = 5,
         namespace: str = "",
         include_metadata: bool = True,
+        filter: Optional[dict] = None,
     ) -> list[dict]:
         """
         Query vectors dari Pinecone.
@@ -127,16 +152,21 @@ class PineconeClient:
             top_k: Jumlah hasil yang dikembalikan
             namespace: Namespace untuk query
             include_metadata: Include metadata dalam hasil
+            filter: Metadata filter Pinecone (mis. {"document_id": {"$eq": "uu-pdp"}})
 
         Returns:
             List of matches dengan score dan metadata
         """
-        results = self.index.query(
-            vector=vector,
-            top_k=top_k,
-            namespace=namespace,
-            include_metadata=include_metadata,
-        )
+        self.rate_limiter.acquire_sync()
+        with span("pinecone_query", top_k=top_k, transport="sdk") as s:
+            results = self.guard.call_sync(lambda: self.index.query(
+                vector=vector,
+                top_k=top_k,
+                namespace=namespace,
+                include_metadata=include_metadata,
+                filter=filter,
+            ))
+            s.add("matches", len(results.matches))
 
         matches = []
         for match in results.matches:
@@ -148,6 +178,156 @@ class PineconeClient:
 
         return matches
 
+    async def aquery(
+        self,
+        vector: list[float],
+        top_k: int = 5,
+        namespace: str = "",
+        include_metadata: bool = True,
+        filter: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Query vectors dari Pinecone secara async.
+
+        Query dikirim langsung ke endpoint REST data plane lewat
+        httpx.AsyncClient bersama (HTTP/2, keep-alive), jadi tidak ada
+        thread executor maupun TLS handshake per request. Query menunggu
+        kuota PINECONE_QPS, dibatasi deadline, di-retry saat error
+        sementara, dan di-hedge jika lebih lambat dari p95 (lihat
+        BackendGuard). Jika PINECONE_HTTP2=false, call SDK sync dijalankan
+        di bounded executor.
+
+        Args:
+            vector: Query embedding vector
+            top_k: Jumlah hasil yang dikembalikan
+            namespace: Namespace untuk query
+            include_metadata: Include metadata dalam hasil
+            filter: Metadata filter Pinecone (mis. {"document_id": {"$eq": "uu-pdp"}})
+
+        Returns:
+            List of matches dengan score dan metadata
+        """
+        if not self.http2:
+            return await run_blocking(
+                self.query,
+                vector=vector,
+                top_k=top_k,
+                namespace=namespace,
+                include_metadata=include_metadata,
+                filter=filter,
+            )
+
+        host = self._host or await run_blocking(lambda: self.host)
+        body = {
+            "vector": vector,
+            "topK": top_k,
+            "namespace": namespace,
+            "includeMetadata": include_metadata,
+            "includeValues": False,
+        }
+        if filter:
+            body["filter"] = filter
+
+        await self.rate_limiter.acquire()
+        with span("pinecone_query", top_k=top_k, transport="http2") as s:
+            matches = await self.guard.call(lambda: self._post_query(host, body))
+            s.add("matches", len(matches))
+
+        return [
+            {
+                "id": match["id"],
+                "score": match.get("score", 0.0),
+                "metadata": match.get("metadata", {}) if include_metadata else {},
+            }
+            for match in matches
+        ]
+
+    async def _post_query(self, host: str, body: dict) -> list[dict]:
+        """Satu request POST /query (satu attempt BackendGuard)."""
+        async with self.registry.track("pinecone"):
+            response = await self.registry.http_client("pinecone").post(
+                f"{host}/query",
+                json=body,
+                headers=self._headers(),
+            )
+            response.raise_for_status()
+        return response.json().get("matches", [])
+
+    async def aquery_many(
+        self,
+        vectors: list[list[float]],
+        top_k: int = 5,
+        namespace: str = "",
+        include_metadata: bool = True,
+        filter: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Query banyak vector secara konkuren.
+
+        Pinecone tidak punya endpoint multi-vector query, jadi setiap vector
+        dikirim sebagai request /query terpisah, semuanya lewat connection
+        pool HTTP/2 yang sama dan dibatasi PINECONE_MAX_CONNECTIONS.
+
+        Args:
+            vectors: List query embedding vector
+            top_k: Jumlah hasil per query
+            namespace: Namespace untuk query
+            include_metadata: Include metadata dalam hasil
+            filter: Metadata filter (sama untuk semua query)
+
+        Returns:
+            List hasil per query (urutan sama dengan vectors)
+        """
+        semaphore = asyncio.Semaphore(self.registry.configs["pinecone"].max_connections)
+
+        async def query_one(vector: list[float]) -> list[dict]:
+            async with semaphore:
+                return await self.aquery(vector, top_k, namespace, include_metadata, filter)
+
+        with span("pinecone_query_many", top_k=top_k) as s:
+            s.add("items", len(vectors))
+            return list(await asyncio.gather(*(query_one(vector) for vector in vectors)))
+
+    async def warm_up(self) -> None:
+        """Resolve host index dan buka koneksi HTTP/2 ke data plane."""
+        host = self._host or await run_blocking(lambda: self.host)
+        if self.http2:
+            async with self.registry.track("pinecone"):
+                response = await self.registry.http_client("pinecone").post(
+                    f"{host}/describe_index_stats", json={}, headers=self._headers()
+                )
+                response.raise_for_status()
+        else:
+            await run_blocking(self.get_stats)
+
+    def _headers(self) -> dict:
+        """Header request REST data plane."""
+        return {"Api-Key": self.api_key, "X-Pinecone-API-Version": PINECONE_API_VERSION}
+
+    def delete_vectors(
+        self,
+        ids: list[str],
+        namespace: str = "",
+        batch_size: int = 1000,
+    ) -> dict:
+        """
+        Hapus vectors berdasarkan ID.
+
+        Args:
+            ids: List vector ID yang dihapus
+            namespace: Namespace vectors
+            batch_size: Jumlah ID per request delete (maksimum Pinecone 1000)
+
+        Returns:
+            Delete stats
+        """
+        for i in range(0, len(ids), batch_size):
+            self.index.delete(ids=ids[i:i + batch_size], namespace=namespace)
+
+        if ids:
+            print(f"🗑️ Deleted {len(ids)} vectors in namespace '{namespace}'")
+        return {"deleted_count": len(ids)}
+
     def delete_all(self, namespace: str = "") -> None:
         """
         Hapus semua vectors dalam namespace.
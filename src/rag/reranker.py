@@ -0,0 +1,379 @@
+"""
+Reranker Module
+===============
+
+Tahap re-ranking setelah retrieval. Retriever mengambil lebih banyak
+kandidat (RERANK_CANDIDATES, default 20) lalu reranker menilai ulang
+pasangan (query, chunk) dan hanya top_k terbaik yang masuk prompt Gemini.
+Dengan begitu top_k bisa kecil (3-5) tanpa kehilangan chunk relevan yang
+ranking vector-nya rendah.
+
+Reranker:
+- LexicalReranker: cakupan term query (bobot IDF BM25) + bigram, boost
+  untuk rujukan pasal/ayat/BAB yang sama persis dengan metadata chunk.
+  Tanpa dependency tambahan; term chunk di-cache sehingga rerank 20
+  kandidat umumnya hanya beberapa milidetik.
+- CrossEncoderReranker: cross-encoder lokal (sentence-transformers,
+  optional) yang berjalan di CPU.
+
+Skor pasangan (query, chunk) di-cache (LRU), dan latency setiap rerank
+dicatat untuk statistik.
+"""
+
+import functools
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .executor import run_blocking
+from .lexical_index import tokenize
+from .singleflight import normalize_query
+
+RERANKERS = ("none", "lexical", "cross-encoder")
+
+# Bucket histogram latency rerank (milidetik)
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500)
+
+PASAL_REFERENCE = re.compile(
+    r"\bpasal\s+(\d{1,3})(?:\s+ayat\s*\(?(\d{1,2})\)?)?", re.IGNORECASE
+)
+AYAT_PASAL_REFERENCE = re.compile(
+    r"\bayat\s*\(?(\d{1,2})\)?\s+pasal\s+(\d{1,3})", re.IGNORECASE
+)
+BAB_REFERENCE = re.compile(r"\bbab\s+([ivxl]+|\d{1,2})\b", re.IGNORECASE)
+
+ROMAN = {
+    "1": "I", "2": "II", "3": "III", "4": "IV", "5": "V", "6": "VI", "7": "VII",
+    "8": "VIII", "9": "IX", "10": "X", "11": "XI", "12": "XII", "13": "XIII",
+    "14": "XIV", "15": "XV", "16": "XVI",
+}
+
+DEFAULT_CROSS_ENCODER = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+
+class Reranker:
+    """
+    Base class reranker: cache skor, prior ranking awal, dan statistik latency.
+
+    Subclass cukup mengimplementasikan _score_pairs(query, texts).
+    """
+
+    # Bobot posisi di ranking awal (tie-breaker, 0 = abaikan)
+    prior_weight = 0.0
+
+    # True jika _score_pairs berat (model) dan harus di luar event loop
+    blocking = False
+
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Initialize Reranker.
+
+        Args:
+            cache_size: Maksimum skor pasangan yang di-cache (default: env
+                RERANK_CACHE_MAX_ENTRIES atau 10000, 0 = tanpa cache)
+        """
+        self.cache_size = (
+            cache_size if cache_size is not None
+            else int(os.getenv("RERANK_CACHE_MAX_ENTRIES", 10000))
+        )
+        self._cache: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.candidates = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._latency_sum = 0.0
+        self._buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def rerank(self, query: str, documents: list[dict], top_k: int) -> list[dict]:
+        """
+        Urutkan ulang kandidat dan ambil top_k terbaik.
+
+        Args:
+            query: User query
+            documents: Kandidat hasil retrieval (terurut, format vector store)
+            top_k: Jumlah dokumen yang dikembalikan
+
+        Returns:
+            top_k dokumen dengan score = skor rerank dan retrieval_score =
+            skor retrieval awal
+        """
+        if not documents:
+            return []
+        start = time.perf_counter()
+
+        query_key = normalize_query(query)
+        doc_keys = [_document_key(doc) for doc in documents]
+        scores: list[Optional[float]] = [None] * len(documents)
+        with self._lock:
+            for i, key in enumerate(doc_keys):
+                score = self._cache.get((query_key, key))
+                if score is not None:
+                    self._cache.move_to_end((query_key, key))
+                    scores[i] = score
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            texts = [documents[i].get("metadata", {}).get("text", "") for i in missing]
+            fresh = self._score_pairs(query, texts, [documents[i] for i in missing])
+            for i, score in zip(missing, fresh):
+                scores[i] = float(score)
+            self._remember(query_key, [(doc_keys[i], scores[i]) for i in missing])
+
+        n = len(documents)
+        ranked = sorted(
+            (
+                (score + self.prior_weight * (1 - rank / n), rank, doc)
+                for rank, (score, doc) in enumerate(zip(scores, documents))
+            ),
+            key=lambda item: (-item[0], item[1]),
+        )[:top_k]
+        results = [
+            {**doc, "score": score, "retrieval_score": doc.get("score", 0.0)}
+            for score, _, doc in ranked
+        ]
+
+        self._observe(time.perf_counter() - start, n, n - len(missing), len(missing))
+        return results
+
+    async def arerank(self, query: str, documents: list[dict], top_k: int) -> list[dict]:
+        """
+        Versi async rerank(); reranker berbasis model dijalankan di bounded executor.
+
+        Args:
+            query: User query
+            documents: Kandidat hasil retrieval
+            top_k: Jumlah dokumen yang dikembalikan
+
+        Returns:
+            top_k dokumen terurut skor rerank
+        """
+        if self.blocking:
+            return await run_blocking(self.rerank, query, documents, top_k)
+        return self.rerank(query, documents, top_k)
+
+    def stats(self) -> dict:
+        """
+        Get statistik reranker.
+
+        Returns:
+            Dict dengan reranker, requests, mean_candidates, cache_hits,
+            cache_hit_rate, mean_ms, histogram kumulatif {"le_<ms>": n}
+        """
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses
+            cumulative, histogram = 0, {}
+            for le, n in zip([*LATENCY_BUCKETS_MS, "inf"], self._buckets):
+                cumulative += n
+                histogram[f"le_{le}"] = cumulative
+            return {
+                "reranker": self.name,
+                "requests": self.requests,
+                "mean_candidates": self.candidates / self.requests if self.requests else 0.0,
+                "cache_entries": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+                "mean_ms": self._latency_sum / self.requests if self.requests else 0.0,
+                "histogram": histogram,
+            }
+
+    def _score_pairs(self, query: str, texts: list[str], documents: list[dict]) -> list[float]:
+        """Skor relevansi setiap (query, teks chunk); makin besar makin relevan."""
+        raise NotImplementedError
+
+    def _remember(self, query_key: str, items: list[tuple[str, float]]) -> None:
+        """Simpan skor baru ke cache LRU."""
+        if not self.cache_size:
+            return
+        with self._lock:
+            for doc_key, score in items:
+                self._cache[(query_key, doc_key)] = score
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _observe(self, seconds: float, candidates: int, hits: int, misses: int) -> None:
+        """Catat latency dan cache hit satu rerank."""
+        ms = seconds * 1000
+        idx = next((i for i, le in enumerate(LATENCY_BUCKETS_MS) if ms <= le), len(LATENCY_BUCKETS_MS))
+        with self._lock:
+            self.requests += 1
+            self.candidates += candidates
+            self.cache_hits += hits
+            self.cache_misses += misses
+            self._latency_sum += ms
+            self._buckets[idx] += 1
+
+
+class LexicalReranker(Reranker):
+    """
+    Reranker lexical/struktural tanpa model.
+
+    Skor = cakupan term query berbobot IDF + 0.5 x cakupan bigram query
+    + boost rujukan struktural (pasal sama persis, ayat, BAB), ditambah
+    prior kecil dari posisi di ranking awal.
+    """
+
+    prior_weight = 0.3
+
+    # Boost rujukan eksplisit di query yang cocok dengan metadata chunk
+    PASAL_BOOST = 1.0
+    AYAT_BOOST = 0.5
+    BAB_BOOST = 0.3
+
+    def __init__(self, idf: Optional[dict[str, float]] = None, cache_size: Optional[int] = None):
+        """
+        Initialize Lexical Reranker.
+
+        Args:
+            idf: Bobot IDF per term (mis. BM25Index.idf); tanpa idf semua
+                term berbobot sama
+            cache_size: Maksimum skor pasangan yang di-cache
+        """
+        super().__init__(cache_size=cache_size)
+        self.idf = idf
+
+    def _score_pairs(self, query: str, texts: list[str], documents: list[dict]) -> list[float]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if self.idf is not None:
+            terms = [t for t in terms if t in self.idf]
+        weights = {t: self.idf[t] if self.idf is not None else 1.0 for t in terms}
+        total = sum(weights.values())
+        bigrams = set(zip(terms, terms[1:]))
+        pasal, ayat, bab = _structural_reference(query)
+
+        scores = []
+        for text, doc in zip(texts, documents):
+            present, present_bigrams = _chunk_terms(text)
+            score = sum(weights[t] for t in terms if t in present) / total if total else 0.0
+            if bigrams:
+                score += 0.5 * len(bigrams & present_bigrams) / len(bigrams)
+            score += self._structural_boost(doc.get("metadata", {}), pasal, ayat, bab)
+            scores.append(score)
+        return scores
+
+    def _structural_boost(
+        self,
+        metadata: dict,
+        pasal: Optional[str],
+        ayat: Optional[str],
+        bab: Optional[str],
+    ) -> float:
+        """Boost jika pasal/ayat/BAB yang dirujuk query sama dengan metadata chunk."""
+        boost = 0.0
+        if pasal and str(metadata.get("pasal", "")) == pasal:
+            boost += self.PASAL_BOOST
+            if ayat and ayat in [str(a) for a in metadata.get("ayat") or []]:
+                boost += self.AYAT_BOOST
+        if bab and str(metadata.get("bab", "")).upper() == bab:
+            boost += self.BAB_BOOST
+        return boost
+
+
+class CrossEncoderReranker(Reranker):
+    """Cross-encoder lokal (sentence-transformers) yang menilai pasangan (query, chunk)."""
+
+    blocking = True
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        encoder: Optional[Any] = None,
+    ):
+        """
+        Initialize Cross-Encoder Reranker.
+
+        Args:
+            model: Nama/path model cross-encoder (default: env RERANK_MODEL
+                atau cross-encoder multilingual mMiniLM)
+            cache_size: Maksimum skor pasangan yang di-cache
+            encoder: Objek dengan predict(list[(query, text)]) (optional, untuk testing)
+        """
+        super().__init__(cache_size=cache_size)
+        self.model = model or os.getenv("RERANK_MODEL", DEFAULT_CROSS_ENCODER)
+        self._encoder = encoder
+        self._encoder_lock = threading.Lock()
+
+    @property
+    def encoder(self) -> Any:
+        """Model cross-encoder (di-load saat rerank pertama)."""
+        if self._encoder is None:
+            with self._encoder_lock:
+                if self._encoder is None:
+                    try:
+                        from sentence_transformers import CrossEncoder
+                    except ImportError as e:
+                        raise ImportError(
+                            "RERANKER=cross-encoder membutuhkan sentence-transformers. "
+                            "Install dengan: pip install -e '.[rerank]'"
+                        ) from e
+                    self._encoder = CrossEncoder(self.model, device="cpu")
+        return self._encoder
+
+    async def warm_up(self) -> None:
+        """Load model cross-encoder di executor sebelum request pertama."""
+        await run_blocking(lambda: self.encoder)
+
+    def _score_pairs(self, query: str, texts: list[str], documents: list[dict]) -> list[float]:
+        return [float(s) for s in self.encoder.predict([(query, text) for text in texts])]
+
+
+@functools.lru_cache(maxsize=4096)
+def _chunk_terms(text: str) -> tuple[frozenset, frozenset]:
+    """Term dan bigram (setelah stemming) satu chunk; chunk populer tidak di-stem ulang."""
+    tokens = tokenize(text)
+    return frozenset(tokens), frozenset(zip(tokens, tokens[1:]))
+
+
+def _structural_reference(query: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """(pasal, ayat, BAB romawi) yang dirujuk eksplisit di query."""
+    pasal = ayat = None
+    match = AYAT_PASAL_REFERENCE.search(query)
+    if match:
+        ayat, pasal = match.group(1), match.group(2)
+    else:
+        match = PASAL_REFERENCE.search(query)
+        if match:
+            pasal, ayat = match.group(1), match.group(2)
+
+    bab = None
+    match = BAB_REFERENCE.search(query)
+    if match:
+        bab = ROMAN.get(match.group(1), match.group(1)).upper()
+    return pasal, ayat, bab
+
+
+def _document_key(doc: dict) -> str:
+    """Key cache untuk chunk: vector ID + hash teks (ID sama setelah re-ingest bisa beda isi)."""
+    text = doc.get("metadata", {}).get("text", "")
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+    return f"{doc.get('id', '')}:{digest}"
+
+
+def get_reranker(idf: Optional[dict[str, float]] = None) -> Optional[Reranker]:
+    """
+    Buat reranker sesuai env RERANKER.
+
+    Args:
+        idf: Bobot IDF untuk LexicalReranker (mis. dari BM25Index)
+
+    Returns:
+        Reranker, atau None jika RERANKER=none
+    """
+    kind = os.getenv("RERANKER", "lexical").lower()
+    if kind not in RERANKERS:
+        raise ValueError(f"RERANKER tidak valid: {kind}. Pilihan: {', '.join(RERANKERS)}")
+    if kind == "lexical":
+        return LexicalReranker(idf=idf)
+    if kind == "cross-encoder":
+        return CrossEncoderReranker()
+    return None
@@ -0,0 +1,546 @@
+"""
+Resilience Module
+=================
+
+Lapisan resilience untuk call ke backend (Gemini embedding, Gemini
+generation, Pinecone). Client registry menyimpan satu BackendGuard per
+backend:
+
+- Deadline: satu call (termasuk semua retry) dibatasi <NAME>_DEADLINE, dan
+  setiap attempt dibatasi <NAME>_TIMEOUT lewat asyncio.wait_for, jadi HTTP
+  call yang macet tidak lagi menggantung tool call.
+- Retry: call idempotent yang gagal karena error sementara (timeout,
+  koneksi putus, HTTP 408/429/5xx) diulang dengan exponential backoff dan
+  full jitter, selama deadline masih cukup.
+- Hedging: jika attempt belum selesai setelah latency p95 terakhir, satu
+  request duplikat dikirim; hasil yang selesai duluan dipakai dan sisanya
+  dibatalkan. Ini memotong tail latency dengan biaya ~5% request tambahan.
+- Circuit breaker: setelah N kegagalan berturut-turut backend dianggap
+  down dan call langsung gagal (CircuitOpenError) tanpa menunggu timeout.
+  Setelah reset timeout, satu call percobaan (half-open) menentukan apakah
+  circuit ditutup lagi. Call percobaan yang dibatalkan membebaskan slotnya,
+  dan yang tidak selesai dalam probe timeout digantikan call berikutnya.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Status HTTP yang menandakan error sementara (layak di-retry)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Default per backend: deadline (detik), jumlah retry, hedging
+DEFAULT_POLICIES = {
+    "gemini_embed": {"deadline": 20.0, "max_retries": 2, "hedge": True},
+    "gemini_generate": {"deadline": 90.0, "max_retries": 1, "hedge": False},
+    "pinecone": {"deadline": 20.0, "max_retries": 2, "hedge": True},
+}
+
+# Jumlah sampel latency minimum sebelum hedging aktif
+HEDGE_MIN_SAMPLES = 20
+
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+# Penanda akhir stream untuk iter_with_timeout
+_END = object()
+
+
+class CircuitOpenError(RuntimeError):
+    """Call ditolak karena circuit breaker backend sedang terbuka."""
+
+    def __init__(self, backend: str, retry_after: float):
+        super().__init__(
+            f"Backend {backend} sedang tidak tersedia (circuit open, "
+            f"coba lagi dalam {retry_after:.0f} detik)"
+        )
+        self.backend = backend
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(TimeoutError):
+    """Call (termasuk retry) melewati timeout attempt atau deadline."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Apakah error bersifat sementara (timeout, koneksi, 408/429/5xx).
+
+    Dikenali tanpa import SDK: google.api_core exceptions punya atribut
+    `code` (status HTTP), httpx.HTTPStatusError punya `response.status_code`,
+    dan error transport httpx turunan dari TransportError.
+
+    Args:
+        error: Exception dari call backend
+
+    Returns:
+        True jika call layak diulang
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ == "TransportError" for cls in type(error).__mro__):
+        return True
+
+    status = getattr(error, "code", None)
+    response = getattr(error, "response", None)
+    if response is not None:
+        status = getattr(response, "status_code", status)
+    return isinstance(status, int) and status in RETRYABLE_STATUS
+
+
+@dataclass
+class ResiliencePolicy:
+    """Deadline, retry, hedging, dan circuit breaker satu backend."""
+
+    name: str
+    timeout: float
+    deadline: float
+    max_retries: int
+    retry_base_delay: float
+    retry_max_delay: float
+    hedge: bool
+    hedge_quantile: float
+    hedge_min_delay: float
+    failure_threshold: int
+    reset_timeout: float
+
+    @classmethod
+    def from_env(cls, name: str, timeout: float) -> "ResiliencePolicy":
+        """
+        Load policy dari env. Per backend: <NAME>_DEADLINE, <NAME>_MAX_RETRIES,
+        <NAME>_HEDGE (mis. PINECONE_DEADLINE); bersama: RETRY_BASE_DELAY,
+        RETRY_MAX_DELAY, HEDGE_QUANTILE, HEDGE_MIN_DELAY,
+        CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT.
+
+        Args:
+            name: Nama backend (salah satu dari BACKENDS)
+            timeout: Timeout per attempt (dari BackendConfig)
+
+        Returns:
+            ResiliencePolicy
+        """
+        prefix = name.upper()
+        defaults = DEFAULT_POLICIES.get(name, DEFAULT_POLICIES["pinecone"])
+        hedge = os.getenv(f"{prefix}_HEDGE", str(defaults["hedge"])).lower() == "true"
+        return cls(
+            name=name,
+            timeout=timeout,
+            deadline=float(os.getenv(f"{prefix}_DEADLINE", max(defaults["deadline"], timeout))),
+            max_retries=int(os.getenv(f"{prefix}_MAX_RETRIES", defaults["max_retries"])),
+            retry_base_delay=float(os.getenv("RETRY_BASE_DELAY", 0.2)),
+            retry_max_delay=float(os.getenv("RETRY_MAX_DELAY", 5.0)),
+            hedge=hedge,
+            hedge_quantile=float(os.getenv("HEDGE_QUANTILE", 0.95)),
+            hedge_min_delay=float(os.getenv("HEDGE_MIN_DELAY", 0.05)),
+            failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5)),
+            reset_timeout=float(os.getenv("CIRCUIT_RESET_TIMEOUT", 30.0)),
+        )
+
+
+class LatencyWindow:
+    """Latency attempt yang berhasil (sliding window) untuk delay hedging."""
+
+    def __init__(self, size: int = 200):
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantile latency (None jika sampel belum cukup)."""
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class CircuitBreaker:
+    """Circuit breaker closed -> open -> half_open berbasis kegagalan berturut-turut."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        probe_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize Circuit Breaker.
+
+        Args:
+            name: Nama backend (untuk pesan error)
+            failure_threshold: Kegagalan berturut-turut sebelum circuit terbuka (0 = nonaktif)
+            reset_timeout: Lama circuit terbuka sebelum call percobaan (detik)
+            clock: Sumber waktu (bisa diganti untuk pengujian)
+            probe_timeout: Batas waktu call percobaan sebelum call lain boleh
+                menggantikannya (default: reset_timeout)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = reset_timeout if probe_timeout is None else probe_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe: Optional[int] = None
+        self._probe_started = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and self._clock() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return self._state
+
+    def before_call(self) -> Optional[int]:
+        """
+        Izinkan call atau raise CircuitOpenError.
+
+        Returns:
+            Token call percobaan jika call ini adalah probe half-open (untuk
+            release_probe()), atau None
+
+        Raises:
+            CircuitOpenError: Circuit terbuka, atau half-open dengan call
+                percobaan yang masih berjalan
+        """
+        with self._lock:
+            if self._state == "closed":
+                return None
+            now = self._clock()
+            elapsed = now - self._opened_at
+            probe_expired = (
+                self._probe is None or now - self._probe_started >= self.probe_timeout
+            )
+            if elapsed >= self.reset_timeout and probe_expired:
+                self._state = "half_open"
+                self._probes += 1
+                self._probe = self._probes
+                self._probe_started = now
+                return self._probe
+            self.rejected += 1
+            retry_after = max(self.reset_timeout - elapsed, 0.0)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def release_probe(self, probe: Optional[int]) -> None:
+        """
+        Bebaskan slot call percobaan tanpa mengubah status circuit (call
+        dibatalkan sebelum sukses/gagal tercatat).
+
+        Args:
+            probe: Token dari before_call() (None = bukan probe, tidak ada efek)
+        """
+        with self._lock:
+            if probe is not None and self._probe == probe:
+                self._probe = None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probe = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or (
+                self.failure_threshold and self._failures >= self.failure_threshold
+            ):
+                if self._state != "open":
+                    self.opened += 1
+                self._state = "open"
+                self._opened_at = self._clock()
+                self._probe = None
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class BackendGuard:
+    """Deadline, retry dengan backoff + jitter, hedging, dan circuit breaker untuk satu backend."""
+
+    def __init__(self, policy: ResiliencePolicy, rng: Optional[random.Random] = None):
+        """
+        Initialize Backend Guard.
+
+        Args:
+            policy: ResiliencePolicy backend
+            rng: Random generator untuk jitter (default: random.Random baru)
+        """
+        self.policy = policy
+        self.breaker = CircuitBreaker(
+            policy.name,
+            policy.failure_threshold,
+            policy.reset_timeout,
+            probe_timeout=policy.deadline,
+        )
+        self.latencies = LatencyWindow()
+        self._random = rng or random.Random()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    async def call(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        idempotent: bool = True,
+        hedge: Optional[bool] = None,
+    ) -> T:
+        """
+        Jalankan operation() dengan deadline, retry, hedging, dan circuit breaker.
+
+        Args:
+            operation: Factory coroutine satu attempt (dipanggil ulang per retry/hedge)
+            idempotent: Boleh diulang/diduplikasi tanpa efek samping
+            hedge: Override hedging (default: policy.hedge, hanya untuk call idempotent)
+
+        Returns:
+            Hasil operation()
+
+        Raises:
+            CircuitOpenError: Backend dianggap down
+            DeadlineExceededError: Timeout attempt terakhir atau deadline habis
+            Exception: Error terakhir dari operation()
+        """
+        hedge = idempotent and (self.policy.hedge if hedge is None else hedge)
+        deadline = time.monotonic() + self.policy.deadline
+        self._count("calls")
+        attempt = 0
+        while True:
+            probe = self.breaker.before_call()
+            remaining = deadline - time.monotonic()
+            timeout = min(self.policy.timeout, remaining)
+            try:
+                if timeout <= 0:
+                    raise asyncio.TimeoutError()
+                result = await self._attempt(operation, timeout, hedge)
+            except Exception as e:
+                error = self._on_error(e, timeout)
+                delay = self._backoff(attempt)
+                if (
+                    not idempotent
+                    or not is_retryable(e)
+                    or attempt >= self.policy.max_retries
+                    or time.monotonic() + delay >= deadline
+                ):
+                    self._count("failures")
+                    if error is e:
+                        raise
+                    raise error from e
+                self._count("retries")
+                attempt += 1
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Dibatalkan (client putus, hedge kalah, stream ditutup): bukan
+                # kegagalan backend, tapi slot call percobaan harus dibebaskan
+                self.breaker.release_probe(probe)
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+    def call_sync(self, operation: Callable[[], T], idempotent: bool = True) -> T:
+        """
+        Versi sync dari call() untuk SDK call blocking: retry dan circuit
+        breaker saja (timeout attempt diatur SDK lewat request_options,
+        tanpa hedging).
+
+        Args:
+            operation: Fungsi satu attempt
+            idempotent: Boleh diulang tanpa efek samping
+
+        Returns:
+            Hasil operation()
+        """
+        deadline = time.monotonic() + self.policy.deadline
+        self._count("calls")
+        attempt = 0
+        while True:
+            probe = self.breaker.before_call()
+            start = time.perf_counter()
+            try:
+                result = operation()
+            except Exception as e:
+                self._on_error(e, self.policy.timeout)
+                delay = self._backoff(attempt)
+                if (
+                    not idempotent
+                    or not is_retryable(e)
+                    or attempt >= self.policy.max_retries
+                    or time.monotonic() + delay >= deadline
+                ):
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                attempt += 1
+                time.sleep(delay)
+            except BaseException:
+                self.breaker.release_probe(probe)
+                raise
+            else:
+                self.breaker.record_success()
+                self.latencies.add(time.perf_counter() - start)
+                return result
+
+    def hedge_delay(self) -> Optional[float]:
+        """Delay sebelum request duplikat: latency p95 terakhir (None jika belum cukup data)."""
+        latency = self.latencies.quantile(self.policy.hedge_quantile)
+        if latency is None:
+            return None
+        return max(latency, self.policy.hedge_min_delay)
+
+    def reseed(self) -> None:
+        """Seed ulang RNG jitter (setelah fork, agar retry antar worker tidak serentak)."""
+        self._random.seed()
+
+    def stats(self) -> dict:
+        """Counter call, retry, timeout, hedge, dan status circuit breaker."""
+        delay = self.hedge_delay() if self.policy.hedge else None
+        with self._lock:
+            result = {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+                "deadline": self.policy.deadline,
+                "max_retries": self.policy.max_retries,
+            }
+        result["circuit"] = self.breaker.stats()
+        return result
+
+    async def _attempt(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        timeout: float,
+        hedge: bool,
+    ) -> T:
+        """Satu attempt dengan timeout; dengan hedging jika delay p95 sudah diketahui."""
+        delay = self.hedge_delay() if hedge else None
+        if delay is None or delay >= timeout:
+            start = time.perf_counter()
+            result = await asyncio.wait_for(operation(), timeout)
+            self.latencies.add(time.perf_counter() - start)
+            return result
+        return await asyncio.wait_for(self._hedged(operation, delay), timeout)
+
+    async def _hedged(self, operation: Callable[[], Awaitable[T]], delay: float) -> T:
+        """Kirim request kedua jika yang pertama belum selesai setelah `delay`."""
+        starts: dict[asyncio.Future, float] = {}
+
+        def launch() -> asyncio.Future:
+            task = asyncio.ensure_future(operation())
+            starts[task] = time.perf_counter()
+            return task
+
+        primary = launch()
+        try:
+            done, _ = await asyncio.wait([primary], timeout=delay)
+            if not done and self.breaker.state == "closed":
+                self._count("hedges")
+                launch()
+
+            pending = set(starts)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self._count("hedge_wins")
+                        self.latencies.add(time.perf_counter() - starts[task])
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in starts:
+                if not task.done():
+                    task.cancel()
+
+    def _on_error(self, error: BaseException, timeout: float) -> BaseException:
+        """Catat kegagalan attempt; timeout diubah menjadi DeadlineExceededError."""
+        if is_retryable(error):
+            self.breaker.record_failure()
+        else:
+            # Error non-sementara (mis. 400) berarti backend tetap merespons
+            self.breaker.record_success()
+        if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+            self._count("timeouts")
+            if not isinstance(error, DeadlineExceededError):
+                return DeadlineExceededError(
+                    f"{self.policy.name}: tidak ada respons dalam {max(timeout, 0):.1f} detik"
+                )
+        return error
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff dengan full jitter."""
+        cap = min(self.policy.retry_max_delay, self.policy.retry_base_delay * (2 ** attempt))
+        return self._random.uniform(0, cap)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+async def iter_with_timeout(
+    iterator: AsyncIterator[T],
+    timeout: float,
+    name: str = "stream",
+) -> AsyncIterator[T]:
+    """
+    Iterasi async iterator dengan batas waktu per item (stream yang macet
+    di tengah jalan gagal dengan DeadlineExceededError, tidak menggantung).
+
+    Args:
+        iterator: Async iterator sumber (mis. stream chunk LLM)
+        timeout: Waktu tunggu maksimum per item (detik)
+        name: Nama backend untuk pesan error
+
+    Yields:
+        Item dari iterator
+    """
+    iterator = aiter(iterator)
+    while True:
+        try:
+            item = await asyncio.wait_for(_anext(iterator), timeout)
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceededError(
+                f"{name}: stream berhenti lebih dari {timeout:.1f} detik"
+            ) from e
+        if item is _END:
+            return
+        yield item
+
+
+async def _anext(iterator: AsyncIterator[T]):
+    return await anext(iterator, _END)
@@ -5,71 +5,219 @@ RAG Retriever Module
 Module untuk retrieval dan generation menggunakan RAG pattern.
 """
 
+import asyncio
 import os
-from typing import Optional
+import re
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
 
-import google.generativeai as genai
 from dotenv import load_dotenv
 
-from .embeddings import EmbeddingService
-from .pinecone_client import PineconeClient
+from .answer_cache import SemanticAnswerCache
+from .clients import get_client_registry
+from .context_budget import AssembledContext, ContextAssembler, estimate_tokens, legacy_context
+from .lexical_index import BM25Index, get_lexical_index, reciprocal_rank_fusion
+from .metrics import get_metrics, span
+from .reranker import Reranker, get_reranker
+from .resilience import iter_with_timeout
+from .singleflight import SingleFlight, normalize_query
+from .vector_store import get_vector_store
+
+if TYPE_CHECKING:
+    # SDK Gemini/Pinecone di-import lazy (lihat __init__)
+    from .embeddings import EmbeddingService
+    from .pinecone_client import PineconeClient
 
 # Load environment variables
 load_dotenv()
 
+RETRIEVAL_MODES = ("vector", "hybrid", "lexical")
+
+# Rujukan pasal eksplisit di query ("Pasal 67", "pasal 5 ayat (1)")
+PASAL_REFERENCE = re.compile(r"\bpasal\s+(\d{1,3})\b", re.IGNORECASE)
+
 
 class RAGRetriever:
     """RAG Retriever untuk menjawab pertanyaan berdasarkan dokumen."""
 
     def __init__(
         self,
-        embedding_service: Optional[EmbeddingService] = None,
-        pinecone_client: Optional[PineconeClient] = None,
+        embedding_service: Optional["EmbeddingService"] = None,
+        pinecone_client: Optional["PineconeClient"] = None,
         model: Optional[str] = None,
         top_k: int = 5,
+        llm: Optional[Any] = None,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        lexical_index: Optional[BM25Index] = None,
+        reranker: Optional[Reranker] = None,
     ):
         """
         Initialize RAG Retriever.
 
         Args:
             embedding_service: Service untuk embeddings
-            pinecone_client: Client untuk Pinecone
+            pinecone_client: Client vector store (default: sesuai VECTOR_BACKEND)
             model: Model Gemini untuk generation
             top_k: Jumlah dokumen yang di-retrieve
+            llm: Model generatif (optional, default: genai.GenerativeModel bersama dari client registry)
+            answer_cache: Semantic answer cache (default: nonaktif; aktif jika ANSWER_CACHE_ENABLED=true)
+            lexical_index: Index BM25 (default: INDEX_DIR/lexical jika RETRIEVAL_MODE bukan vector,
+                dimuat ulang setelah ingest)
+            reranker: Tahap re-ranking (default: sesuai env RERANKER)
         """
-        self.embedding_service = embedding_service or EmbeddingService()
-        self.pinecone_client = pinecone_client or PineconeClient()
+        if embedding_service is None:
+            from .embeddings import get_embedding_service
+
+            embedding_service = get_embedding_service()
+        self.embedding_service = embedding_service
+        self.pinecone_client = pinecone_client or get_vector_store()
         self.model = model or os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
         self.top_k = int(os.getenv("TOP_K_RESULTS", top_k))
 
-        # Configure Gemini for generation
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        self.llm = genai.GenerativeModel(self.model)
+        # Model Gemini dan timeout generation dari client registry
+        self.registry = get_client_registry()
+        self.generate_options = {}
+        if llm is None:
+            llm = self.registry.generative_model(self.model)
+            self.generate_options = {
+                "request_options": self.registry.configs["gemini_generate"].request_options
+            }
+        self.llm = llm
+
+        if answer_cache is None and os.getenv("ANSWER_CACHE_ENABLED", "false").lower() == "true":
+            answer_cache = SemanticAnswerCache()
+        self.answer_cache = answer_cache
+
+        self.retrieval_mode = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+        if self.retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"RETRIEVAL_MODE tidak valid: {self.retrieval_mode}. "
+                f"Pilihan: {', '.join(RETRIEVAL_MODES)}"
+            )
+        # Tanpa index yang di-inject, index BM25 global dipakai (dimuat ulang setelah ingest)
+        self._lexical_index = lexical_index
+        self._loaded_lexical: Optional[BM25Index] = None
+        loaded = self.lexical_index
+        self.hybrid_candidates = int(os.getenv("HYBRID_CANDIDATES", 20))
+        self.lexical_shortcut = os.getenv("HYBRID_LEXICAL_SHORTCUT", "true").lower() == "true"
 
-    def retrieve(self, query: str, top_k: Optional[int] = None) -> list[dict]:
+        # Re-ranking: ambil RERANK_CANDIDATES kandidat, hanya top_k terbaik ke LLM
+        if reranker is None:
+            reranker = get_reranker(idf=loaded.idf if loaded is not None else None)
+        self.reranker = reranker
+        self.rerank_candidates = int(os.getenv("RERANK_CANDIDATES", 20))
+
+        # Context: gabung chunk berurutan, buang span duplikat, batasi token
+        self.context_assembler = None
+        if os.getenv("CONTEXT_ASSEMBLER_ENABLED", "true").lower() == "true":
+            self.context_assembler = ContextAssembler()
+
+        # Request identik yang sedang berjalan berbagi satu eksekusi pipeline
+        self.singleflight = SingleFlight()
+        self.coalesce = os.getenv("COALESCE_ENABLED", "true").lower() == "true"
+
+    @property
+    def lexical_index(self) -> Optional[BM25Index]:
+        """
+        Index BM25 untuk retrieval.
+
+        Index yang di-inject ke constructor dipakai apa adanya; selain itu
+        index global dari get_lexical_index(), yang dimuat ulang ketika
+        ingest menulis versi index baru. IDF LexicalReranker ikut diganti.
+
+        Returns:
+            BM25Index, atau None jika mode vector atau index belum dibangun
+        """
+        if self._lexical_index is not None or self.retrieval_mode == "vector":
+            return self._lexical_index
+
+        index = get_lexical_index()
+        if index is not self._loaded_lexical:
+            previous, self._loaded_lexical = self._loaded_lexical, index
+            reranker = getattr(self, "reranker", None)
+            if previous is not None and getattr(reranker, "idf", None) is previous.idf:
+                reranker.idf = index.idf if index is not None else None
+        return index
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        document: Optional[str | list[str]] = None,
+    ) -> list[dict]:
         """
         Retrieve relevant documents untuk query.
 
         Args:
             query: User query
             top_k: Override jumlah dokumen
+            document: ID dokumen korpus (atau list ID) untuk membatasi pencarian
 
         Returns:
             List of relevant documents dengan score
         """
         k = top_k or self.top_k
+        filter = document_filter(document)
 
-        # Generate query embedding
-        query_embedding = self.embedding_service.embed_query(query)
+        with span("retrieve", top_k=k) as s:
+            # BM25 dulu: hit lexical yang pasti tidak butuh embedding sama sekali
+            lexical = self._lexical_search(query, filter)
+            if self._lexical_only(query, lexical):
+                s.add("lexical_only", 1)
+                return lexical[:k]
 
-        # Query Pinecone
-        results = self.pinecone_client.query(
-            vector=query_embedding,
-            top_k=k,
-            include_metadata=True,
-        )
+            # Generate query embedding
+            query_embedding = self.embedding_service.embed_query(query)
 
-        return results
+            # Query Pinecone
+            results = self.pinecone_client.query(
+                vector=query_embedding,
+                top_k=self._candidate_k(k, lexical),
+                include_metadata=True,
+                filter=filter,
+            )
+
+            return self._rank(query, results, lexical, k)
+
+    async def aretrieve(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        document: Optional[str | list[str]] = None,
+    ) -> list[dict]:
+        """
+        Retrieve relevant documents secara async.
+
+        Args:
+            query: User query
+            top_k: Override jumlah dokumen
+            document: ID dokumen korpus (atau list ID) untuk membatasi pencarian
+
+        Returns:
+            List of relevant documents dengan score
+        """
+        k = top_k or self.top_k
+        filter = document_filter(document)
+
+        with span("retrieve", top_k=k) as s:
+            # BM25 dulu: hit lexical yang pasti tidak butuh embedding sama sekali
+            lexical = self._lexical_search(query, filter)
+            if self._lexical_only(query, lexical):
+                s.add("lexical_only", 1)
+                return lexical[:k]
+
+            # Generate query embedding
+            query_embedding = await self.embedding_service.aembed_query(query)
+
+            # Query Pinecone
+            results = await self.pinecone_client.aquery(
+                vector=query_embedding,
+                top_k=self._candidate_k(k, lexical),
+                include_metadata=True,
+                filter=filter,
+            )
+
+            return await self._arank(query, results, lexical, k)
 
     def generate_context(self, documents: list[dict]) -> str:
         """
@@ -81,30 +229,43 @@ class RAGRetriever:
         Returns:
             Formatted context string
         """
-        context_parts = []
+        return self.assemble_context(documents).text
 
-        for i, doc in enumerate(documents, 1):
-            metadata = doc.get("metadata", {})
-            text = metadata.get("text", "")
-
-            # Format dengan metadata
-            pasal = metadata.get("pasal", "")
-            bab = metadata.get("bab", "")
+    def assemble_context(self, documents: list[dict]) -> AssembledContext:
+        """
+        Susun context untuk prompt beserta statistik token.
 
-            header = f"[Dokumen {i}]"
-            if bab:
-                header += f" BAB {bab}"
-            if pasal:
-                header += f" Pasal {pasal}"
+        Chunk berurutan digabung tanpa teks overlap, span duplikat dibuang,
+        dan context dibatasi CONTEXT_BUDGET_TOKENS. Jika
+        CONTEXT_ASSEMBLER_ENABLED=false, semua chunk disambung apa adanya.
 
-            context_parts.append(f"{header}\n{text}")
+        Args:
+            documents: List of retrieved documents
 
-        return "\n\n---\n\n".join(context_parts)
+        Returns:
+            AssembledContext (text, documents yang dipakai, tokens, saved_tokens)
+        """
+        with span("generate_context") as s:
+            s.add("input_chunks", len(documents))
+            if self.context_assembler is not None:
+                assembled = self.context_assembler.assemble(documents)
+            else:
+                text = legacy_context(documents)
+                tokens = estimate_tokens(text)
+                assembled = AssembledContext(
+                    text=text, documents=documents, tokens=tokens, raw_tokens=tokens
+                )
+            s.add("context_tokens", assembled.tokens)
+            s.add("saved_tokens", assembled.saved_tokens)
+        return assembled
 
     def answer(self, query: str, top_k: Optional[int] = None) -> dict:
         """
         Jawab pertanyaan menggunakan RAG.
 
+        Pertanyaan identik (setelah normalize_query) yang sedang diproses
+        thread lain tidak dijalankan ulang, tetapi menunggu hasil yang sama.
+
         Args:
             query: User query
             top_k: Override jumlah dokumen
@@ -112,33 +273,616 @@ class RAGRetriever:
         Returns:
             Dict dengan answer dan sources
         """
-        # Retrieve relevant documents
-        documents = self.retrieve(query, top_k)
+        k = top_k or self.top_k
+        with span("answer", top_k=k) as s:
+            s.add("query_chars", len(query))
+            if not self.coalesce:
+                result = self._answer(query, k)
+            else:
+                key = ("answer", normalize_query(query), k)
+                result = dict(self.singleflight.call(key, lambda: self._answer(query, k)))
+            s.add("answer_chars", len(result["answer"]))
+        return result
 
-        if not documents:
-            return {
-                "answer": "Maaf, saya tidak menemukan informasi yang relevan dalam UU PDP.",
-                "sources": [],
-                "context": "",
-            }
+    def _answer(self, query: str, k: int) -> dict:
+        """Pipeline answer() tanpa coalescing, setelah mendapat slot admission."""
+        with self.registry.admission.admit_sync("interactive"):
+            start = time.perf_counter()
+
+            # BM25 dulu: keputusan lexical-only sama dengan retrieve()
+            lexical = self._lexical_search(query)
+            query_embedding = None
+            if self._lexical_only(query, lexical):
+                documents = lexical[:k]
+            else:
+                # Generate query embedding
+                query_embedding = self.embedding_service.embed_query(query)
+
+                # Semantic cache: pertanyaan mirip tidak perlu ke Pinecone/LLM
+                cached = self._lookup_cache(query, query_embedding, k)
+                if cached is not None:
+                    return cached
+
+                # Retrieve relevant documents (vector + BM25 dengan RRF, lalu rerank)
+                documents = self.pinecone_client.query(
+                    vector=query_embedding,
+                    top_k=self._candidate_k(k, lexical),
+                    include_metadata=True,
+                )
+                documents = self._rank(query, documents, lexical, k)
+
+            if not documents:
+                return self._empty_answer()
+
+            # Generate context
+            assembled = self.assemble_context(documents)
+
+            # Create prompt
+            prompt = self._create_prompt(query, assembled.text)
+
+            # Generate answer
+            answer = self._generate(prompt)
+
+            result = self._build_answer(answer, assembled)
+            self._cache_answer(query, query_embedding, k, result, start)
+            return result
+
+    async def aanswer(self, query: str, top_k: Optional[int] = None) -> dict:
+        """
+        Jawab pertanyaan menggunakan RAG secara async.
+
+        Versi non-blocking dari answer(): embedding dan generation memakai
+        API async Gemini, query Pinecone dijalankan di bounded executor.
+        Request identik yang datang bersamaan berbagi satu eksekusi.
+
+        Args:
+            query: User query
+            top_k: Override jumlah dokumen
+
+        Returns:
+            Dict dengan answer dan sources
+        """
+        k = top_k or self.top_k
+        with span("answer", top_k=k) as s:
+            s.add("query_chars", len(query))
+            if not self.coalesce:
+                result = await self._aanswer(query, k)
+            else:
+                key = ("answer", normalize_query(query), k)
+                result = dict(await self.singleflight.do(key, lambda: self._aanswer(query, k)))
+            s.add("answer_chars", len(result["answer"]))
+        return result
+
+    async def _aanswer(self, query: str, k: int) -> dict:
+        """Pipeline aanswer() tanpa coalescing, setelah mendapat slot admission."""
+        async with self.registry.admission.admit("interactive"):
+            start = time.perf_counter()
+
+            # BM25 dulu: keputusan lexical-only sama dengan aretrieve()
+            lexical = self._lexical_search(query)
+            query_embedding = None
+            if self._lexical_only(query, lexical):
+                documents = lexical[:k]
+            else:
+                # Generate query embedding
+                query_embedding = await self.embedding_service.aembed_query(query)
+
+                # Semantic cache: pertanyaan mirip tidak perlu ke Pinecone/LLM
+                cached = self._lookup_cache(query, query_embedding, k)
+                if cached is not None:
+                    return cached
+
+                # Retrieve relevant documents (vector + BM25 dengan RRF, lalu rerank)
+                documents = await self.pinecone_client.aquery(
+                    vector=query_embedding,
+                    top_k=self._candidate_k(k, lexical),
+                    include_metadata=True,
+                )
+                documents = await self._arank(query, documents, lexical, k)
+
+            if not documents:
+                return self._empty_answer()
+
+            # Generate context
+            assembled = self.assemble_context(documents)
+
+            # Create prompt
+            prompt = self._create_prompt(query, assembled.text)
+
+            # Generate answer
+            answer = await self._agenerate(prompt)
+
+            result = self._build_answer(answer, assembled)
+            self._cache_answer(query, query_embedding, k, result, start)
+            return result
+
+    async def astream_answer(self, query: str, top_k: Optional[int] = None) -> AsyncIterator[dict]:
+        """
+        Jawab pertanyaan menggunakan RAG dengan streaming token.
+
+        Retrieval sama seperti aanswer(), tetapi generation memakai API
+        streaming Gemini (stream=True) sehingga potongan jawaban bisa
+        diteruskan ke client begitu diterima. Sources baru tersedia di
+        event terakhir. Request identik yang datang bersamaan berlangganan
+        ke stream yang sama (token yang sudah terkirim diputar ulang).
+
+        Args:
+            query: User query
+            top_k: Override jumlah dokumen
+
+        Yields:
+            {"type": "token", "text": ...} untuk setiap potongan jawaban,
+            lalu satu {"type": "done", "answer", "sources", "context"}
+        """
+        k = top_k or self.top_k
+        if not self.coalesce:
+            events = self._astream_answer(query, k)
+        else:
+            events = self.singleflight.stream(
+                ("stream", normalize_query(query), k), lambda: self._astream_answer(query, k)
+            )
+        start = time.perf_counter()
+        error = None
+        try:
+            async for event in events:
+                yield event
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            get_metrics().observe(
+                "answer_stream", time.perf_counter() - start, error, {"query_chars": len(query)}
+            )
+
+    async def _astream_answer(self, query: str, k: int) -> AsyncIterator[dict]:
+        """Pipeline astream_answer() tanpa coalescing, setelah mendapat slot admission."""
+        async with self.registry.admission.admit("interactive"):
+            start = time.perf_counter()
+
+            # BM25 dulu: keputusan lexical-only sama dengan aretrieve()
+            lexical = self._lexical_search(query)
+            query_embedding = None
+            if self._lexical_only(query, lexical):
+                documents = lexical[:k]
+            else:
+                # Generate query embedding
+                query_embedding = await self.embedding_service.aembed_query(query)
+
+                # Semantic cache: jawaban tersimpan dikirim sebagai satu token
+                cached = self._lookup_cache(query, query_embedding, k)
+                if cached is not None:
+                    yield {"type": "token", "text": cached["answer"]}
+                    yield {"type": "done", **cached}
+                    return
+
+                # Retrieve relevant documents (vector + BM25 dengan RRF, lalu rerank)
+                documents = await self.pinecone_client.aquery(
+                    vector=query_embedding,
+                    top_k=self._candidate_k(k, lexical),
+                    include_metadata=True,
+                )
+                documents = await self._arank(query, documents, lexical, k)
+
+            if not documents:
+                empty = self._empty_answer()
+                yield {"type": "token", "text": empty["answer"]}
+                yield {"type": "done", **empty}
+                return
+
+            assembled = self.assemble_context(documents)
+            prompt = self._create_prompt(query, assembled.text)
+
+            # Stream jawaban dari LLM (span manual: context manager tidak boleh melewati yield).
+            # Membuka stream sampai chunk pertama di-retry lewat guard (belum ada token
+            # terkirim); setelah itu setiap chunk dibatasi timeout agar stream macet gagal.
+            parts = []
+            metrics = get_metrics()
+            guard = self.registry.guard("gemini_generate")
+            await self.registry.rate_limiter("gemini_generate").acquire(estimate_tokens(prompt))
+            generate_start = time.perf_counter()
+            error = None
+            try:
+                async with self.registry.track("gemini_generate"):
+                    first, response = await guard.call(lambda: self._aopen_stream(prompt))
+                    chunks = iter_with_timeout(response, guard.policy.timeout, "gemini_generate")
+                    async for chunk in _prepend(first, chunks):
+                        text = _chunk_text(chunk)
+                        if text:
+                            if not parts:
+                                first_token = time.perf_counter() - generate_start
+                                metrics.observe("generate_first_token", first_token)
+                            parts.append(text)
+                            yield {"type": "token", "text": text}
+            except BaseException as e:
+                error = type(e).__name__
+                raise
+            finally:
+                metrics.observe(
+                    "generate_stream",
+                    time.perf_counter() - generate_start,
+                    error,
+                    {"prompt_chars": len(prompt), "output_chars": sum(len(p) for p in parts)},
+                )
+
+            result = self._build_answer("".join(parts), assembled)
+            self._cache_answer(query, query_embedding, k, result, start)
+            yield {"type": "done", **result}
+
+    async def agenerate(self, query: str, context: str) -> str:
+        """
+        Generate jawaban LLM dari context yang sudah tersedia (tanpa retrieval).
+
+        Args:
+            query: Pertanyaan/instruksi untuk LLM
+            context: Teks sumber (misalnya isi pasal dari structure index)
+
+        Returns:
+            Teks jawaban LLM
+        """
+        async with self.registry.admission.admit("interactive"):
+            return await self._agenerate(self._create_prompt(query, context))
+
+    async def answer_many(
+        self,
+        queries: list[str],
+        top_k: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Jawab banyak pertanyaan sekaligus (misalnya checklist kepatuhan).
+
+        Pertanyaan identik (normalize_query) hanya diproses sekali, semua
+        query di-embed dalam satu request batch, vector query dijalankan
+        konkuren (atau satu perkalian matrix untuk index lokal), chunk yang
+        sama dari beberapa pertanyaan dipakai bersama, dan generation
+        dibatasi semaphore serta admission control (prioritas batch, di
+        belakang tanya_pdp interaktif). Hasil di-yield sesuai urutan input
+        begitu tersedia.
 
-        # Generate context
-        context = self.generate_context(documents)
+        Args:
+            queries: List pertanyaan
+            top_k: Override jumlah dokumen per pertanyaan
+            concurrency: Maksimum generation paralel (default: env BATCH_CONCURRENCY atau 4)
+            stats: Dict opsional yang diisi statistik batch (questions,
+                unique_questions, cache_hits, retrieved_chunks, unique_chunks)
+
+        Yields:
+            Dict per pertanyaan: index, question, answer, sources, context,
+            dan error (jika pertanyaan itu gagal)
+        """
+        k = top_k or self.top_k
+        concurrency = concurrency or int(os.getenv("BATCH_CONCURRENCY", 4))
+        start = time.perf_counter()
+
+        keys = [normalize_query(q) for q in queries]
+        first = {}
+        for query, key in zip(queries, keys):
+            first.setdefault(key, query)
+        unique = list(first)
+        futures = {key: asyncio.get_running_loop().create_future() for key in unique}
+        tasks = []
+        stats = stats if stats is not None else {}
+        stats.update(questions=len(queries), unique_questions=len(unique), cache_hits=0)
+
+        try:
+            # BM25 dulu: pertanyaan lexical-only (lihat aretrieve) tidak di-embed
+            lexical = {key: self._lexical_search(first[key]) for key in unique}
+            fused: dict[str, list[dict]] = {}
+            for key in unique:
+                if self._lexical_only(first[key], lexical[key]):
+                    fused[key] = lexical[key][:k]
+            to_embed = [key for key in unique if key not in fused]
+
+            # Satu request embedding untuk semua pertanyaan unik lainnya.
+            # Kegagalan embedding/vector query menjadi error per pertanyaan
+            # (seperti kegagalan generation), pertanyaan lain tetap dijawab.
+            embeddings = {}
+            try:
+                embeddings = dict(zip(
+                    to_embed, await self._aembed_many([first[key] for key in to_embed])
+                ))
+            except Exception as e:
+                for key in to_embed:
+                    futures[key].set_result(self._error_answer(e))
 
-        # Create prompt
-        prompt = self._create_prompt(query, context)
+            pending = []
+            for key in embeddings:
+                cached = self._lookup_cache(first[key], embeddings[key], k)
+                if cached is not None:
+                    futures[key].set_result(cached)
+                    stats["cache_hits"] += 1
+                else:
+                    pending.append(key)
 
-        # Generate answer
-        response = self.llm.generate_content(prompt)
-        answer = response.text
+            # Vector query untuk semua pertanyaan sekaligus, lalu fusion per pertanyaan
+            candidates = [self._candidate_k(k, lexical[key]) for key in pending]
+            try:
+                vector_results = await self._aquery_many(
+                    [embeddings[key] for key in pending], max(candidates, default=k)
+                )
+            except Exception as e:
+                vector_results = []
+                for key in pending:
+                    futures[key].set_result(self._error_answer(e))
+            for key, results, candidate_k in zip(pending, vector_results, candidates):
+                try:
+                    fused[key] = await self._arank(
+                        first[key], results[:candidate_k], lexical[key], k
+                    )
+                except Exception as e:
+                    futures[key].set_result(self._error_answer(e))
 
-        # Extract sources
-        sources = self._extract_sources(documents)
+            shared: dict[str, dict] = {}
+            retrieved = 0
+            documents = {}
+            for key, docs in fused.items():
+                retrieved += len(docs)
+                documents[key] = _dedupe_chunks(docs, shared)
+            stats.update(retrieved_chunks=retrieved, unique_chunks=len(shared))
 
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def generate(key: str, embedding: Optional[list[float]], docs: list[dict]) -> None:
+                try:
+                    if not docs:
+                        result = self._empty_answer()
+                    else:
+                        assembled = self.assemble_context(docs)
+                        prompt = self._create_prompt(first[key], assembled.text)
+                        async with semaphore, self.registry.admission.admit("batch"):
+                            answer = await self._agenerate(prompt)
+                        result = self._build_answer(answer, assembled)
+                        self._cache_answer(first[key], embedding, k, result, start)
+                    futures[key].set_result(result)
+                except Exception as e:
+                    futures[key].set_result(self._error_answer(e))
+
+            tasks = [
+                asyncio.create_task(generate(key, embeddings.get(key), docs))
+                for key, docs in documents.items()
+            ]
+
+            for index, (query, key) in enumerate(zip(queries, keys)):
+                yield {"index": index, "question": query, **await futures[key]}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _aembed_many(self, queries: list[str]) -> list[list[float]]:
+        """Embedding banyak query (batch request jika service mendukung)."""
+        if not queries:
+            return []
+        if hasattr(self.embedding_service, "aembed_queries"):
+            return await self.embedding_service.aembed_queries(queries)
+        return list(await asyncio.gather(
+            *(self.embedding_service.aembed_query(query) for query in queries)
+        ))
+
+    async def _aquery_many(self, vectors: list[list[float]], top_k: int) -> list[list[dict]]:
+        """Vector query untuk banyak embedding (aquery_many jika vector store mendukung)."""
+        if not vectors:
+            return []
+        if hasattr(self.pinecone_client, "aquery_many"):
+            return await self.pinecone_client.aquery_many(
+                vectors, top_k=top_k, include_metadata=True
+            )
+        return list(await asyncio.gather(*(
+            self.pinecone_client.aquery(vector=vector, top_k=top_k, include_metadata=True)
+            for vector in vectors
+        )))
+
+    def _lexical_search(self, query: str, filter: Optional[dict] = None) -> list[dict]:
+        """
+        Kandidat BM25 untuk query.
+
+        Args:
+            query: User query
+            filter: Metadata filter
+
+        Returns:
+            List of matches (kosong jika mode vector atau index belum ada)
+        """
+        index = self.lexical_index
+        if index is None or self.retrieval_mode == "vector":
+            return []
+        with span("lexical_search") as s:
+            results = index.search(query, top_k=self.hybrid_candidates, filter=filter)
+            s.add("matches", len(results))
+        return results
+
+    def _lexical_only(self, query: str, lexical: list[dict]) -> bool:
+        """
+        Apakah hasil BM25 cukup tanpa vector search.
+
+        True untuk RETRIEVAL_MODE=lexical, atau jika query merujuk pasal
+        tertentu dan hit BM25 teratas memang pasal tersebut.
+        """
+        if not lexical:
+            return False
+        if self.retrieval_mode == "lexical":
+            return True
+        if not self.lexical_shortcut:
+            return False
+
+        reference = PASAL_REFERENCE.search(query)
+        return (
+            reference is not None
+            and str(lexical[0]["metadata"].get("pasal", "")) == reference.group(1)
+        )
+
+    def _candidate_k(self, k: int, lexical: list[dict]) -> int:
+        """Jumlah kandidat vector: lebih banyak jika akan di-rerank atau digabung dengan BM25."""
+        if self.reranker is not None:
+            return max(k, self.rerank_candidates)
+        return max(k, self.hybrid_candidates) if lexical else k
+
+    def _fuse(self, vector_results: list[dict], lexical: list[dict], k: int) -> list[dict]:
+        """Gabungkan hasil vector dan BM25 dengan reciprocal-rank fusion."""
+        if not lexical:
+            return vector_results[:k]
+        return reciprocal_rank_fusion([vector_results, lexical], top_k=k)
+
+    def _rank(
+        self,
+        query: str,
+        vector_results: list[dict],
+        lexical: list[dict],
+        k: int,
+    ) -> list[dict]:
+        """
+        Dokumen final untuk context: fusion vector + BM25, lalu rerank ke top_k.
+
+        Args:
+            query: User query
+            vector_results: Hasil vector store (sudah over-fetch)
+            lexical: Hasil BM25
+            k: Jumlah dokumen final
+
+        Returns:
+            top_k dokumen terurut relevansi
+        """
+        if self.reranker is None:
+            return self._fuse(vector_results, lexical, k)
+        candidates = self._fuse(vector_results, lexical, self._candidate_k(k, lexical))
+        with span("rerank", reranker=self.reranker.name) as s:
+            s.add("candidates", len(candidates))
+            return self.reranker.rerank(query, candidates, k)
+
+    async def _arank(
+        self,
+        query: str,
+        vector_results: list[dict],
+        lexical: list[dict],
+        k: int,
+    ) -> list[dict]:
+        """Versi async _rank(): reranker berbasis model tidak memblokir event loop."""
+        if self.reranker is None:
+            return self._fuse(vector_results, lexical, k)
+        candidates = self._fuse(vector_results, lexical, self._candidate_k(k, lexical))
+        with span("rerank", reranker=self.reranker.name) as s:
+            s.add("candidates", len(candidates))
+            return await self.reranker.arerank(query, candidates, k)
+
+    def _lookup_cache(
+        self, query: str, query_embedding: list[float], k: int
+    ) -> Optional[dict]:
+        """Cari jawaban di semantic cache (None jika cache nonaktif atau miss)."""
+        if self.answer_cache is None:
+            return None
+        with span("answer_cache_lookup") as s:
+            cached = self.answer_cache.lookup(query, query_embedding, k)
+            s.add("hits", int(cached is not None))
+        return cached
+
+    def _generate(self, prompt: str) -> str:
+        """
+        Panggil LLM (sync) setelah kuota QPS/TPM tersedia, lalu catat
+        latency, ukuran prompt, dan token.
+        """
+        self.registry.rate_limiter("gemini_generate").acquire_sync(estimate_tokens(prompt))
+        with span("generate", model=self.model) as s:
+            response = self.registry.guard("gemini_generate").call_sync(
+                lambda: self.llm.generate_content(prompt, **self.generate_options)
+            )
+            _record_generation(s, prompt, response)
+        return response.text
+
+    async def _agenerate(self, prompt: str) -> str:
+        """
+        Panggil LLM (async) setelah kuota QPS/TPM tersedia, dengan deadline
+        dan retry, lalu catat latency, ukuran prompt, dan token.
+        """
+        await self.registry.rate_limiter("gemini_generate").acquire(estimate_tokens(prompt))
+        with span("generate", model=self.model) as s:
+            response = await self.registry.guard("gemini_generate").call(
+                lambda: self._agenerate_once(prompt)
+            )
+            _record_generation(s, prompt, response)
+        return response.text
+
+    async def _agenerate_once(self, prompt: str) -> Any:
+        """Satu request generate_content async (satu attempt BackendGuard)."""
+        async with self.registry.track("gemini_generate"):
+            return await self.llm.generate_content_async(prompt, **self.generate_options)
+
+    async def _aopen_stream(self, prompt: str) -> tuple[Any, AsyncIterator]:
+        """Buka stream LLM dan tunggu chunk pertama (None jika stream kosong)."""
+        response = await self.llm.generate_content_async(
+            prompt, stream=True, **self.generate_options
+        )
+        iterator = aiter(response)
+        return await anext(iterator, None), iterator
+
+    def _cache_answer(
+        self,
+        query: str,
+        query_embedding: Optional[list[float]],
+        top_k: int,
+        result: dict,
+        start: float,
+    ) -> None:
+        """
+        Simpan hasil answer ke semantic cache (jika aktif).
+
+        Args:
+            query: User query
+            query_embedding: Embedding query (None untuk jawaban lexical-only: tidak di-cache)
+            top_k: Jumlah dokumen yang dipakai
+            result: Hasil answer
+            start: Waktu mulai pipeline (time.perf_counter)
+        """
+        if self.answer_cache is not None and query_embedding is not None:
+            self.answer_cache.put(
+                query,
+                query_embedding,
+                top_k,
+                result,
+                latency=time.perf_counter() - start,
+            )
+
+    def _error_answer(self, error: Exception) -> dict:
+        """
+        Hasil answer_many untuk pertanyaan yang gagal.
+
+        Args:
+            error: Exception dari embedding, vector query, rerank, atau generation
+
+        Returns:
+            Dict dengan answer, sources, dan context kosong serta pesan error
+        """
+        return {"answer": "", "sources": [], "context": "", "error": str(error)}
+
+    def _empty_answer(self) -> dict:
+        """
+        Jawaban default ketika tidak ada dokumen relevan.
+
+        Returns:
+            Dict dengan answer, sources, dan context kosong
+        """
+        return {
+            "answer": "Maaf, saya tidak menemukan informasi yang relevan dalam UU PDP.",
+            "sources": [],
+            "context": "",
+        }
+
+    def _build_answer(self, answer: str, assembled: AssembledContext) -> dict:
+        """
+        Susun hasil akhir answer()/aanswer().
+
+        Args:
+            answer: Teks jawaban dari LLM
+            assembled: Context yang dikirim ke LLM (dari assemble_context)
+
+        Returns:
+            Dict dengan answer, sources (dokumen yang masuk context),
+            context, dan context_tokens (tokens, raw_tokens, saved_tokens, ...)
+        """
         return {
             "answer": answer,
-            "sources": sources,
-            "context": context,
+            "sources": self._extract_sources(assembled.documents),
+            "context": assembled.text,
+            "context_tokens": assembled.to_dict(),
         }
 
     def _create_prompt(self, query: str, context: str) -> str:
@@ -193,14 +937,92 @@ JAWABAN:"""
         return sources
 
 
+def document_filter(document: Optional[str | list[str]]) -> Optional[dict]:
+    """
+    Metadata filter untuk membatasi query ke dokumen tertentu.
+
+    Args:
+        document: ID dokumen korpus, list ID, atau None (semua dokumen)
+
+    Returns:
+        Filter {"document_id": ...} atau None
+    """
+    if not document:
+        return None
+    if isinstance(document, str):
+        return {"document_id": {"$eq": document}}
+    return {"document_id": {"$in": list(document)}}
+
+
+def _dedupe_chunks(documents: list[dict], shared: dict[str, dict]) -> list[dict]:
+    """
+    Buang chunk duplikat dalam satu hasil dan pakai bersama metadata chunk
+    yang sama antar pertanyaan dalam satu batch.
+
+    Args:
+        documents: Hasil retrieval satu pertanyaan
+        shared: Metadata per chunk id yang sudah terlihat di batch ini
+
+    Returns:
+        Dokumen tanpa duplikat (id atau teks yang sama), urutan dipertahankan
+    """
+    seen = set()
+    unique = []
+    for doc in documents:
+        metadata = shared.setdefault(doc["id"], doc.get("metadata", {}))
+        text = metadata.get("text", "")
+        if doc["id"] in seen or (text and text in seen):
+            continue
+        seen.update((doc["id"], text))
+        unique.append({**doc, "metadata": metadata})
+    return unique
+
+
+def _record_generation(s: Any, prompt: str, response: Any) -> None:
+    """
+    Counter generation: karakter dan token prompt/jawaban.
+
+    Token diambil dari usage_metadata response Gemini; jika tidak ada
+    (mis. LLM fake), dipakai estimasi lokal.
+    """
+    text = response.text
+    usage = getattr(response, "usage_metadata", None)
+    s.add("prompt_chars", len(prompt))
+    s.add("output_chars", len(text))
+    s.add("prompt_tokens", getattr(usage, "prompt_token_count", 0) or estimate_tokens(prompt))
+    s.add("output_tokens", getattr(usage, "candidates_token_count", 0) or estimate_tokens(text))
+
+
+def _chunk_text(chunk: Any) -> str:
+    """
+    Teks dari satu chunk response streaming.
+
+    Chunk terakhir Gemini bisa tidak punya parts (mis. hanya finish_reason),
+    dan akses .text pada chunk seperti itu melempar ValueError.
+    """
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
+
+
+async def _prepend(first: Any, chunks: AsyncIterator) -> AsyncIterator:
+    """Chunk pertama (yang sudah dibaca saat membuka stream) lalu sisa stream."""
+    if first is None:
+        return
+    yield first
+    async for chunk in chunks:
+        yield chunk
+
+
 def get_rag_retriever() -> RAGRetriever:
     """
     Factory function untuk mendapatkan RAGRetriever instance.
 
     Returns:
-        RAGRetriever instance
+        RAGRetriever bersama dari client registry
     """
-    return RAGRetriever()
+    return get_client_registry().retriever()
 
 
 if __name__ == "__main__":
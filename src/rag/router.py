@@ -0,0 +1,459 @@
+"""
+Query Router Module
+===================
+
+Lapisan aturan di depan RAGRetriever.answer: pertanyaan yang sebenarnya
+hanya menanyakan isi Pasal/ayat, isi BAB, atau definisi istilah dari Pasal 1
+dijawab langsung dari structure index (tanpa embedding, vector search,
+maupun LLM). Hanya pertanyaan terbuka yang diteruskan ke pipeline RAG.
+
+Setiap route dicatat di RouteStats (counter + histogram latency) untuk
+melihat berapa banyak traffic yang tidak perlu ke LLM.
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from ..document.structure import StructureIndex, format_pasal, get_structure_index
+from .executor import run_blocking
+from .index_version import IndexVersionWatcher
+
+ROUTES = ("pasal", "bab", "definisi", "rag")
+
+# Bucket histogram latency (milidetik)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+PASAL_REFERENCE = re.compile(
+    r"\bpasal\s+(\d{1,3})(?:\s+ayat\s*\(?(\d{1,2})\)?)?", re.IGNORECASE
+)
+AYAT_PASAL_REFERENCE = re.compile(
+    r"\bayat\s*\(?(\d{1,2})\)?\s+pasal\s+(\d{1,3})", re.IGNORECASE
+)
+BAB_REFERENCE = re.compile(r"\bbab\s+([ivxl]+|\d{1,2})\b", re.IGNORECASE)
+DEFINITION_QUESTION = re.compile(
+    r"^(?:apa|siapa)\s+(?:itu|yang\s+dimaksud(?:\s+dengan)?|arti(?:nya)?|pengertian|definisi)\s+(.+)$"
+    r"|^(?:definisi|pengertian|arti)(?:\s+dari)?\s+(.+)$",
+    re.IGNORECASE,
+)
+
+# Penutup query yang tidak mengubah istilah yang ditanyakan
+DEFINITION_SUFFIX = re.compile(
+    r"\s+(?:menurut|dalam|di|pada|berdasarkan)\s+(?:uu|undang|pasal).*$"
+    r"|\s+(?:uu\s+pdp|undang-undang\s+ini)$",
+    re.IGNORECASE,
+)
+
+# Kata yang menandai pertanyaan "apa isi ..." (bukan pertanyaan terbuka)
+LOOKUP_WORDS = frozenset("""
+    apa apakah isi bunyi berbunyi teks yang diatur mengatur dalam di pada tentang
+    uu pdp undang undang ini itu sebutkan tampilkan lihat tunjukkan menyatakan
+    mengenai disebutkan ketentuan saja dari bagaimana tolong coba berapa
+""".split())
+
+ROMAN = {
+    "1": "I", "2": "II", "3": "III", "4": "IV", "5": "V", "6": "VI", "7": "VII",
+    "8": "VIII", "9": "IX", "10": "X", "11": "XI", "12": "XII", "13": "XIII",
+    "14": "XIV", "15": "XV", "16": "XVI",
+}
+
+
+@dataclass
+class Route:
+    """Hasil klasifikasi query."""
+
+    name: str
+    pasal: Optional[int] = None
+    ayat: Optional[str] = None
+    bab: Optional[str] = None
+    definition: Optional[dict] = None
+
+
+class RouteStats:
+    """Counter dan histogram latency per route (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {route: 0 for route in ROUTES}
+        self._sums = {route: 0.0 for route in ROUTES}
+        self._buckets = {route: [0] * (len(LATENCY_BUCKETS_MS) + 1) for route in ROUTES}
+
+    def observe(self, route: str, seconds: float) -> None:
+        """
+        Catat satu request.
+
+        Args:
+            route: Nama route
+            seconds: Latency request
+        """
+        ms = seconds * 1000
+        idx = next((i for i, le in enumerate(LATENCY_BUCKETS_MS) if ms <= le), len(LATENCY_BUCKETS_MS))
+        with self._lock:
+            self._counts[route] += 1
+            self._sums[route] += ms
+            self._buckets[route][idx] += 1
+
+    def stats(self) -> dict:
+        """
+        Get statistik router.
+
+        Returns:
+            Dict dengan total, llm_avoided, llm_avoided_rate, dan per route:
+            count, mean_ms, histogram kumulatif {"le_<ms>": n, "le_inf": n}
+        """
+        with self._lock:
+            routes = {}
+            for route in ROUTES:
+                count = self._counts[route]
+                cumulative, histogram = 0, {}
+                for le, n in zip([*LATENCY_BUCKETS_MS, "inf"], self._buckets[route]):
+                    cumulative += n
+                    histogram[f"le_{le}"] = cumulative
+                routes[route] = {
+                    "count": count,
+                    "mean_ms": self._sums[route] / count if count else 0.0,
+                    "histogram": histogram,
+                }
+
+        total = sum(r["count"] for r in routes.values())
+        avoided = total - routes["rag"]["count"]
+        return {
+            "total": total,
+            "llm_avoided": avoided,
+            "llm_avoided_rate": avoided / total if total else 0.0,
+            "routes": routes,
+        }
+
+
+class QueryRouter:
+    """Router aturan: structural lookup untuk query sederhana, RAG untuk sisanya."""
+
+    def __init__(
+        self,
+        retriever_factory: Callable,
+        structure_index: Optional[StructureIndex] = None,
+        max_residual: Optional[int] = None,
+        aretriever_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        """
+        Initialize Query Router.
+
+        Args:
+            retriever_factory: Callable yang mengembalikan RAGRetriever
+                (dipanggil hanya untuk route rag, jadi route struktural tidak
+                perlu menginisialisasi Gemini/Pinecone)
+            structure_index: Structure index (default: get_structure_index())
+            max_residual: Maksimum kata "sisa" di luar rujukan pasal/BAB agar
+                query masih dianggap lookup (default: env ROUTER_MAX_RESIDUAL atau 1)
+            aretriever_factory: Versi async retriever_factory untuk aanswer/astream
+                (optional, agar pembuatan retriever tidak memblokir event loop)
+        """
+        self.retriever_factory = retriever_factory
+        self.aretriever_factory = aretriever_factory
+        self._structure_index = structure_index
+        # Index global (structure_index=None) dimuat ulang saat versi index berubah
+        self._structure_loaded = structure_index is not None
+        self._structure_version = IndexVersionWatcher() if structure_index is None else None
+        self.max_residual = max_residual if max_residual is not None else int(
+            os.getenv("ROUTER_MAX_RESIDUAL", 1)
+        )
+        self.enabled = os.getenv("ROUTER_ENABLED", "true").lower() == "true"
+        self.route_stats = RouteStats()
+
+    @property
+    def structure_index(self) -> Optional[StructureIndex]:
+        """Structure index yang sudah dimuat (lihat load_structure_index)."""
+        return self._structure_index
+
+    def _structure_stale(self) -> bool:
+        """Apakah structure index perlu dimuat (pertama kali atau setelah ingest)."""
+        if not self.enabled:
+            return False
+        if not self._structure_loaded:
+            return True
+        return self._structure_version is not None and self._structure_version.changed()
+
+    def load_structure_index(self) -> Optional[StructureIndex]:
+        """
+        Load structure index jika belum dimuat atau versi index berubah.
+
+        Returns:
+            StructureIndex, atau None jika belum ada (hasil None juga di-cache)
+        """
+        if self._structure_stale():
+            self._structure_index = get_structure_index()
+            self._structure_loaded = True
+        return self._structure_index
+
+    async def aload_structure_index(self) -> Optional[StructureIndex]:
+        """Versi async load_structure_index: load (file atau PDF) di bounded executor."""
+        if self._structure_stale():
+            self._structure_index = await run_blocking(get_structure_index)
+            self._structure_loaded = True
+        return self._structure_index
+
+    def classify(self, query: str) -> Route:
+        """
+        Tentukan route untuk query.
+
+        Args:
+            query: Pertanyaan user
+
+        Returns:
+            Route (name salah satu dari ROUTES)
+        """
+        # Hanya index yang sudah dimuat (load_structure_index), tanpa I/O di sini
+        structure = self._structure_index if self.enabled else None
+        if structure is None:
+            return Route("rag")
+
+        text = query.strip().rstrip("?!. ")
+
+        # Rujukan pasal eksplisit: hanya satu pasal, sisanya kata lookup
+        references = PASAL_REFERENCE.findall(text)
+        reverse = AYAT_PASAL_REFERENCE.search(text)
+        if len({int(n) for n, _ in references}) == 1:
+            nomor = int(references[0][0])
+            ayat = references[0][1] or (reverse.group(1) if reverse else None)
+            entry = structure.get_pasal(nomor)
+            if entry is not None and self._is_lookup(text, PASAL_REFERENCE, AYAT_PASAL_REFERENCE):
+                if ayat is None or any(a["nomor"] == ayat for a in entry["ayat"]):
+                    return Route("pasal", pasal=nomor, ayat=ayat, bab=entry["bab"])
+
+        # Rujukan BAB eksplisit
+        babs = BAB_REFERENCE.findall(text)
+        if len(babs) == 1 and not references:
+            romawi = ROMAN.get(babs[0], babs[0].upper())
+            if structure.get_bab(romawi) is not None and self._is_lookup(text, BAB_REFERENCE):
+                return Route("bab", bab=romawi)
+
+        # Pertanyaan definisi istilah di Pasal 1
+        match = DEFINITION_QUESTION.match(text)
+        if match:
+            term = DEFINITION_SUFFIX.sub("", match.group(1) or match.group(2))
+            definition = structure.get_definition(term)
+            if definition is not None:
+                return Route("definisi", pasal=1, bab="I", definition=definition)
+
+        return Route("rag")
+
+    async def aanswer(self, query: str, top_k: Optional[int] = None) -> dict:
+        """
+        Jawab pertanyaan lewat route yang sesuai.
+
+        Args:
+            query: Pertanyaan user
+            top_k: Override jumlah dokumen untuk route rag
+
+        Returns:
+            Dict dengan answer, sources, context, dan route
+        """
+        start = time.perf_counter()
+        await self.aload_structure_index()
+        route = self.classify(query)
+
+        if route.name == "rag":
+            retriever = await self._aretriever()
+            result = await retriever.aanswer(query, top_k=top_k)
+            result = {**result, "route": "rag"}
+        else:
+            result = self.answer_structural(route)
+
+        self.route_stats.observe(route.name, time.perf_counter() - start)
+        return result
+
+    async def astream(self, query: str, top_k: Optional[int] = None) -> AsyncIterator[dict]:
+        """
+        Versi streaming dari aanswer().
+
+        Route rag meneruskan token dari RAGRetriever.astream_answer();
+        route struktural mengirim jawaban lengkap sebagai satu token.
+
+        Args:
+            query: Pertanyaan user
+            top_k: Override jumlah dokumen untuk route rag
+
+        Yields:
+            {"type": "token", "text": ...}, lalu satu {"type": "done", ...}
+            dengan answer, sources, context, dan route
+        """
+        start = time.perf_counter()
+        await self.aload_structure_index()
+        route = self.classify(query)
+
+        if route.name == "rag":
+            retriever = await self._aretriever()
+            async for event in retriever.astream_answer(query, top_k=top_k):
+                if event["type"] == "done":
+                    event = {**event, "route": "rag"}
+                yield event
+        else:
+            result = self.answer_structural(route)
+            yield {"type": "token", "text": result["answer"]}
+            yield {"type": "done", **result}
+
+        self.route_stats.observe(route.name, time.perf_counter() - start)
+
+    async def answer_many(
+        self,
+        queries: list[str],
+        top_k: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Jawab banyak pertanyaan: route struktural langsung dijawab, sisanya
+        diteruskan sebagai satu batch ke RAGRetriever.answer_many().
+
+        Args:
+            queries: List pertanyaan
+            top_k: Override jumlah dokumen untuk route rag
+            stats: Dict opsional yang diisi statistik batch (lihat
+                RAGRetriever.answer_many) ditambah jumlah per route
+
+        Yields:
+            Dict per pertanyaan (urutan input): index, question, answer,
+            sources, context, route, dan error jika gagal
+        """
+        start = time.perf_counter()
+        await self.aload_structure_index()
+        routes = []
+        classify_seconds = []
+        for query in queries:
+            classified = time.perf_counter()
+            routes.append(self.classify(query))
+            classify_seconds.append(time.perf_counter() - classified)
+        rag = [query for query, route in zip(queries, routes) if route.name == "rag"]
+        stats = stats if stats is not None else {}
+        stats["routes"] = {name: sum(r.name == name for r in routes) for name in ROUTES}
+
+        rag_results = None
+        if rag:
+            retriever = await self._aretriever()
+            rag_results = retriever.answer_many(rag, top_k=top_k, stats=stats)
+
+        # Latency per pertanyaan, bukan sejak awal batch: route struktural
+        # hanya classify + lookup-nya sendiri; route rag sampai hasilnya
+        # tersedia (pipeline batch berjalan sejak awal), tanpa waktu yang
+        # dihabiskan consumer di antara yield.
+        consumer_seconds = 0.0
+        try:
+            for index, (query, route) in enumerate(zip(queries, routes)):
+                if route.name == "rag":
+                    result = {**await rag_results.__anext__(), "route": "rag"}
+                    seconds = time.perf_counter() - start - consumer_seconds
+                else:
+                    answered = time.perf_counter()
+                    result = self.answer_structural(route)
+                    seconds = classify_seconds[index] + time.perf_counter() - answered
+                self.route_stats.observe(route.name, seconds)
+                yielded = time.perf_counter()
+                yield {**result, "index": index, "question": query}
+                consumer_seconds += time.perf_counter() - yielded
+        finally:
+            if rag_results is not None:
+                await rag_results.aclose()
+
+    def answer(self, query: str, top_k: Optional[int] = None) -> dict:
+        """
+        Versi sync dari aanswer().
+
+        Args:
+            query: Pertanyaan user
+            top_k: Override jumlah dokumen untuk route rag
+
+        Returns:
+            Dict dengan answer, sources, context, dan route
+        """
+        start = time.perf_counter()
+        self.load_structure_index()
+        route = self.classify(query)
+
+        if route.name == "rag":
+            result = {**self.retriever_factory().answer(query, top_k=top_k), "route": "rag"}
+        else:
+            result = self.answer_structural(route)
+
+        self.route_stats.observe(route.name, time.perf_counter() - start)
+        return result
+
+    def answer_structural(self, route: Route) -> dict:
+        """
+        Susun jawaban dari structure index untuk route pasal/bab/definisi.
+
+        Args:
+            route: Route hasil classify()
+
+        Returns:
+            Dict dengan answer, sources, context, dan route
+        """
+        structure = self.structure_index
+
+        if route.name == "pasal":
+            entry = structure.get_pasal(route.pasal)
+            if route.ayat:
+                ayat = next(a for a in entry["ayat"] if a["nomor"] == route.ayat)
+                title = f"📜 Pasal {route.pasal} ayat ({route.ayat}) UU PDP"
+                body = f"({ayat['nomor']}) {ayat['text']}"
+            else:
+                title = f"📜 Pasal {route.pasal} UU PDP"
+                body = format_pasal(entry)
+            answer = f"{title} (BAB {entry['bab']}):\n\n{body}"
+            sources = [{"score": 1.0, "pasal": str(route.pasal), "bab": entry["bab"]}]
+
+        elif route.name == "bab":
+            bab = structure.get_bab(route.bab)
+            numbers = bab["pasal"]
+            span = f"Pasal {numbers[0]}" if len(numbers) == 1 else f"Pasal {numbers[0]}-{numbers[-1]}"
+            lines = [f"📖 BAB {route.bab} - {bab['judul']} ({span}):", ""]
+            for nomor in numbers:
+                text = structure.get_pasal(nomor)["text"]
+                lines.append(f"• Pasal {nomor}: {_excerpt(text)}")
+            answer = "\n".join(lines)
+            sources = [{"score": 1.0, "pasal": "", "bab": route.bab}]
+
+        else:
+            definition = route.definition
+            aliases = definition.get("alias") or []
+            alias = f" (selanjutnya disebut {aliases[0]})" if aliases else ""
+            answer = (
+                f"📘 {definition['istilah']} (Pasal 1 angka {definition['nomor']} UU PDP):\n\n"
+                f"{definition['istilah']}{alias} adalah {definition['definisi']}"
+            )
+            sources = [{"score": 1.0, "pasal": "1", "bab": "I"}]
+
+        return {"answer": answer, "sources": sources, "context": "", "route": route.name}
+
+    def stats(self) -> dict:
+        """
+        Get statistik per route.
+
+        Returns:
+            Dict dari RouteStats.stats()
+        """
+        return self.route_stats.stats()
+
+    async def _aretriever(self) -> Any:
+        """Retriever untuk route rag (lewat aretriever_factory jika ada)."""
+        if self.aretriever_factory is not None:
+            return await self.aretriever_factory()
+        return self.retriever_factory()
+
+    def _is_lookup(self, text: str, *patterns: re.Pattern) -> bool:
+        """True jika di luar rujukan hanya ada kata lookup (maks max_residual kata lain)."""
+        for pattern in patterns:
+            text = pattern.sub(" ", text)
+        residual = [
+            word for word in re.findall(r"[a-z]+", text.lower())
+            if word not in LOOKUP_WORDS
+        ]
+        return len(residual) <= self.max_residual
+
+
+def _excerpt(text: str, limit: int = 160) -> str:
+    """Potong teks di batas kata."""
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + " ..."
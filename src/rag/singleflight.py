@@ -0,0 +1,233 @@
+"""
+Single-Flight Module
+====================
+
+Deduplikasi request identik yang sedang berjalan (request coalescing).
+Jika beberapa client menanyakan hal yang sama pada saat bersamaan, hanya
+request pertama (leader) yang menjalankan pipeline embed -> query ->
+generate; request lain menunggu dan menerima hasil yang sama.
+
+Berbeda dengan semantic answer cache yang baru terisi setelah jawaban
+selesai, single-flight menangani lonjakan request identik yang datang
+sebelum jawaban pertama selesai dibuat.
+"""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Optional
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalisasi query untuk key single-flight.
+
+    Args:
+        query: Pertanyaan user
+
+    Returns:
+        Query lowercase dengan whitespace dirapikan dan tanpa tanda baca di akhir
+    """
+    return " ".join(query.lower().split()).rstrip("?!. ")
+
+
+class _Call:
+    """Satu eksekusi bersama (sync)."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.callers = 1
+
+
+class _Broadcast:
+    """Satu stream bersama: event disimpan agar follower bisa replay dari awal."""
+
+    def __init__(self):
+        self.events: list[dict] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.callers = 1
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def publish(self, event: Optional[dict] = None) -> None:
+        """Tambah event (atau hanya bangunkan subscriber) lalu reset sinyal."""
+        if event is not None:
+            self.events.append(event)
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self) -> None:
+        """Tunggu event berikutnya."""
+        await self._changed.wait()
+
+
+class SingleFlight:
+    """Coalescing request identik (async, streaming, dan sync) dengan counter."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._task_callers: dict[Hashable, int] = {}
+        self._streams: dict[Hashable, _Broadcast] = {}
+        self._calls: dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.max_shared = 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Jalankan fn() sekali untuk semua caller dengan key yang sama.
+
+        Eksekusi berjalan sebagai task tersendiri: caller yang dibatalkan
+        (misalnya client disconnect) tidak membatalkan caller lain.
+
+        Args:
+            key: Key request (mis. normalize_query + parameter tool)
+            fn: Coroutine function yang menjalankan pipeline
+
+        Returns:
+            Hasil fn() (objek yang sama untuk semua caller)
+        """
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fn())
+                self._tasks[key] = task
+                self._task_callers[key] = 1
+                self.executions += 1
+                task.add_done_callback(lambda t: self._finish_task(key, t))
+            else:
+                self._task_callers[key] += 1
+                self._coalesce(self._task_callers[key])
+        return await asyncio.shield(task)
+
+    async def stream(
+        self,
+        key: Hashable,
+        factory: Callable[[], AsyncIterator[dict]],
+    ) -> AsyncIterator[dict]:
+        """
+        Bagikan satu async generator ke semua caller dengan key yang sama.
+
+        Follower yang bergabung di tengah stream menerima ulang event yang
+        sudah terkirim, lalu event berikutnya begitu tiba.
+
+        Args:
+            key: Key request
+            factory: Callable yang membuat async generator event
+
+        Yields:
+            Event yang sama dengan yang diterima leader
+        """
+        with self._lock:
+            flight = self._streams.get(key)
+            if flight is None:
+                flight = _Broadcast()
+                self._streams[key] = flight
+                self.executions += 1
+                flight.task = asyncio.ensure_future(self._pump(key, flight, factory()))
+            else:
+                flight.callers += 1
+                self._coalesce(flight.callers)
+
+        position = 0
+        while True:
+            while position < len(flight.events):
+                yield flight.events[position]
+                position += 1
+            if flight.done:
+                if flight.error is not None:
+                    raise flight.error
+                return
+            await flight.wait()
+
+    def call(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Versi sync dari do() untuk caller di thread berbeda.
+
+        Args:
+            key: Key request
+            fn: Fungsi yang menjalankan pipeline
+
+        Returns:
+            Hasil fn()
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                call.callers += 1
+                self._coalesce(call.callers)
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> dict:
+        """
+        Get statistik coalescing.
+
+        Returns:
+            Dict dengan executions (pipeline yang benar-benar dijalankan),
+            coalesced (request yang menumpang), coalesced_rate, in_flight,
+            dan max_shared (caller terbanyak pada satu eksekusi)
+        """
+        with self._lock:
+            total = self.executions + self.coalesced
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalesced_rate": self.coalesced / total if total else 0.0,
+                "in_flight": len(self._tasks) + len(self._streams) + len(self._calls),
+                "max_shared": self.max_shared,
+            }
+
+    def _coalesce(self, callers: int) -> None:
+        """Catat satu request yang menumpang (dipanggil dengan lock)."""
+        self.coalesced += 1
+        self.max_shared = max(self.max_shared, callers)
+
+    def _finish_task(self, key: Hashable, task: asyncio.Task) -> None:
+        """Lepas key setelah task selesai (dan tandai exception sudah dibaca)."""
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+                del self._task_callers[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _pump(self, key: Hashable, flight: _Broadcast, events: AsyncIterator[dict]) -> None:
+        """Baca generator leader dan teruskan setiap event ke semua subscriber."""
+        try:
+            async for event in events:
+                flight.publish(event)
+        except asyncio.CancelledError as e:
+            flight.error = e
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                if self._streams.get(key) is flight:
+                    del self._streams[key]
+            flight.done = True
+            flight.publish()
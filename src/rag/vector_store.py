@@ -0,0 +1,42 @@
+"""
+Vector Store Module
+===================
+
+Pemilihan backend vector database lewat env VECTOR_BACKEND:
+    pinecone - Pinecone serverless (default)
+    local    - LocalVectorIndex in-process (NumPy, tanpa jaringan)
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+VECTOR_BACKENDS = ("pinecone", "local")
+
+
+def get_vector_store():
+    """
+    Factory function untuk vector store sesuai VECTOR_BACKEND.
+
+    Returns:
+        PineconeClient atau LocalVectorIndex instance
+    """
+    backend = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+
+    if backend == "local":
+        from .local_index import LocalVectorIndex
+
+        return LocalVectorIndex()
+
+    if backend == "pinecone":
+        from .pinecone_client import PineconeClient
+
+        return PineconeClient()
+
+    raise ValueError(
+        f"VECTOR_BACKEND tidak valid: {backend}. "
+        f"Pilihan: {', '.join(VECTOR_BACKENDS)}"
+    )
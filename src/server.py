@@ -6,12 +6,16 @@ MCP Server untuk menjawab pertanyaan tentang UU Perlindungan Data Pribadi
 No 27 Tahun 2022.
 """
 
+import asyncio
+import json
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator
 
 from dotenv import load_dotenv
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 # Load environment variables
 load_dotenv()
@@ -19,27 +23,92 @@ load_dotenv()
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.rag.retriever import RAGRetriever
+from src.healthcheck import clear_readiness, write_readiness
+from src.rag.clients import get_client_registry
+from src.rag.metrics import get_metrics
+from src.rag.router import QueryRouter
+from src.tools import pdp_tools
 
-# Initialize FastMCP server
+if TYPE_CHECKING:
+    # RAGRetriever (dan SDK Gemini/Pinecone) di-import lazy oleh client registry
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    from src.rag.retriever import RAGRetriever
+
+
+# True selama lifespan proses aktif (lihat server_lifespan)
+_lifespan_active = False
+
+
+@asynccontextmanager
+async def server_lifespan() -> AsyncIterator[None]:
+    """
+    Warm-up di background saat server start (sekali per proses).
+
+    Server langsung menerima koneksi; import SDK, load index, dan koneksi
+    ke Gemini/Pinecone disiapkan paralel, lalu status readiness ditulis
+    untuk Docker HEALTHCHECK (python -m src.healthcheck). Jika sudah aktif
+    (mis. dipegang lifespan app HTTP), masuk lagi tidak melakukan apa pun.
+    """
+    global _lifespan_active
+    if _lifespan_active:
+        yield
+        return
+
+    _lifespan_active = True
+    registry = get_client_registry()
+    clear_readiness()
+    task = None
+    if os.getenv("CLIENT_WARMUP", "true").lower() == "true":
+        task = asyncio.create_task(registry.run_warm_up())
+    else:
+        write_readiness(True, {})
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+        clear_readiness()
+        await registry.aclose()
+        _lifespan_active = False
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """
+    Lifespan FastMCP. Pada stdio berjalan sekali per proses; pada transport
+    HTTP FastMCP menjalankannya per session (per request jika stateless),
+    sehingga warm-up dan penutupan client dipegang lifespan app HTTP
+    (lihat src/http_server.py) dan di sini menjadi no-op.
+    """
+    async with server_lifespan():
+        yield
+
+
+# Initialize FastMCP server (host/port/stateless dipakai transport HTTP)
 mcp = FastMCP(
     "PDP-Assistant",
+    lifespan=lifespan,
+    host=os.getenv("MCP_HOST", "0.0.0.0"),
+    port=int(os.getenv("MCP_PORT", 8000)),
+    stateless_http=os.getenv("MCP_STATELESS_HTTP", "true").lower() == "true",
+    log_level=os.getenv("MCP_LOG_LEVEL", "INFO").upper(),
 )
 
-# Global retriever (lazy initialized)
-_retriever = None
+
+async def get_retriever() -> "RAGRetriever":
+    """Get RAGRetriever bersama (client registry, menunggu warm-up jika perlu)."""
+    return await get_client_registry().aretriever()
 
 
-def get_retriever() -> RAGRetriever:
-    """Get or create RAGRetriever instance."""
-    global _retriever
-    if _retriever is None:
-        _retriever = RAGRetriever()
-    return _retriever
+def get_router() -> QueryRouter:
+    """Get QueryRouter bersama (structural lookup di depan RAG)."""
+    return get_client_registry().router()
 
 
 @mcp.tool()
-async def tanya_pdp(pertanyaan: str) -> str:
+async def tanya_pdp(pertanyaan: str, ctx: Context) -> str:
     """
     Menjawab pertanyaan seputar UU Perlindungan Data Pribadi No 27 Tahun 2022.
 
@@ -50,39 +119,63 @@ async def tanya_pdp(pertanyaan: str) -> str:
     - Sanksi dan ketentuan pidana
     - Dan topik lainnya terkait perlindungan data pribadi
 
+    Jawaban di-stream: setiap potongan jawaban dikirim sebagai progress
+    notification (field message) begitu diterima dari LLM, referensi pasal
+    dikirim terakhir. Hasil tool tetap berisi jawaban lengkap.
+
     Args:
         pertanyaan: Pertanyaan tentang UU PDP dalam bahasa Indonesia
 
     Returns:
         Jawaban berdasarkan UU PDP beserta referensi pasal
     """
-    retriever = get_retriever()
-    result = retriever.answer(pertanyaan)
+    # Pertanyaan pasal/BAB/definisi dijawab dari structure index, sisanya RAG
+    parts = []
+    result = {}
+    async for event in get_router().astream(pertanyaan):
+        if event["type"] == "token":
+            parts.append(event["text"])
+            await ctx.report_progress(len(parts), message=event["text"])
+        else:
+            result = event
 
     # Format response
-    response = result["answer"]
+    response = result.get("answer", "".join(parts))
 
     # Add sources
-    sources = result.get("sources", [])
-    if sources:
-        relevant_sources = [s for s in sources if s.get("pasal")]
-        if relevant_sources:
-            pasal_refs = set()
-            for s in relevant_sources:
-                if s.get("pasal"):
-                    ref = f"Pasal {s['pasal']}"
-                    if s.get("bab"):
-                        ref = f"BAB {s['bab']}, {ref}"
-                    pasal_refs.add(ref)
-
-            if pasal_refs:
-                response += f"\n\n📚 Referensi: {', '.join(sorted(pasal_refs))}"
+    references = pdp_tools.format_references(result.get("sources", []))
+    if references:
+        await ctx.report_progress(len(parts) + 1, message=references)
+        response += references
 
     return response
 
 
 @mcp.tool()
-async def cari_pasal(nomor_pasal: int) -> str:
+async def tanya_pdp_batch(pertanyaan: list[str], ctx: Context) -> str:
+    """
+    Menjawab banyak pertanyaan UU PDP sekaligus (misalnya checklist kepatuhan).
+
+    Lebih efisien daripada memanggil tanya_pdp berulang kali: semua
+    pertanyaan di-embed dalam satu request, vector search berjalan
+    konkuren, pertanyaan yang sama hanya dijawab sekali, dan jawaban
+    dibuat paralel dengan batas concurrency. Setiap jawaban dikirim sebagai
+    progress notification sesuai urutan pertanyaan begitu tersedia.
+
+    Args:
+        pertanyaan: Daftar pertanyaan tentang UU PDP (maksimal BATCH_MAX_QUESTIONS, default 200)
+
+    Returns:
+        Jawaban bernomor untuk setiap pertanyaan beserta referensi pasal
+    """
+    async def report(number: int, section: str) -> None:
+        await ctx.report_progress(number, total=len(pertanyaan), message=section)
+
+    return await pdp_tools.tanya_pdp_batch(pertanyaan, on_section=report)
+
+
+@mcp.tool()
+async def cari_pasal(nomor_pasal: int, jelaskan: bool = False) -> str:
     """
     Mencari dan menampilkan isi pasal tertentu dalam UU PDP.
 
@@ -90,19 +183,13 @@ async def cari_pasal(nomor_pasal: int) -> str:
 
     Args:
         nomor_pasal: Nomor pasal yang dicari (1-76)
+        jelaskan: Tambahkan penjelasan dari LLM (default: False)
 
     Returns:
         Isi lengkap pasal yang dimaksud
     """
-    if nomor_pasal < 1 or nomor_pasal > 76:
-        return f"Nomor pasal harus antara 1-76. Anda memasukkan: {nomor_pasal}"
-
-    retriever = get_retriever()
-    query = f"Apa isi lengkap Pasal {nomor_pasal} UU Perlindungan Data Pribadi?"
-
-    result = retriever.answer(query, top_k=3)
-
-    return f"📜 Pasal {nomor_pasal} UU PDP:\n\n{result['answer']}"
+    # Implementasi bersama dengan src/tools/pdp_tools.py (structure index di executor)
+    return await pdp_tools.cari_pasal(nomor_pasal, jelaskan)
 
 
 @mcp.tool()
@@ -134,26 +221,39 @@ async def ringkasan_bab(nomor_bab: str) -> str:
     Returns:
         Ringkasan isi bab tersebut
     """
-    # Convert angka ke romawi
-    romawi_map = {
-        "1": "I", "2": "II", "3": "III", "4": "IV", "5": "V",
-        "6": "VI", "7": "VII", "8": "VIII", "9": "IX", "10": "X",
-        "11": "XI", "12": "XII", "13": "XIII", "14": "XIV", "15": "XV",
-        "16": "XVI",
-    }
+    return await pdp_tools.ringkasan_bab(nomor_bab)
 
-    bab_romawi = romawi_map.get(str(nomor_bab), str(nomor_bab).upper())
 
-    valid_babs = list(romawi_map.values())
-    if bab_romawi not in valid_babs:
-        return f"Nomor BAB tidak valid. Gunakan 1-16 atau I-XVI. Anda memasukkan: {nomor_bab}"
+@mcp.resource("pdp://stats/router")
+def router_stats() -> str:
+    """Statistik query router: jumlah request dan histogram latency per route."""
+    return json.dumps(get_router().stats(), indent=2)
 
-    retriever = get_retriever()
-    query = f"Apa saja yang diatur dalam BAB {bab_romawi} UU Perlindungan Data Pribadi? Berikan ringkasan lengkap."
 
-    result = retriever.answer(query, top_k=5)
+@mcp.resource("pdp://stats/clients")
+def client_stats() -> str:
+    """Statistik client backend: request, in-flight, pool, coalescing, token context, dan rerank."""
+    return json.dumps(get_client_registry().stats(), indent=2)
 
-    return f"📖 Ringkasan BAB {bab_romawi} UU PDP:\n\n{result['answer']}"
+
+@mcp.resource("pdp://stats/stages")
+def stage_stats() -> str:
+    """Latency per tahap pipeline RAG (embedding, vector query, rerank, generation): p50/p95/p99."""
+    return json.dumps(get_metrics().stats(), indent=2)
+
+
+@mcp.resource("pdp://metrics", mime_type="text/plain")
+def metrics() -> str:
+    """Metrics format Prometheus: histogram latency per tahap, error, token, dan backend."""
+    return get_metrics().render()
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: "Request") -> "Response":
+    """Endpoint scrape Prometheus (aktif saat server memakai transport HTTP)."""
+    from starlette.responses import PlainTextResponse
+
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4")
 
 
 @mcp.tool()
@@ -209,15 +309,34 @@ async def info_uu_pdp() -> str:
 
 
 def main():
-    """Run the MCP server."""
-    host = os.getenv("MCP_HOST", "0.0.0.0")
-    port = int(os.getenv("MCP_PORT", 8000))
-
-    print(f"🚀 Starting MCP PDP Server on {host}:{port}")
-    print(f"📚 UU Perlindungan Data Pribadi No 27 Tahun 2022")
-    print(f"🔧 Tools: tanya_pdp, cari_pasal, ringkasan_bab, info_uu_pdp")
+    """
+    Run the MCP server.
 
-    mcp.run()
+    Transport dari env MCP_TRANSPORT: stdio (default), streamable-http,
+    atau sse. Transport HTTP dilayani uvicorn dengan MCP_WORKERS worker
+    (lihat src/http_server.py).
+    """
+    transport = os.getenv("MCP_TRANSPORT", "stdio")
+    host = mcp.settings.host
+    port = mcp.settings.port
+    workers = int(os.getenv("MCP_WORKERS", 1))
+
+    # Pada stdio, stdout adalah kanal protokol MCP
+    out = sys.stderr if transport == "stdio" else sys.stdout
+    if transport == "stdio":
+        print("🚀 Starting MCP PDP Server (stdio)", file=out)
+    else:
+        print(f"🚀 Starting MCP PDP Server on {host}:{port} "
+              f"({transport}, {workers} worker)", file=out)
+    print(f"📚 UU Perlindungan Data Pribadi No 27 Tahun 2022", file=out)
+    print(f"🔧 Tools: tanya_pdp, cari_pasal, ringkasan_bab, info_uu_pdp", file=out)
+
+    if transport == "stdio":
+        mcp.run()
+    else:
+        from src.http_server import serve
+
+        serve(mcp, transport, host, port, workers)
 
 
 if __name__ == "__main__":
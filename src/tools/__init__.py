@@ -5,6 +5,6 @@ MCP Tools Module
 Module berisi definisi tools MCP untuk pertanyaan PDP.
 """
 
-from .pdp_tools import tanya_pdp, cari_pasal, ringkasan_bab
+from .pdp_tools import tanya_pdp, tanya_pdp_batch, cari_pasal, ringkasan_bab
 
-__all__ = ["tanya_pdp", "cari_pasal", "ringkasan_bab"]
+__all__ = ["tanya_pdp", "tanya_pdp_batch", "cari_pasal", "ringkasan_bab"]
@@ -5,21 +5,74 @@ PDP Tools Module
 MCP Tools untuk menjawab pertanyaan tentang UU Perlindungan Data Pribadi.
 """
 
-from typing import Optional
+import os
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
 
-from ..rag.retriever import RAGRetriever
+from ..document.structure import StructureIndex, format_pasal, get_structure_index
+from ..rag.bab_summaries import get_summary_store
+from ..rag.clients import get_client_registry
+from ..rag.executor import run_blocking
+from ..rag.router import QueryRouter
 
+if TYPE_CHECKING:
+    from ..rag.retriever import RAGRetriever
 
-# Global retriever instance
-_retriever: Optional[RAGRetriever] = None
 
+async def get_retriever() -> "RAGRetriever":
+    """Get RAGRetriever bersama (client registry, sama dengan server.py)."""
+    return await get_client_registry().aretriever()
 
-def get_retriever() -> RAGRetriever:
-    """Get or create RAGRetriever instance."""
-    global _retriever
-    if _retriever is None:
-        _retriever = RAGRetriever()
-    return _retriever
+
+def get_router() -> QueryRouter:
+    """Get QueryRouter bersama (structural lookup di depan RAG)."""
+    return get_client_registry().router()
+
+
+def format_references(sources: list[dict]) -> str:
+    """
+    Format referensi pasal dari sources hasil retriever/router.
+
+    Args:
+        sources: List source dengan keys pasal dan bab
+
+    Returns:
+        Baris "📚 Referensi: ..." (diawali baris kosong), atau "" jika tidak ada pasal
+    """
+    pasal_refs = set()
+    for s in sources:
+        if s.get("pasal"):
+            ref = f"Pasal {s['pasal']}"
+            if s.get("bab"):
+                ref = f"BAB {s['bab']}, {ref}"
+            pasal_refs.add(ref)
+
+    if not pasal_refs:
+        return ""
+    return f"\n\n📚 Referensi: {', '.join(sorted(pasal_refs))}"
+
+
+def format_batch_summary(stats: dict) -> str:
+    """
+    Format ringkasan statistik tanya_pdp_batch.
+
+    Args:
+        stats: Statistik dari QueryRouter.answer_many()
+
+    Returns:
+        String "📋 N pertanyaan dijawab (...)"
+    """
+    total = sum(stats["routes"].values())
+    rag = stats["routes"]["rag"]
+    details = []
+    if total - rag:
+        details.append(f"{total - rag} dari structure index")
+    if rag:
+        details.append(f"{stats['unique_questions']} pertanyaan unik lewat RAG")
+    if stats.get("retrieved_chunks"):
+        details.append(f"{stats['unique_chunks']}/{stats['retrieved_chunks']} chunk unik")
+    if stats.get("cache_hits"):
+        details.append(f"{stats['cache_hits']} dari cache")
+    return f"📋 {total} pertanyaan dijawab ({', '.join(details)})"
 
 
 async def tanya_pdp(pertanyaan: str) -> str:
@@ -30,71 +83,118 @@ async def tanya_pdp(pertanyaan: str) -> str:
         pertanyaan: Pertanyaan tentang UU PDP
 
     Returns:
-        Jawaban berdasarkan UU PDP
+        Jawaban berdasarkan UU PDP beserta referensi pasal
     """
-    retriever = get_retriever()
-    result = retriever.answer(pertanyaan)
+    # Pertanyaan pasal/BAB/definisi dijawab dari structure index, sisanya RAG
+    result = await get_router().aanswer(pertanyaan)
+    return result["answer"] + format_references(result.get("sources", []))
 
-    # Format response
-    response = result["answer"]
 
-    # Add sources if available
-    sources = result.get("sources", [])
-    if sources:
-        relevant_sources = [s for s in sources if s.get("pasal")]
-        if relevant_sources:
-            pasal_refs = set()
-            for s in relevant_sources:
-                if s.get("pasal"):
-                    ref = f"Pasal {s['pasal']}"
-                    if s.get("bab"):
-                        ref = f"BAB {s['bab']}, {ref}"
-                    pasal_refs.add(ref)
+async def tanya_pdp_batch(
+    pertanyaan: list[str],
+    on_section: Optional[Callable[[int, str], Awaitable[None]]] = None,
+) -> str:
+    """
+    Menjawab banyak pertanyaan UU PDP sekaligus (checklist kepatuhan).
 
-            if pasal_refs:
-                response += f"\n\n📚 Referensi: {', '.join(sorted(pasal_refs))}"
+    Args:
+        pertanyaan: Daftar pertanyaan tentang UU PDP (maksimal BATCH_MAX_QUESTIONS, default 200)
+        on_section: Callback opsional (nomor, section) untuk setiap jawaban
+            begitu tersedia, sesuai urutan pertanyaan (progress notification)
 
-    return response
+    Returns:
+        Jawaban bernomor untuk setiap pertanyaan (urutan sama dengan input)
+        beserta ringkasan batch
+    """
+    max_questions = int(os.getenv("BATCH_MAX_QUESTIONS", 200))
+    if not pertanyaan:
+        return "❌ Daftar pertanyaan kosong."
+    if len(pertanyaan) > max_questions:
+        return f"❌ Maksimal {max_questions} pertanyaan per batch (diterima {len(pertanyaan)})."
+
+    stats = {}
+    sections = []
+    async for result in get_router().answer_many(pertanyaan, stats=stats):
+        number = result["index"] + 1
+        if result.get("error"):
+            body = f"❌ Error: {result['error']}"
+        else:
+            body = result["answer"] + format_references(result.get("sources", []))
+        section = f"❓ {number}. {result['question']}\n\n{body}"
+        sections.append(section)
+        if on_section is not None:
+            await on_section(number, section)
+
+    return "\n\n---\n\n".join([*sections, format_batch_summary(stats)])
+
+
+async def aget_structure_index() -> Optional[StructureIndex]:
+    """
+    get_structure_index() di bounded executor: load pertama bisa membaca
+    file index atau mem-parse PDF, jadi tidak dijalankan di event loop.
+    """
+    return await run_blocking(get_structure_index)
 
 
-async def cari_pasal(nomor_pasal: int) -> str:
+async def cari_pasal(nomor_pasal: int, jelaskan: bool = False) -> str:
     """
     Mencari isi pasal tertentu dalam UU Perlindungan Data Pribadi.
 
+    Implementasi bersama tool cari_pasal di server.py: lookup dari
+    structure index, fallback ke RAG jika structure index belum ada.
+
     Args:
         nomor_pasal: Nomor pasal yang dicari (1-76)
+        jelaskan: Tambahkan penjelasan dari LLM
 
     Returns:
         Isi pasal yang dimaksud
     """
-    retriever = get_retriever()
+    if nomor_pasal < 1 or nomor_pasal > 76:
+        return f"Nomor pasal harus antara 1-76. Anda memasukkan: {nomor_pasal}"
 
-    # Query spesifik untuk pasal
-    query = f"Pasal {nomor_pasal} UU Perlindungan Data Pribadi"
+    # Lookup langsung dari structure index (tanpa vector search/LLM)
+    structure = await aget_structure_index()
+    entry = structure.get_pasal(nomor_pasal) if structure else None
+    if entry is not None:
+        header = f"📜 Pasal {nomor_pasal} UU PDP"
+        if entry.get("bab"):
+            header += f" (BAB {entry['bab']})"
+        response = f"{header}:\n\n{format_pasal(entry)}"
 
-    result = retriever.answer(query, top_k=3)
+        if jelaskan:
+            retriever = await get_retriever()
+            explanation = await retriever.agenerate(
+                f"Jelaskan maksud Pasal {nomor_pasal} UU Perlindungan Data Pribadi.",
+                f"[Pasal {nomor_pasal}]\n{entry['text']}",
+            )
+            response += f"\n\n💡 Penjelasan:\n{explanation}"
 
-    # Check if pasal found in sources
-    sources = result.get("sources", [])
-    pasal_found = any(s.get("pasal") == str(nomor_pasal) for s in sources)
+        return response
 
-    if not pasal_found:
-        return f"Maaf, Pasal {nomor_pasal} tidak ditemukan atau mungkin di luar jangkauan UU PDP (Pasal 1-76)."
+    # Fallback ke RAG jika structure index belum dibuat
+    retriever = await get_retriever()
+    query = f"Apa isi lengkap Pasal {nomor_pasal} UU Perlindungan Data Pribadi?"
 
-    return result["answer"]
+    result = await retriever.aanswer(query, top_k=3)
+
+    return f"📜 Pasal {nomor_pasal} UU PDP:\n\n{result['answer']}"
 
 
 async def ringkasan_bab(nomor_bab: str) -> str:
     """
     Memberikan ringkasan dari bab tertentu dalam UU Perlindungan Data Pribadi.
 
+    Implementasi bersama tool ringkasan_bab di server.py: ringkasan
+    precomputed, fallback ke RAG jika belum dibuat atau sudah basi.
+
     Args:
         nomor_bab: Nomor bab dalam format Romawi (I, II, III, dst) atau angka (1, 2, 3)
 
     Returns:
         Ringkasan bab yang dimaksud
     """
-    # Convert angka ke romawi jika perlu
+    # Convert angka ke romawi
     romawi_map = {
         "1": "I", "2": "II", "3": "III", "4": "IV", "5": "V",
         "6": "VI", "7": "VII", "8": "VIII", "9": "IX", "10": "X",
@@ -104,21 +204,25 @@ async def ringkasan_bab(nomor_bab: str) -> str:
 
     bab_romawi = romawi_map.get(str(nomor_bab), str(nomor_bab).upper())
 
-    retriever = get_retriever()
-
-    # Query untuk ringkasan bab
-    query = f"Ringkasan BAB {bab_romawi} UU Perlindungan Data Pribadi. Apa saja yang diatur dalam BAB {bab_romawi}?"
+    valid_babs = list(romawi_map.values())
+    if bab_romawi not in valid_babs:
+        return f"Nomor BAB tidak valid. Gunakan 1-16 atau I-XVI. Anda memasukkan: {nomor_bab}"
 
-    result = retriever.answer(query, top_k=5)
+    # Ringkasan precomputed (dibuat saat ingest dari semua pasal di BAB)
+    structure = await aget_structure_index()
+    entry = get_summary_store().get(bab_romawi, structure) if structure else None
+    if entry is not None:
+        numbers = entry["pasal"]
+        span = f"Pasal {numbers[0]}" if len(numbers) == 1 else f"Pasal {numbers[0]}-{numbers[-1]}"
+        return f"📖 Ringkasan BAB {bab_romawi} UU PDP - {entry['judul']} ({span}):\n\n{entry['summary']}"
 
-    # Check if bab found
-    sources = result.get("sources", [])
-    bab_found = any(s.get("bab") == bab_romawi for s in sources)
+    # Fallback ke RAG jika ringkasan belum dibuat atau sudah basi
+    retriever = await get_retriever()
+    query = f"Apa saja yang diatur dalam BAB {bab_romawi} UU Perlindungan Data Pribadi? Berikan ringkasan lengkap."
 
-    if not bab_found:
-        return f"Maaf, BAB {bab_romawi} tidak ditemukan. UU PDP terdiri dari BAB I sampai BAB XVI."
+    result = await retriever.aanswer(query, top_k=5)
 
-    return f"📖 Ringkasan BAB {bab_romawi}:\n\n{result['answer']}"
+    return f"📖 Ringkasan BAB {bab_romawi} UU PDP:\n\n{result['answer']}"
 
 
 # Info tentang struktur UU PDP
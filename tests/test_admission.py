@@ -0,0 +1,145 @@
+"""Admission control: batas concurrency, antrean prioritas, load shedding, dan token bucket."""
+
+import asyncio
+
+import pytest
+
+from src.rag.admission import AdmissionController, BackendRateLimiter, OverloadedError, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def hold(controller: AdmissionController, priority: str, release: asyncio.Event, log: list):
+    async with controller.admit(priority):
+        log.append(priority)
+        await release.wait()
+
+
+async def test_full_queue_sheds_lower_priority():
+    controller = AdmissionController(max_concurrent=1, queue_size=1, queue_timeout=5)
+    release = asyncio.Event()
+    log: list[str] = []
+
+    running = asyncio.ensure_future(hold(controller, "interactive", release, log))
+    await asyncio.sleep(0)
+    background = asyncio.ensure_future(hold(controller, "background", release, log))
+    await asyncio.sleep(0)
+    interactive = asyncio.ensure_future(hold(controller, "interactive", release, log))
+    await asyncio.sleep(0)
+
+    # Request background yang antre digeser oleh request interactive
+    with pytest.raises(OverloadedError) as shed:
+        await background
+    assert shed.value.reason == "shed"
+    assert shed.value.retry_after >= 1.0
+
+    # Antrean penuh oleh prioritas yang sama: request baru ditolak langsung
+    with pytest.raises(OverloadedError) as full:
+        async with controller.admit("interactive"):
+            pass
+    assert full.value.reason == "queue_full"
+
+    release.set()
+    await asyncio.gather(running, interactive)
+    assert log == ["interactive", "interactive"]
+    stats = controller.stats()
+    assert stats["rejected"] == {"queue_full": 1, "queue_timeout": 0, "shed": 1}
+    assert stats["active"] == 0 and stats["queue_length"] == 0
+
+
+async def test_queue_timeout_rejects_and_frees_queue():
+    controller = AdmissionController(max_concurrent=1, queue_size=4, queue_timeout=0.02)
+    release = asyncio.Event()
+    running = asyncio.ensure_future(hold(controller, "interactive", release, []))
+    await asyncio.sleep(0)
+
+    with pytest.raises(OverloadedError) as timeout:
+        async with controller.admit("batch"):
+            pass
+    assert timeout.value.reason == "queue_timeout"
+    assert controller.stats()["queue_length"] == 0
+
+    release.set()
+    await running
+    async with controller.admit("batch"):
+        assert controller.stats()["active"] == 1
+
+
+async def test_waiters_are_admitted_by_priority():
+    controller = AdmissionController(max_concurrent=1, queue_size=4, queue_timeout=5)
+    release = asyncio.Event()
+    log: list[str] = []
+
+    running = asyncio.ensure_future(hold(controller, "interactive", release, log))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.ensure_future(hold(controller, priority, release, log))
+        for priority in ("background", "batch", "interactive")
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(running, *queued)
+
+    assert log == ["interactive", "interactive", "batch", "background"]
+    assert controller.stats()["peak_active"] == 1
+
+
+async def test_cancelled_waiter_leaves_queue():
+    controller = AdmissionController(max_concurrent=1, queue_size=4, queue_timeout=5)
+    release = asyncio.Event()
+    running = asyncio.ensure_future(hold(controller, "interactive", release, []))
+    await asyncio.sleep(0)
+    waiting = asyncio.ensure_future(hold(controller, "batch", release, []))
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert controller.stats()["queue_length"] == 0
+
+    release.set()
+    await running
+    assert controller.stats()["active"] == 0
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    # Melebihi max_wait: ditolak tanpa mengurangi token
+    assert bucket.reserve(max_wait=0.5) is None
+    assert bucket.wait_time() == pytest.approx(1.0)
+
+    clock.now = 1.5
+    assert bucket.reserve() == 0.0
+
+
+def test_rate_limiter_rejects_instead_of_waiting_too_long():
+    limiter = BackendRateLimiter("gemini_generate", qps=1, tpm=600, max_wait=0.5)
+
+    assert limiter.reserve(tokens=100) == 0.0
+    with pytest.raises(OverloadedError) as rejected:
+        limiter.reserve(tokens=100)
+    assert rejected.value.reason == "rate_limit"
+    assert 0.5 < rejected.value.retry_after <= 1.0
+    assert limiter.stats()["rejected"] == 1
+
+    # Tanpa batas waktu tunggu, call berikutnya dijadwalkan setelah kuota terisi
+    assert limiter.reserve(tokens=100, max_wait=float("inf")) > 0.5
+    assert limiter.stats()["waited"] == 1
+
+
+def test_rate_limiter_share_splits_quota():
+    limiter = BackendRateLimiter("pinecone", qps=8, tpm=0)
+    limiter.share(4)
+    assert limiter.stats()["qps"] == 2
+    assert limiter.requests.rate == 2
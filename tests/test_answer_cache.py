@@ -0,0 +1,48 @@
+"""Semantic answer cache: referensi Pasal/ayat/BAB bagian dari key cache."""
+
+import pytest
+
+from src.rag.answer_cache import SemanticAnswerCache, extract_references
+
+EMBEDDING = [0.3, 0.5, 0.8]
+
+
+@pytest.fixture
+def cache(tmp_path) -> SemanticAnswerCache:
+    return SemanticAnswerCache(threshold=0.9, version_path=tmp_path / "VERSION")
+
+
+def test_different_pasal_never_hits(cache):
+    cache.put("Apa isi lengkap Pasal 5?", EMBEDDING, 5, {"answer": "Pasal 5 ..."})
+
+    assert cache.lookup("Apa isi lengkap Pasal 6?", EMBEDDING, 5) is None
+    assert cache.lookup("Apa isi lengkap Pasal 5 ayat (2)?", EMBEDDING, 5) is None
+    assert cache.lookup("apa isi lengkap pasal 5", EMBEDDING, 5)["answer"] == "Pasal 5 ..."
+
+
+def test_bab_roman_and_arabic_are_the_same_reference(cache):
+    cache.put("Ringkas BAB IV", EMBEDDING, 5, {"answer": "BAB IV"})
+
+    assert cache.lookup("Ringkas bab 4", EMBEDDING, 5)["answer"] == "BAB IV"
+    assert cache.lookup("Ringkas BAB VI", EMBEDDING, 5) is None
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("Apa hak subjek data?", ()),
+        ("Bunyi Pasal 12 ayat (3)", (("ayat", 3), ("pasal", 12))),
+        ("ayat 1 pasal 4 dan BAB XIV", (("ayat", 1), ("bab", 14), ("pasal", 4))),
+    ],
+)
+def test_extract_references(query, expected):
+    assert extract_references(query) == expected
+
+
+def test_explicit_zero_settings_are_honoured(tmp_path):
+    cache = SemanticAnswerCache(threshold=0.0, ttl=0, max_entries=0,
+                                version_path=tmp_path / "VERSION")
+    assert (cache.threshold, cache.ttl, cache.max_entries) == (0.0, 0, 0)
+
+    cache.put("Apa itu data pribadi?", EMBEDDING, 5, {"answer": "..."})
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,79 @@
+"""Pipeline async: aanswer tidak memblokir event loop dan request berjalan paralel."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeEmbeddingService, FakeLLM, FakeVectorIndex
+from src.rag import executor
+from src.rag.executor import run_blocking
+from src.rag.retriever import RAGRetriever
+
+LATENCY = 0.15
+
+
+@pytest.fixture
+def retriever(monkeypatch) -> RAGRetriever:
+    monkeypatch.setenv("RETRIEVAL_MODE", "vector")
+    monkeypatch.setenv("RERANKER", "none")
+    return RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=0.02),
+        pinecone_client=FakeVectorIndex(latency=0.02),
+        llm=FakeLLM(latency=LATENCY),
+        answer_cache=None,
+    )
+
+
+async def ticker(stop: asyncio.Event, ticks: list[float]) -> None:
+    while not stop.is_set():
+        ticks.append(time.perf_counter())
+        await asyncio.sleep(0.01)
+
+
+async def test_concurrent_answers_overlap_and_loop_stays_responsive(retriever):
+    stop, ticks = asyncio.Event(), []
+    tick_task = asyncio.create_task(ticker(stop, ticks))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(retriever.aanswer(f"Apa kewajiban pengendali nomor {i}?") for i in range(6))
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick_task
+
+    assert all(r["answer"].startswith("Jawaban palsu") and r["sources"] for r in results)
+    assert retriever.llm.calls == 6
+    # Berjalan paralel: jauh di bawah 6 x latency LLM
+    assert elapsed < 3 * LATENCY
+    # Event loop tetap berdetak selama generation
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+
+
+async def test_run_blocking_is_bounded_and_off_loop(monkeypatch):
+    monkeypatch.setenv("RAG_EXECUTOR_WORKERS", "2")
+    monkeypatch.setattr(executor, "_executor", None)
+    active, peak, lock = 0, 0, threading.Lock()
+
+    def blocking_sdk_call(n: int) -> int:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return n * 2
+
+    stop, ticks = asyncio.Event(), []
+    tick_task = asyncio.create_task(ticker(stop, ticks))
+    results = await asyncio.gather(*(run_blocking(blocking_sdk_call, n) for n in range(4)))
+    stop.set()
+    await tick_task
+
+    assert results == [0, 2, 4, 6]
+    assert peak == 2
+    assert len(ticks) >= 5
+    executor.shutdown_executor()
@@ -0,0 +1,25 @@
+"""Ringkasan BAB: store global dimuat ulang saat file ringkasan berubah."""
+
+from src.rag import bab_summaries
+from src.rag.bab_summaries import BabSummaryStore, get_summary_store
+
+
+def entry(bab: str, summary: str) -> dict:
+    return {"bab": bab, "judul": "KETENTUAN UMUM", "pasal": ["1"], "model": "fake",
+            "source_hash": "x", "summary": summary, "generated_at": 0}
+
+
+def test_global_store_reloads_when_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv("INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(bab_summaries, "_summary_store", None)
+    assert get_summary_store().get("I") is None
+
+    # Ingest (proses lain) menulis ringkasan baru
+    writer = BabSummaryStore()
+    writer.put(entry("I", "Ringkasan lama"))
+    writer.save()
+    assert get_summary_store().get("I")["summary"] == "Ringkasan lama"
+
+    writer.put(entry("I", "Ringkasan baru"))
+    writer.save()
+    assert get_summary_store().get("I")["summary"] == "Ringkasan baru"
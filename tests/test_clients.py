@@ -0,0 +1,155 @@
+"""Client registry: httpx client per event loop ditutup bersama loop-nya, warm-up dan readiness."""
+
+import asyncio
+import gc
+import warnings
+
+import pytest
+
+from benchmarks.fake_servers import FakePineconeServer
+from src.healthcheck import check_readiness
+from src.rag.clients import ClientRegistry
+
+
+def test_http_client_is_closed_when_its_loop_is_replaced():
+    registry = ClientRegistry()
+    clients = []
+
+    async def query(url: str) -> int:
+        client = registry.http_client("pinecone")
+        clients.append(client)
+        response = await client.post(f"{url}/describe_index_stats", json={})
+        return response.status_code
+
+    with FakePineconeServer(latency=0) as server, warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        assert [asyncio.run(query(server.url)) for _ in range(3)] == [200, 200, 200]
+        gc.collect()
+
+    assert len({id(client) for client in clients}) == 3
+    assert all(client.is_closed for client in clients)
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+
+async def test_aclose_closes_clients_of_the_current_loop():
+    registry = ClientRegistry()
+    client = registry.http_client("pinecone")
+    assert registry.http_client("pinecone") is client
+
+    await registry.aclose()
+    assert client.is_closed
+    assert registry.http_client("pinecone") is not client
+    await registry.aclose()
+
+
+async def test_requests_reuse_one_keepalive_connection(monkeypatch):
+    monkeypatch.setenv("PINECONE_MAX_CONNECTIONS", "4")
+    registry = ClientRegistry()
+
+    with FakePineconeServer(latency=0) as server:
+        for _ in range(5):
+            client = registry.http_client("pinecone")
+            response = await client.post(f"{server.url}/query", json={"vector": [0.1], "topK": 1})
+            assert response.status_code == 200
+        pool = registry.stats()["pinecone"]["pool"]
+
+    assert registry.http_client("pinecone") is client
+    assert pool["connections"] == 1
+    assert pool["idle"] == 1 and pool["utilization"] == 0.0
+    assert registry.stats()["pinecone"]["max_connections"] == 4
+    await registry.aclose()
+
+
+def test_genai_is_configured_once_per_api_key(monkeypatch):
+    import google.generativeai as genai
+
+    calls = []
+    monkeypatch.setattr(genai, "configure", lambda **kwargs: calls.append(kwargs["api_key"]))
+    registry = ClientRegistry()
+    registry.configure_genai("key-a")
+    registry.configure_genai("key-a")
+    registry.configure_genai("key-b")
+    assert calls == ["key-a", "key-b"]
+
+
+async def test_server_and_tools_share_one_retriever(monkeypatch):
+    from src import server
+    from src.rag import clients
+    from src.tools import pdp_tools
+
+    monkeypatch.setattr(clients, "_registry", ClientRegistry())
+    retriever = object()
+    clients.get_client_registry().register(retriever=retriever)
+
+    assert await server.get_retriever() is retriever
+    assert await pdp_tools.get_retriever() is retriever
+    assert server.get_router() is pdp_tools.get_router()
+
+
+class WarmUpBackend:
+    """Backend fake dengan warm_up() yang gagal `failures` kali lalu berhasil."""
+
+    def __init__(self, failures: int = 0, on_call=None):
+        self.failures = failures
+        self.calls = 0
+        self.on_call = on_call
+
+    async def warm_up(self) -> None:
+        self.calls += 1
+        if self.on_call is not None:
+            self.on_call()
+        if self.calls <= self.failures:
+            raise ConnectionError("pinecone belum bisa dihubungi")
+
+
+class WarmUpRetriever:
+    def __init__(self, pinecone_client: WarmUpBackend):
+        self.embedding_service = WarmUpBackend()
+        self.pinecone_client = pinecone_client
+        self.reranker = None
+
+
+@pytest.fixture
+def ready_file(tmp_path, monkeypatch):
+    path = tmp_path / "ready"
+    monkeypatch.setenv("READY_FILE", str(path))
+    return path
+
+
+async def test_warm_up_retries_until_ready(ready_file):
+    observed = []
+    pinecone = WarmUpBackend(failures=1, on_call=lambda: observed.append(check_readiness()))
+    registry = ClientRegistry()
+    registry.register(retriever=WarmUpRetriever(pinecone))
+
+    results = await registry.run_warm_up(retry_interval=0.01)
+
+    # Belum ready sebelum warm-up pertama selesai, lalu gagal, lalu ready
+    assert observed[0] == (False, "warm-up belum selesai")
+    assert observed[1][0] is False and "pinecone belum bisa dihubungi" in observed[1][1]
+    assert check_readiness() == (True, "ready")
+    assert registry.ready
+    assert pinecone.calls == 2
+    assert registry.retriever().embedding_service.calls == 2
+    assert set(results) == {"imports", "structure", "retriever", "gemini", "pinecone"}
+    assert all(isinstance(ms, float) for ms in results.values())
+
+
+async def test_failed_warm_up_without_retry_stays_not_ready(ready_file):
+    registry = ClientRegistry()
+    registry.register(retriever=WarmUpRetriever(WarmUpBackend(failures=1)))
+
+    results = await registry.run_warm_up(retry_interval=0)
+
+    assert results["pinecone"].startswith("error:")
+    assert not registry.ready
+    assert check_readiness()[0] is False
+
+
+async def test_server_lifespan_clears_readiness_on_shutdown(ready_file, monkeypatch):
+    from src.server import server_lifespan
+
+    monkeypatch.setenv("CLIENT_WARMUP", "false")
+    async with server_lifespan():
+        assert check_readiness() == (True, "ready")
+    assert check_readiness() == (False, "warm-up belum selesai")
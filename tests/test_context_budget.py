@@ -0,0 +1,87 @@
+"""Context budget: merge chunk berurutan, dedupe baris, dan batas token context."""
+
+import pytest
+
+from src.rag.context_budget import ContextAssembler, estimate_tokens, legacy_context
+
+SENTENCES = [
+    "Pengendali data pribadi wajib memiliki dasar pemrosesan data pribadi.",
+    "Subjek data pribadi berhak mendapatkan informasi tentang kejelasan identitas.",
+    "Pemrosesan data pribadi dilakukan secara terbatas dan spesifik.",
+    "Pengendali data pribadi wajib menjaga kerahasiaan data pribadi.",
+    "Sanksi administratif berupa peringatan tertulis dan denda administratif.",
+]
+
+
+def make_doc(index: int, text: str, score: float, pasal: str, document_id: str = "uu-pdp") -> dict:
+    return {
+        "id": f"{document_id}-{index}",
+        "score": score,
+        "metadata": {
+            "text": text,
+            "chunk_index": index,
+            "document_id": document_id,
+            "bab": "IV",
+            "pasal": pasal,
+        },
+    }
+
+
+def make_documents() -> list[dict]:
+    docs = []
+    for i in range(8):
+        text = "\n".join(f"{SENTENCES[(i + j) % len(SENTENCES)]} ({i})" for j in range(3))
+        pasal = str(20 + i)
+        docs.append(make_doc(i * 2, f"Pasal {pasal}\n{text}", score=1.0 - i * 0.1, pasal=pasal))
+    return docs
+
+
+@pytest.mark.parametrize("budget", [30, 60, 100, 150, 250, 400])
+def test_context_never_exceeds_budget(budget):
+    assembler = ContextAssembler(budget_tokens=budget)
+    result = assembler.assemble(make_documents())
+
+    assert result.tokens <= budget
+    assert result.tokens == estimate_tokens(result.text)
+    assert result.truncated
+    assert result.documents[0]["id"] == "uu-pdp-0"
+
+
+def test_consecutive_chunks_are_merged_without_overlap():
+    overlap = "data pribadi yang diproses secara elektronik"
+    first = make_doc(3, f"Pasal 4\nPasal ini berlaku untuk {overlap}", 0.9, "4")
+    second = make_doc(4, f"{overlap} maupun nonelektronik.", 0.8, "4")
+    other = make_doc(3, "Pasal 4 dokumen lain", 0.7, "4", document_id="pp-71")
+
+    result = ContextAssembler(budget_tokens=0).assemble([second, other, first])
+
+    assert result.merged_chunks == 1
+    assert result.text.count(overlap) == 1
+    assert "elektronik maupun nonelektronik." in result.text
+    assert "Pasal 4 dokumen lain" in result.text
+    assert result.saved_tokens > 0
+    assert not result.truncated
+
+
+def test_duplicate_lines_are_dropped_from_less_relevant_segments():
+    line = SENTENCES[0]
+    docs = [
+        make_doc(0, f"Pasal 20\n{line}", 0.9, "20"),
+        make_doc(10, f"Pasal 35\n{line}\n{SENTENCES[1]}", 0.5, "35"),
+    ]
+    result = ContextAssembler(budget_tokens=0).assemble(docs)
+
+    assert result.text.count(line) == 1
+    assert result.duplicate_lines == 1
+    assert result.tokens < estimate_tokens(legacy_context(docs))
+
+
+def test_stats_accumulate_per_request():
+    assembler = ContextAssembler(budget_tokens=60)
+    for _ in range(2):
+        assembler.assemble(make_documents())
+
+    stats = assembler.stats()
+    assert stats["requests"] == 2
+    assert stats["truncated"] == 2
+    assert 0 < stats["mean_tokens"] <= 60
@@ -0,0 +1,123 @@
+"""Korpus multi-dokumen: manifest, ID dokumen, dan filter document_id di retrieval."""
+
+import json
+
+import pytest
+
+from benchmarks.fakes import FakeEmbeddingService, FakeLLM
+from src.document.corpus import get_document, iter_corpus_chunks, load_corpus, make_document_id
+from src.rag.ingestion import IngestionPipeline
+from src.rag.lexical_index import BM25Index, LexicalSegment
+from src.rag.local_index import LocalVectorIndex
+from src.rag.retriever import RAGRetriever, document_filter
+
+
+def write_manifest(data_dir, documents):
+    (data_dir / "corpus.json").write_text(json.dumps({"documents": documents}))
+
+
+def test_manifest_and_unlisted_pdfs(tmp_path):
+    for name in ("UU Nomor 27 Tahun 2022.pdf", "PP Nomor 71 Tahun 2019.pdf", "PP_Nomor 71.pdf"):
+        (tmp_path / name).write_bytes(b"")
+    write_manifest(tmp_path, [
+        {"id": "uu-pdp", "file": "UU Nomor 27 Tahun 2022.pdf", "title": "UU PDP"},
+    ])
+
+    documents = load_corpus(tmp_path)
+
+    assert [d.id for d in documents][:2] == ["uu-pdp", "pp-nomor-71-tahun-2019"]
+    assert documents[2].id == "pp-nomor-71"
+    assert documents[0].title == "UU PDP"
+    assert documents[0].id_prefix == "uu-pdp-chunk"
+    assert get_document("uu-pdp", tmp_path).path.name == "UU Nomor 27 Tahun 2022.pdf"
+    with pytest.raises(KeyError):
+        get_document("pp-80", tmp_path)
+
+
+@pytest.mark.parametrize(
+    "documents",
+    [
+        [{"id": "UU PDP", "file": "a.pdf"}],
+        [{"id": "uu-pdp", "file": "a.pdf"}, {"id": "uu-pdp", "file": "b.pdf"}],
+    ],
+)
+def test_invalid_or_duplicate_manifest_ids_are_rejected(tmp_path, documents):
+    write_manifest(tmp_path, documents)
+    with pytest.raises(ValueError):
+        load_corpus(tmp_path)
+
+
+def test_colliding_slug_gets_file_hash_suffix(tmp_path):
+    for name in ("PP Nomor 71.pdf", "PP_Nomor 71.pdf"):
+        (tmp_path / name).write_bytes(b"")
+    first, second = load_corpus(tmp_path)
+    assert first.id == "pp-nomor-71"
+    assert second.id.startswith("pp-nomor-71-") and second.id != first.id
+
+
+def test_make_document_id_is_stable_slug():
+    assert make_document_id("Pedoman  Teknis (v2).pdf") == "pedoman-teknis-v2"
+    assert make_document_id("___.pdf") == make_document_id("___.pdf") != ""
+
+
+def test_document_filter():
+    assert document_filter(None) is None
+    assert document_filter("uu-pdp") == {"document_id": {"$eq": "uu-pdp"}}
+    assert document_filter(["uu-pdp", "pp-71"]) == {"document_id": {"$in": ["uu-pdp", "pp-71"]}}
+
+
+def make_corpus(tmp_path) -> list:
+    write_manifest(tmp_path, [
+        {"id": "uu-pdp", "file": "uu.pdf", "title": "UU PDP"},
+        {"id": "pp-71", "file": "pp.pdf", "title": "PP 71"},
+    ])
+    return load_corpus(tmp_path)
+
+
+PAGES = {
+    "uu-pdp": [
+        "BAB I\nKETENTUAN UMUM\nPasal 1\nPengendali data pribadi wajib melindungi data.\n"
+        "Pasal 2\nSubjek data pribadi berhak atas informasi."
+    ],
+    "pp-71": [
+        "BAB I\nKETENTUAN UMUM\nPasal 1\nPenyelenggara sistem elektronik wajib melindungi data.\n"
+        "Pasal 2\nPenyelenggara wajib mendaftarkan sistem elektronik."
+    ],
+}
+
+
+def test_retrieval_is_limited_to_requested_documents(tmp_path, monkeypatch):
+    monkeypatch.setenv("RETRIEVAL_MODE", "hybrid")
+    monkeypatch.setenv("RERANKER", "none")
+    embedder = FakeEmbeddingService(latency=0, dimension=8)
+    store = LocalVectorIndex(index_dir=tmp_path / "index", dimension=8)
+    segments = {}
+    for document in make_corpus(tmp_path):
+        chunks = list(iter_corpus_chunks(document, PAGES[document.id], mode="structural"))
+        assert {c["metadata"]["document_id"] for c in chunks} == {document.id}
+        assert {c["metadata"]["source"] for c in chunks} == {document.title}
+
+        pipeline = IngestionPipeline(embedder, store, embed_workers=1, id_prefix=document.id_prefix)
+        pipeline.run(chunks, resume=False)
+        segments[document.id] = LexicalSegment.build(
+            [c["id"] for c in chunks],
+            [c["text"] for c in chunks],
+            [{"text": c["text"], **c["metadata"]} for c in chunks],
+        )
+
+    retriever = RAGRetriever(
+        embedding_service=embedder,
+        pinecone_client=store,
+        llm=FakeLLM(latency=0),
+        lexical_index=BM25Index(segments),
+    )
+    query = "wajib melindungi data pribadi"
+
+    assert {d["metadata"]["document_id"] for d in retriever.retrieve(query, top_k=4)} == {
+        "uu-pdp", "pp-71"
+    }
+    for doc_id in ("uu-pdp", "pp-71"):
+        results = retriever.retrieve(query, top_k=4, document=doc_id)
+        assert results
+        assert {d["metadata"]["document_id"] for d in results} == {doc_id}
+        assert all(d["id"].startswith(f"{doc_id}-chunk-") for d in results)
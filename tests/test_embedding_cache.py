@@ -0,0 +1,59 @@
+"""Embedding cache: SQLite tidak disentuh di event loop dan cache hit tidak menulis."""
+
+import threading
+
+from src.rag.embedding_cache import CachedEmbeddingService, EmbeddingCache
+
+
+class RecordingCache(EmbeddingCache):
+    """EmbeddingCache yang mencatat thread setiap akses SQLite."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = []
+
+    def get_many(self, *args):
+        self.threads.append(threading.get_ident())
+        return super().get_many(*args)
+
+    def put_many(self, *args):
+        self.threads.append(threading.get_ident())
+        return super().put_many(*args)
+
+
+class FakeService:
+    model = "fake-embedding"
+    dimension = 2
+
+    async def aembed_query(self, query):
+        return [float(len(query)), 1.0]
+
+    async def aembed_queries(self, queries):
+        return [[float(len(q)), 1.0] for q in queries]
+
+
+async def test_async_embeddings_do_not_touch_sqlite_on_event_loop(tmp_path):
+    cache = RecordingCache(tmp_path / "cache.sqlite3")
+    service = CachedEmbeddingService(FakeService(), cache)
+
+    assert await service.aembed_query("pengendali") == [10.0, 1.0]
+    assert await service.aembed_query("pengendali") == [10.0, 1.0]
+    assert await service.aembed_queries(["pengendali", "prosesor"]) == [[10.0, 1.0], [8.0, 1.0]]
+
+    assert len(cache.threads) == 5
+    assert threading.get_ident() not in cache.threads
+
+
+def test_hits_batch_last_access_writes(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", touch_interval=60)
+    cache.put_many("m", "retrieval_query", ["a", "b"], [[1.0], [2.0]])
+    changes = cache._conn.total_changes
+
+    for _ in range(5):
+        assert cache.get_many("m", "retrieval_query", ["a", "b"]) == [[1.0], [2.0]]
+    assert cache._conn.total_changes == changes
+
+    # Waktu akses tertunda ditulis sebelum eviction berikutnya
+    cache.put("m", "retrieval_query", "c", [3.0])
+    assert cache._conn.total_changes == changes + 3
+    cache.close()
@@ -0,0 +1,82 @@
+"""EmbeddingService.embed_batch: request multi-content, paralel terbatas, retry, urutan input."""
+
+import threading
+import time
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from src.rag import clients, embeddings
+from src.rag.embeddings import EmbeddingService
+
+
+class FakeBatchEndpoint:
+    """Meniru genai.embed_content: satu request per list content."""
+
+    def __init__(self, latency: float = 0.02, rate_limited: int = 0):
+        self.latency = latency
+        self.rate_limited = rate_limited
+        self.requests: list[list[str]] = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, model, content, task_type, request_options=None):
+        assert isinstance(content, list)
+        with self._lock:
+            self.requests.append(content)
+            if self.rate_limited:
+                self.rate_limited -= 1
+                raise google_exceptions.ResourceExhausted("quota")
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        # Batch yang lebih awal selesai lebih lambat agar urutan hasil teruji
+        time.sleep(self.latency * (1 + len(self.requests) % 3))
+        with self._lock:
+            self.active -= 1
+        return {"embedding": [[float(text.split()[-1])] for text in content]}
+
+
+@pytest.fixture
+def service(monkeypatch) -> EmbeddingService:
+    monkeypatch.setattr(clients, "_registry", clients.ClientRegistry())
+    monkeypatch.setattr(clients.ClientRegistry, "configure_genai", lambda self, api_key=None: None)
+    return EmbeddingService(api_key="test-key", retry_base_delay=0.001)
+
+
+def test_embed_batch_sends_multi_content_requests_in_order(service, monkeypatch):
+    endpoint = FakeBatchEndpoint()
+    monkeypatch.setattr(embeddings.genai, "embed_content", endpoint)
+    texts = [f"chunk {i}" for i in range(250)]
+
+    vectors = service.embed_batch(texts, batch_size=50, max_concurrency=3)
+
+    assert vectors == [[float(i)] for i in range(250)]
+    assert sorted(len(batch) for batch in endpoint.requests) == [50] * 5
+    assert 1 < endpoint.peak <= 3
+
+
+def test_embed_batch_caps_batch_size_at_api_limit(service, monkeypatch):
+    endpoint = FakeBatchEndpoint(latency=0)
+    monkeypatch.setattr(embeddings.genai, "embed_content", endpoint)
+
+    service.embed_batch([f"chunk {i}" for i in range(150)], batch_size=500)
+    assert sorted(len(batch) for batch in endpoint.requests) == [50, 100]
+    assert service.embed_batch([]) == []
+
+
+def test_embed_batch_retries_rate_limited_requests(service, monkeypatch):
+    endpoint = FakeBatchEndpoint(latency=0, rate_limited=2)
+    monkeypatch.setattr(embeddings.genai, "embed_content", endpoint)
+
+    vectors = service.embed_batch([f"chunk {i}" for i in range(10)], max_concurrency=1)
+    assert vectors == [[float(i)] for i in range(10)]
+    assert len(endpoint.requests) == 3
+
+
+def test_embed_batch_gives_up_after_max_retries(service, monkeypatch):
+    service.max_retries = 1
+    monkeypatch.setattr(embeddings.genai, "embed_content", FakeBatchEndpoint(rate_limited=5))
+
+    with pytest.raises(google_exceptions.ResourceExhausted):
+        service.embed_batch(["chunk 1"])
@@ -0,0 +1,50 @@
+"""Readiness: satu proses server dan agregasi per worker HTTP."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.healthcheck import (
+    check_readiness,
+    worker_ready_file,
+    write_readiness,
+    write_workers,
+)
+
+
+@pytest.fixture
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_single_process_readiness(tmp_path):
+    path = tmp_path / "ready"
+    assert check_readiness(path) == (False, "warm-up belum selesai")
+
+    write_readiness(False, {"pinecone": "timeout"}, path)
+    assert check_readiness(path) == (False, "warm-up gagal: {'pinecone': 'timeout'}")
+
+    write_readiness(True, {"pinecone": 12.0}, path)
+    assert check_readiness(path) == (True, "ready")
+
+
+def test_every_worker_must_be_ready(tmp_path, dead_pid):
+    path = tmp_path / "ready"
+    pid = os.getpid()
+    write_workers([pid], path)
+    assert check_readiness(path) == (False, f"worker {pid}: warm-up belum selesai")
+
+    write_readiness(True, {}, worker_ready_file(pid, path))
+    assert check_readiness(path) == (True, "ready (1 worker)")
+
+    # Worker yang mati (belum diganti master) membuat server tidak ready
+    write_workers([pid, dead_pid], path)
+    worker_ready_file(dead_pid, path).write_text(json.dumps({"pid": dead_pid, "ready": True}))
+    assert check_readiness(path) == (
+        False, f"worker {dead_pid}: proses server {dead_pid} tidak berjalan"
+    )
@@ -0,0 +1,134 @@
+"""Ingest incremental: mengubah satu pasal hanya meng-upsert chunk pasal tersebut."""
+
+import numpy as np
+
+from src.document.structural_chunker import StructuralChunker
+from src.rag.ingestion import ChunkManifest, IngestionPipeline, chunk_hash
+from src.rag.lexical_index import LexicalSegment, LexicalSegmentBuilder
+
+
+class FakeEmbeddingService:
+    model = "fake-embedding"
+
+    def embed_batch(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class MemoryVectorStore:
+    index_name = "memory"
+
+    def __init__(self):
+        self.vectors = {}
+        self.upserted = []
+        self.deleted = []
+
+    def upsert_vectors(self, vectors, namespace="", batch_size=100):
+        for vector in vectors:
+            self.vectors[vector["id"]] = vector
+            self.upserted.append(vector["id"])
+
+    def delete_vectors(self, ids, namespace=""):
+        for vector_id in ids:
+            self.vectors.pop(vector_id, None)
+            self.deleted.append(vector_id)
+
+
+def make_pages(pasal_2: str) -> list[str]:
+    lines = ["BAB I", "KETENTUAN UMUM"]
+    for nomor in range(1, 9):
+        lines.append(f"Pasal {nomor}")
+        if nomor == 2:
+            lines.append(pasal_2)
+            continue
+        lines.append(f"(1) Ketentuan pertama pasal {nomor} mengatur pemrosesan data pribadi.")
+        lines.append(f"(2) Ketentuan kedua pasal {nomor} mengatur pengendali data pribadi.")
+    return ["\n".join(lines)]
+
+
+def ingest(pages, store, manifest, max_chars=200):
+    pipeline = IngestionPipeline(
+        FakeEmbeddingService(), store, batch_size=3, embed_workers=1,
+        id_prefix="uu-pdp-chunk", manifest=manifest,
+    )
+    chunks = StructuralChunker(max_chars=max_chars).iter_chunks(pages)
+    return pipeline.run(chunks, resume=False)
+
+
+def test_amending_one_pasal_only_upserts_its_chunks(tmp_path):
+    store = MemoryVectorStore()
+    manifest = ChunkManifest(tmp_path / "manifest.json")
+    first = ingest(make_pages("Undang-Undang ini berlaku untuk setiap orang."), store, manifest)
+    assert first["diff"]["added"] == len(store.vectors)
+
+    # Pasal 2 diperpanjang sampai dipecah menjadi beberapa chunk
+    amended = " ".join(f"Kalimat tambahan nomor {i} tentang ruang lingkup." for i in range(8))
+    store.upserted.clear()
+    second = ingest(make_pages(amended), store, manifest)
+
+    assert store.upserted
+    assert all(v.startswith("uu-pdp-chunk-pasal-2") for v in store.upserted)
+    assert all(v.startswith("uu-pdp-chunk-pasal-2") for v in store.deleted)
+    assert second["diff"]["unchanged"] == first["diff"]["added"] - 1
+
+
+def test_vector_ids_follow_structure():
+    pipeline = IngestionPipeline(FakeEmbeddingService(), MemoryVectorStore(), id_prefix="doc")
+    chunks = list(StructuralChunker(max_chars=90).iter_chunks(make_pages("Pasal pendek.")))
+    ids = [pipeline.vector_id(chunk) for chunk in chunks]
+
+    assert "doc-pasal-2" in ids
+    assert "doc-pasal-1-ayat-1" in ids and "doc-pasal-1-ayat-2" in ids
+    assert len(set(ids)) == len(ids)
+
+
+def test_chunk_hash_ignores_positional_metadata():
+    chunk = {"text": "Pasal 5\nIsi", "metadata": {"pasal": "5", "chunk_index": 4, "char_count": 11}}
+    moved = {"text": "Pasal 5\nIsi", "metadata": {"pasal": "5", "chunk_index": 9, "char_count": 11}}
+    relabeled = {"text": "Pasal 5\nIsi", "metadata": {"pasal": "6", "chunk_index": 4}}
+
+    assert chunk_hash(chunk) == chunk_hash(moved)
+    assert chunk_hash(chunk) != chunk_hash(relabeled)
+
+
+def test_lexical_builder_matches_batch_build(tmp_path):
+    chunks = list(StructuralChunker(max_chars=120).iter_chunks(make_pages("Pasal pendek.")))
+    ids = [f"doc-{i}" for i in range(len(chunks))]
+    metadata = [{"text": c["text"], **c["metadata"]} for c in chunks]
+
+    builder = LexicalSegmentBuilder(tmp_path / "stream", "doc")
+    for vector_id, chunk, meta in zip(ids, chunks, metadata):
+        builder.add(vector_id, chunk["text"], meta)
+    stats = builder.save()
+    LexicalSegment.build(ids, [c["text"] for c in chunks], metadata).save(tmp_path / "batch", "doc")
+
+    streamed = LexicalSegment.load(tmp_path / "stream", "doc")
+    expected = LexicalSegment.load(tmp_path / "batch", "doc")
+    assert stats == {"chunks": len(chunks), "terms": len(expected.terms),
+                     "postings": len(expected.doc_ids)}
+    assert (streamed.terms, streamed.ids, streamed.metadata) == (
+        expected.terms, expected.ids, expected.metadata
+    )
+    for field in ("offsets", "doc_ids", "tfs", "lengths"):
+        assert np.array_equal(getattr(streamed, field), getattr(expected, field))
+    assert not (tmp_path / "stream" / "doc.spill.jsonl").exists()
+
+
+def test_pipeline_builds_lexical_segment_for_unchanged_chunks(tmp_path):
+    store = MemoryVectorStore()
+    manifest = ChunkManifest(tmp_path / "manifest.json")
+    pages = make_pages("Undang-Undang ini berlaku untuk setiap orang.")
+    ingest(pages, store, manifest)
+
+    # Ingest ulang tanpa perubahan: tidak ada upsert, tetapi segment BM25 tetap lengkap
+    store.upserted.clear()
+    pipeline = IngestionPipeline(
+        FakeEmbeddingService(), store, batch_size=3, embed_workers=1,
+        id_prefix="uu-pdp-chunk", manifest=manifest,
+        lexical=LexicalSegmentBuilder(tmp_path / "lexical", "uu-pdp"),
+    )
+    stats = pipeline.run(StructuralChunker(max_chars=200).iter_chunks(pages), resume=False)
+
+    assert store.upserted == []
+    assert stats["lexical"]["chunks"] == len(store.vectors)
+    segment = LexicalSegment.load(tmp_path / "lexical", "uu-pdp")
+    assert sorted(segment.ids) == sorted(store.vectors)
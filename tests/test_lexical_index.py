@@ -0,0 +1,92 @@
+"""Index BM25: stemming, reload setelah ingest, dan keputusan lexical-only di semua jalur answer."""
+
+import pytest
+
+from benchmarks.fakes import FakeEmbeddingService, FakeLLM, FakeStreamingLLM, FakeVectorIndex
+from src.rag import lexical_index
+from src.rag.index_version import bump_index_version
+from src.rag.lexical_index import BM25Index, LexicalSegment, stem
+from src.rag.retriever import RAGRetriever
+
+
+@pytest.mark.parametrize(
+    "words, expected",
+    [
+        (("pengendali", "mengendalikan", "pengendalian"), "endali"),
+        (("pemrosesan", "memproses", "diproses", "proses"), "proses"),
+        (("sanksi",), "sanksi"),
+        (("melindungi", "pelindungan", "perlindungan"), "lindung"),
+        (("persetujuan", "menyetujui"), "setuju"),
+        (("dikendalikan",), "kendali"),
+        (("diperlukan",), "perlu"),
+    ],
+)
+def test_stem_is_consistent_across_affixes(words, expected):
+    assert [stem(word) for word in words] == [expected] * len(words)
+
+
+def make_segment(pasal: dict[int, str]) -> LexicalSegment:
+    ids = [f"uu-pdp-pasal-{n}" for n in pasal]
+    metadata = [{"pasal": str(n), "text": text} for n, text in pasal.items()]
+    return LexicalSegment.build(ids, list(pasal.values()), metadata)
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(lexical_index, "_lexical_index", None)
+    monkeypatch.setattr(lexical_index, "_lexical_watcher", None)
+    return tmp_path
+
+
+def test_global_index_reloads_after_new_index_version(index_dir):
+    make_segment({1: "Pengendali data pribadi wajib"}).save(index_dir / "lexical", "uu-pdp")
+    bump_index_version()
+    assert lexical_index.get_lexical_index().search("sanksi administratif") == []
+
+    make_segment({57: "Sanksi administratif berupa denda"}).save(index_dir / "lexical", "uu-pdp")
+    bump_index_version()
+    [hit] = lexical_index.get_lexical_index().search("sanksi administratif")
+    assert hit["id"] == "uu-pdp-pasal-57"
+
+
+def make_retriever(monkeypatch, mode: str, llm=None) -> tuple[RAGRetriever, FakeEmbeddingService]:
+    monkeypatch.setenv("RETRIEVAL_MODE", mode)
+    embedder = FakeEmbeddingService(latency=0)
+    bm25 = BM25Index({"uu-pdp": make_segment({
+        5: "Pasal 5 subjek data pribadi berhak mendapatkan informasi",
+        20: "Pasal 20 pengendali data pribadi wajib memiliki dasar pemrosesan",
+        57: "Pasal 57 sanksi administratif bagi pengendali",
+    })})
+    retriever = RAGRetriever(
+        embedding_service=embedder,
+        pinecone_client=FakeVectorIndex(latency=0),
+        llm=llm or FakeLLM(latency=0),
+        answer_cache=None,
+        lexical_index=bm25,
+    )
+    return retriever, embedder
+
+
+def test_lexical_mode_never_embeds_in_answer_paths(monkeypatch):
+    retriever, embedder = make_retriever(monkeypatch, "lexical")
+
+    assert retriever.answer("Apa kewajiban pengendali?")["sources"]
+    assert embedder.calls == 0
+
+
+async def test_pasal_shortcut_skips_embedding_in_async_paths(monkeypatch):
+    retriever, embedder = make_retriever(
+        monkeypatch, "hybrid", llm=FakeStreamingLLM(first_token_latency=0, token_latency=0)
+    )
+
+    result = await retriever.aanswer("Apa isi Pasal 57?")
+    assert result["sources"][0]["pasal"] == "57"
+    events = [event async for event in retriever.astream_answer("Bunyi Pasal 20")]
+    assert events[-1]["type"] == "done"
+    batch = [r async for r in retriever.answer_many(["Pasal 5 tentang apa?", "Pasal 57"])]
+    assert [r["sources"][0]["pasal"] for r in batch] == ["5", "57"]
+    assert embedder.calls == 0
+
+    await retriever.aanswer("Apa hak subjek data?")
+    assert embedder.calls == 1
@@ -0,0 +1,82 @@
+"""Benchmark suite: load generator, perbandingan hasil, dan fault injection fake backend."""
+
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.fakes import FakeBackendError, FakeLLM, FakeRateLimitError, FakeVectorIndex
+from benchmarks.loadgen import compare_results, percentile, run_load, save_results
+
+
+def test_percentile_interpolates_like_numpy():
+    values = [10.0, 1.0, 4.0, 7.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 5.5
+    assert percentile(values, 100) == 10.0
+    assert percentile([], 99) == 0.0
+
+
+async def test_closed_loop_respects_concurrency_and_counts_errors():
+    active, peak = 0, 0
+
+    async def operation(i: int) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if i % 5 == 0:
+            raise FakeBackendError("injected")
+
+    result = await run_load("single", operation, requests=20, concurrency=4)
+    summary = result.to_dict()
+
+    assert peak == 4
+    assert summary["requests"] == 20
+    assert summary["errors"] == 4 and summary["error_rate"] == 0.2
+    assert summary["error_types"] == {"FakeBackendError": 4}
+    assert 10 <= summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+    assert summary["rps"] > 0 and summary["rss_peak_mb"] > 0
+    json.dumps(summary)
+
+
+async def test_open_loop_latency_includes_queueing():
+    async def operation(i: int) -> None:
+        await asyncio.sleep(0.02)
+
+    # 100 rps ke satu worker 50 rps: request ke-i antre ~10i ms di belakang jadwalnya
+    result = await run_load("overload", operation, requests=20, concurrency=1, rate=100)
+    summary = result.to_dict()
+    assert summary["p50_ms"] >= 100
+    assert summary["p99_ms"] >= 200
+
+
+def test_compare_results_flags_regressions(tmp_path):
+    baseline = {"single": {"p95_ms": 100.0, "rps": 50.0, "error_rate": 0.0}}
+    path = tmp_path / "baseline.json"
+    save_results(path, {"commit": "abc123"}, baseline)
+    saved = json.loads(path.read_text())
+
+    rows = compare_results(
+        saved, {"single": {"p95_ms": 125.0, "rps": 52.0, "error_rate": 0.05}, "new": {}}
+    )
+    flagged = {row["metric"]: row["regression"] for row in rows}
+    assert flagged == {"p95_ms": True, "rps": False, "error_rate": False}
+    assert saved["meta"]["commit"] == "abc123"
+
+
+async def test_fakes_inject_latency_errors_and_quota():
+    llm = FakeLLM(latency=0, error_rate=1.0, seed=1)
+    with pytest.raises(FakeBackendError):
+        await llm.generate_content_async("prompt")
+    assert llm.errors == 1
+
+    index = FakeVectorIndex(latency=0)
+    index.quota_qps = 2
+    await index.aquery([0.1], top_k=3)
+    await index.aquery([0.1], top_k=3)
+    with pytest.raises(FakeRateLimitError):
+        await index.aquery([0.1], top_k=3)
+    assert index.throttled == 1
+    assert len(await FakeVectorIndex(latency=0).aquery([0.1], top_k=3)) == 3
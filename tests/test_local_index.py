@@ -0,0 +1,73 @@
+"""Index lokal: upsert per batch ditampung di memory dan ditulis sekali saat flush()."""
+
+import numpy as np
+
+from src.rag.index_version import bump_index_version
+from src.rag.ingestion import IngestionPipeline
+from src.rag.local_index import LocalVectorIndex
+
+
+def vectors(start: int, count: int) -> list[dict]:
+    return [
+        {"id": f"chunk-{i}", "values": [float(i), 1.0], "metadata": {"text": f"chunk {i}"}}
+        for i in range(start, start + count)
+    ]
+
+
+def test_batches_are_staged_until_flush(tmp_path):
+    index = LocalVectorIndex(index_dir=tmp_path, dimension=2)
+    for start in range(0, 30, 10):
+        index.upsert_vectors(vectors(start, 10))
+    assert not list(tmp_path.iterdir())
+
+    # Query melihat perubahan yang belum disimpan
+    assert index.query([29.0, 1.0], top_k=1)[0]["id"] == "chunk-29"
+    index.upsert_vectors([{"id": "chunk-0", "values": [0.0, 2.0], "metadata": {"text": "baru"}}])
+    assert index.delete_vectors(["chunk-1", "chunk-1", "missing"]) == {"deleted_count": 1}
+    index.flush()
+
+    reloaded = LocalVectorIndex(index_dir=tmp_path, dimension=2)
+    assert reloaded.get_stats()["total_vector_count"] == 29
+    [match] = reloaded.query([0.0, 1.0], top_k=1)
+    assert match["metadata"]["text"] == "baru"
+    assert isinstance(reloaded._load("").matrix, np.memmap)
+
+
+class FakeEmbeddingService:
+    model = "fake-embedding"
+
+    def embed_batch(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_pipeline_writes_local_index_once(tmp_path, monkeypatch):
+    index = LocalVectorIndex(index_dir=tmp_path, dimension=2)
+    saves = []
+    save = index._save
+    monkeypatch.setattr(index, "_save", lambda namespace: (saves.append(namespace), save(namespace)))
+
+    pipeline = IngestionPipeline(FakeEmbeddingService(), index, batch_size=5, embed_workers=1)
+    chunks = [{"text": f"teks chunk {i}", "metadata": {"chunk_index": i}} for i in range(40)]
+    stats = pipeline.run(chunks, resume=False)
+
+    assert stats["upserted"] == 40
+    assert saves == [""]
+    assert LocalVectorIndex(index_dir=tmp_path).get_stats()["total_vector_count"] == 40
+
+
+def test_server_reloads_namespace_after_new_index_version(tmp_path):
+    version = tmp_path / "VERSION"
+    server = LocalVectorIndex(index_dir=tmp_path / "local", dimension=2, version_path=version)
+    ingest = LocalVectorIndex(index_dir=tmp_path / "local", dimension=2, version_path=version)
+    ingest.upsert_vectors(vectors(0, 3))
+    ingest.flush()
+    bump_index_version(version)
+    assert server.get_stats()["total_vector_count"] == 3
+
+    ingest.delete_vectors(["chunk-0", "chunk-1"])
+    ingest.upsert_vectors(vectors(10, 1))
+    ingest.flush()
+    assert len(server.query([1.0, 1.0], top_k=5)) == 3
+
+    bump_index_version(version)
+    assert [m["id"] for m in server.query([1.0, 1.0], top_k=5)] == ["chunk-2", "chunk-10"]
@@ -0,0 +1,46 @@
+"""Metrics per tahap: pembatalan dicatat terpisah dari error."""
+
+import asyncio
+
+import pytest
+
+from src.rag.metrics import StageMetrics
+
+
+async def test_cancelled_span_is_not_an_error():
+    metrics = StageMetrics()
+
+    async def slow():
+        with metrics.span("generate"):
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(slow())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    with pytest.raises(ValueError), metrics.span("generate"):
+        raise ValueError("quota")
+
+    stats = metrics.stats()["generate"]
+    assert (stats["count"], stats["errors"], stats["cancelled"]) == (1, 1, 1)
+    text = metrics.render()
+    assert 'pdp_stage_cancelled_total{stage="generate"} 1' in text
+    assert "CancelledError" not in text
+
+
+def test_closed_stream_is_cancelled():
+    metrics = StageMetrics()
+
+    def stream():
+        with metrics.span("answer_stream"):
+            yield "token"
+            yield "token"
+
+    events = stream()
+    next(events)
+    events.close()
+
+    assert metrics.stats()["answer_stream"]["cancelled"] == 1
+    assert metrics.stats()["answer_stream"]["errors"] == 0
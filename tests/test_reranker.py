@@ -0,0 +1,82 @@
+"""Reranker: urutan ulang kandidat, boost rujukan struktural, cache skor, dan cross-encoder."""
+
+import pytest
+
+from src.rag.reranker import CrossEncoderReranker, LexicalReranker, get_reranker
+
+
+def make_doc(vector_id: str, text: str, score: float, **metadata) -> dict:
+    return {"id": vector_id, "score": score, "metadata": {"text": text, **metadata}}
+
+
+CANDIDATES = [
+    make_doc("c-1", "Ketentuan umum tentang informasi elektronik.", 0.9, pasal="1", bab="I"),
+    make_doc("c-2", "Subjek data pribadi berhak mengajukan keberatan.", 0.8, pasal="9", bab="III"),
+    make_doc(
+        "c-3",
+        "Pengendali data pribadi wajib dikenai sanksi administratif berupa denda.",
+        0.7, pasal="57", bab="VIII", ayat=["1", "2"],
+    ),
+    make_doc("c-4", "Sanksi pidana bagi setiap orang.", 0.6, pasal="67", bab="XIV"),
+]
+
+
+def test_relevant_low_ranked_candidate_moves_to_top():
+    reranker = LexicalReranker()
+    results = reranker.rerank("sanksi administratif pengendali data pribadi", CANDIDATES, top_k=2)
+
+    assert [doc["id"] for doc in results] == ["c-3", "c-2"]
+    assert results[0]["retrieval_score"] == 0.7
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_explicit_pasal_and_ayat_reference_is_boosted():
+    reranker = LexicalReranker()
+    [top] = reranker.rerank("Apa bunyi ayat (2) Pasal 57?", CANDIDATES, top_k=1)
+    assert top["id"] == "c-3"
+
+    [top] = reranker.rerank("Ringkas BAB XIV", CANDIDATES, top_k=1)
+    assert top["id"] == "c-4"
+
+
+def test_scores_are_cached_per_query_and_text():
+    reranker = LexicalReranker()
+    reranker.rerank("sanksi administratif", CANDIDATES, top_k=2)
+    reranker.rerank("Sanksi  administratif?", CANDIDATES, top_k=2)
+    assert reranker.stats()["cache_hits"] == len(CANDIDATES)
+
+    # Teks chunk berubah setelah re-ingest: skor dihitung ulang
+    changed = [make_doc("c-1", "Teks baru pasal 1.", 0.9, pasal="1"), *CANDIDATES[1:]]
+    reranker.rerank("sanksi administratif", changed, top_k=2)
+    stats = reranker.stats()
+    assert stats["cache_hits"] == 2 * len(CANDIDATES) - 1
+    assert stats["requests"] == 3
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.pairs = []
+
+    def predict(self, pairs):
+        self.pairs.extend(pairs)
+        return [float(len(text)) for _, text in pairs]
+
+
+async def test_cross_encoder_runs_off_loop_and_caches():
+    encoder = FakeEncoder()
+    reranker = CrossEncoderReranker(encoder=encoder)
+
+    results = await reranker.arerank("denda", CANDIDATES, top_k=1)
+    assert results[0]["id"] == "c-3"
+    await reranker.arerank("denda", CANDIDATES, top_k=1)
+    assert len(encoder.pairs) == len(CANDIDATES)
+
+
+def test_get_reranker_from_env(monkeypatch):
+    monkeypatch.setenv("RERANKER", "none")
+    assert get_reranker() is None
+    monkeypatch.setenv("RERANKER", "lexical")
+    assert isinstance(get_reranker(idf={"sanksi": 2.0}), LexicalReranker)
+    monkeypatch.setenv("RERANKER", "bm42")
+    with pytest.raises(ValueError):
+        get_reranker()
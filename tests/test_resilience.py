@@ -0,0 +1,67 @@
+"""Circuit breaker: call percobaan half-open yang dibatalkan tidak mengunci circuit."""
+
+import asyncio
+import dataclasses
+import time
+
+import pytest
+
+from src.rag.resilience import BackendGuard, CircuitBreaker, CircuitOpenError, ResiliencePolicy
+
+
+def make_guard(**overrides) -> BackendGuard:
+    policy = ResiliencePolicy.from_env("pinecone", 1.0)
+    defaults = {"max_retries": 0, "hedge": False, "failure_threshold": 1, "reset_timeout": 0.05}
+    return BackendGuard(dataclasses.replace(policy, **{**defaults, **overrides}))
+
+
+async def fail():
+    raise ConnectionError("backend down")
+
+
+async def test_cancelled_half_open_probe_releases_circuit():
+    guard = make_guard()
+    with pytest.raises(ConnectionError):
+        await guard.call(fail)
+    assert guard.breaker.state == "open"
+
+    await asyncio.sleep(0.06)
+    probe = asyncio.create_task(guard.call(lambda: asyncio.sleep(10)))
+    await asyncio.sleep(0.01)
+    with pytest.raises(CircuitOpenError):
+        await guard.call(lambda: asyncio.sleep(0, "ok"))
+
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert await guard.call(lambda: asyncio.sleep(0, "ok")) == "ok"
+    assert guard.breaker.state == "closed"
+
+
+def test_cancelled_sync_probe_releases_circuit():
+    guard = make_guard()
+    with pytest.raises(ConnectionError):
+        guard.call_sync(lambda: (_ for _ in ()).throw(ConnectionError("down")))
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    time.sleep(0.06)
+    with pytest.raises(KeyboardInterrupt):
+        guard.call_sync(interrupted)
+    assert guard.call_sync(lambda: "ok") == "ok"
+
+
+def test_stuck_probe_is_replaced_after_probe_timeout():
+    now = [0.0]
+    breaker = CircuitBreaker("pinecone", 1, reset_timeout=5, clock=lambda: now[0], probe_timeout=10)
+    breaker.record_failure()
+
+    now[0] = 5.0
+    assert breaker.before_call() is not None
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] = 15.0
+    assert breaker.before_call() is not None
@@ -0,0 +1,115 @@
+"""Query router: route struktural dan latency per pertanyaan di answer_many."""
+
+import asyncio
+
+import pytest
+
+from src.document.structure import StructureIndex
+from src.rag.router import QueryRouter
+
+
+def make_structure() -> StructureIndex:
+    pasal = {
+        n: {"nomor": n, "bab": "I", "bab_judul": "KETENTUAN UMUM", "bagian": "",
+            "text": f"Isi pasal {n}.", "ayat": [], "referensi_pasal": []}
+        for n in (1, 2)
+    }
+    bab = {"I": {"romawi": "I", "judul": "KETENTUAN UMUM", "pasal": [1, 2]}}
+    return StructureIndex(pasal=pasal, bab=bab, definitions=[])
+
+
+class SlowRetriever:
+    """answer_many yang butuh `delay` detik sebelum hasil pertama."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def answer_many(self, queries, top_k=None, stats=None):
+        await asyncio.sleep(self.delay)
+        for query in queries:
+            yield {"answer": f"RAG: {query}", "sources": [], "context": ""}
+
+
+async def test_structural_latency_is_not_charged_for_earlier_rag_questions():
+    retriever = SlowRetriever(delay=0.2)
+    router = QueryRouter(lambda: retriever, structure_index=make_structure())
+
+    results = [r async for r in router.answer_many(["Apa itu privasi?", "Pasal 2"])]
+    assert [r["route"] for r in results] == ["rag", "pasal"]
+
+    routes = router.route_stats.stats()["routes"]
+    assert routes["rag"]["mean_ms"] >= 200
+    assert routes["pasal"]["count"] == 1 and routes["pasal"]["mean_ms"] < 50
+
+
+def make_uu_structure() -> StructureIndex:
+    pasal = {
+        1: {"nomor": 1, "bab": "I", "bab_judul": "KETENTUAN UMUM", "bagian": "",
+            "text": "Dalam Undang-Undang ini yang dimaksud dengan: ...", "ayat": [],
+            "referensi_pasal": []},
+        20: {"nomor": 20, "bab": "VI", "bab_judul": "KEWAJIBAN PENGENDALI", "bagian": "",
+             "text": "(1) Pengendali wajib memiliki dasar pemrosesan. (2) Dasar pemrosesan.",
+             "ayat": [{"nomor": "1", "text": "Pengendali wajib memiliki dasar pemrosesan."},
+                      {"nomor": "2", "text": "Dasar pemrosesan meliputi persetujuan."}],
+             "referensi_pasal": []},
+    }
+    bab = {
+        "I": {"romawi": "I", "judul": "KETENTUAN UMUM", "pasal": [1]},
+        "VI": {"romawi": "VI", "judul": "KEWAJIBAN PENGENDALI", "pasal": [20]},
+    }
+    definitions = [{
+        "nomor": 4, "istilah": "Pengendali Data Pribadi", "alias": [],
+        "definisi": "setiap orang yang menentukan tujuan pemrosesan Data Pribadi.",
+    }]
+    return StructureIndex(pasal=pasal, bab=bab, definitions=definitions)
+
+
+class CountingRetriever:
+    def __init__(self):
+        self.calls = []
+
+    async def aanswer(self, query, top_k=None):
+        self.calls.append(query)
+        return {"answer": "RAG", "sources": [], "context": ""}
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("Apa isi Pasal 20?", ("pasal", 20, None, "VI")),
+        ("bunyi pasal 20 ayat (2)", ("pasal", 20, "2", "VI")),
+        ("Ayat 1 Pasal 20 berbunyi apa?", ("pasal", 20, "1", "VI")),
+        ("Apa yang diatur BAB 6?", ("bab", None, None, "VI")),
+        ("Apa itu pengendali data pribadi?", ("definisi", 1, None, "I")),
+        # Pasal/ayat yang tidak ada dan pertanyaan terbuka tetap ke RAG
+        ("Apa isi Pasal 99?", ("rag", None, None, None)),
+        ("Pasal 20 ayat (5)", ("rag", None, None, None)),
+        ("Bagaimana sanksi jika pengendali melanggar Pasal 20?", ("rag", None, None, None)),
+        ("Bandingkan Pasal 1 dan Pasal 20", ("rag", None, None, None)),
+    ],
+)
+def test_classify_structural_references(query, expected):
+    router = QueryRouter(CountingRetriever, structure_index=make_uu_structure())
+    route = router.classify(query)
+    assert (route.name, route.pasal, route.ayat, route.bab) == expected
+
+
+async def test_structural_routes_skip_the_rag_pipeline():
+    retriever = CountingRetriever()
+    router = QueryRouter(lambda: retriever, structure_index=make_uu_structure())
+
+    pasal = await router.aanswer("Bunyi Pasal 20 ayat (1)")
+    definisi = await router.aanswer("Apa yang dimaksud dengan pengendali?")
+    rag = await router.aanswer("Apa hak subjek data?")
+
+    assert pasal["route"] == "pasal"
+    assert "Pengendali wajib memiliki dasar pemrosesan." in pasal["answer"]
+    assert pasal["sources"] == [{"score": 1.0, "pasal": "20", "bab": "VI"}]
+    assert definisi["route"] == "definisi"
+    assert "menentukan tujuan pemrosesan" in definisi["answer"]
+    assert rag["route"] == "rag"
+    assert retriever.calls == ["Apa hak subjek data?"]
+
+    stats = router.stats()
+    assert stats["total"] == 3 and stats["llm_avoided"] == 2
+    assert stats["routes"]["pasal"]["histogram"]["le_inf"] == 1
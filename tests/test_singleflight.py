@@ -0,0 +1,126 @@
+"""Single-flight: request identik dieksekusi sekali, pembatalan satu caller tidak merambat."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.rag.singleflight import SingleFlight, normalize_query
+
+
+def test_normalize_query_ignores_case_spacing_and_trailing_punctuation():
+    assert normalize_query("  Apa isi   Pasal 5? ") == normalize_query("apa isi pasal 5")
+
+
+async def test_concurrent_do_executes_once():
+    flight = SingleFlight()
+    runs = 0
+
+    async def pipeline():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return {"answer": "Pasal 5"}
+
+    results = await asyncio.gather(*(flight.do("q", pipeline) for _ in range(5)))
+
+    assert runs == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["max_shared"] == 5
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_cancelling_one_caller_leaves_the_other_intact():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def pipeline():
+        started.set()
+        await release.wait()
+        return "jawaban"
+
+    first = asyncio.ensure_future(flight.do("q", pipeline))
+    second = asyncio.ensure_future(flight.do("q", pipeline))
+    await started.wait()
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+
+    assert await second == "jawaban"
+    assert flight.stats()["executions"] == 1
+
+
+async def test_error_is_shared_and_key_released():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise RuntimeError("pinecone down")
+
+    results = await asyncio.gather(
+        flight.do("q", failing), flight.do("q", failing), return_exceptions=True
+    )
+    assert [str(r) for r in results] == ["pinecone down"] * 2
+
+    async def ok():
+        return "pulih"
+
+    assert await flight.do("q", ok) == "pulih"
+    assert flight.stats()["executions"] == 2
+
+
+async def test_stream_follower_replays_events_from_start():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def events():
+        yield {"type": "token", "text": "Pasal "}
+        await release.wait()
+        yield {"type": "token", "text": "5"}
+        yield {"type": "done"}
+
+    async def consume():
+        return [event async for event in flight.stream("q", events)]
+
+    leader = asyncio.ensure_future(consume())
+    await asyncio.sleep(0.01)
+    follower = asyncio.ensure_future(consume())
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await leader == await follower
+    assert [e.get("text") for e in await follower] == ["Pasal ", "5", None]
+    assert flight.stats()["executions"] == 1
+
+
+def test_sync_call_coalesces_threads():
+    flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def pipeline():
+        runs.append(1)
+        entered.set()
+        release.wait(5)
+        return "jawaban"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.call("q", pipeline)))
+    leader.start()
+    entered.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.call("q", pipeline)))
+    follower.start()
+    while flight.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert results == ["jawaban", "jawaban"]
+    assert len(runs) == 1
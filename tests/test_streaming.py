@@ -0,0 +1,70 @@
+"""Streaming: token dikirim begitu diterima dari LLM, sources di event terakhir."""
+
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeEmbeddingService, FakeStreamingLLM, FakeVectorIndex
+from src import server
+from src.document.structure import StructureIndex
+from src.rag.retriever import RAGRetriever
+from src.rag.router import QueryRouter
+
+FIRST_TOKEN = 0.1
+TOKEN = 0.02
+TOKENS = 15
+
+
+@pytest.fixture
+def retriever(monkeypatch) -> RAGRetriever:
+    monkeypatch.setenv("RETRIEVAL_MODE", "vector")
+    monkeypatch.setenv("RERANKER", "none")
+    return RAGRetriever(
+        embedding_service=FakeEmbeddingService(latency=0),
+        pinecone_client=FakeVectorIndex(latency=0),
+        llm=FakeStreamingLLM(first_token_latency=FIRST_TOKEN, token_latency=TOKEN, tokens=TOKENS),
+        answer_cache=None,
+    )
+
+
+async def test_tokens_arrive_before_generation_finishes(retriever):
+    start = time.perf_counter()
+    arrivals, events = [], []
+    async for event in retriever.astream_answer("Apa kewajiban pengendali?"):
+        arrivals.append(time.perf_counter() - start)
+        events.append(event)
+
+    tokens = [e for e in events[:-1] if e["type"] == "token"]
+    done = events[-1]
+    assert len(tokens) == TOKENS and all(e["type"] == "token" for e in events[:-1])
+    assert done["type"] == "done"
+    assert done["answer"] == "".join(e["text"] for e in tokens)
+    assert done["sources"] and "sources" not in tokens[0]
+
+    # Time-to-first-token ~ prefill, jauh sebelum token terakhir
+    assert arrivals[0] < FIRST_TOKEN + 5 * TOKEN
+    assert arrivals[-1] >= FIRST_TOKEN + (TOKENS - 1) * TOKEN
+
+
+class FakeContext:
+    def __init__(self):
+        self.progress = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.progress.append((progress, message))
+
+
+async def test_tanya_pdp_reports_tokens_then_references(retriever, monkeypatch):
+    router = QueryRouter(
+        lambda: retriever, structure_index=StructureIndex(pasal={}, bab={}, definitions=[])
+    )
+    monkeypatch.setattr(server, "get_router", lambda: router)
+    ctx = FakeContext()
+
+    response = await server.tanya_pdp("Apa kewajiban pengendali?", ctx)
+
+    messages = [message for _, message in ctx.progress]
+    assert [n for n, _ in ctx.progress] == list(range(1, TOKENS + 2))
+    assert messages[0] == "token0 "
+    assert messages[-1].startswith("\n\n📚 Referensi: BAB I, Pasal 1")
+    assert response == "".join(messages)
@@ -0,0 +1,79 @@
+"""Structural chunker: batas chunk mengikuti BAB/Pasal/ayat, bukan jumlah karakter."""
+
+import pytest
+
+from src.document.structural_chunker import StructuralChunker, chunk_document
+
+PAGES = [
+    "BAB I\nKETENTUAN UMUM\nPasal 1\nDalam Undang-Undang ini yang dimaksud dengan:\n"
+    "1. Data Pribadi adalah data tentang orang perseorangan.\n"
+    "2. Pelindungan Data Pribadi adalah keseluruhan upaya.\n"
+    "3. Informasi adalah keterangan.\n"
+    "Pasal 2\n(1) Undang-Undang ini berlaku untuk Setiap Orang yang melakukan",
+    "perbuatan hukum di wilayah hukum Negara.\n"
+    "(2) Undang-Undang ini tidak berlaku untuk pemrosesan pribadi.\n"
+    "BAB II\nASAS\nBagian Kesatu\nUmum\nPasal 3\nUndang-Undang ini berasaskan pelindungan.",
+]
+
+
+def test_one_chunk_per_pasal_with_structural_metadata():
+    chunks = StructuralChunker(max_chars=1500).chunk_pages(PAGES)
+
+    assert [c["metadata"]["pasal"] for c in chunks] == ["1", "2", "3"]
+    assert [c["metadata"]["chunk_index"] for c in chunks] == [0, 1, 2]
+    assert all(c["text"].startswith(f"Pasal {c['metadata']['pasal']}\n") for c in chunks)
+
+    pasal_2 = chunks[1]
+    # Ayat yang terpotong pergantian halaman tetap utuh di satu chunk
+    assert "(1) Undang-Undang ini berlaku untuk Setiap Orang yang melakukan perbuatan hukum" in (
+        pasal_2["text"]
+    )
+    assert pasal_2["metadata"]["ayat"] == ["1", "2"]
+    assert pasal_2["metadata"]["bab"] == "I"
+    assert pasal_2["metadata"]["bab_judul"] == "KETENTUAN UMUM"
+
+    pasal_3 = chunks[2]["metadata"]
+    assert (pasal_3["bab"], pasal_3["bab_judul"]) == ("II", "ASAS")
+    assert pasal_3["bagian"] == "Bagian Kesatu - Umum"
+    assert pasal_3["parent"] == "bab-II"
+
+
+def test_long_pasal_is_split_at_ayat_boundaries():
+    chunks = StructuralChunker(max_chars=90).chunk_pages(PAGES)
+    pasal_2 = [c for c in chunks if c["metadata"]["pasal"] == "2"]
+
+    assert [c["metadata"]["ayat"] for c in pasal_2] == [["1"], ["2"]]
+    assert all(c["metadata"]["chunk_type"] == "ayat" for c in pasal_2)
+    assert all(c["metadata"]["parent"] == "pasal-2" for c in pasal_2)
+    assert pasal_2[1]["text"] == (
+        "Pasal 2\n(2) Undang-Undang ini tidak berlaku untuk pemrosesan pribadi."
+    )
+
+
+def test_long_pasal_without_ayat_is_split_at_items():
+    chunks = StructuralChunker(max_chars=90).chunk_pages(PAGES)
+    pasal_1 = [c for c in chunks if c["metadata"]["pasal"] == "1"]
+
+    assert [c["metadata"]["part"] for c in pasal_1] == [1, 2, 3, 4]
+    assert pasal_1[1]["text"] == "Pasal 1\n1. Data Pribadi adalah data tentang orang perseorangan."
+    assert all(len(c["text"]) <= 90 for c in pasal_1)
+
+
+def test_chunks_stream_before_last_page_is_read():
+    read = []
+
+    def pages():
+        for page in PAGES:
+            read.append(page)
+            yield page
+
+    first = next(StructuralChunker().iter_chunks(pages()))
+    assert first["metadata"]["pasal"] == "1"
+    assert len(read) == 1
+
+
+def test_chunk_document_mode(monkeypatch):
+    monkeypatch.setenv("CHUNK_MAX_CHARS", "1500")
+    assert len(chunk_document(PAGES, mode="structural")) == 3
+    with pytest.raises(ValueError):
+        chunk_document(PAGES, mode="per-kalimat")
@@ -0,0 +1,122 @@
+"""Structure index: cache global, reload setelah ingest, dan lookup router."""
+
+import pytest
+
+from src.document import structure
+from src.document.structure import StructureIndex
+from src.rag.index_version import bump_index_version
+from src.rag.router import QueryRouter
+
+
+def make_structure(text: str) -> StructureIndex:
+    pasal = {1: {"nomor": 1, "bab": "I", "bab_judul": "KETENTUAN UMUM", "bagian": "",
+                 "text": text, "ayat": [], "referensi_pasal": []}}
+    bab = {"I": {"romawi": "I", "judul": "KETENTUAN UMUM", "pasal": [1]}}
+    return StructureIndex(pasal=pasal, bab=bab, definitions=[])
+
+
+class FakeRetriever:
+    async def aanswer(self, query, top_k=None):
+        return {"answer": "RAG", "sources": [], "context": ""}
+
+    async def answer_many(self, queries, top_k=None, stats=None):
+        for query in queries:
+            yield await self.aanswer(query)
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    """INDEX_DIR kosong tanpa PDF; catat berapa kali index dimuat."""
+    monkeypatch.setenv("INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(structure, "_structure_index", None)
+    monkeypatch.setattr(structure, "_structure_watcher", None)
+    loads = []
+    load = structure._load_structure_index
+
+    def counting_load():
+        loads.append(1)
+        return load()
+
+    def missing_pdf():
+        raise FileNotFoundError("UU Nomor 27 Tahun 2022.pdf")
+
+    monkeypatch.setattr(structure, "_load_structure_index", counting_load)
+    monkeypatch.setattr("src.document.pdf_loader.get_uu_pdp_path", missing_pdf)
+    return tmp_path, loads
+
+
+def test_missing_index_is_cached_until_new_version(index_dir):
+    path, loads = index_dir
+    assert structure.get_structure_index() is None
+    assert structure.get_structure_index() is None
+    assert len(loads) == 1
+
+    make_structure("Isi baru.").save(path / "structure.json")
+    bump_index_version()
+    assert structure.get_structure_index().get_pasal(1)["text"] == "Isi baru."
+    assert len(loads) == 2
+
+
+async def test_router_classifies_without_loading_and_reloads_after_ingest(index_dir):
+    path, loads = index_dir
+    retriever = FakeRetriever()
+    router = QueryRouter(lambda: retriever)
+
+    # Index belum ada: dicek sekali untuk seluruh batch, bukan per pertanyaan
+    results = [r async for r in router.answer_many(["Pasal 1", "Pasal 1 apa?", "BAB I"])]
+    assert [r["route"] for r in results] == ["rag"] * 3
+    assert len(loads) == 1
+
+    make_structure("Isi setelah ingest.").save(path / "structure.json")
+    bump_index_version()
+    result = await router.aanswer("Pasal 1")
+    assert result["route"] == "pasal" and "Isi setelah ingest." in result["answer"]
+    assert len(loads) == 2
+
+
+def pages_with_headings(*headings: str) -> list[str]:
+    lines = ["BAB I", "KETENTUAN UMUM"]
+    for heading in headings:
+        lines += [heading, f"Isi setelah heading {heading}."]
+    return ["\n".join(lines)]
+
+
+@pytest.mark.parametrize(
+    "headings, expected",
+    [
+        # Nomor dibaca dari heading dengan koreksi OCR
+        (("Pasal I", "Pasa72", "Pasal 3"), [1, 2, 3]),
+        # Heading Pasal 2 tidak terbaca: Pasal 3 tetap Pasal 3
+        (("Pasal 1", "Pasal 3", "Pasal 4"), [1, 3, 4]),
+        # Heading ganda tidak menggeser pasal berikutnya
+        (("Pasal 1", "Pasal 2", "Pasal 2", "Pasal 3"), [1, 2, 3]),
+        # Nomor yang tidak masuk akal ("8O" untuk 3) diganti nomor urut
+        (("Pasal 1", "Pasal 2", "Pasal 8O", "Pasal 4"), [1, 2, 3, 4]),
+    ],
+)
+def test_pasal_numbers_follow_headings(headings, expected):
+    assert [p["nomor"] for p in structure.iter_pasal(pages_with_headings(*headings))] == expected
+
+
+def test_shipped_pdf_first_and_last_pasal():
+    from src.document.pdf_loader import PDFLoader, get_uu_pdp_path
+
+    pages = [page["text"] for page in PDFLoader(get_uu_pdp_path()).load_pages()]
+    index = structure.build_structure_index(pages)
+
+    assert sorted(index.pasal) == list(range(1, 77))
+    assert index.get_pasal(1)["text"].startswith(
+        "Dalam Undang-Undang ini yang dimaksud dengan: 1. Data Pribadi adalah data tentang"
+    )
+    assert index.get_pasal(76) == {
+        "nomor": 76,
+        "bab": "XVI",
+        "bab_judul": "KETENTUAN PENUTUP",
+        "bagian": "",
+        "text": "Undang-Undang ini mulai berlaku pada tanggal diundangkan.",
+        "ayat": [],
+        "referensi_pasal": [],
+    }
+    assert index.get_pasal(75)["text"].endswith(
+        "tidak bertentangan dengan ketentuan dalam Undang-Undang ini."
+    )
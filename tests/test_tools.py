@@ -0,0 +1,89 @@
+"""Tool MCP: server.py dan src/tools/pdp_tools.py berperilaku sama."""
+
+import threading
+
+import pytest
+
+from benchmarks.fakes import FakeEmbeddingService, FakeLLM, FakeVectorIndex
+from src import server
+from src.rag.lexical_index import BM25Index, LexicalSegment
+from src.rag.retriever import RAGRetriever
+from src.rag.router import QueryRouter
+from src.tools import pdp_tools
+
+
+class FakeRetriever:
+    async def aanswer(self, query, top_k=None):
+        return {"answer": f"Jawaban RAG untuk: {query}", "sources": []}
+
+
+@pytest.fixture
+def no_structure_index(monkeypatch):
+    """Structure index belum dibuat; catat thread yang memuatnya."""
+    threads = []
+
+    def get_structure_index():
+        threads.append(threading.get_ident())
+        return None
+
+    async def get_retriever():
+        return FakeRetriever()
+
+    monkeypatch.setattr(pdp_tools, "get_structure_index", get_structure_index)
+    monkeypatch.setattr(pdp_tools, "get_retriever", get_retriever)
+    return threads
+
+
+@pytest.mark.parametrize("nomor_pasal", [5, 0, 77])
+async def test_cari_pasal_surfaces_match(no_structure_index, nomor_pasal):
+    expected = await server.cari_pasal(nomor_pasal)
+    assert await pdp_tools.cari_pasal(nomor_pasal) == expected
+    if nomor_pasal == 5:
+        assert "Jawaban RAG" in expected
+
+
+@pytest.mark.parametrize("nomor_bab", ["4", "XVII"])
+async def test_ringkasan_bab_surfaces_match(no_structure_index, nomor_bab):
+    assert await pdp_tools.ringkasan_bab(nomor_bab) == await server.ringkasan_bab(nomor_bab)
+
+
+async def test_structure_index_loads_off_event_loop(no_structure_index):
+    await server.cari_pasal(5)
+    assert no_structure_index and threading.get_ident() not in no_structure_index
+
+
+async def test_batch_cap_applies_to_both_surfaces(monkeypatch):
+    monkeypatch.setenv("BATCH_MAX_QUESTIONS", "2")
+
+    message = await pdp_tools.tanya_pdp_batch(["a", "b", "c"])
+    assert message == "❌ Maksimal 2 pertanyaan per batch (diterima 3)."
+    assert await pdp_tools.tanya_pdp_batch([]) == "❌ Daftar pertanyaan kosong."
+
+
+@pytest.mark.parametrize("failing", ["embedding", "vector"])
+async def test_batch_backend_failure_is_per_question(monkeypatch, failing):
+    monkeypatch.setenv("RETRIEVAL_MODE", "hybrid")
+    monkeypatch.setenv("ROUTER_ENABLED", "false")
+    segment = LexicalSegment.build(
+        ["uu-pdp-pasal-57"],
+        ["Pasal 57 sanksi administratif bagi pengendali"],
+        [{"pasal": "57", "text": "Pasal 57 sanksi administratif bagi pengendali"}],
+    )
+    retriever = RAGRetriever(
+        embedding_service=FakeEmbeddingService(
+            latency=0, error_rate=1.0 if failing == "embedding" else 0.0
+        ),
+        pinecone_client=FakeVectorIndex(
+            latency=0, error_rate=1.0 if failing == "vector" else 0.0
+        ),
+        llm=FakeLLM(latency=0),
+        answer_cache=None,
+        lexical_index=BM25Index({"uu-pdp": segment}),
+    )
+    monkeypatch.setattr(pdp_tools, "get_router", lambda: QueryRouter(lambda: retriever))
+
+    # Pasal 57 lexical-only (tanpa embedding), pertanyaan lain gagal sendiri
+    output = await pdp_tools.tanya_pdp_batch(["Pasal 57", "Apa hak subjek data?"])
+    answered, failed, _summary = output.split("\n\n---\n\n")
+    assert "❌" not in answered and "Pasal 57" in answered
+    assert "❌ Error:" in failed